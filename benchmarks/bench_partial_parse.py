@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Whole-file vs sliced parsing, for picking `PARTIAL_PARSE_MIN_BYTES`.
+
+Generates modules shaped like generated API code: mostly plain helper
+functions with docstrings, multi-line dict tables, some pydantic models and
+enums, and an `@cli` command every 200 lines whose defaults name
+module-level constants. Each size is timed both ways, end to end through
+the extractors `_ast_parse_file` runs:
+
+  full     ast.parse + extract_cli_functions/_python_enums/_pydantic_models
+  partial  partial_parse.parse_slices + the same extractors on its tree
+
+The two must agree (the run aborts if they don't). The report gives the
+median per cell and the smallest size at which slicing wins by 10%: the
+crossover.
+
+    python benchmarks/bench_partial_parse.py
+    python benchmarks/bench_partial_parse.py --lines 500,2000,20000 --repeat 9
+"""
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+
+def make_module(n_lines: int) -> str:
+    out = [
+        '"""Generated client module."""',
+        "from enum import Enum",
+        "from pydantic import BaseModel",
+        "from cliche import cli",
+        "",
+        "DEFAULT_LIMIT = 10",
+        "DEFAULT_REGION: str = 'eu-west-1'",
+        "",
+    ]
+    i = 0
+    while len(out) < n_lines:
+        if i % 20 == 0:
+            out += [f"class Color{i}(Enum):", "    RED = 'red'", "    GREEN = 'green'", ""]
+        elif i % 20 == 1:
+            out += [f"class Model{i}(BaseModel):", "    a: int = 1", "    b: str = 'x'", ""]
+        elif i % 20 == 2:
+            out += [f"TABLE_{i} = {{",
+                    *(f"    'k{j}': ({j}, \"v{j}\", [1, 2, 3])," for j in range(8)),
+                    "}", ""]
+        else:
+            out += [f"def helper{i}(a, b=None, *args, **kw):",
+                    f'    """Helper {i}.', "", "    Calls the backend.", '    """',
+                    "    x = [a, b, {'k': (1, 2)}]", "    if a:",
+                    "        return dict(a=a, b=b)",
+                    f"    return helper{i}(b, a) + \"s\" + 'q'", ""]
+        if i % 20 == 19:
+            out += ["@cli", f"def cmd{i}(x: int, limit: int = DEFAULT_LIMIT,",
+                    f"         region=DEFAULT_REGION, color: Color0 = Color0.RED):",
+                    f'    """Command {i}."""', "    return x", ""]
+        i += 1
+    return "\n".join(out) + "\n"
+
+
+def extract(content: str, partial: bool) -> str:
+    from cliche import main, partial_parse
+    if partial:
+        tree = partial_parse.parse_slices(content)
+        assert tree is not None, "the slicer fell back on generated code"
+    else:
+        tree = ast.parse(content)
+    # extract_cli_functions parses on its own; hand it the tree instead.
+    parse, main.ast.parse = main.ast.parse, lambda *a, **k: tree
+    try:
+        functions = main.extract_cli_functions(content, Path("/pkg/gen.py"), Path("/pkg"))
+    finally:
+        main.ast.parse = parse
+    return json.dumps([functions, main.extract_python_enums(content, tree),
+                       sorted(main.extract_pydantic_models(content, tree))])
+
+
+def time_one(content: str, partial: bool, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        extract(content, partial)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--lines", default="200,1000,2000,5000,20000,50000",
+                        help="comma-separated module sizes in lines (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per cell (median)")
+    args = parser.parse_args()
+
+    from cliche.partial_parse import PARTIAL_PARSE_MIN_BYTES
+
+    print(f"{'lines':>7} {'KiB':>7} {'full ms':>9} {'partial ms':>11} {'speedup':>8}")
+    crossover = None
+    for n in (int(s) for s in args.lines.split(",")):
+        content = make_module(n)
+        if extract(content, True) != extract(content, False):
+            print(f"partial and full parses disagree at {n} lines", file=sys.stderr)
+            return 1
+        full = time_one(content, False, args.repeat)
+        partial = time_one(content, True, args.repeat)
+        size = len(content.encode())
+        print(f"{n:>7} {size / 1024:>7.0f} {full:>9.2f} {partial:>11.2f} {full / partial:>7.1f}x")
+        # A 10% margin keeps run-to-run noise from calling a crossover.
+        if crossover is None and partial < 0.9 * full:
+            crossover = size
+    print("crossover: "
+          + (f"{crossover / 1024:.0f} KiB" if crossover else "none — full parsing wins at every size")
+          + f" (PARTIAL_PARSE_MIN_BYTES is {PARTIAL_PARSE_MIN_BYTES // 1024} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""Protobuf enum extraction: descriptor walk vs the old regex scan.
+
+Generates `_pb2.py` modules the way protoc 3.x lays them out — the
+serialized FileDescriptorProto as an escaped bytes literal, then the
+`_NAME._serialized_start/end` markers — each with messages of many fields
+and nested enums, plus top-level enums. Two ways to get the enums out:
+
+  regex  what cliche did before: `unicode_escape`-decode the literal, cut
+         each marker's byte range and regex it for identifier-like runs
+  walk   proto_enums.parse_pb2_enums: decode the literal, walk the
+         descriptor in the wire format
+
+Every enum the walk finds must be one the regex finds too, with the same
+values (the run aborts otherwise); the regex also reports each message as
+an "enum" of its field names, which the count line shows. Then a package
+holding the modules is scanned, one module touched, and the rescan timed:
+only that module is read again.
+
+    python benchmarks/bench_proto_enums.py
+    python benchmarks/bench_proto_enums.py --files 40 --messages 400 --repeat 9
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while n >= 0x80:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _field(number: int, payload: bytes) -> bytes:
+    return _varint(number << 3 | 2) + _varint(len(payload)) + payload
+
+
+def _enum(name: str, values: list[str]) -> bytes:
+    return _field(1, name.encode()) + b"".join(
+        _field(2, _field(1, v.encode()) + _varint(2 << 3) + _varint(i))
+        for i, v in enumerate(values))
+
+
+def make_pb2(index: int, n_messages: int) -> tuple[str, dict[str, list[str]]]:
+    """Source of one module and the enums it defines."""
+    blob = _field(1, f"gen{index}.proto".encode()) + _field(2, f"gen{index}".encode())
+    markers, enums = [], {}
+    for m in range(n_messages):
+        name = f"Msg{index}x{m}"
+        body = _field(1, name.encode())
+        for f in range(12):
+            fdesc = (_field(1, f"field_{f}_of_{m}".encode()) + _varint(3 << 3) + _varint(f + 1)
+                     + _varint(4 << 3) + _varint(1) + _varint(5 << 3) + _varint(9))
+            body += _field(2, fdesc)
+        enum_name = f"Kind{index}x{m}"
+        values = [f"KIND_{m}_{v}" for v in range(6)]
+        nested = _enum(enum_name, values)
+        nested_at = len(body) + len(_field(4, nested)) - len(nested)
+        body += _field(4, nested)
+        enums[enum_name] = values
+        msg = _field(4, body)
+        start = len(blob) + len(msg) - len(body)
+        markers.append((f"_{name.upper()}", start, start + len(body)))
+        markers.append((f"_{name.upper()}_{enum_name.upper()}",
+                        start + nested_at, start + nested_at + len(nested)))
+        blob += msg
+    for e in range(max(1, n_messages // 10)):
+        name = f"Top{index}x{e}"
+        values = ["UNSET", *(f"v{e}_{v}" for v in range(20))]
+        enum = _enum(name, values)
+        start = len(blob) + len(_field(5, enum)) - len(enum)
+        markers.append((f"_{name.upper()}", start, start + len(enum)))
+        blob += _field(5, enum)
+        enums[name] = values
+    literal = "b'" + "".join(
+        chr(b) if 32 <= b < 127 and b not in (39, 92) else f"\\x{b:02x}" for b in blob) + "'"
+    lines = [
+        "from google.protobuf import descriptor_pool as _descriptor_pool",
+        f"DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile({literal})",
+        "if _descriptor._USE_C_DESCRIPTORS == False:",
+        "  DESCRIPTOR._options = None",
+    ]
+    for name, start, end in markers:
+        lines += [f"  {name}._serialized_start={start}", f"  {name}._serialized_end={end}"]
+    return "\n".join(lines) + "\n", enums
+
+
+def regex_enums(pb2_path: Path) -> dict[str, list[str]]:
+    """The pre-walker implementation, kept here for comparison."""
+    content = pb2_path.read_text()
+    match = re.search(r"AddSerializedFile\(b'(.+?)'\)", content, re.DOTALL)
+    if not match:
+        return {}
+    blob = bytes(match.group(1), 'utf-8').decode('unicode_escape').encode('latin-1')
+    ranges = {}
+    for m in re.finditer(r'_([A-Z][A-Z0-9_]+)\._serialized_start=(\d+)', content):
+        ranges[m.group(1)] = {'start': int(m.group(2))}
+    for m in re.finditer(r'_([A-Z][A-Z0-9_]+)\._serialized_end=(\d+)', content):
+        if m.group(1) in ranges:
+            ranges[m.group(1)]['end'] = int(m.group(2))
+    enums = {}
+    for r in ranges.values():
+        if 'end' not in r:
+            continue
+        values = [s.decode('latin-1')
+                  for s in re.findall(rb'[A-Za-z_][A-Za-z0-9_]+', blob[r['start']:r['end']])]
+        if values:
+            enums[values[0]] = values[1:]
+    return enums
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    ap.add_argument("--files", type=int, default=40, help="number of _pb2.py modules")
+    ap.add_argument("--messages", type=int, default=300, help="messages per module")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    from cliche.proto_enums import parse_pb2_enums
+    from cliche.runtime import _get_cache_path, _scan_and_cache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["XDG_CACHE_HOME"] = str(Path(tmp) / "cache")
+        pkg = Path(tmp) / "bench_proto_pkg"
+        pkg.mkdir()
+        (pkg / "__init__.py").write_text("")
+        (pkg / "cli.py").write_text("from cliche import cli\n\n@cli\ndef hello():\n    pass\n")
+        paths, expected = [], {}
+        for i in range(args.files):
+            source, enums = make_pb2(i, args.messages)
+            path = pkg / f"gen{i}_pb2.py"
+            path.write_text(source)
+            paths.append(path)
+            expected.update(enums)
+        size = sum(p.stat().st_size for p in paths)
+
+        walked, scanned = {}, {}
+        for path in paths:
+            walked.update(parse_pb2_enums(path))
+            scanned.update(regex_enums(path))
+        if walked != expected:
+            print("walk disagrees with the generated descriptors", file=sys.stderr)
+            return 1
+        if any(scanned.get(name) != values for name, values in walked.items()):
+            print("walk disagrees with the regex scan", file=sys.stderr)
+            return 1
+
+        print(f"{args.files} modules, {size / 1e6:.1f} MB; "
+              f"enums: walk {len(walked)}, regex {len(scanned)} "
+              f"({len(scanned) - len(walked)} of them messages)")
+        for label, fn in (("regex", regex_enums), ("walk", parse_pb2_enums)):
+            ms = _median_ms(lambda: [fn(p) for p in paths], args.repeat)
+            print(f"  {label:<6} all modules  {ms:8.1f} ms")
+
+        cache_file = _get_cache_path("bench_proto_pkg", pkg)
+        _scan_and_cache(pkg, cache_file, "bench_proto_pkg")
+
+        def touch_and_rescan():
+            later = time.time() + 5
+            os.utime(paths[0], (later, later))
+            _scan_and_cache(pkg, cache_file, "bench_proto_pkg")
+
+        ms = _median_ms(touch_and_rescan, args.repeat)
+        print(f"  rescan, one module touched  {ms:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""Startup and scaling of a generated CLI, recorded as JSON for comparison.
+
+Generates a package with N modules, M `@cli` commands (a third of them in
+groups), K enums that the commands take, and P pydantic models that every
+tenth command takes as a parameter. It then times:
+
+  scan.cold     _scan_and_cache with no cache at all (no object store either)
+  scan.warm     _scan_and_cache with nothing changed: the fast path
+  scan.touch    after bumping the mtime of --churn modules, content unchanged
+  scan.edit     after editing one command's module
+
+in-process, and then these calls end to end, each process included:
+
+  help           --help
+  command_help   <cmd> --help
+  complete       tab completion of `<prog> c`
+  unknown        a command that doesn't exist (exit 1)
+  dispatch       <cmd> 1: a real call, which always reaches Python
+  llm_help       --llm-help
+  command_llm    <cmd> --llm-help
+
+Each call runs on four engines side by side. `python` is the launcher that
+a pip shim runs. `clichec` is the C binary on its own; its exit status is
+recorded, and 64 means it would hand the call to Python. `wrapper` is the
+fast-shim shell script, which runs clichec and falls back to Python.
+`entry` is clichec installed as the CLI, as `cliche install` does, which
+exec's Python itself. Where clichec served the call itself, `same_output`
+says whether both fast shims printed what Python printed.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --files 2000 --commands 5000 -o after.json
+    python benchmarks/bench_startup.py -o after.json --compare before.json
+
+`-o` writes the medians with the commit, interpreter and parameters. With
+`--compare` the report adds the older run's medians and the ratio; compare
+runs made with the same parameters on the same machine.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PKG_NAME = "bench_startup_pkg"
+PROG = "benchcli"
+GROUPS = 4
+
+
+def make_package(root: Path, n_files: int, n_commands: int, n_enums: int, n_models: int) -> Path:
+    pkg = root / "src" / PKG_NAME
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    n_enums = max(n_enums, 1)
+    (pkg / "enums.py").write_text("from enum import Enum\n\n" + "".join(
+        f"\nclass Color{k}(Enum):\n    RED = 'red'\n    GREEN = 'green'\n    BLUE = 'blue'\n"
+        for k in range(n_enums)))
+    if n_models:
+        (pkg / "models.py").write_text("from pydantic import BaseModel\n\n" + "".join(
+            f"\nclass Config{p}(BaseModel):\n    host: str = 'localhost'\n"
+            f"    port: int = 8080\n    debug: bool = False\n"
+            for p in range(n_models)))
+
+    n_modules = max(n_files - 3, 1)
+    bodies: list[list[str]] = [[] for _ in range(n_modules)]
+    for j in range(n_commands):
+        lines = bodies[j % n_modules]
+        decorator = f'@cli("grp{j % GROUPS}")' if j % 3 == 2 else "@cli"
+        params = ["x: int", f"name: str = 'n{j}'", f"color: Color{j % n_enums} = Color{j % n_enums}.RED",
+                  "tags: list[str] | None = None", "verbose: bool = False"]
+        if n_models and j % 10 == 0:
+            params.insert(1, f"cfg: Config{j % n_models}")
+        lines += ["", "", decorator, f"def cmd{j}({', '.join(params)}):",
+                  f'    """Command {j}: does the thing.', "",
+                  "    :param x: how many", "    :param name: who for", '    """',
+                  "    return {'x': x, 'name': name}"]
+    for i, lines in enumerate(bodies):
+        imports = ["from cliche import cli", "from .enums import *"]
+        if n_models:
+            imports.append("from .models import *")
+        helpers = [f"\n\ndef helper{i}_{h}(a, b=None):\n    return [a, b]" for h in range(5)]
+        sub = pkg / f"m{i // 100:03d}"
+        if i % 100 == 0:
+            sub.mkdir()
+            (sub / "__init__.py").write_text("")
+        (sub / f"mod{i % 100:02d}.py").write_text(
+            "\n".join(imports) + "".join(helpers) + "\n".join(lines) + "\n")
+    return pkg
+
+
+def command_names(n_commands: int) -> tuple[list[str], list[str]]:
+    """argv for a plain command and for a grouped one (the first of each)."""
+    plain = ["cmd0"]
+    grouped = [f"grp{2 % GROUPS}", "cmd2"] if n_commands > 2 else plain
+    return plain, grouped
+
+
+def time_call(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def bench_scan(pkg: Path, cache_dir: Path, churn: int, repeat: int) -> dict:
+    from cliche import runtime
+    cache_file = runtime._get_cache_path(PKG_NAME, pkg)
+    modules = sorted(p for p in pkg.rglob("mod*.py"))
+
+    def scan():
+        runtime._scan_and_cache(pkg, cache_file, PKG_NAME, prog=PROG)
+
+    def cold():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        scan()
+
+    results = {"scan.cold": {"python": time_call(cold, max(repeat // 2, 1))}}
+    results["scan.warm"] = {"python": time_call(scan, repeat)}
+
+    # Two seconds on: filesystems with coarse mtimes still see the bump.
+    start = time.time() + 2
+    bumps = iter(range(1, 1000))
+
+    def touch():
+        t = start + next(bumps)
+        for p in modules[:churn]:
+            os.utime(p, (t, t))
+        scan()
+
+    results["scan.touch"] = {"python": time_call(touch, repeat)}
+
+    edits = iter(range(1000))
+
+    def edit():
+        with open(modules[0], "a") as f:
+            f.write(f"# edit {next(edits)}\n")
+        scan()
+
+    results["scan.edit"] = {"python": time_call(edit, repeat)}
+    return results
+
+
+def run_argv(argv, env, extra_env=None):
+    env = {**env, **extra_env} if extra_env else env
+    return subprocess.run(argv, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def bench_calls(root: Path, pkg: Path, env: dict, clichec, n_commands: int, repeat: int) -> dict:
+    from cliche import runtime
+    from cliche._clichec import entry_config_path, render_entry_config, render_wrapper
+    cache_file = runtime._get_cache_path(PKG_NAME, pkg)
+    python = [sys.executable, "-c",
+              f"import sys; sys.argv[0] = '{PROG}'; "
+              f"from cliche.launcher import launch_{PKG_NAME}; launch_{PKG_NAME}()"]
+    engines = {"python": python}
+    if clichec:
+        wrapper = root / "bin" / PROG
+        wrapper.parent.mkdir()
+        wrapper.write_text(render_wrapper(
+            PROG, PKG_NAME, str(pkg), sys.executable, str(clichec),
+            hashlib.md5(str(pkg).encode()).hexdigest()[:8]))
+        wrapper.chmod(0o755)
+        entry = root / "entry" / PROG
+        entry.parent.mkdir()
+        shutil.copy2(clichec, entry)
+        entry_config_path(entry).write_text(render_entry_config(
+            PROG, PKG_NAME, sys.executable, str(clichec),
+            hashlib.md5(str(pkg).encode()).hexdigest()[:8]))
+        engines["clichec"] = [str(clichec), str(cache_file), PKG_NAME]
+        engines["wrapper"] = [str(wrapper)]
+        engines["entry"] = [str(entry)]
+    env = {**env, "CLICHEC_PROG": PROG}
+
+    plain, grouped = command_names(n_commands)
+    complete_out = root / "complete.out"
+    complete_env = {"_ARGCOMPLETE": "1", "COMP_LINE": f"{PROG} c", "COMP_POINT": str(len(PROG) + 2),
+                    "_ARGCOMPLETE_STDOUT_FILENAME": str(complete_out)}
+    cases = {
+        "help": (["--help"], None),
+        "command_help": ([*grouped, "--help"], None),
+        "complete": ([], complete_env),
+        "unknown": (["nosuchcommand"], None),
+        "dispatch": ([*plain, "1"], None),
+        "llm_help": (["--llm-help"], None),
+        "command_llm": ([*plain, "--llm-help"], None),
+    }
+
+    # Prime the cache and the help store for PROG before timing anything.
+    run_argv(python + ["--help"], env)
+    results: dict[str, dict] = {}
+    for case, (args, extra_env) in cases.items():
+        row: dict = {}
+        outputs = {}
+        for engine, argv in engines.items():
+            p = run_argv(argv + args, env, extra_env)
+            if engine == "clichec":
+                row["clichec_rc"] = p.returncode
+            out = p.stdout + p.stderr
+            if extra_env is not None:
+                # Candidates in any order: the shell sorts them.
+                out = sorted(complete_out.read_bytes().split(b"\v")) if complete_out.exists() else []
+                complete_out.unlink(missing_ok=True)
+            outputs[engine] = out
+            row[engine] = time_call(lambda: run_argv(argv + args, env, extra_env), repeat)
+        # Where clichec deferred, the fast shims ran Python too: nothing to compare.
+        if row.get("clichec_rc") in (0, 1):
+            row["same_output"] = outputs["wrapper"] == outputs["entry"] == outputs["python"]
+        results[case] = row
+        print(f"  {case} done", file=sys.stderr)
+    return results
+
+
+def git_commit() -> str | None:
+    here = Path(__file__).resolve().parent
+    try:
+        head = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=here,
+                              capture_output=True, text=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               cwd=here, capture_output=True, text=True)
+    except OSError:
+        return None
+    if head.returncode != 0:
+        return None
+    return head.stdout.strip() + ("-dirty" if dirty.stdout.strip() else "")
+
+
+def report(results: dict, base: dict | None) -> None:
+    engines = ["python", "clichec", "wrapper", "entry"]
+    header = f"{'case':<14}" + "".join(f"{e + ' ms':>12}" for e in engines)
+    if base:
+        header += f"{'base ms':>10}{'ratio':>8}"
+    print(header)
+    for case, row in results.items():
+        line = f"{case:<14}"
+        for engine in engines:
+            value = row.get(engine)
+            cell = "" if value is None else f"{value:.2f}"
+            if engine == "clichec" and row.get("clichec_rc") not in (None, 0, 1):
+                cell += f" ({row['clichec_rc']})"
+            line += f"{cell:>12}"
+        if base:
+            # The ratio is for the fastest engine both runs have.
+            old = base.get(case, {})
+            engine = next(e for e in ("entry", "wrapper", "python")
+                          if e == "python" or (e in row and e in old))
+            if engine in old and engine in row:
+                line += f"{old[engine]:>10.2f}{row[engine] / old[engine]:>7.2f}x"
+        if row.get("same_output") is False:
+            line += "  output differs"
+        print(line)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=200, help="modules (default: %(default)s)")
+    parser.add_argument("--commands", type=int, default=400, help="@cli commands (default: %(default)s)")
+    parser.add_argument("--enums", type=int, default=20, help="enums (default: %(default)s)")
+    parser.add_argument("--models", type=int, default=10,
+                        help="pydantic models, 0 without pydantic (default: %(default)s)")
+    parser.add_argument("--churn", type=int, default=20,
+                        help="modules touched for scan.touch (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=7, help="runs per cell (median)")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="a JSON file from an earlier run to compare against")
+    parser.add_argument("--no-clichec", action="store_true", help="time the Python engine only")
+    args = parser.parse_args()
+    if args.models and importlib.util.find_spec("pydantic") is None:
+        print("pydantic isn't installed; generating no models", file=sys.stderr)
+        args.models = 0
+    params = {k: v for k, v in vars(args).items() if k not in ("output", "compare")}
+    base = None
+    if args.compare:
+        with open(args.compare) as f:
+            base = json.load(f)
+        if base.get("params") != params:
+            print(f"warning: {args.compare} was run with other parameters", file=sys.stderr)
+        base = base["results"]
+
+    clichec = None
+    if not args.no_clichec:
+        from cliche._clichec import ensure_built
+        clichec = ensure_built()
+        if clichec is None:
+            print("clichec could not be built; timing Python only", file=sys.stderr)
+
+    with tempfile.TemporaryDirectory(prefix="cliche-bench-startup-") as tmp:
+        root = Path(tmp).resolve()
+        pkg = make_package(root, args.files, args.commands, args.enums, args.models)
+        cache_home = root / "cache"
+        env = {**os.environ, "XDG_CACHE_HOME": str(cache_home), "NO_COLOR": "1",
+               "PYTHONPATH": str(root / "src"), "CLICHE_NO_FAST_SHIM": "1"}
+        for var in ("CLICHE_ZYGOTE", "CLICHE_TRACE", "COLUMNS"):
+            env.pop(var, None)
+        os.environ["XDG_CACHE_HOME"] = str(cache_home)
+        results = bench_scan(pkg, cache_home / "cliche", args.churn, args.repeat)
+        print("  scans done", file=sys.stderr)
+        results.update(bench_calls(root, pkg, env, clichec, args.commands, args.repeat))
+
+    try:
+        from cliche import __version__ as cliche_version
+    except ImportError:
+        cliche_version = "unknown"
+    record = {
+        "commit": git_commit(),
+        "cliche_version": cliche_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "params": params,
+        "results": results,
+    }
+    print(f"\nmedian ms over {args.repeat} runs: {args.files} modules, {args.commands} commands, "
+          f"{args.enums} enums, {args.models} models")
+    report(results, base)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(record, f, indent=2)
+            f.write("\n")
+        print(f"results written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
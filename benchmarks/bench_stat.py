@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Serial vs parallel freshness checks, for picking `_PARALLEL_STAT_THRESHOLD`.
+
+Builds a synthetic package of N `.py` files (100 per directory), writes its
+cache, then times the freshness check both launchers run on every call:
+
+  python   runtime._stat_batch over every tracked file and directory, the
+           way `_scan_and_cache` phases 1–2 check them
+  clichec  `clichec <cache> <pkg> --help` end to end (process start
+           included), which spends its time in idx_is_fresh
+
+Each engine runs serially (CLICHE_STAT_THREADS=1) and with each thread
+count in --threads. The report gives the median per cell and, per engine,
+the smallest size at which some thread count beats serial by 10% — the
+crossover.
+
+    python benchmarks/bench_stat.py
+    python benchmarks/bench_stat.py --sizes 1000,10000 --threads 4,16 --cold
+
+--cold drops the page cache before every run (root only, Linux), which is
+the closest a local disk gets to NFS-like stat latency. On a warm cache
+expect serial to win until several thousand files, or always on one CPU.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PKG_NAME = "bench_stat_pkg"
+
+
+def make_tree(root: Path, n_files: int) -> Path:
+    pkg = root / "src" / PKG_NAME
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cli.py").write_text("from cliche import cli\n\n@cli\ndef hello():\n    pass\n")
+    for i in range(n_files - 2):
+        sub = pkg / f"m{i // 100:04d}"
+        if i % 100 == 0:
+            sub.mkdir()
+        (sub / f"f{i % 100:02d}.py").write_text("x = 1\n")
+    return pkg
+
+
+def drop_caches() -> None:
+    os.sync()
+    with open("/proc/sys/vm/drop_caches", "w") as f:
+        f.write("3\n")
+
+
+def time_python(paths, expected, threads: int, repeat: int, cold: bool) -> float:
+    from cliche.runtime import _stat_batch
+    os.environ["CLICHE_STAT_THREADS"] = str(threads)
+    samples = []
+    for _ in range(repeat):
+        if cold:
+            drop_caches()
+        t0 = time.perf_counter()
+        assert _stat_batch(paths, expected)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def time_clichec(clichec, cache_file, env, threads: int, repeat: int, cold: bool) -> float:
+    env = {**env, "CLICHE_STAT_THREADS": str(threads)}
+    argv = [str(clichec), str(cache_file), PKG_NAME, "--help"]
+    samples = []
+    for _ in range(repeat):
+        if cold:
+            drop_caches()
+        t0 = time.perf_counter()
+        rc = subprocess.run(argv, env=env, stdout=subprocess.DEVNULL).returncode
+        samples.append(time.perf_counter() - t0)
+        assert rc == 0, "clichec deferred: the cache isn't fresh"
+    return statistics.median(samples) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="100,1000,10000,50000",
+                        help="comma-separated file counts (default: %(default)s)")
+    parser.add_argument("--threads", default="2,4,8",
+                        help="comma-separated thread counts (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=7, help="runs per cell (median)")
+    parser.add_argument("--cold", action="store_true",
+                        help="drop the page cache before every run (root, Linux)")
+    parser.add_argument("--no-clichec", action="store_true", help="time the Python engine only")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    thread_counts = [int(t) for t in args.threads.split(",")]
+
+    clichec = None
+    if not args.no_clichec:
+        from cliche._clichec import ensure_built
+        clichec = ensure_built()
+        if clichec is None:
+            print("clichec could not be built; timing Python only", file=sys.stderr)
+
+    columns = ["serial", *(f"{t} thr" for t in thread_counts)]
+    rows: dict[str, list[tuple[int, list[float]]]] = {"python": [], "clichec": []}
+    with tempfile.TemporaryDirectory(prefix="cliche-bench-stat-") as tmp:
+        for n in sizes:
+            root = Path(tmp) / str(n)
+            pkg = make_tree(root, n)
+            env = {**os.environ, "XDG_CACHE_HOME": str(root / "cache"),
+                   "PYTHONPATH": str(root / "src"), "NO_COLOR": "1"}
+            os.environ["XDG_CACHE_HOME"] = env["XDG_CACHE_HOME"]
+            from cliche import runtime
+            cache_file = runtime._get_cache_path(PKG_NAME, pkg)
+            cache = runtime._scan_and_cache(pkg, cache_file, PKG_NAME)
+            tracked = {**cache["dir_mtimes"], **cache["py_mtimes"]}
+            paths = [str(pkg) if rel == "." else os.path.join(pkg, rel) for rel in tracked]
+            expected = list(tracked.values())
+
+            rows["python"].append((n, [time_python(paths, expected, t, args.repeat, args.cold)
+                                       for t in (1, *thread_counts)]))
+            if clichec:
+                rows["clichec"].append((n, [time_clichec(clichec, cache_file, env, t,
+                                                         args.repeat, args.cold)
+                                            for t in (1, *thread_counts)]))
+            print(f"  {n} files done", file=sys.stderr)
+
+    mode = "cold" if args.cold else "warm"
+    print(f"\nfreshness check, median ms ({mode} page cache, {os.cpu_count()} CPUs)")
+    for engine, results in rows.items():
+        if not results:
+            continue
+        print(f"\n{engine:<8} {'files':>7} " + " ".join(f"{c:>9}" for c in columns))
+        crossover = None
+        for n, times in results:
+            print(f"{'':<8} {n:>7} " + " ".join(f"{t:>9.2f}" for t in times))
+            # A 10% margin keeps run-to-run noise from calling a crossover.
+            if crossover is None and min(times[1:]) < 0.9 * times[0]:
+                crossover = n
+        print(f"{'':<8} crossover: "
+              + (f"{crossover} files" if crossover else "none — serial wins at every size"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -40,3 +40,15 @@ def cli(fn_or_group=None):
     def _decorator(fn):
         return fn
     return _decorator  # @cli("group")
+
+
+def completer(*params, ttl=None):
+    """No-op decorator — cliche detects @completer via AST parsing.
+
+    `@completer("service", ttl=600)` makes the function the source of
+    completions for every `service` parameter of the module's @cli
+    functions (see cliche/completions.py).
+    """
+    def _decorator(fn):
+        return fn
+    return _decorator
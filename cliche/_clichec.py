@@ -2,9 +2,11 @@
 
 The native launcher lives at ``cliche/clichec.c`` in this package. We compile
 it on demand into ``$XDG_CACHE_HOME/cliche/clichec-<cliche_version>`` so version
-bumps invalidate stale binaries in place. ``fast-shim`` then writes a shell
-wrapper that exec's this binary and falls back to the Python launcher when
-the C side returns 64 ("I can't handle this").
+bumps invalidate stale binaries in place. ``install_fast_shim`` then puts
+this binary in place of the CLI's console script, with its settings in a
+sidecar, and it exec's the Python launcher itself whenever the C side can't
+handle a call (its 64, "defer"). ``render_wrapper`` is the older form, a
+shell wrapper that runs clichec and falls back to Python on a 64.
 
 Failure modes are deliberately silent: if there's no C compiler, or the build
 fails, ``binary_path()`` returns None and the caller writes a Python-only
@@ -125,9 +127,12 @@ def build(verbose: bool = False) -> Path | None:
         from cliche import __version__ as _v
     except ImportError:
         _v = "unknown"
-    cmd = [cc, "-std=c99", "-O2", "-Wall", "-Wextra",
+    # Built aside and renamed into place, so that a CLI being installed as a
+    # copy of `out` (install_fast_shim) never copies a half-written binary.
+    tmp = out.with_name(out.name + ".build")
+    cmd = [cc, "-std=c99", "-O2", "-Wall", "-Wextra", "-pthread",
            f'-DCLICHEC_VERSION="{_v}"',
-           "-o", str(out), str(src)]
+           "-o", str(tmp), str(src)]
     if verbose:
         print("clichec build:", " ".join(cmd), file=sys.stderr)
     try:
@@ -140,6 +145,10 @@ def build(verbose: bool = False) -> Path | None:
         if verbose and r.stderr:
             print(r.stderr, file=sys.stderr)
         return None
+    try:
+        os.replace(tmp, out)
+    except OSError:
+        return None
     return out
 
 
@@ -172,8 +181,89 @@ def ensure_built(verbose: bool = False) -> Path | None:
 WRAPPER_MARKER = "# cliche fast-shim wrapper"
 
 
+# Run as `python -S -c` under the CLI's interpreter by `record_site`: does
+# the `site` initialisation that -S skipped, keeping the `.pth` import lines
+# that install an import hook (editable finders), and prints what it added.
+_SITE_PROBE = """\
+import json, os, site, sys
+base = {os.path.abspath(p) for p in sys.path}   # site.main makes them absolute
+hooks = []
+def _exec(line, *args):
+    before = list(sys.meta_path), list(sys.path_hooks)
+    exec(line, *args)
+    if (list(sys.meta_path), list(sys.path_hooks)) != before:
+        hooks.append(line)
+site.exec = _exec
+site.main()
+hooks += ["import " + m for m in ("sitecustomize", "usercustomize") if m in sys.modules]
+dirs = site.getsitepackages() + ([site.getusersitepackages()] if site.ENABLE_USER_SITE else [])
+stamps = {}
+for d in dirs:
+    try:
+        stamps[d] = os.stat(d).st_mtime_ns
+    except OSError:
+        stamps[d] = -1
+print(json.dumps({"path": [p for p in sys.path if p not in base], "hooks": hooks,
+                  "prefix": sys.prefix, "exec_prefix": sys.exec_prefix, "stamps": stamps}))
+"""
+
+
+def record_site(python_exe: str) -> dict | None:
+    """What `site` adds to `python_exe`'s start-up: the sys.path entries of
+    its site-packages and `.pth` files, the `.pth` lines that install an
+    import hook, sitecustomize, and the venv's prefixes, with the mtime of
+    each site-packages dir it read. None when it can't be run."""
+    import json
+    import subprocess
+    try:
+        out = subprocess.run([python_exe, "-S", "-c", _SITE_PROBE], cwd="/",
+                             stdin=subprocess.DEVNULL, capture_output=True,
+                             text=True, timeout=30)
+        return json.loads(out.stdout) if out.returncode == 0 else None
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        return None
+
+
+# A `.pth` hook line `_site_free` lets through: setuptools' distutils shim,
+# which only decides where `import distutils` comes from.
+_CHILD_SAFE_HOOKS = ("_distutils_hack",)
+
+
+def _site_free(site: dict | None) -> dict | None:
+    """`site` when the CLI can start under -S with it, else None.
+
+    Python passes -S on to the interpreters it starts for `multiprocessing`
+    (spawn, forkserver) and `subprocess._args_from_interpreter_flags`. Those
+    get the parent's sys.path but not what `restore_site` replayed, so a
+    module only an import hook finds (an editable install's finder, say)
+    can't be imported there. With such a hook, or a sitecustomize, the CLI
+    keeps the full start-up.
+    """
+    if site is None:
+        return None
+    if any(not any(safe in line for safe in _CHILD_SAFE_HOOKS) for line in site["hooks"]):
+        return None
+    return site
+
+
+def _site_restore(site: dict) -> str:
+    """The Python that puts back what `site` would have set up (see
+    `record_site`), ahead of `launcher.launch_<pkg>()` under -S."""
+    return (f"sys.path += {site['path']!r}; from cliche import launcher; "
+            f"launcher.restore_site({site['stamps']!r}, {site['hooks']!r}, "
+            f"{site['prefix']!r}, {site['exec_prefix']!r}); ")
+
+
+def _sh_quoted(text: str) -> str:
+    """`text` escaped for a double-quoted sh string."""
+    for char in ('\\', '"', '$', '`'):
+        text = text.replace(char, '\\' + char)
+    return text
+
+
 def render_wrapper(binary_name: str, package_name: str, pkg_dir: str,
-                   python_exe: str, clichec: str, cache_hash: str) -> str:
+                   python_exe: str, clichec: str, cache_hash: str,
+                   pycache_prefix: bool = False, site: dict | None = None) -> str:
     """Render the shell wrapper that runs clichec then falls back to Python.
 
     The wrapper:
@@ -181,6 +271,20 @@ def render_wrapper(binary_name: str, package_name: str, pkg_dir: str,
       2. Tries clichec; if exit code != 64, exits with that code (handled).
       3. Falls through to the Python launcher with the original argv.
 
+    With ``CLICHE_ZYGOTE`` set it instead exec's clichec outright, which
+    tries the warm zygote server (cliche/zygote.py) before exec'ing Python.
+
+    ``pycache_prefix`` starts that Python with ``-X pycache_prefix=`` the
+    private bytecode dir (cliche/bytecode.py), for installs whose sources
+    can't have their ``.pyc`` written next to them.
+
+    ``site`` (`record_site`) starts that Python with ``-S`` instead, and
+    the snippet puts back what ``site`` would have: the recorded sys.path
+    entries, then ``launcher.restore_site`` for the prefixes and import
+    hooks, which falls back to a full ``site.main()`` (and has the launcher
+    record again) once a site-packages dir's mtime changed.
+    ``CLICHE_FULL_SITE=1`` skips it.
+
     Layout decisions:
       - Hash-encodes pkg_dir at install time (matches runtime.py's
         ``_get_cache_path``); editable-install moves invalidate the wrapper,
@@ -189,6 +293,16 @@ def render_wrapper(binary_name: str, package_name: str, pkg_dir: str,
       - Embeds absolute paths (clichec, python) for predictability — if either
         moves, the wrapper falls through to system PATH lookup.
     """
+    python_opts = ' -X "pycache_prefix=$CACHE_HOME/cliche/pycache"' if pycache_prefix else ""
+    site_free = ""
+    if site is not None:
+        restore = _sh_quoted(_site_restore(site))
+        site_free = f"""# Without `site` (its .pth scan and hooks): the path, prefixes and import
+# hooks it would set up were recorded at install (_clichec.record_site).
+if [ -z "$CLICHE_FULL_SITE" ]; then
+    exec "$PYTHON" -S{python_opts} -c "import sys; sys.argv[0] = '$0'; {restore}launcher.launch_${{PKG}}()" "$@"
+fi
+"""
     return f"""#!/bin/sh
 {WRAPPER_MARKER} for {binary_name} (cliche-installed)
 PKG="{package_name}"
@@ -197,19 +311,34 @@ CLICHEC="{clichec}"
 PYTHON="{python_exe}"
 CACHE_HOME="${{XDG_CACHE_HOME:-$HOME/.cache}}"
 CACHE_FILE="$CACHE_HOME/cliche/${{PKG}}_${{PKG_DIR_HASH}}.json"
+# CLICHE_TRACE (cliche/trace.py): each stage's span starts at the time the
+# previous one handed over. Non-digits (date without %N) are ignored.
+if [ -n "$CLICHE_TRACE" ]; then
+    CLICHE_TRACE_EXEC_NS=$(date +%s%N)
+    export CLICHE_TRACE_EXEC_NS
+fi
+# Opt-in zygote mode (CLICHE_ZYGOTE=1, see cliche/zygote.py): clichec takes
+# over the whole invocation — it relays a warm zygote server's exit status
+# verbatim (any code is final, so the rc filter below must not apply) and
+# exec's the Python launcher itself when nothing else serves the call.
+if [ -n "$CLICHE_ZYGOTE" ] && [ "$CLICHE_ZYGOTE" != 0 ] && [ -x "$CLICHEC" ]; then
+    CLICHEC_PROG="${{0##*/}}" CLICHEC_ARGV0="$0" CLICHEC_PYTHON="$PYTHON" \\
+        exec "$CLICHEC" "$CACHE_FILE" "$PKG" "$@"
+fi
 if [ -x "$CLICHEC" ] && [ -f "$CACHE_FILE" ]; then
     # CLICHEC_PROG carries the wrapper's filename so error messages and help
     # text say "mathlib" rather than the unrelated path of the C binary.
     # Done via env because POSIX sh can't override argv[0] across exec.
     CLICHEC_PROG="${{0##*/}}" "$CLICHEC" "$CACHE_FILE" "$PKG" "$@"
     rc=$?
-    # Only honour rc=0 (success) and rc=1 (handled error like unknown-command).
+    # Only honour rc=0 (success), rc=1 (handled error like unknown-command)
+    # and rc=2 (argv argparse would reject; help and error already printed).
     # Anything else — 64 (defer), 139 (SIGSEGV), 134 (SIGABRT), 137 (OOM-kill),
     # or any other unexpected code — falls through to the Python launcher.
     # That keeps the binary working even if clichec hits a bug or new env
     # quirk; the Python path is the canonical execution surface.
     case $rc in
-        0|1) exit $rc ;;
+        0|1|2) exit $rc ;;
     esac
 fi
 # Fallback: full Python launcher (handles dispatch + anything clichec deferred).
@@ -218,10 +347,63 @@ fi
 # `prog_name == single_func_name`, which only works when sys.argv[0] is the
 # binary path. POSIX sh has no `exec -a NAME`, so we do the override inside
 # the Python -c snippet.
-exec "$PYTHON" -c "import sys; sys.argv[0] = '$0'; from cliche.launcher import launch_${{PKG}}; launch_${{PKG}}()" "$@"
+[ -n "$CLICHE_TRACE" ] && CLICHE_TRACE_EXEC_NS=$(date +%s%N)
+{site_free}exec "$PYTHON"{python_opts} -c "import sys; sys.argv[0] = '$0'; from cliche.launcher import launch_${{PKG}}; launch_${{PKG}}()" "$@"
 """
 
 
+def entry_config_path(path: str | Path) -> Path:
+    """The sidecar holding an entry binary's settings: `.<name>.cliche`
+    next to it."""
+    path = Path(path)
+    return path.with_name(f".{path.name}.cliche")
+
+
+def render_entry_config(binary_name: str, package_name: str, python_exe: str,
+                        clichec: str, cache_hash: str, pycache_prefix: bool = False,
+                        site: dict | None = None) -> str:
+    """Render the sidecar an entry binary reads (`entry_main` in clichec.c):
+    what the wrapper from `render_wrapper` has embedded. `CLICHEC` is the
+    binary it was copied from, for the launcher to notice a rebuilt one."""
+    lines = [
+        f"{WRAPPER_MARKER} settings for {binary_name} (cliche-installed)",
+        f"PKG={package_name}",
+        f"PKG_DIR_HASH={cache_hash}",
+        f"PYTHON={python_exe}",
+        f"CLICHEC={clichec}",
+        f"PYCACHE_PREFIX={int(pycache_prefix)}",
+    ]
+    if site is not None:
+        lines.append(f"SITE={_site_restore(site)}")
+    return "\n".join(lines) + "\n"
+
+
+def read_entry_config(path: str | Path) -> dict[str, str]:
+    """The settings in the sidecar of the entry binary at `path`; empty
+    when there is none."""
+    try:
+        text = entry_config_path(path).read_text()
+    except (OSError, UnicodeDecodeError):
+        return {}
+    return dict(line.split("=", 1) for line in text.splitlines()
+                if "=" in line and not line.startswith("#"))
+
+
+def _write_atomically(target: Path, write) -> None:
+    """`write(tmp)` then rename it over `target`; the tmp file is removed
+    on failure."""
+    tmp = target.with_name(target.name + ".cliche-tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
 def _resolve_installed_binary(binary_name: str) -> str | None:
     """Find the installed shim for `binary_name`, even when the venv's bin
     dir isn't on the caller's PATH.
@@ -248,8 +430,17 @@ def _resolve_installed_binary(binary_name: str) -> str | None:
 def install_fast_shim(binary_name: str, package_name: str, pkg_dir: str,
                       verbose: bool = False,
                       target_path: str | None = None) -> tuple[bool, str]:
-    """Replace the pip-generated console-script for `binary_name` with a shell
-    wrapper that exec's clichec first, falling back to the Python launcher.
+    """Replace the pip-generated console-script for `binary_name` with
+    clichec itself, falling back to the Python launcher.
+
+    The console script becomes a copy of the clichec binary (not a hard
+    link: whatever rewrites the script in place would rewrite clichec for
+    every CLI), with its settings in a sidecar next to it (`entry_config_path`,
+    `render_entry_config`). Every call then starts clichec directly: no
+    `/bin/sh`, no fork, and on a defer clichec exec's Python itself. With
+    ``CLICHE_SH_WRAPPER=1`` set, the console script becomes the shell
+    wrapper from `render_wrapper` instead, which runs clichec as a child and
+    so survives a clichec crash by falling back to Python.
 
     `target_path` lets callers pin the exact shim file to rewrite. Used by
     `cliche.launcher._maybe_self_upgrade_shim` which already knows the
@@ -270,45 +461,63 @@ def install_fast_shim(binary_name: str, package_name: str, pkg_dir: str,
 
     # Backup the original Python shim so we can recover or recover python_exe.
     try:
-        original = Path(target).read_text()
+        with open(target, "rb") as f:
+            original = f.read(4096).decode(errors="replace")
     except OSError as e:
         return False, f"cannot read existing shim {target}: {e}"
 
-    # Extract the python interpreter from the shebang of the existing shim.
+    # Extract the python interpreter from the shebang of the existing shim,
+    # or keep a fast shim's own when installing it again.
     python_exe = sys.executable
     first_line = original.splitlines()[0] if original else ""
     if first_line.startswith("#!") and "python" in first_line:
         python_exe = first_line[2:].strip().split()[0]
+    elif WRAPPER_MARKER in original:
+        for line in original.splitlines():
+            if line.startswith('PYTHON="') and line.endswith('"'):
+                python_exe = line[len('PYTHON="'):-1]
+                break
+    elif not first_line.startswith("#!"):
+        python_exe = read_entry_config(target).get("PYTHON", python_exe)
 
     clichec = ensure_built(verbose=verbose)
     if not clichec:
         return False, "clichec binary unavailable (no C compiler?)"
 
     cache_hash = hashlib.md5(pkg_dir.encode()).hexdigest()[:8]
-    wrapper = render_wrapper(
+    from cliche.bytecode import needs_prefix, sources
+    settings = dict(
         binary_name=binary_name,
         package_name=package_name,
-        pkg_dir=pkg_dir,
         python_exe=python_exe,
         clichec=str(clichec),
         cache_hash=cache_hash,
+        pycache_prefix=needs_prefix(sources(pkg_dir)),
+        site=_site_free(record_site(python_exe)),
     )
-    tmp = Path(target).with_suffix(".cliche-tmp")
+    target = Path(target)
+    config = entry_config_path(target)
     try:
-        tmp.write_text(wrapper)
-        tmp.chmod(0o755)
-        os.replace(tmp, target)
+        if os.environ.get("CLICHE_SH_WRAPPER"):
+            wrapper = render_wrapper(pkg_dir=pkg_dir, **settings)
+
+            def write(tmp):
+                tmp.write_text(wrapper)
+                tmp.chmod(0o755)
+            _write_atomically(target, write)
+            config.unlink(missing_ok=True)
+            return True, f"wrote fast-shim wrapper at {target} (clichec={clichec})"
+        # The settings first: the binary without them can't run.
+        _write_atomically(config, lambda tmp: tmp.write_text(render_entry_config(**settings)))
+        _write_atomically(target, lambda tmp: shutil.copy2(clichec, tmp))
     except OSError as e:
-        try:
-            tmp.unlink()
-        except OSError:
-            pass
-        return False, f"failed to write wrapper {target}: {e}"
-    return True, f"wrote fast-shim wrapper at {target} (clichec={clichec})"
+        return False, f"failed to write fast shim {target}: {e}"
+    return True, f"installed clichec as {target} (settings in {config.name})"
 
 
 def is_fast_shim(path: str | Path) -> bool:
-    """True if the file at `path` is a cliche-written fast-shim wrapper.
+    """True if the file at `path` is a cliche-written fast shim: clichec
+    installed with its settings sidecar, or the shell wrapper.
 
     Used by `cliche ls` to fill the SHIM column. We deliberately do NOT
     expose a `restore_python_shim` counterpart: pip's natural reinstall
@@ -320,8 +529,10 @@ def is_fast_shim(path: str | Path) -> bool:
     and `cliche.install.install`.
     """
     try:
-        with open(path) as f:
+        with open(path, "rb") as f:
             head = f.read(512)
-        return WRAPPER_MARKER in head
     except OSError:
         return False
+    if head.startswith(b"#!"):
+        return WRAPPER_MARKER.encode() in head
+    return entry_config_path(path).is_file()
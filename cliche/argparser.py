@@ -0,0 +1,105 @@
+"""cliche's argparse classes, kept out of cliche/run.py.
+
+Importing argparse (and the gettext it pulls in) costs a few milliseconds,
+and most invocations never build a parser: commands whose signature has a
+parse plan (cliche/fast_parse.py) go straight from argv to keyword
+arguments. run.py imports this module when it does need argparse: for
+`-h`/`--help`, an argv the plan can't take, a signature without one, or
+shell completion.
+"""
+import argparse
+import sys
+
+from cliche.run import Colors, colorize_help
+
+
+class CleanHelpFormatter(argparse.HelpFormatter):
+    """Custom formatter that hides choices from usage line but shows in help."""
+
+    def __init__(self, prog, indent_increment=2, max_help_position=24, width=None):
+        super().__init__(prog, indent_increment, max_help_position, width)
+        self._in_usage = False
+
+    def _format_usage(self, usage, actions, groups, prefix):
+        self._in_usage = True
+        result = super()._format_usage(usage, actions, groups, prefix)
+        self._in_usage = False
+        return result
+
+    def _metavar_formatter(self, action, default_metavar):
+        # For choices in usage line, just show the dest name
+        if self._in_usage and action.choices is not None:
+            result = action.dest.upper()
+            def format(tuple_size):
+                if isinstance(result, tuple):
+                    return result
+                else:
+                    return (result,) * tuple_size
+            return format
+        return super()._metavar_formatter(action, default_metavar)
+
+
+class CleanArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser with better error output - shows help before error."""
+
+    llm_mode = False  # Class-level flag for LLM mode
+
+    def __init__(self, *args, **kwargs):
+        # setdefault (not overwrite) so callers can opt into RawDescriptionHelpFormatter
+        # for multi-line description blocks; subparsers created via add_parser inherit
+        # this class through parser_class but may pass their own formatter.
+        kwargs.setdefault('formatter_class', CleanHelpFormatter)
+        super().__init__(*args, **kwargs)
+
+    def format_clean_help(self, stream=None) -> str:
+        """The exact text `print_help(stream)` writes."""
+        help_text = self.format_help()
+        # Replace "options:" with "OPTIONS::"
+        help_text = help_text.replace("options:", "OPTIONS::")
+        help_text = help_text.replace("positional arguments:", "POSITIONAL ARGUMENTS:")
+        return colorize_help(help_text, stream=stream)
+
+    def print_help(self, file=None):
+        if file is None:
+            file = sys.stdout
+        file.write(self.format_clean_help(stream=file))
+
+    def error(self, message):
+        if CleanArgumentParser.llm_mode:
+            # Compact error for LLM consumption
+            sys.stderr.write(f"error: {message}\n")
+            sys.exit(2)
+        # Print help first, then the error
+        self.print_help(sys.stderr)
+        sys.stderr.write(f"\n{Colors.red(message, stream=sys.stderr)}\n")
+        sys.exit(2)
+
+
+class _DictAction(argparse.Action):
+    """Collect `--opt k=v --opt k2=v2` (or `--opt k=v k2=v2` with nargs) into a dict.
+
+    The key/value converters come from the annotation — e.g. `dict[str, int]`
+    gives str keys and int values. Raises ArgumentError on bad format so the
+    user sees the standard argparse error, not a traceback.
+    """
+    def __init__(self, *args, key_type=str, value_type=str, **kwargs):
+        self._key_type = key_type
+        self._value_type = value_type
+        super().__init__(*args, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        result = getattr(namespace, self.dest, None) or {}
+        items = values if isinstance(values, list) else [values]
+        for item in items:
+            if '=' not in item:
+                raise argparse.ArgumentError(
+                    self, f"expected KEY=VALUE, got {item!r}"
+                )
+            k, v = item.split('=', 1)
+            try:
+                k_conv = self._key_type(k)
+                v_conv = self._value_type(v)
+            except (ValueError, TypeError) as e:
+                raise argparse.ArgumentError(self, f"bad key/value {item!r}: {e}")
+            result[k_conv] = v_conv
+        setattr(namespace, self.dest, result)
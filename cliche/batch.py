@@ -0,0 +1,266 @@
+"""`mytool --batch FILE|-`: many invocations in one interpreter.
+
+Each non-blank input line is one argv, without the program name. It is
+either shell-quoted (`add 2 3`, `greet --name 'Ann Lee'`) or a JSON array
+of strings (`["greet", "--name", "Ann Lee"]`). Lines starting with `#` are
+skipped. Every line resolves its command like `run.main` does, is parsed by
+that command's parse plan or argparse parser, and runs through
+`run.invoke_function`. Only the first run pays for interpreter startup, the
+cache load and the command tables. Parsers are built once per command, and
+user modules are imported once.
+
+Each line produces one NDJSON record on stdout, in input order:
+
+    {"line":3,"argv":["add","2","3"],"status":0,"result":5}
+
+`status` is the exit status the same call would have had on its own: 2 for
+argparse errors, the code of a `SystemExit`, and 1 for an exception, whose
+`error` is `Type: message`. Text the command printed is in `stdout` and
+`stderr` (with the traceback on failure), and those keys are present only
+when non-empty. The batch exits 1 if any line failed.
+
+`-j N` runs N lines at a time. Workers are processes forked from this one,
+so they inherit the loaded cache, and each keeps its own parsers and
+imports. `--threads` uses a thread pool instead, for I/O-bound commands.
+Where fork isn't available, threads are used.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import shlex
+import sys
+import threading
+import traceback
+from collections.abc import AsyncIterator, Iterator
+
+import cliche.run as runner
+from cliche import fast_parse, output
+
+# Set by `run` before any line executes; read by workers, which get it by
+# fork or by sharing the process.
+_STATE: dict = {}
+_PARSERS_LOCK = threading.Lock()
+_CLICHE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class _PerThreadStream(io.TextIOBase):
+    """Stands in for sys.stdout/sys.stderr while a batch runs: writes go to
+    the calling thread's capture buffer, or to `fallback` outside a line."""
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self.local = threading.local()
+
+    def _target(self):
+        return getattr(self.local, "buf", None) or self.fallback
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def isatty(self):
+        return False
+
+
+def _read_lines(source: str):
+    """`(line number, argv or error message)` per command line of `source`."""
+    f = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                if line.startswith("["):
+                    argv = json.loads(line)
+                    if not all(isinstance(a, str) for a in argv):
+                        raise ValueError("a JSON argv holds strings only")
+                else:
+                    argv = shlex.split(line)
+            except ValueError as e:
+                yield n, f"unreadable line: {e}"
+                continue
+            yield n, argv
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _lookup(argv: list):
+    """`(func, its argv, key)` for a line, resolved as `run.main` resolves
+    its command line; None when no command matches."""
+    commands, subcommands = _STATE["commands"], _STATE["subcommands"]
+    cmd = argv[0].replace("_", "-")
+    if cmd in commands:
+        return commands[cmd], argv[1:], ("", cmd)
+    if cmd in subcommands and len(argv) > 1:
+        subcmd = argv[1].replace("_", "-")
+        if subcmd in subcommands[cmd]:
+            return subcommands[cmd][subcmd], argv[2:], (cmd, subcmd)
+    # The single-command CLI named like its binary takes arguments directly.
+    if len(commands) == 1 and not subcommands:
+        name, func = next(iter(commands.items()))
+        if name == _STATE["prog_name"].replace("_", "-"):
+            return func, argv, ("", name)
+    return None
+
+
+def _parser_for(key, func):
+    parsers = _STATE["parsers"]
+    parser = parsers.get(key)
+    if parser is None:
+        with _PARSERS_LOCK:
+            parser = parsers.get(key)
+            if parser is None:
+                parser = runner.build_parser_for_function(
+                    func, _STATE["enums"], prog_name=_STATE["prog_name"],
+                    pydantic_models=_STATE["pydantic_models"])
+                parsers[key] = parser
+    return parser
+
+
+def _call(argv: list):
+    """Run one argv; `(status, result, error)`."""
+    if not argv:
+        return 2, None, "empty command line"
+    found = _lookup(argv)
+    if found is None:
+        error = f"Unknown command: {argv[0]}"
+        suggestion = runner._suggest_command(argv[0].replace("_", "-"), _STATE["commands"],
+                                          _STATE["subcommands"], _STATE["prog_name"])
+        if suggestion:
+            error += f". Did you mean: {suggestion}?"
+        return 1, None, error
+    func, func_argv, key = found
+    func_argv = list(func_argv)
+    runner._dasherize_flags(func_argv)
+    parsed_args = pydantic_binds = None
+    if "parse_plan" in func:
+        parsed_args = fast_parse.parse(func["parse_plan"], func_argv, _STATE["enums"],
+                                       _STATE["pydantic_models"])
+    if parsed_args is None:
+        parser = _parser_for(key, func)
+        parsed_args = parser.parse_args(func_argv)
+        pydantic_binds = getattr(parser, "_pydantic_binds", None)
+    result = runner.invoke_function(func, parsed_args, _STATE["enums"],
+                                 pydantic_binds=pydantic_binds, print_result=False)
+    # Iterators are collected: a record holds one value.
+    if isinstance(result, AsyncIterator):
+        result = list(output._iterate_async(result))
+    elif isinstance(result, Iterator):
+        result = list(result)
+    return 0, result, None
+
+
+def _run_line(task) -> tuple[int, bytes]:
+    """One input line → its status and NDJSON record."""
+    n, argv = task
+    record = {"line": n, "argv": argv}
+    if isinstance(argv, str):
+        record.update(argv=None, status=2, error=argv)
+        return 2, output._encode(record, False) + b"\n"
+
+    out, err = io.StringIO(), io.StringIO()
+    _STATE["stdout"].local.buf = out
+    _STATE["stderr"].local.buf = err
+    status, result, error = 1, None, None
+    try:
+        status, result, error = _call(argv)
+    except SystemExit as e:
+        code = e.code
+        status = code if isinstance(code, int) else 0 if code is None else 1
+        if isinstance(code, str):
+            err.write(code + "\n")
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        # Like run.main's excepthook: open the traceback at the user's code.
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename.startswith(_CLICHE_DIR):
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__, file=err)
+    finally:
+        _STATE["stdout"].local.buf = None
+        _STATE["stderr"].local.buf = None
+
+    record["status"] = status
+    if result is not None:
+        record["result"] = result
+    if error:
+        record["error"] = error
+    if out.getvalue():
+        record["stdout"] = out.getvalue()
+    if err.getvalue():
+        record["stderr"] = err.getvalue()
+    try:
+        return status, output._encode(record, False) + b"\n"
+    except (TypeError, ValueError):
+        record["result"] = str(result)
+        return status, output._encode(record, False) + b"\n"
+
+
+def _results(tasks, jobs: int, threads: bool):
+    if jobs <= 1:
+        return map(_run_line, tasks)
+    import multiprocessing
+    if not threads and "fork" in multiprocessing.get_all_start_methods():
+        pool = multiprocessing.get_context("fork").Pool(jobs)
+        return _drain(pool, pool.imap(_run_line, tasks, chunksize=4))
+    from concurrent.futures import ThreadPoolExecutor
+    pool = ThreadPoolExecutor(jobs)
+    return _drain(pool, pool.map(_run_line, tasks))
+
+
+def _drain(pool, results):
+    """`results`, then a clean pool shutdown; a consumer that stops early
+    (a closed pipe) cancels whatever is still queued."""
+    try:
+        yield from results
+    except BaseException:
+        if hasattr(pool, "terminate"):
+            pool.terminate()
+        else:
+            pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    if hasattr(pool, "terminate"):
+        pool.close()
+        pool.join()
+    else:
+        pool.shutdown()
+
+
+def run(source: str, commands, subcommands, enums, pydantic_models, prog_name: str,
+        jobs: int = 1, threads: bool = False) -> int:
+    """Run every line of `source` (a path, or `-` for stdin) and write the
+    records to stdout. Returns the batch's exit status."""
+    try:
+        tasks = _read_lines(source)
+        next_task = next(tasks, None)
+    except OSError as e:
+        print(f"error: --batch {source}: {e.strerror}", file=sys.stderr)
+        return 2
+
+    real_stdout, real_stderr = sys.stdout, sys.stderr
+    _STATE.update(commands=commands, subcommands=subcommands, enums=enums,
+                  pydantic_models=pydantic_models, prog_name=prog_name, parsers={},
+                  stdout=_PerThreadStream(real_stdout), stderr=_PerThreadStream(real_stderr))
+    real_stdout.flush()
+    sink = output._Sink(getattr(real_stdout, "buffer", None) or output._TextOut(real_stdout))
+    failed = False
+    sys.stdout, sys.stderr = _STATE["stdout"], _STATE["stderr"]
+    try:
+        if next_task is not None:
+            import itertools
+            for status, data in _results(itertools.chain((next_task,), tasks), jobs, threads):
+                failed = failed or status != 0
+                sink.write(data)
+        sink.flush()
+    except BrokenPipeError:
+        sys.stdout, sys.stderr = real_stdout, real_stderr
+        output._stdout_closed()
+    finally:
+        sys.stdout, sys.stderr = real_stdout, real_stderr
+    return 1 if failed else 0
@@ -0,0 +1,121 @@
+"""Ahead-of-time bytecode for installed CLIs, and a private pycache.
+
+Python writes a module's `.pyc` next to its source (`__pycache__/`) the
+first time it imports it. When that directory isn't writable (a root-owned
+site-packages, a read-only image, some `uv tool` layouts) the write fails
+silently. Every invocation that reaches Python then compiles the user's
+modules and cliche's own runtime (run.py alone is ~2,400 lines) again.
+
+`warm(pkg)` compiles them once, ahead of time: the package's modules (the
+tree the scan walks) and every module of cliche itself. They go next to
+their sources when all of those directories are writable. Otherwise they
+go to a private prefix, in the `sys.pycache_prefix` layout (each source's
+absolute path mirrored under it):
+
+    $XDG_CACHE_HOME/cliche/pycache/
+
+The fast shim then starts Python with `-X pycache_prefix=<that dir>` (see
+`_clichec.render_entry_config` and `render_wrapper`). Python reads every
+`.pyc` from there, including the standard library's, so `warm` also
+imports cliche's runtime once under the prefix to put the stdlib modules
+it needs there.
+
+`cliche install`, the launcher's shim self-upgrade and `cliche warm <name>`
+run it. A `.pyc` records its source's mtime, so an edited module is simply
+recompiled on its next import.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+# Imported by every Python fallback (cliche.argparser for help, errors and
+# signatures without a parse plan); warming them under the prefix also
+# stores the stdlib modules they pull in.
+RUNTIME_MODULES = ("cliche.launcher", "cliche.runtime", "cliche.run", "cliche.argparser")
+
+
+def pycache_dir() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return Path(cache_home) / "cliche" / "pycache"
+
+
+def package_dir(pkg: str) -> str | None:
+    """Where `pkg` is imported from, without importing it."""
+    import importlib.util
+    try:
+        spec = importlib.util.find_spec(pkg)
+    except (ImportError, ValueError):
+        return None
+    if spec is None:
+        return None
+    if spec.origin and spec.origin != "namespace":
+        return str(Path(spec.origin).parent)
+    if spec.submodule_search_locations:
+        return str(list(spec.submodule_search_locations)[0])
+    return None
+
+
+def sources(pkg_dir: str) -> list[str]:
+    """The package's modules, then cliche's."""
+    from cliche.runtime import _walk_tree
+    py_files, _ = _walk_tree(Path(pkg_dir))
+    paths = [os.path.join(pkg_dir, rel) for rel in sorted(py_files)]
+    cliche_dir = Path(__file__).parent
+    if Path(pkg_dir).resolve() != cliche_dir.resolve():
+        paths += sorted(str(p) for p in cliche_dir.glob("*.py"))
+    return paths
+
+
+def _writable(directory: str) -> bool:
+    pycache = os.path.join(directory, "__pycache__")
+    return os.access(pycache if os.path.isdir(pycache) else directory, os.W_OK)
+
+
+def needs_prefix(paths) -> bool:
+    """True when `.pyc` files can't be written next to every one of `paths`
+    (see `sources`)."""
+    return not all(_writable(d) for d in {os.path.dirname(p) for p in paths})
+
+
+def compile_files(paths, prefix: str | None = None) -> int:
+    """Compile `paths` where imports will look for them (under `prefix`
+    when given); up-to-date `.pyc` files are kept. Returns how many failed,
+    e.g. on a syntax error, which the import reports as usual."""
+    import compileall
+    saved = sys.pycache_prefix
+    sys.pycache_prefix = prefix
+    try:
+        return sum(not compileall.compile_file(p, quiet=2) for p in paths)
+    finally:
+        sys.pycache_prefix = saved
+
+
+def warm(pkg: str, pkg_dir: str | None = None, verbose: bool = False) -> int:
+    """Compile `pkg` and cliche ahead of time (see the module docstring).
+    Must run under the interpreter the CLI runs under: `.pyc` files are
+    per Python version."""
+    pkg_dir = pkg_dir or package_dir(pkg)
+    if pkg_dir is None:
+        if verbose:
+            print(f"Error: cannot find package '{pkg}'", file=sys.stderr)
+        return 1
+    paths = sources(pkg_dir)
+    prefix = str(pycache_dir()) if needs_prefix(paths) else None
+    failed = compile_files(paths, prefix)
+    if prefix is not None:
+        # Written like compileall's, even under PYTHONDONTWRITEBYTECODE.
+        import subprocess
+        env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+        subprocess.run(
+            [sys.executable, "-X", f"pycache_prefix={prefix}", "-c",
+             "import " + ", ".join(RUNTIME_MODULES)],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, env=env,
+        )
+    if verbose:
+        where = f" into {prefix}" if prefix else ""
+        skipped = f" ({failed} failed to compile)" if failed else ""
+        print(f"compiled {len(paths) - failed} modules of {pkg} and cliche{where}{skipped}")
+    return 0
@@ -0,0 +1,301 @@
+"""Binary command index written next to the JSON cache for clichec.
+
+`<pkg>_<hash>.json` is the source of truth. Reading it from C means parsing
+the whole document — every function, every parameter — before clichec can
+answer even a bare `--help` or a completion keystroke, and on a CLI with a
+few thousand commands that parse is most of clichec's budget. The sidecar
+`<pkg>_<hash>.idx` carries just what those paths need, laid out so clichec
+can mmap it and binary-search without parsing or allocating:
+
+    header      magic "CLIX", format, the JSON's size + mtime_ns, adler32
+                of everything after the header, flags, pyproject mtime, and
+                references to the cache version / pkg_dir / description
+                strings plus the byte spans of "enums", "pydantic_models"
+                and "pydantic_schemas" inside the JSON
+    commands    sorted by (group, name) like clichec's build_index: name
+                (dasherized), group, first docstring line, and the byte span
+                of the function's object inside the JSON
+    freshness   every tracked .py file and directory with its mtime
+    strings     NUL-terminated UTF-8, deduplicated
+
+All integers are little-endian; string references are absolute
+(offset, length) pairs, with offset 0xFFFFFFFF meaning "absent".
+
+The per-command paths (`<cmd> --help`, `<cmd> --llm-help`, flag completion)
+still need one function object; clichec parses just that span out of the
+JSON. The index is only trusted while the JSON on disk has exactly the size
+and mtime recorded in the header — anything else (a cache rewritten by an
+older cliche, a hand edit, a torn copy) and clichec reads the JSON instead.
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+
+MAGIC = b"CLIX"
+FORMAT = 2
+ABSENT = 0xFFFFFFFF
+
+FLAG_PYPROJECT_MTIME = 1
+
+KIND_FILE = 0
+KIND_DIR = 1
+
+_HEADER = struct.Struct("<4sIQQIId" + "II" * 6 + "I" * 6)
+_CMD = struct.Struct("<8I")
+_FRESH = struct.Struct("<IIId")
+
+
+def index_path(cache_file) -> Path:
+    """Sidecar path for a cache file: `<pkg>_<hash>.json` → `<pkg>_<hash>.idx`."""
+    return Path(cache_file).with_suffix(".idx")
+
+
+def dumps_with_spans(cache: dict) -> tuple[str, dict, dict]:
+    """Serialise `cache` exactly like `json.dumps(cache)`, recording spans.
+
+    Returns `(text, key_spans, fn_spans)`: `key_spans[key]` is the
+    `(offset, length)` of each top-level value and `fn_spans[(rel, i)]` that
+    of the i-th function of `files[rel]`. `ensure_ascii` is on (the json
+    default), so character offsets are byte offsets.
+    """
+    dumps = json.dumps
+    parts = ["{"]
+    pos = 1
+    key_spans = {}
+    fn_spans = {}
+    for n, (key, val) in enumerate(cache.items()):
+        head = (", " if n else "") + dumps(key) + ": "
+        parts.append(head)
+        pos += len(head)
+        if key == "files" and isinstance(val, dict):
+            text = _dump_files(val, pos, fn_spans)
+        else:
+            text = dumps(val)
+        key_spans[key] = (pos, len(text))
+        parts.append(text)
+        pos += len(text)
+    parts.append("}")
+    return "".join(parts), key_spans, fn_spans
+
+
+def _dump_files(files: dict, pos: int, fn_spans: dict) -> str:
+    dumps = json.dumps
+    parts = ["{"]
+    pos += 1
+    for n, (rel, finfo) in enumerate(files.items()):
+        head = (", " if n else "") + dumps(rel) + ": "
+        parts.append(head)
+        pos += len(head)
+        if not isinstance(finfo, dict):
+            text = dumps(finfo)
+            parts.append(text)
+            pos += len(text)
+            continue
+        parts.append("{")
+        pos += 1
+        for m, (key, val) in enumerate(finfo.items()):
+            head = (", " if m else "") + dumps(key) + ": "
+            parts.append(head)
+            pos += len(head)
+            if key == "functions" and isinstance(val, list) and val:
+                parts.append("[")
+                pos += 1
+                for i, fn in enumerate(val):
+                    if i:
+                        parts.append(", ")
+                        pos += 2
+                    text = dumps(fn)
+                    fn_spans[(rel, i)] = (pos, len(text))
+                    parts.append(text)
+                    pos += len(text)
+                parts.append("]")
+                pos += 1
+            else:
+                text = dumps(val)
+                parts.append(text)
+                pos += len(text)
+        parts.append("}")
+        pos += 1
+    parts.append("}")
+    return "".join(parts)
+
+
+class _Strings:
+    """String table builder; references are absolute file offsets."""
+
+    def __init__(self, base: int):
+        self.base = base
+        self.buf = bytearray()
+        self.seen: dict[str, tuple[int, int]] = {}
+
+    def ref(self, s: str | None) -> tuple[int, int]:
+        if s is None:
+            return ABSENT, 0
+        hit = self.seen.get(s)
+        if hit is None:
+            raw = s.encode("utf-8", "surrogatepass")
+            hit = (self.base + len(self.buf), len(raw))
+            self.buf += raw + b"\0"
+            self.seen[s] = hit
+        return hit
+
+
+def build_index(cache: dict, key_spans: dict, fn_spans: dict, pkg_dir,
+                json_size: int, json_mtime_ns: int) -> bytes:
+    """Encode the sidecar for a cache whose JSON was produced by `dumps_with_spans`."""
+    cmds = []
+    for rel, finfo in cache.get("files", {}).items():
+        if not isinstance(finfo, dict):
+            continue
+        for i, fn in enumerate(finfo.get("functions") or ()):
+            span = fn_spans.get((rel, i))
+            name = fn.get("name") if isinstance(fn, dict) else None
+            if span is None or not isinstance(name, str):
+                continue
+            group = fn.get("group")
+            if not isinstance(group, str):
+                group = None
+            doc = fn.get("docstring")
+            doc = doc.split("\n", 1)[0] if isinstance(doc, str) else None
+            cmds.append((name.replace("_", "-"), group, doc, span))
+    # Same order as clichec's cmd_cmp: strcmp on (group or "", name).
+    cmds.sort(key=lambda c: ((c[1] or "").encode("utf-8", "surrogatepass"),
+                             c[0].encode("utf-8", "surrogatepass")))
+
+    fresh = [(rel, KIND_FILE, m) for rel, m in cache.get("py_mtimes", {}).items()]
+    fresh += [(rel, KIND_DIR, m) for rel, m in cache.get("dir_mtimes", {}).items()]
+
+    cmds_off = _HEADER.size
+    fresh_off = cmds_off + _CMD.size * len(cmds)
+    strtab_off = fresh_off + _FRESH.size * len(fresh)
+    strings = _Strings(strtab_off)
+
+    body = bytearray()
+    for name, group, doc, span in cmds:
+        body += _CMD.pack(*strings.ref(name), *strings.ref(group),
+                          *strings.ref(doc), *span)
+    for rel, kind, mtime in fresh:
+        body += _FRESH.pack(*strings.ref(rel), kind, float(mtime))
+
+    flags = 0
+    pyproject_mtime = cache.get("pyproject_mtime")
+    if isinstance(pyproject_mtime, (int, float)):
+        flags |= FLAG_PYPROJECT_MTIME
+    else:
+        pyproject_mtime = 0.0
+    description = cache.get("description")
+    version = cache.get("version")
+    refs = (
+        *strings.ref(version if isinstance(version, str) else ""),
+        *strings.ref(str(pkg_dir)),
+        *strings.ref(description if isinstance(description, str) and description else None),
+    )
+    body += strings.buf
+    header = _HEADER.pack(
+        MAGIC, FORMAT, json_size, json_mtime_ns, zlib.adler32(body), flags,
+        float(pyproject_mtime), *refs,
+        *key_spans.get("enums", (ABSENT, 0)),
+        *key_spans.get("pydantic_models", (ABSENT, 0)),
+        *key_spans.get("pydantic_schemas", (ABSENT, 0)),
+        len(cmds), cmds_off, len(fresh), fresh_off,
+        strtab_off, len(strings.buf),
+    )
+    return header + bytes(body)
+
+
+def index_matches(cache_file) -> bool:
+    """True when the sidecar exists and was written for the JSON now on disk."""
+    try:
+        st = os.stat(cache_file)
+        with open(index_path(cache_file), "rb") as f:
+            head = f.read(_HEADER.size)
+    except OSError:
+        return False
+    if len(head) != _HEADER.size:
+        return False
+    magic, fmt, size, mtime_ns = _HEADER.unpack(head)[:4]
+    return (magic == MAGIC and fmt == FORMAT
+            and size == st.st_size and mtime_ns == st.st_mtime_ns)
+
+
+def write_cache(cache: dict, cache_file, pkg_dir) -> None:
+    """Atomically write the JSON cache and its binary index.
+
+    The JSON lands first; the index records the JSON's final size and mtime
+    (os.replace keeps the temp file's mtime), so a reader that sees the new
+    JSON with the old index — or the other way round — notices and uses the
+    JSON. Raises on failure; the caller decides how much that matters.
+    """
+    cache_file = Path(cache_file)
+    text, key_spans, fn_spans = dumps_with_spans(cache)
+    pid = os.getpid()
+    tmp_json = cache_file.with_suffix(cache_file.suffix + f".tmp.{pid}")
+    idx_file = index_path(cache_file)
+    tmp_idx = idx_file.with_suffix(idx_file.suffix + f".tmp.{pid}")
+    try:
+        with open(tmp_json, "w") as f:
+            f.write(text)
+        st = os.stat(tmp_json)
+        os.replace(tmp_json, cache_file)
+        blob = build_index(cache, key_spans, fn_spans, pkg_dir,
+                           st.st_size, st.st_mtime_ns)
+        with open(tmp_idx, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_idx, idx_file)
+    finally:
+        for tmp in (tmp_json, tmp_idx):
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+def read_index(path) -> dict:
+    """Decode a sidecar back into plain Python (tests and debugging).
+
+    Raises ValueError on a bad magic, format, or checksum.
+    """
+    data = Path(path).read_bytes()
+    if len(data) < _HEADER.size:
+        raise ValueError("index truncated")
+    h = _HEADER.unpack_from(data)
+    magic, fmt, json_size, json_mtime_ns, checksum, flags, pyproject_mtime = h[:7]
+    (ver_o, ver_l, dir_o, dir_l, desc_o, desc_l,
+     enums_o, enums_l, pyd_o, pyd_l, schemas_o, schemas_l,
+     n_cmds, cmds_off, n_fresh, fresh_off, _strtab_off, _strtab_len) = h[7:]
+    if magic != MAGIC or fmt != FORMAT:
+        raise ValueError("not a cliche index")
+    if zlib.adler32(data[_HEADER.size:]) != checksum:
+        raise ValueError("index checksum mismatch")
+
+    def s(off, length):
+        if off == ABSENT:
+            return None
+        return data[off:off + length].decode("utf-8", "surrogatepass")
+
+    commands = []
+    for i in range(n_cmds):
+        no, nl, go, gl, do, dl, so, sl = _CMD.unpack_from(data, cmds_off + i * _CMD.size)
+        commands.append({"name": s(no, nl), "group": s(go, gl), "doc": s(do, dl),
+                         "span": (so, sl)})
+    fresh = []
+    for i in range(n_fresh):
+        po, pl, kind, mtime = _FRESH.unpack_from(data, fresh_off + i * _FRESH.size)
+        fresh.append((s(po, pl), "dir" if kind == KIND_DIR else "file", mtime))
+    return {
+        "json_size": json_size,
+        "json_mtime_ns": json_mtime_ns,
+        "version": s(ver_o, ver_l),
+        "pkg_dir": s(dir_o, dir_l),
+        "description": s(desc_o, desc_l),
+        "pyproject_mtime": pyproject_mtime if flags & FLAG_PYPROJECT_MTIME else None,
+        "enums_span": None if enums_o == ABSENT else (enums_o, enums_l),
+        "pydantic_models_span": None if pyd_o == ABSENT else (pyd_o, pyd_l),
+        "pydantic_schemas_span": None if schemas_o == ABSENT else (schemas_o, schemas_l),
+        "commands": commands,
+        "fresh": fresh,
+    }
@@ -4,19 +4,36 @@
  * Reads a cliche cache JSON file (~/.cache/cliche/<pkg>_<dirhash>.json) and
  * services a narrow set of paths without ever spawning a Python interpreter:
  *   - bare-binary / `--help` / `-h`        → top-level command listing
+ *   - `<group>` / `<group> --help`         → group listing (pre-rendered)
+ *   - `<cmd> --help`                       → per-command help
  *   - `--llm-help`                         → full LLM dump (line format)
  *   - `<cmd> --llm-help`                   → per-command LLM dump
  *   - `<group> <cmd> --llm-help`           → per-subcommand LLM dump
  *   - unknown top-level command            → suggestion list, exit 1
+ *   - `<cmd> args...` argparse would reject → help + error, exit 2
  *
- * For everything else (real dispatch, complex --help, --pdb/--pip/--uv/...,
- * stale cache, cache-version mismatch, signatures with pydantic/lazy-arg
- * types, ...) it exits with status 64 — the wrapper script then falls
+ * For everything else (dispatch of argv that validates, complex --help,
+ * --pdb/--pip/--uv/..., stale cache, cache-version mismatch, signatures
+ * with pydantic/lazy-arg types, ...) it exits with status 64 — the wrapper script then falls
  * through to the Python launcher (`cliche.launcher:launch_<pkg>`).
  *
  * Usage (from the wrapper):
  *     clichec <cache_file> <pkg_name> [user-args...]
  *
+ * Entry mode (see entry_main): installed as bin/<name> itself, with its
+ * settings in a sidecar, clichec does the wrapper's job and exec's Python
+ * directly when it defers.
+ *
+ * Zygote mode (CLICHE_ZYGOTE=1, see cliche/zygote.py): the wrapper exec's
+ * clichec with CLICHEC_PYTHON / CLICHEC_ARGV0 set and hands it the whole
+ * invocation. Anything clichec would defer is first offered to the warm
+ * per-package zygote server over its Unix socket; if no server takes it,
+ * clichec exec's the Python launcher itself.
+ *
+ * Watch mode (`cliche watch <binary>`, see cliche/watch.py): while the
+ * daemon runs, proving the cache fresh is a token read and a lock probe
+ * instead of a stat per tracked file and directory.
+ *
  * No external dependencies. C99, POSIX. ~ stdlib only.
  */
 
@@ -31,8 +48,15 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
+#include <signal.h>
+#include <pthread.h>
+#include <sys/ioctl.h>
+#include <sys/mman.h>
+#include <sys/socket.h>
 #include <sys/stat.h>
 #include <sys/types.h>
+#include <sys/un.h>
+#include <time.h>
 #include <unistd.h>
 
 #define DEFER 64
@@ -94,18 +118,20 @@ static int color_out = 0;
 
 /* Only colour stdout — stderr stays plain to match run.py's `Unknown
  * command:` line (Python doesn't colour that either). If we ever want
- * red error styling, both sides must change together; track state here. */
+ * red error styling, both sides must change together; track state here.
+ * argparse errors are the exception: validate_command_args works out
+ * stderr's colour itself, like CleanArgumentParser.error does. */
 static void detect_colors(void) {
     if (getenv("NO_COLOR")) return;
     int force = getenv("FORCE_COLOR") != NULL;
     color_out = force || isatty(STDOUT_FILENO);
 }
 
-/* `red_on` lived here to colour the C-side "Unknown command" stderr line.
- * Dropped for parity with run.py, which prints plain stderr. ANSI_RED is
- * left defined so a future addition can re-enable red without rewiring
- * the macros — see the unknown_command comment for why parity matters. */
+/* The "Unknown command" stderr line stays plain for parity with run.py;
+ * red is only used for argparse error messages, which run.py colours
+ * (CleanArgumentParser.error). */
 static const char *blue_on(int on)  { return on ? ANSI_BLUE  : ""; }
+static const char *red_on(int on)   { return on ? ANSI_RED   : ""; }
 static const char *reset_on(int on) { return on ? ANSI_RESET : ""; }
 
 /* ============================================================
@@ -463,7 +489,10 @@ typedef struct {
      * Group names are NOT converted, mirroring Python's behaviour. */
     const char *name;
     const char *group;     /* NULL for ungrouped */
-    const jv   *func;      /* full function object from cache */
+    const char *doc;       /* docstring (read up to the first \n), or NULL */
+    const jv   *func;      /* full function object; NULL until cmd_func
+                            * parses it when the list came from the index */
+    uint32_t    span_off, span_len;  /* function's bytes in the JSON (index) */
 } CmdEntry;
 
 typedef struct {
@@ -525,9 +554,11 @@ static void build_index(const jv *cache, CmdList *out, Arena *a) {
             const jv *name = jv_obj_get(fn, "name");
             if (!name || name->kind != JV_STR) continue;
             const jv *grp = jv_obj_get(fn, "group");
+            const jv *doc = jv_obj_get(fn, "docstring");
             CmdEntry e = {
                 .name  = dasherize(a, name->u.str.s, name->u.str.l),
                 .group = (grp && grp->kind == JV_STR) ? grp->u.str.s : NULL,
+                .doc   = (doc && doc->kind == JV_STR) ? doc->u.str.s : NULL,
                 .func  = fn,
             };
             cmdlist_push(out, e);
@@ -536,6 +567,52 @@ static void build_index(const jv *cache, CmdList *out, Arena *a) {
     qsort(out->items, out->n, sizeof(CmdEntry), cmd_cmp);
 }
 
+/* Look up `name` (optionally inside `group`) with cmd_name_eq semantics.
+ * The list is sorted by cmd_cmp, and stored names are already dasherized,
+ * so dasherizing the needle makes a binary search exact for top-level
+ * commands. Group names are stored as written, so a group typed with the
+ * other separator (`my-group` for `my_group`) falls back to a scan. */
+static CmdEntry *find_cmd(CmdList *cmds, const char *group, const char *name) {
+    char key[256];
+    size_t l = strlen(name);
+    if (group && !*group) return NULL;
+    if (l < sizeof(key)) {
+        for (size_t i = 0; i <= l; i++) key[i] = (name[i] == '_') ? '-' : name[i];
+        CmdEntry probe = { .name = key, .group = group };
+        CmdEntry *hit = (CmdEntry *)bsearch(&probe, cmds->items, cmds->n,
+                                            sizeof(CmdEntry), cmd_cmp);
+        if (hit) return hit;
+        if (!group || !strpbrk(group, "-_")) return NULL;
+    }
+    for (size_t i = 0; i < cmds->n; i++) {
+        CmdEntry *e = &cmds->items[i];
+        if (!e->group != !group) continue;
+        if (group && !cmd_name_eq(e->group, group)) continue;
+        if (cmd_name_eq(e->name, name)) return e;
+    }
+    return NULL;
+}
+
+/* True iff some command lives in `group` (cmd_name_eq semantics). Groups
+ * sort after every top-level command, so a lower-bound search on the exact
+ * spelling answers the common case. */
+static int has_group(CmdList *cmds, const char *group) {
+    size_t lo = 0, hi = cmds->n;
+    while (lo < hi) {
+        size_t mid = lo + (hi - lo) / 2;
+        const char *g = cmds->items[mid].group;
+        if (strcmp(g ? g : "", group) < 0) lo = mid + 1;
+        else hi = mid;
+    }
+    if (lo < cmds->n && cmds->items[lo].group &&
+        strcmp(cmds->items[lo].group, group) == 0) return 1;
+    if (!strpbrk(group, "-_")) return 0;
+    for (size_t i = 0; i < cmds->n; i++)
+        if (cmds->items[i].group && cmd_name_eq(cmds->items[i].group, group))
+            return 1;
+    return 0;
+}
+
 /* ============================================================
  *                   freshness check
  * ============================================================ */
@@ -550,108 +627,536 @@ static void build_index(const jv *cache, CmdList *out, Arena *a) {
  * Without the dir-mtime check clichec would happily serve "Unknown command"
  * for functions defined in brand-new files, since those files are absent from
  * py_mtimes and the wrapper doesn't fall through on rc=1. */
-static int cache_is_fresh(const jv *cache, const char *pkg_dir) {
-    if (!pkg_dir) return 0;
-    const jv *fms = jv_obj_get(cache, "py_mtimes");
-    if (!fms || fms->kind != JV_OBJ) return 0;
+/* Does `path` still carry the mtime the cache recorded? Python stores
+ * float seconds, so compare with a 1 ms tolerance. `what` only labels the
+ * CLICHEC_DEBUG trace ("file" / "dir"). */
+static int mtime_matches(const char *path, double want, const char *what) {
+    struct stat st;
+    if (stat(path, &st) != 0) {
+        if (getenv("CLICHEC_DEBUG"))
+            fprintf(stderr, "clichec: stat failed for %s %s\n", what, path);
+        return 0;
+    }
+    double cur = (double)st.st_mtime + ST_MTIM_NSEC(st) / 1e9;
+    double diff = cur - want;
+    if (diff < 0) diff = -diff;
+    if (diff > 0.001) {
+        if (getenv("CLICHEC_DEBUG"))
+            fprintf(stderr, "clichec: %s mtime drift %s: cur=%.6f want=%.6f\n",
+                    what, path, cur, want);
+        return 0;
+    }
+    return 1;
+}
+
+/* Resolve a tracked path relative to pkg_dir ("." is pkg_dir itself) and
+ * check its mtime. Paths that don't fit the buffer count as drift. */
+static int rel_mtime_matches(const char *pkg_dir, const char *rel, size_t rl,
+                             double want, const char *what) {
     char buf[4096];
-    for (size_t i = 0; i < fms->u.obj.n; i++) {
-        const char *rel = fms->u.obj.keys[i];
-        size_t      rl  = fms->u.obj.klens[i];
-        const jv   *mv  = &fms->u.obj.vals[i];
-        if (mv->kind != JV_NUM) return 0;
-        int n = snprintf(buf, sizeof(buf), "%s/%.*s", pkg_dir,
-                         (int)rl, rel);
-        if (n < 0 || (size_t)n >= sizeof(buf)) return 0;
+    int n;
+    if (rl == 1 && rel[0] == '.')
+        n = snprintf(buf, sizeof(buf), "%s", pkg_dir);
+    else
+        n = snprintf(buf, sizeof(buf), "%s/%.*s", pkg_dir, (int)rl, rel);
+    if (n < 0 || (size_t)n >= sizeof(buf)) return 0;
+    return mtime_matches(buf, want, what);
+}
+
+/* pyproject.toml mtime — cached when runtime.py reads [project].description
+ * for the top-level help blurb. We must defer to Python on drift so the
+ * description (and the cache itself) get refreshed. Two candidate paths
+ * mirror runtime.py:_read_pyproject_meta: pkg_dir/pyproject.toml (flat
+ * layout) and pkg_dir/../pyproject.toml (subdir layout). Whichever exists
+ * with a matching mtime wins. */
+static int pyproject_matches(const char *pkg_dir, double want) {
+    const char *paths[2] = { NULL, NULL };
+    char p1[4096], p2[4096];
+    if (snprintf(p1, sizeof(p1), "%s/pyproject.toml", pkg_dir) < (int)sizeof(p1))
+        paths[0] = p1;
+    if (snprintf(p2, sizeof(p2), "%s/../pyproject.toml", pkg_dir) < (int)sizeof(p2))
+        paths[1] = p2;
+    for (int i = 0; i < 2; i++) {
+        if (!paths[i]) continue;
         struct stat st;
-        if (stat(buf, &st) != 0) {
-            if (getenv("CLICHEC_DEBUG"))
-                fprintf(stderr, "clichec: stat failed for file %s\n", buf);
-            return 0;
-        }
+        if (stat(paths[i], &st) != 0) continue;
         double cur = (double)st.st_mtime + ST_MTIM_NSEC(st) / 1e9;
-        double want = mv->u.n;
         double diff = cur - want;
         if (diff < 0) diff = -diff;
-        if (diff > 0.001) {
-            if (getenv("CLICHEC_DEBUG"))
-                fprintf(stderr, "clichec: file mtime drift %s: cur=%.6f want=%.6f\n",
-                        buf, cur, want);
-            return 0;
-        }
+        if (diff <= 0.001) return 1;
     }
+    if (getenv("CLICHEC_DEBUG"))
+        fprintf(stderr, "clichec: pyproject mtime drift (want=%.6f)\n", want);
+    return 0;
+}
 
-    /* pyproject.toml mtime — cached when runtime.py reads [project].description
-     * for the top-level help blurb. We must defer to Python on drift so the
-     * description (and the cache itself) get refreshed. Two candidate paths
-     * mirror runtime.py:_read_pyproject_meta: pkg_dir/pyproject.toml (flat
-     * layout) and pkg_dir/../pyproject.toml (subdir layout). Whichever exists
-     * with a matching mtime wins. Missing field on older caches: skip the
-     * check (backwards-compatible). */
-    const jv *ppm = jv_obj_get(cache, "pyproject_mtime");
-    if (ppm && ppm->kind == JV_NUM) {
-        double want = ppm->u.n;
-        const char *paths[2] = { NULL, NULL };
-        char p1[4096], p2[4096];
-        if (snprintf(p1, sizeof(p1), "%s/pyproject.toml", pkg_dir) < (int)sizeof(p1))
-            paths[0] = p1;
-        if (snprintf(p2, sizeof(p2), "%s/../pyproject.toml", pkg_dir) < (int)sizeof(p2))
-            paths[1] = p2;
-        int matched = 0;
-        for (int i = 0; i < 2 && !matched; i++) {
-            if (!paths[i]) continue;
-            struct stat st;
-            if (stat(paths[i], &st) != 0) continue;
-            double cur = (double)st.st_mtime + ST_MTIM_NSEC(st) / 1e9;
-            double diff = cur - want;
-            if (diff < 0) diff = -diff;
-            if (diff <= 0.001) matched = 1;
-        }
-        if (!matched) {
-            if (getenv("CLICHEC_DEBUG"))
-                fprintf(stderr, "clichec: pyproject mtime drift (want=%.6f)\n", want);
-            return 0;
+/* Parallel stat engine. On a warm page cache a stat is about a microsecond
+ * and a serial loop is fastest; on a cold cache or NFS each one waits on
+ * I/O and overlapping them is what pays. So a batch goes to worker threads
+ * only past PARALLEL_STAT_THRESHOLD entries, one per CPU up to 8, and
+ * CLICHE_STAT_THREADS=N forces N workers for any batch (1 = serial). Same
+ * policy as runtime.py:_stat_workers. Every worker checks a shared drift
+ * flag before each stat, so the first mismatch stops them all. */
+#define PARALLEL_STAT_THRESHOLD 1024
+#define MAX_STAT_WORKERS        64
+
+typedef int (*fresh_fn)(const void *ctx, size_t i);
+
+typedef struct {
+    fresh_fn      fn;
+    const void   *ctx;
+    size_t        lo, hi;
+    volatile int *drift;    /* set once, read racily: a late read only costs a stat */
+} StatSlice;
+
+static void *stat_slice(void *arg) {
+    StatSlice *s = (StatSlice *)arg;
+    for (size_t i = s->lo; i < s->hi && !*s->drift; i++)
+        if (!s->fn(s->ctx, i)) *s->drift = 1;
+    return NULL;
+}
+
+static int stat_workers(size_t n) {
+    const char *env = getenv("CLICHE_STAT_THREADS");
+    if (env && *env) {
+        char *end;
+        long forced = strtol(env, &end, 10);
+        if (*end == 0 && forced > 0) {
+            if (forced > MAX_STAT_WORKERS) forced = MAX_STAT_WORKERS;
+            return (size_t)forced < n ? (int)forced : (int)(n ? n : 1);
         }
     }
+    if (n < PARALLEL_STAT_THRESHOLD) return 1;
+    long cpus = sysconf(_SC_NPROCESSORS_ONLN);
+    if (cpus < 1) return 1;
+    return cpus < 8 ? (int)cpus : 8;
+}
+
+/* 1 iff fn(ctx, i) holds for every i < n. The calling thread takes the
+ * last slice itself; a slice whose thread can't be created runs inline. */
+static int all_fresh(fresh_fn fn, const void *ctx, size_t n) {
+    volatile int drift = 0;
+    int workers = stat_workers(n);
+    if (workers <= 1) {
+        StatSlice s = { fn, ctx, 0, n, &drift };
+        stat_slice(&s);
+        return !drift;
+    }
+    pthread_t  tids[MAX_STAT_WORKERS];
+    StatSlice  slices[MAX_STAT_WORKERS];
+    int        started[MAX_STAT_WORKERS];
+    size_t     step = (n + (size_t)workers - 1) / (size_t)workers;
+    int        w = 0;
+    for (size_t lo = 0; lo < n; lo += step, w++) {
+        slices[w] = (StatSlice){ fn, ctx, lo, lo + step < n ? lo + step : n, &drift };
+        started[w] = lo + step < n &&
+                     pthread_create(&tids[w], NULL, stat_slice, &slices[w]) == 0;
+        if (!started[w]) stat_slice(&slices[w]);
+    }
+    for (int i = 0; i < w; i++)
+        if (started[i]) pthread_join(tids[i], NULL);
+    return !drift;
+}
+
+typedef struct {
+    const char *pkg_dir;
+    const jv   *files;  /* py_mtimes */
+    const jv   *dirs;   /* dir_mtimes, or NULL */
+} TreeCheck;
+
+/* Entry i of py_mtimes followed by dir_mtimes. Keys are relative paths
+ * ("." for the package root, "sub" for a subpackage, etc.). */
+static int tree_entry_fresh(const void *ctx, size_t i) {
+    const TreeCheck *t = (const TreeCheck *)ctx;
+    const jv *o = t->files;
+    const char *what = "file";
+    if (i >= o->u.obj.n) {
+        i -= o->u.obj.n;
+        o = t->dirs;
+        what = "dir";
+    }
+    const jv *mv = &o->u.obj.vals[i];
+    if (mv->kind != JV_NUM) return 0;
+    return rel_mtime_matches(t->pkg_dir, o->u.obj.keys[i], o->u.obj.klens[i],
+                             mv->u.n, what);
+}
+
+static int cache_is_fresh(const jv *cache, const char *pkg_dir) {
+    if (!pkg_dir) return 0;
+    const jv *fms = jv_obj_get(cache, "py_mtimes");
+    if (!fms || fms->kind != JV_OBJ) return 0;
+
+    /* Missing pyproject_mtime on older caches: skip the check
+     * (backwards-compatible). */
+    const jv *ppm = jv_obj_get(cache, "pyproject_mtime");
+    if (ppm && ppm->kind == JV_NUM && !pyproject_matches(pkg_dir, ppm->u.n))
+        return 0;
 
-    /* Tracked directories — keys are relative paths ("." for the package
-     * root, "sub" for a subpackage, etc.). A drift here indicates a file
-     * has been added/removed in that dir, so the cache may not know about
-     * a brand-new @cli function. Defer to Python so it can rescan. */
+    /* Tracked files, then tracked directories. A directory drift means a
+     * file has been added/removed in that dir, so the cache may not know
+     * about a brand-new @cli function. Defer to Python so it can rescan. */
     const jv *dms = jv_obj_get(cache, "dir_mtimes");
-    if (dms && dms->kind == JV_OBJ) {
-        for (size_t i = 0; i < dms->u.obj.n; i++) {
-            const char *rel = dms->u.obj.keys[i];
-            size_t      rl  = dms->u.obj.klens[i];
-            const jv   *mv  = &dms->u.obj.vals[i];
-            if (mv->kind != JV_NUM) return 0;
-            int n;
-            if (rl == 1 && rel[0] == '.') {
-                n = snprintf(buf, sizeof(buf), "%s", pkg_dir);
-            } else {
-                n = snprintf(buf, sizeof(buf), "%s/%.*s", pkg_dir,
-                             (int)rl, rel);
-            }
-            if (n < 0 || (size_t)n >= sizeof(buf)) return 0;
-            struct stat st;
-            if (stat(buf, &st) != 0) {
-                if (getenv("CLICHEC_DEBUG"))
-                    fprintf(stderr, "clichec: stat failed for dir %s\n", buf);
-                return 0;
-            }
-            double cur = (double)st.st_mtime + ST_MTIM_NSEC(st) / 1e9;
-            double want = mv->u.n;
-            double diff = cur - want;
-            if (diff < 0) diff = -diff;
-            if (diff > 0.001) {
-                if (getenv("CLICHEC_DEBUG"))
-                    fprintf(stderr, "clichec: dir mtime drift %s: cur=%.6f want=%.6f\n",
-                            buf, cur, want);
-                return 0;
-            }
+    if (dms && dms->kind != JV_OBJ) dms = NULL;
+    TreeCheck t = { pkg_dir, fms, dms };
+    return all_fresh(tree_entry_fresh, &t, fms->u.obj.n + (dms ? dms->u.obj.n : 0));
+}
+
+/* ============================================================
+ *              binary command index (<pkg>_<hash>.idx)
+ * ============================================================
+ *
+ * runtime.py writes a sidecar next to the JSON cache (format documented in
+ * cliche/cache_index.py): a fixed header, a command table already sorted
+ * the way build_index sorts, a freshness table, and NUL-terminated
+ * strings. We mmap it and point CmdEntry fields straight into the mapping,
+ * so bare `--help`, unknown-command and top-level completion never touch
+ * the JSON at all. Paths that need a whole function object (`<cmd> --help`,
+ * `--llm-help`, flag completion) parse just that function's byte span out
+ * of the mmap'd JSON — see cmd_func.
+ *
+ * The index is trusted only when its magic, format, adler32 and cache
+ * version check out AND the JSON on disk still has the size and mtime_ns
+ * recorded in the header. Any mismatch means the two were not written
+ * together, and we read the JSON as before. Every reference is
+ * bounds-checked once at open, so the rest of the file can use them
+ * without further validation.
+ */
+
+#define IDX_MAGIC       "CLIX"
+#define IDX_FORMAT      2
+#define IDX_HEADER_SIZE 112
+#define IDX_CMD_SIZE    32
+#define IDX_FRESH_SIZE  20
+#define IDX_ABSENT      0xFFFFFFFFu
+#define IDX_FLAG_PYPROJECT_MTIME 1u
+
+typedef struct {
+    const unsigned char *base;  /* mmap of the .idx file */
+    size_t               len;
+    const char          *json;  /* mmap of the .json file; sliced per command */
+    size_t               json_len;
+    uint64_t             json_mtime_ns;
+    uint32_t             flags;
+    double               pyproject_mtime;
+    const char          *pkg_dir;
+    const char          *description;   /* NULL when absent */
+    uint32_t             enums_off, enums_len;
+    uint32_t             pyd_off, pyd_len;
+    uint32_t             schemas_off, schemas_len;
+    uint32_t             n_cmds, cmds_off;
+    uint32_t             n_fresh, fresh_off;
+    uint32_t             strtab_off;
+} Idx;
+
+/* The open index, if any. cmd_func reaches the JSON through it. */
+static Idx g_idx;
+
+static uint32_t rd32(const unsigned char *p) {
+    return (uint32_t)p[0] | (uint32_t)p[1] << 8 |
+           (uint32_t)p[2] << 16 | (uint32_t)p[3] << 24;
+}
+
+static uint64_t rd64(const unsigned char *p) {
+    return (uint64_t)rd32(p) | (uint64_t)rd32(p + 4) << 32;
+}
+
+static double rdf64(const unsigned char *p) {
+    uint64_t u = rd64(p);
+    double d;
+    memcpy(&d, &u, sizeof(d));
+    return d;
+}
+
+/* zlib's adler32, matching Python's `zlib.adler32`. 5552 is the largest n
+ * for which the sums can't overflow 32 bits before the modulo. */
+static uint32_t adler32(const unsigned char *p, size_t n) {
+    uint32_t a = 1, b = 0;
+    while (n) {
+        size_t k = n < 5552 ? n : 5552;
+        n -= k;
+        while (k--) { a += *p++; b += a; }
+        a %= 65521;
+        b %= 65521;
+    }
+    return b << 16 | a;
+}
+
+/* Resolve a string reference: must live in the string table and be
+ * NUL-terminated in place. `*ok` is cleared on a bad reference; an absent
+ * one (allowed only where `nullable`) yields NULL. */
+static const char *idx_str(const Idx *ix, const unsigned char *ref,
+                           int nullable, int *ok) {
+    uint32_t off = rd32(ref), len = rd32(ref + 4);
+    if (off == IDX_ABSENT) {
+        if (!nullable) *ok = 0;
+        return NULL;
+    }
+    if (off < ix->strtab_off || (uint64_t)off + len >= ix->len ||
+        ix->base[off + len] != 0) {
+        *ok = 0;
+        return NULL;
+    }
+    return (const char *)ix->base + off;
+}
+
+static int idx_span_ok(const Idx *ix, uint32_t off, uint32_t len) {
+    return off != IDX_ABSENT && (uint64_t)off + len <= ix->json_len;
+}
+
+static void *map_file(int fd, size_t len) {
+    void *p = mmap(NULL, len, PROT_READ, MAP_PRIVATE, fd, 0);
+    return p == MAP_FAILED ? NULL : p;
+}
+
+static void idx_close(Idx *ix) {
+    if (ix->base) munmap((void *)ix->base, ix->len);
+    if (ix->json) munmap((void *)ix->json, ix->json_len);
+    memset(ix, 0, sizeof(*ix));
+}
+
+/* Map `<cache>.idx` and the JSON it describes. Returns 0 when the index is
+ * usable; anything else leaves `ix` closed and the caller reads the JSON. */
+static int idx_open(const char *cache_path, Idx *ix) {
+    memset(ix, 0, sizeof(*ix));
+    size_t cl = strlen(cache_path);
+    char path[4096];
+    if (cl < 5 || strcmp(cache_path + cl - 5, ".json") != 0 ||
+        cl + 1 > sizeof(path)) return -1;
+    memcpy(path, cache_path, cl - 5);
+    memcpy(path + cl - 5, ".idx", 5);
+
+    int fd = open(path, O_RDONLY);
+    if (fd < 0) return -1;
+    struct stat st;
+    if (fstat(fd, &st) != 0 || st.st_size < IDX_HEADER_SIZE) {
+        close(fd);
+        return -1;
+    }
+    ix->len = (size_t)st.st_size;
+    ix->base = (const unsigned char *)map_file(fd, ix->len);
+    close(fd);
+    if (!ix->base) { ix->len = 0; return -1; }
+
+    const unsigned char *h = ix->base;
+    const char *why = NULL;
+    if (memcmp(h, IDX_MAGIC, 4) != 0 || rd32(h + 4) != IDX_FORMAT) {
+        why = "bad magic/format";
+        goto fail;
+    }
+    if (adler32(h + IDX_HEADER_SIZE, ix->len - IDX_HEADER_SIZE) != rd32(h + 24)) {
+        why = "checksum mismatch";
+        goto fail;
+    }
+
+    /* The JSON must be byte-for-byte the one this index was built from. */
+    fd = open(cache_path, O_RDONLY);
+    if (fd < 0) { why = "no JSON"; goto fail; }
+    if (fstat(fd, &st) != 0) { close(fd); why = "no JSON"; goto fail; }
+    uint64_t mtime_ns = (uint64_t)st.st_mtime * 1000000000u + (uint64_t)ST_MTIM_NSEC(st);
+    if ((uint64_t)st.st_size != rd64(h + 8) || mtime_ns != rd64(h + 16) ||
+        st.st_size == 0) {
+        close(fd);
+        why = "JSON changed since the index was written";
+        goto fail;
+    }
+    ix->json_len = (size_t)st.st_size;
+    ix->json_mtime_ns = mtime_ns;
+    ix->json = (const char *)map_file(fd, ix->json_len);
+    close(fd);
+    if (!ix->json) { ix->json_len = 0; why = "mmap failed"; goto fail; }
+
+    ix->flags           = rd32(h + 28);
+    ix->pyproject_mtime = rdf64(h + 32);
+    ix->enums_off  = rd32(h + 64); ix->enums_len = rd32(h + 68);
+    ix->pyd_off    = rd32(h + 72); ix->pyd_len   = rd32(h + 76);
+    ix->schemas_off = rd32(h + 80); ix->schemas_len = rd32(h + 84);
+    ix->n_cmds     = rd32(h + 88); ix->cmds_off  = rd32(h + 92);
+    ix->n_fresh    = rd32(h + 96); ix->fresh_off = rd32(h + 100);
+    ix->strtab_off = rd32(h + 104);
+    if ((uint64_t)ix->cmds_off + (uint64_t)ix->n_cmds * IDX_CMD_SIZE > ix->len ||
+        (uint64_t)ix->fresh_off + (uint64_t)ix->n_fresh * IDX_FRESH_SIZE > ix->len ||
+        ix->strtab_off < IDX_HEADER_SIZE || ix->strtab_off > ix->len) {
+        why = "table out of bounds";
+        goto fail;
+    }
+
+    int ok = 1;
+    const char *ver = idx_str(ix, h + 40, 0, &ok);
+    ix->pkg_dir     = idx_str(ix, h + 48, 0, &ok);
+    ix->description = idx_str(ix, h + 56, 1, &ok);
+    if (!ok) { why = "bad header reference"; goto fail; }
+    if (strcmp(ver, EXPECTED_CACHE_VERSION) != 0) {
+        why = "cache version mismatch";
+        goto fail;
+    }
+    if ((ix->enums_off != IDX_ABSENT && !idx_span_ok(ix, ix->enums_off, ix->enums_len)) ||
+        (ix->pyd_off != IDX_ABSENT && !idx_span_ok(ix, ix->pyd_off, ix->pyd_len)) ||
+        (ix->schemas_off != IDX_ABSENT &&
+         !idx_span_ok(ix, ix->schemas_off, ix->schemas_len))) {
+        why = "bad JSON span";
+        goto fail;
+    }
+    for (uint32_t i = 0; i < ix->n_cmds && ok; i++) {
+        const unsigned char *r = ix->base + ix->cmds_off + (size_t)i * IDX_CMD_SIZE;
+        idx_str(ix, r, 0, &ok);
+        idx_str(ix, r + 8, 1, &ok);
+        idx_str(ix, r + 16, 1, &ok);
+        if (!idx_span_ok(ix, rd32(r + 24), rd32(r + 28))) ok = 0;
+    }
+    for (uint32_t i = 0; i < ix->n_fresh && ok; i++)
+        idx_str(ix, ix->base + ix->fresh_off + (size_t)i * IDX_FRESH_SIZE, 0, &ok);
+    if (!ok) { why = "bad table reference"; goto fail; }
+    return 0;
+
+fail:
+    if (getenv("CLICHEC_DEBUG"))
+        fprintf(stderr, "clichec: index unusable (%s), reading JSON\n", why);
+    idx_close(ix);
+    return -1;
+}
+
+static int idx_entry_fresh(const void *ctx, size_t i) {
+    const Idx *ix = (const Idx *)ctx;
+    const unsigned char *r = ix->base + ix->fresh_off + i * IDX_FRESH_SIZE;
+    int ok = 1;
+    const char *rel = idx_str(ix, r, 0, &ok);
+    int is_dir = rd32(r + 8) != 0;
+    return rel_mtime_matches(ix->pkg_dir, rel, rd32(r + 4), rdf64(r + 12),
+                             is_dir ? "dir" : "file");
+}
+
+/* Same contract as cache_is_fresh, driven by the index's freshness table. */
+static int idx_is_fresh(const Idx *ix) {
+    if ((ix->flags & IDX_FLAG_PYPROJECT_MTIME) &&
+        !pyproject_matches(ix->pkg_dir, ix->pyproject_mtime))
+        return 0;
+    return all_fresh(idx_entry_fresh, ix, ix->n_fresh);
+}
+
+/* ============================================================
+ *            watcher token (<pkg>_<hash>.gen)
+ * ============================================================
+ *
+ * `cliche watch` (cliche/watch.py) rescans the package on every inotify
+ * event and publishes a 32-byte token naming the JSON it last verified:
+ * "CLWG", u32 format, u64 JSON size, u64 JSON mtime_ns, u64 generation
+ * (little-endian). It holds a POSIX write lock on `<pkg>_<hash>.gen.lock`
+ * for as long as it runs. When the token names the JSON we are about to
+ * trust and the lock is held, that JSON is fresh without a stat per
+ * tracked file and directory. A crashed daemon leaves the token but not
+ * the lock, so we go back to the mtime checks.
+ */
+
+#define WATCH_MAGIC  "CLWG"
+#define WATCH_FORMAT 1
+#define WATCH_SIZE   32
+
+static int watch_vouches(const char *cache_path, uint64_t size, uint64_t mtime_ns) {
+    size_t cl = strlen(cache_path);
+    char path[4096];
+    if (cl < 5 || strcmp(cache_path + cl - 5, ".json") != 0 ||
+        cl + 5 > sizeof(path)) return 0;
+    memcpy(path, cache_path, cl - 5);
+    memcpy(path + cl - 5, ".gen", 5);
+    int fd = open(path, O_RDONLY);
+    if (fd < 0) return 0;
+    unsigned char tok[WATCH_SIZE + 1];
+    ssize_t n = read(fd, tok, sizeof(tok));
+    close(fd);
+    if (n != WATCH_SIZE || memcmp(tok, WATCH_MAGIC, 4) != 0 ||
+        rd32(tok + 4) != WATCH_FORMAT || rd64(tok + 8) != size ||
+        rd64(tok + 16) != mtime_ns) return 0;
+
+    /* F_GETLK only asks; it never takes the lock. Querying as a reader
+     * means only the daemon's write lock counts, not another launcher's
+     * probe. */
+    memcpy(path + cl - 5, ".gen.lock", 10);
+    fd = open(path, O_RDONLY);
+    if (fd < 0) return 0;
+    struct flock fl;
+    memset(&fl, 0, sizeof(fl));
+    fl.l_type = F_RDLCK;
+    fl.l_whence = SEEK_SET;
+    int held = fcntl(fd, F_GETLK, &fl) == 0 && fl.l_type == F_WRLCK;
+    close(fd);
+    if (held && getenv("CLICHEC_DEBUG"))
+        fprintf(stderr, "clichec: watcher vouches for the cache (generation %llu)\n",
+                (unsigned long long)rd64(tok + 24));
+    return held;
+}
+
+/* Fill `out` straight from the index's command table: pointers into the
+ * mapping, no copies, no sort (Python wrote it in cmd_cmp order). */
+static void idx_build_list(const Idx *ix, CmdList *out) {
+    out->items = (CmdEntry *)calloc(ix->n_cmds ? ix->n_cmds : 1, sizeof(CmdEntry));
+    if (!out->items) { perror("clichec: calloc"); exit(DEFER); }
+    out->cap = ix->n_cmds;
+    int ok = 1;
+    for (uint32_t i = 0; i < ix->n_cmds; i++) {
+        const unsigned char *r = ix->base + ix->cmds_off + (size_t)i * IDX_CMD_SIZE;
+        CmdEntry *e = &out->items[out->n++];
+        e->name     = idx_str(ix, r, 0, &ok);
+        e->group    = idx_str(ix, r + 8, 1, &ok);
+        e->doc      = idx_str(ix, r + 16, 1, &ok);
+        e->span_off = rd32(r + 24);
+        e->span_len = rd32(r + 28);
+    }
+}
+
+/* Parse one byte span of the mmap'd JSON into the arena. */
+static const jv *idx_parse_span(uint32_t off, uint32_t len, Arena *a) {
+    if (!g_idx.json || off == IDX_ABSENT) return NULL;
+    JP p = { .src = g_idx.json + off, .i = 0, .len = len, .a = a, .err = 0 };
+    jv *v = (jv *)arena_alloc(a, sizeof(jv));
+    if (parse_value(&p, v) || p.err) return NULL;
+    return v;
+}
+
+/* The function object behind a command, parsed on first use when the list
+ * came from the index. NULL only if the span doesn't parse — callers
+ * defer. */
+static const jv *cmd_func(CmdEntry *e, Arena *a) {
+    if (!e->func) {
+        const jv *fn = idx_parse_span(e->span_off, e->span_len, a);
+        if (fn && fn->kind == JV_OBJ) e->func = fn;
+    }
+    return e->func;
+}
+
+/* A stand-in for the parsed cache root holding only the keys the renderers
+ * look up: "description" (from the index, no parsing) and, when `aux` is
+ * set, "enums" / "pydantic_models" / "pydantic_schemas" parsed from their
+ * JSON spans. */
+static int idx_root(const Idx *ix, Arena *a, jv *root, int aux) {
+    root->kind = JV_OBJ;
+    root->u.obj.keys  = (const char **)arena_alloc(a, 4 * sizeof(char *));
+    root->u.obj.klens = (size_t *)arena_alloc(a, 4 * sizeof(size_t));
+    root->u.obj.vals  = (jv *)arena_alloc(a, 4 * sizeof(jv));
+    size_t n = 0;
+    if (ix->description) {
+        root->u.obj.keys[n] = "description";
+        root->u.obj.klens[n] = strlen("description");
+        root->u.obj.vals[n].kind = JV_STR;
+        root->u.obj.vals[n].u.str.s = ix->description;
+        root->u.obj.vals[n].u.str.l = strlen(ix->description);
+        n++;
+    }
+    if (aux) {
+        static const char *names[3] = { "enums", "pydantic_models", "pydantic_schemas" };
+        const uint32_t offs[3] = { ix->enums_off, ix->pyd_off, ix->schemas_off };
+        const uint32_t lens[3] = { ix->enums_len, ix->pyd_len, ix->schemas_len };
+        for (int i = 0; i < 3; i++) {
+            if (offs[i] == IDX_ABSENT) continue;
+            const jv *v = idx_parse_span(offs[i], lens[i], a);
+            if (!v) return -1;
+            root->u.obj.keys[n] = names[i];
+            root->u.obj.klens[n] = strlen(names[i]);
+            root->u.obj.vals[n] = *v;
+            n++;
         }
     }
-    return 1;
+    root->u.obj.n = n;
+    return 0;
 }
 
 /* ============================================================
@@ -917,27 +1422,187 @@ static int render_command_llm(const jv *cache, const char *prog,
         }
     }
 
-    /* The four trailing lines below are copied verbatim from
+    /* The six trailing lines below are copied verbatim from
      * run.py:print_llm_command_help (the global options + the top-level-only
      * note). Parity test (tests/test_clichec_parity.py) keeps them in lock-step. */
     fputs("## global options\n", out);
     fputs("--pdb: debugger on error | --pyspy N: profile Ns | --raw: plain output (no JSON/color)\n", out);
+    fputs("--output-format F: json, json-compact, ndjson, csv, tsv, msgpack, arrow\n", out);
     fputs("--full-traceback: include cliche wrappers | --timing: timing info | --llm-help: this view\n", out);
-    fprintf(out, "# Top-level only (run on `%s` itself): --version, --cli, --pip, --uv — see `%s --llm-help`\n",
+    fputs("--import-profile[=N|FILE]: import times, top N or a speedscope/.folded file\n", out);
+    fprintf(out, "# Top-level only (run on `%s` itself): --version, --cli, --pip, --uv, --batch — see `%s --llm-help`\n",
             prog, prog);
     return 0;
 }
 
 /* ============================================================
- *                 rendering: top-level --help
- * ============================================================ */
+ *              pre-rendered help (<pkg>_<hash>.help)
+ * ============================================================
+ *
+ * runtime.py renders the help texts once, through run.py's own functions,
+ * and stores the exact bytes next to the cache (format documented in
+ * cliche/help_store.py): top-level help, group listings, and per-command
+ * argparse help and --llm-help, colored and plain. When the store has an
+ * entry we write it verbatim and the C renderers below never run; they
+ * remain the fallback for entries the store doesn't have (pydantic
+ * signatures, a store still being filled in, a different terminal width).
+ *
+ * Trusted only while the JSON on disk has the size and mtime_ns in the
+ * header, the program name matches, and the entry table and the served
+ * blob pass their adler32 checks. The argparse kinds additionally need the
+ * terminal to be exactly as wide as the one they were rendered for.
+ */
+
+#define HELP_MAGIC       "CLIH"
+#define HELP_FORMAT      1
+#define HELP_HEADER_SIZE 56
+#define HELP_ENTRY_SIZE  28
+
+/* shutil.get_terminal_size().columns, as argparse sees it: a positive
+ * $COLUMNS wins, then the size of stdout's terminal, then 80. -1 when
+ * $COLUMNS is set to something we don't parse exactly like int() does. */
+static int terminal_columns(void) {
+    const char *env = getenv("COLUMNS");
+    if (env && *env) {
+        char *end;
+        errno = 0;
+        long v = strtol(env, &end, 10);
+        if (errno || *end || !isdigit((unsigned char)env[0]) || v > INT_MAX)
+            return -1;
+        if (v > 0) return (int)v;
+    }
+    struct winsize ws;
+    if (ioctl(STDOUT_FILENO, TIOCGWINSZ, &ws) != 0) return 80;
+    return ws.ws_col ? (int)ws.ws_col : -1;
+}
+
+/* Write the stored text for `kind` (top, group, help, llm, meta) to `out`,
+ * its "+color" variant when `color` is set. With `out` NULL, only report
+ * whether the entry is there. Returns 0 on a hit, -1 when the caller has
+ * to do without. */
+static int write_stored(const char *cache_path, const char *prog,
+                        const char *kind, int color, const char *group,
+                        const char *name, FILE *out) {
+    char want[1024];
+    int width_kind = strcmp(kind, "help") == 0;
+    int n = snprintf(want, sizeof(want), "%s%s\t%s\t%s", kind,
+                     color ? "+color" : "", group ? group : "", name);
+    if (n < 0 || (size_t)n >= sizeof(want)) return -1;
+
+    size_t cl = strlen(cache_path);
+    char path[4096];
+    if (cl < 5 || strcmp(cache_path + cl - 5, ".json") != 0 ||
+        cl + 1 > sizeof(path)) return -1;
+    memcpy(path, cache_path, cl - 5);
+    memcpy(path + cl - 5, ".help", 6);
+
+    struct stat jst, st;
+    if (stat(cache_path, &jst) != 0) return -1;
+    int fd = open(path, O_RDONLY);
+    if (fd < 0) return -1;
+    if (fstat(fd, &st) != 0 || st.st_size < HELP_HEADER_SIZE) {
+        close(fd);
+        return -1;
+    }
+    size_t len = (size_t)st.st_size;
+    const unsigned char *base = (const unsigned char *)map_file(fd, len);
+    close(fd);
+    if (!base) return -1;
+
+    const char *why = NULL;
+    int rc = -1;
+    const unsigned char *h = base;
+    uint64_t mtime_ns = (uint64_t)jst.st_mtime * 1000000000u + (uint64_t)ST_MTIM_NSEC(jst);
+    uint32_t n_entries = rd32(h + 44), entries_off = rd32(h + 48);
+    uint32_t blobs_off = rd32(h + 52);
+    uint32_t prog_off = rd32(h + 36), prog_len = rd32(h + 40);
+    uint64_t strtab_off = (uint64_t)entries_off + (uint64_t)n_entries * HELP_ENTRY_SIZE;
+    if (memcmp(h, HELP_MAGIC, 4) != 0 || rd32(h + 4) != HELP_FORMAT) {
+        why = "bad magic/format";
+        goto out;
+    }
+    if ((uint64_t)jst.st_size != rd64(h + 8) || mtime_ns != rd64(h + 16)) {
+        why = "JSON changed since the store was written";
+        goto out;
+    }
+    if (entries_off != HELP_HEADER_SIZE || strtab_off > blobs_off || blobs_off > len) {
+        why = "table out of bounds";
+        goto out;
+    }
+    if (adler32(h + HELP_HEADER_SIZE, blobs_off - HELP_HEADER_SIZE) != rd32(h + 24)) {
+        why = "checksum mismatch";
+        goto out;
+    }
+    if (prog_off < strtab_off || (uint64_t)prog_off + prog_len >= blobs_off ||
+        strlen(prog) != prog_len || memcmp(base + prog_off, prog, prog_len) != 0) {
+        why = "rendered for another program name";
+        goto out;
+    }
+    if (width_kind && terminal_columns() != (int)rd32(h + 28)) {
+        why = "terminal width differs";
+        goto out;
+    }
+
+    size_t lo = 0, hi = n_entries;
+    while (lo < hi) {
+        size_t mid = lo + (hi - lo) / 2;
+        const unsigned char *r = base + entries_off + mid * HELP_ENTRY_SIZE;
+        uint32_t ko = rd32(r), kl = rd32(r + 4);
+        if (ko < strtab_off || (uint64_t)ko + kl >= blobs_off || base[ko + kl] != 0) {
+            why = "bad key reference";
+            goto out;
+        }
+        int c = strcmp((const char *)base + ko, want);
+        if (c < 0) { lo = mid + 1; continue; }
+        if (c > 0) { hi = mid; continue; }
+        uint32_t bo = rd32(r + 8), bl = rd32(r + 12);
+        if (bo < blobs_off || (uint64_t)bo + bl > len ||
+            adler32(base + bo, bl) != rd32(r + 16)) {
+            why = "blob checksum mismatch";
+            goto out;
+        }
+        if (out) {
+            fwrite(base + bo, 1, bl, out);
+            fflush(out);
+        }
+        rc = 0;
+        break;
+    }
+
+out:
+    if (why && getenv("CLICHEC_DEBUG"))
+        fprintf(stderr, "clichec: help store unusable (%s)\n", why);
+    munmap((void *)base, len);
+    return rc;
+}
 
-static const char *first_doc_line(const jv *fn) {
-    const jv *d = jv_obj_get(fn, "docstring");
-    if (!d || d->kind != JV_STR) return NULL;
-    return d->u.str.s; /* caller stops at \n */
+/* The stored text for `kind` on stdout, coloured like everything else
+ * clichec prints there (llm-help is never coloured). */
+static int serve_stored_help(const char *cache_path, const char *prog,
+                             const char *kind, const char *group,
+                             const char *name) {
+    return write_stored(cache_path, prog, kind,
+                        color_out && strcmp(kind, "llm") != 0, group, name,
+                        stdout);
 }
 
+/* `<group>` / `<group> --help` from the store. run.py only treats the
+ * argument as a group when its dasherized spelling is the group's name,
+ * and the store is keyed by that name, so a miss covers both "not a group"
+ * and "not stored". */
+static int serve_group_listing(const char *cache_path, const char *prog,
+                               const char *typed) {
+    char dashed[256];
+    size_t l = strlen(typed);
+    if (l >= sizeof(dashed)) return -1;
+    for (size_t i = 0; i <= l; i++) dashed[i] = (typed[i] == '_') ? '-' : typed[i];
+    return serve_stored_help(cache_path, prog, "group", dashed, "");
+}
+
+/* ============================================================
+ *                 rendering: top-level --help
+ * ============================================================ */
+
 static void render_top_help(const char *prog, CmdList *cmds, const jv *cache) {
     FILE *out = stdout;
     const char *B = blue_on(color_out), *R = reset_on(color_out);
@@ -957,7 +1622,7 @@ static void render_top_help(const char *prog, CmdList *cmds, const jv *cache) {
     fputs("COMMANDS:\n", out);
     for (size_t i = 0; i < cmds->n; i++) {
         if (cmds->items[i].group) continue;
-        const char *doc = first_doc_line(cmds->items[i].func);
+        const char *doc = cmds->items[i].doc;
         if (doc) {
             /* Pad name to 20 chars (matches Python's `f"    {name:20}"`),
              * colour only the padded-name span — docstring stays uncoloured. */
@@ -1017,8 +1682,11 @@ static void render_top_help(const char *prog, CmdList *cmds, const jv *cache) {
     fprintf(out, "  %s--uv%s          Run uv targeting this CLI's Python environment\n", B,R);
     fprintf(out, "  %s--pyspy N%s     Profile for N seconds with py-spy (speedscope format)\n", B,R);
     fprintf(out, "  %s--raw%s         Print return value as-is (no JSON, no color)\n", B,R);
+    fprintf(out, "  %s--output-format F%s Write the return value as json, json-compact, ndjson, csv, tsv, msgpack or arrow\n", B,R);
     fprintf(out, "  %s--full-traceback%s Show the full traceback including cliche wrapper frames\n", B,R);
     fprintf(out, "  %s--timing%s      Show timing information\n", B,R);
+    fprintf(out, "  %s--import-profile%s Time every import; =N for the top N, =FILE for speedscope/.folded\n", B,R);
+    fprintf(out, "  %s--batch FILE%s  Run one command line per line of FILE (- for stdin) in one process; -j N in parallel\n", B,R);
 }
 
 /* ============================================================
@@ -1027,8 +1695,8 @@ static void render_top_help(const char *prog, CmdList *cmds, const jv *cache) {
  *
  * Mirrors `<cmd> --help` from run.py closely enough to be drop-in for the
  * tab-complete + skim-help workflow. Defers (returns DEFER) when the
- * function references a pydantic model — those need per-field expansion
- * that lives on the Python side. lazy_arg defaults render as "Default:
+ * function references a pydantic model — those need per-field argument
+ * groups, which only the stored (Python-rendered) help has. lazy_arg defaults render as "Default:
  * <source-text>"; the user gets the same readable surface as Python.
  */
 
@@ -1093,8 +1761,10 @@ static const jv *enum_for_annotation(const jv *enums, const char *ann) {
 }
 
 /* True if any param annotation references a pydantic model name from the
- * cache. We can't expand pydantic fields without Python; defer when we see
- * one so the user gets the canonical Python --help, fields and all. */
+ * cache. This renderer doesn't draw argparse's per-model argument groups;
+ * defer when we see one so the user gets the canonical --help, fields and
+ * all. The help store has that text without Python for every model whose
+ * fields are cached (see pydantic_fields_for). */
 static int touches_pydantic(const jv *params, const jv *pyd_models) {
     if (!params || params->kind != JV_ARR) return 0;
     if (!pyd_models || pyd_models->kind != JV_ARR || !pyd_models->u.arr.n) return 0;
@@ -1143,7 +1813,8 @@ static int render_command_help(const jv *cache, const char *prog,
 
     /* usage line — coloured as a whole, like run.py's colorize_help. */
     fprintf(out, "%susage: %s %s [-h] [--llm-help] [--pdb] [--pyspy N] "
-                 "[--raw] [--notraceback] [--timing]", B, prog, full);
+                 "[--raw] [--output-format FORMAT] [--notraceback] [--timing] "
+                 "[--import-profile [N|FILE]]", B, prog, full);
     /* optional flags (alpha order isn't strictly required; param order is fine) */
     if (params && params->kind == JV_ARR) {
         for (size_t i = 0; i < params->u.arr.n; i++) {
@@ -1349,8 +2020,14 @@ static int render_command_help(const jv *cache, const char *prog,
     fprintf(out, "  %s--pdb%s                 Drop into debugger on error\n", B,R);
     fprintf(out, "  %s--pyspy N%s             Profile for N seconds with py-spy\n", B,R);
     fprintf(out, "  %s--raw%s                 Print return value as-is\n", B,R);
+    fprintf(out, "  %s--output-format FORMAT%s\n"
+                 "                        Write the return value as json, json-compact, ndjson,\n"
+                 "                        csv, tsv, msgpack or arrow\n", B,R);
     fprintf(out, "  %s--full-traceback%s      Show the full traceback including cliche wrapper frames\n", B,R);
     fprintf(out, "  %s--timing%s              Show timing information\n", B,R);
+    fprintf(out, "  %s--import-profile [N|FILE]%s\n"
+                 "                        Time every import: top N on stderr, or a\n"
+                 "                        speedscope/.folded FILE\n", B,R);
     return 0;
 }
 
@@ -1451,45 +2128,1021 @@ static int is_single_cmd_dispatch(CmdList *cmds, const char *prog) {
 }
 
 /* ============================================================
- *                          main
- * ============================================================ */
+ *             argument validation (fail fast)
+ * ============================================================
+ *
+ * A missing positional, an unknown flag, `--count abc` on an int or a value
+ * outside an enum used to boot Python just so argparse could print the
+ * command's help and one red line. From the cached signature we rebuild the
+ * actions build_parser_for_function would add, walk argv the way argparse's
+ * _parse_known_args does, and on the first error write what
+ * CleanArgumentParser.error writes: the command's help, a blank line and
+ * the message (red when stderr is coloured), exit 2.
+ *
+ * Only failures are served. argv that validates goes to Python untouched,
+ * and so does anything whose outcome needs Python: custom type callables,
+ * pydantic models without a cached field schema, lazy-arg and dict
+ * parameters, abbreviated or `=`-joined
+ * options, `--`, the cliche globals, non-ASCII input. The error embeds the
+ * stored argparse help, so a store miss (another width, a store still
+ * being filled in) defers too, as does a store without the "argv-check"
+ * entry — help_store.py writes that one only after checking that the
+ * interpreter's argparse still behaves the way this mirror assumes.
+ */
 
-static int read_file(const char *path, Arena *a, char **out, size_t *len) {
-    int fd = open(path, O_RDONLY);
-    if (fd < 0) return -1;
-    struct stat st;
-    if (fstat(fd, &st) != 0) { close(fd); return -1; }
-    char *buf = (char *)arena_alloc(a, (size_t)st.st_size + 1);
-    size_t got = 0;
-    while (got < (size_t)st.st_size) {
-        ssize_t r = read(fd, buf + got, (size_t)st.st_size - got);
-        if (r <= 0) { close(fd); return -1; }
-        got += (size_t)r;
-    }
-    buf[got] = 0;
-    close(fd);
-    *out = buf;
-    *len = got;
-    return 0;
+/* run.py:type_from_annotation, reduced to what argparse's `type=` does with
+ * the token: never fails (str, Path), int(), float(), _parse_date,
+ * _parse_datetime — or bool, which makes the param a flag. */
+enum { VT_STR, VT_PATH, VT_INT, VT_FLOAT, VT_DATE, VT_DATETIME, VT_BOOL };
+
+#define NARGS_STAR '*'
+#define NARGS_PLUS '+'
+
+/* One argparse action of the per-command parser. */
+typedef struct {
+    const char *opts[2];  /* option strings in add_argument order */
+    int         n_opts;   /* 0 for positionals */
+    const char *dest;     /* what positionals are called in messages */
+    int         nargs;    /* 0 (store_true/false), 1, NARGS_STAR, NARGS_PLUS */
+    int         vtype;
+    const jv   *choices;  /* enum values, NULL when unrestricted */
+    int         required; /* an option argparse insists on */
+    int         seen;     /* argparse's seen_actions */
+} VAction;
+
+/* Every option build_parser_for_function adds ahead of the parameters,
+ * plus the ones run.main acts on wherever they appear in argv. Any of
+ * these, or an abbreviation argparse could expand to one, is Python's. */
+static const char *const cliche_globals[] = {
+    "-h", "--help", "--llm-help", "--pdb", "--pyspy", "--raw", "--output-format",
+    "--full-traceback", "--timing", "--import-profile", "--version", "--cli",
+    "--pip", "--uv", NULL
+};
+
+/* run.py:_supports_color for one stream (RAW_MODE aside: --raw defers). */
+static int stream_supports_color(int fd) {
+    const char *v = getenv("NO_COLOR");
+    if (v && *v) return 0;
+    v = getenv("FORCE_COLOR");
+    if (v && *v) return 1;
+    return isatty(fd);
 }
 
-/* Identify global options that need Python (anything stateful). */
-static int needs_python_for_globals(int uargc, char **uargv) {
-    static const char *bail[] = {
-        "--pdb", "--pip", "--uv", "--pyspy", "--cli", "--version",
-        "--skip-gen", "--raw", "--notraceback", "--timing",
-        NULL
+static int is_ascii(const char *s) {
+    for (; *s; s++)
+        if ((unsigned char)*s >= 0x80) return 0;
+    return 1;
+}
+
+/* str.strip() on ASCII text. */
+static void strip_span(const char **s, size_t *l) {
+    while (*l && isspace((unsigned char)(*s)[0])) { (*s)++; (*l)--; }
+    while (*l && isspace((unsigned char)(*s)[*l - 1])) (*l)--;
+}
+
+static int span_eq(const char *s, size_t l, const char *lit) {
+    return strlen(lit) == l && memcmp(s, lit, l) == 0;
+}
+
+/* type_from_annotation's type_map; -1 for a name it doesn't have. */
+static int vtype_lookup(const char *s, size_t l) {
+    static const struct { const char *name; int vt; } map[] = {
+        { "str", VT_STR }, { "int", VT_INT }, { "float", VT_FLOAT },
+        { "bool", VT_BOOL }, { "Path", VT_PATH }, { "pathlib.Path", VT_PATH },
+        { "date", VT_DATE }, { "datetime.date", VT_DATE },
+        { "datetime", VT_DATETIME }, { "datetime.datetime", VT_DATETIME },
     };
-    for (int i = 0; i < uargc; i++) {
-        for (int k = 0; bail[k]; k++) {
-            if (strcmp(uargv[i], bail[k]) == 0) return 1;
+    for (size_t i = 0; i < sizeof(map) / sizeof(map[0]); i++)
+        if (span_eq(s, l, map[i].name)) return map[i].vt;
+    return -1;
+}
+
+static int vtype_or_str(const char *s, size_t l) {
+    int vt = vtype_lookup(s, l);
+    return vt < 0 ? VT_STR : vt;
+}
+
+/* run.py:type_from_annotation, step for step. -1 where Python would raise. */
+static int annotation_vtype(const char *ann) {
+    static const char *containers[] = {
+        "list[", "List[", "tuple[", "Tuple[", "set[", "Set[",
+        "frozenset[", "FrozenSet[", NULL
+    };
+    const char *s = ann;
+    size_t l = strlen(ann);
+    if (l >= 2 && ((s[0] == '"' && s[l - 1] == '"') ||
+                   (s[0] == '\'' && s[l - 1] == '\''))) {
+        s++;
+        l -= 2;
+    }
+    if (l >= 9 && memcmp(s, "Optional[", 9) == 0)  /* annotation[9:-1] */
+        return vtype_or_str(s + 9, l > 9 ? l - 10 : 0);
+    for (int k = 0; containers[k]; k++) {
+        size_t pl = strlen(containers[k]);
+        if (l < pl || memcmp(s, containers[k], pl) != 0) continue;
+        size_t close = l;
+        while (close > 0 && s[close - 1] != ']') close--;
+        if (!close) return -1;
+        const char *in = s + pl;
+        size_t il = close - 1 > pl ? close - 1 - pl : 0;
+        strip_span(&in, &il);
+        while (il && (in[0] == '(' || in[0] == ')')) { in++; il--; }
+        while (il && (in[il - 1] == '(' || in[il - 1] == ')')) il--;
+        strip_span(&in, &il);
+        const char *comma = memchr(in, ',', il);
+        if (comma) il = (size_t)(comma - in);
+        strip_span(&in, &il);
+        return vtype_or_str(in, il);
+    }
+    const char *end = s + l;
+    const char *bar = s;
+    while (bar + 3 <= end && memcmp(bar, " | ", 3) != 0) bar++;
+    if (bar + 3 <= end) {
+        /* PEP 604 union: the first mapped part, a later one replacing str */
+        int best = -1;
+        for (const char *part = s;; part = bar + 3) {
+            bar = part;
+            while (bar + 3 <= end && memcmp(bar, " | ", 3) != 0) bar++;
+            if (bar + 3 > end) bar = end;
+            const char *ps = part;
+            size_t pl = (size_t)(bar - part);
+            strip_span(&ps, &pl);
+            int vt = span_eq(ps, pl, "None") ? -1 : vtype_lookup(ps, pl);
+            if (vt >= 0 && (best < 0 || best == VT_STR)) best = vt;
+            if (bar == end) break;
         }
+        if (best >= 0) return best;
     }
-    return 0;
+    return vtype_or_str(s, l);
 }
 
-/* ============================================================
- *                 argcomplete (shell completion)
+/* run.py:get_enum_from_annotation: the longest enum name found at a word
+ * boundary (a trailing `.V` is allowed). */
+static const jv *enum_choices_for(const jv *enums, const char *ann) {
+    if (!ann || !*ann || !enums || enums->kind != JV_OBJ) return NULL;
+    const jv *best = NULL;
+    size_t best_len = 0, al = strlen(ann);
+    for (size_t k = 0; k < enums->u.obj.n; k++) {
+        const char *name = enums->u.obj.keys[k];
+        size_t nl = enums->u.obj.klens[k];
+        if (!nl || nl > al) continue;
+        size_t idx = 0;
+        while (idx + nl <= al && memcmp(ann + idx, name, nl) != 0) idx++;
+        if (idx + nl > al) continue;
+        if (idx > 0 && isalnum((unsigned char)ann[idx - 1])) continue;
+        char after = ann[idx + nl];
+        if (after && isalnum((unsigned char)after) && after != '.') continue;
+        if (nl > best_len) {
+            best = &enums->u.obj.vals[k];
+            best_len = nl;
+        }
+    }
+    return best;
+}
+
+static int is_identifier(const char *s, size_t l) {
+    if (!l || !(isalpha((unsigned char)s[0]) || s[0] == '_')) return 0;
+    for (size_t i = 1; i < l; i++)
+        if (!(isalnum((unsigned char)s[i]) || s[i] == '_')) return 0;
+    return 1;
+}
+
+/* Could run.py:_resolve_callable_type hand argparse a user callable for
+ * this (str-typed) annotation? Enum classes it leaves alone. */
+static int maybe_custom_type(const char *ann, const jv *enums) {
+    static const char *builtin[] = {
+        "str", "int", "float", "bool", "Path", "date", "datetime", "Optional",
+        "list", "tuple", "dict", "List", "Tuple", "Dict", NULL
+    };
+    const char *s = ann;
+    size_t l = strlen(ann);
+    strip_span(&s, &l);
+    if (!is_identifier(s, l)) return 0;
+    for (int k = 0; builtin[k]; k++)
+        if (span_eq(s, l, builtin[k])) return 0;
+    if (enums && enums->kind == JV_OBJ)
+        for (size_t k = 0; k < enums->u.obj.n; k++)
+            if (enums->u.obj.klens[k] == l &&
+                memcmp(enums->u.obj.keys[k], s, l) == 0) return 0;
+    return 1;
+}
+
+/* run.py:is_multi_value_type. */
+static int is_multi_value(const char *ann) {
+    static const char *heads[] = { "tuple[", "list[", "set[", "frozenset[", NULL };
+    if (!ann) return 0;
+    for (int k = 0; heads[k]; k++) {
+        size_t i = 0;
+        while (heads[k][i] && tolower((unsigned char)ann[i]) == heads[k][i]) i++;
+        if (!heads[k][i]) return 1;
+    }
+    return 0;
+}
+
+static int is_num_space(char c) {
+    return c == ' ' || (c >= '\t' && c <= '\r');
+}
+
+/* Digits with single underscores between them, as int() and float() take
+ * them. Advances *p; returns the digit count, 0 when there are none. */
+static size_t scan_digits(const char **p) {
+    const char *s = *p;
+    size_t n = 0;
+    while (isdigit((unsigned char)*s)) {
+        s++;
+        n++;
+        if (*s == '_' && isdigit((unsigned char)s[1])) s++;
+    }
+    *p = s;
+    return n;
+}
+
+/* int(s): 1 valid, 0 ValueError, -1 near the int-max-str-digits limit
+ * (configurable, so Python decides). */
+static int check_int(const char *s) {
+    while (is_num_space(*s)) s++;
+    if (*s == '+' || *s == '-') s++;
+    size_t n = scan_digits(&s);
+    while (is_num_space(*s)) s++;
+    if (!n || *s) return 0;
+    return n > 4000 ? -1 : 1;
+}
+
+/* float(s): 1 valid, 0 ValueError. */
+static int check_float(const char *s) {
+    static const char *special[] = { "inf", "infinity", "nan", NULL };
+    while (is_num_space(*s)) s++;
+    if (*s == '+' || *s == '-') s++;
+    const char *end = s + strlen(s);
+    while (end > s && is_num_space(end[-1])) end--;
+    for (int k = 0; special[k]; k++) {
+        size_t kl = strlen(special[k]);
+        if ((size_t)(end - s) != kl) continue;
+        size_t i = 0;
+        while (i < kl && tolower((unsigned char)s[i]) == special[k][i]) i++;
+        if (i == kl) return 1;
+    }
+    size_t n = scan_digits(&s);
+    if (*s == '.') {
+        s++;
+        n += scan_digits(&s);
+    }
+    if (!n) return 0;
+    if (*s == 'e' || *s == 'E') {
+        s++;
+        if (*s == '+' || *s == '-') s++;
+        if (!scan_digits(&s)) return 0;
+    }
+    return s == end;
+}
+
+/* run.py:_parse_date — strptime(s, "%Y-%m-%d") with _strptime's regexes
+ * for %Y, %m and %d, then date()'s range check. */
+static int check_date(const char *s) {
+    static const int mdays[] = { 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31 };
+    for (int i = 0; i < 4; i++)
+        if (!isdigit((unsigned char)s[i])) return 0;
+    int year = atoi(s), month, day;
+    const char *p = s + 4;
+    if (*p++ != '-') return 0;
+    if (((p[0] == '1' && p[1] >= '0' && p[1] <= '2') ||
+         (p[0] == '0' && p[1] >= '1' && p[1] <= '9')) && p[2] == '-') {
+        month = (p[0] - '0') * 10 + (p[1] - '0');
+        p += 3;
+    } else if (p[0] >= '1' && p[0] <= '9' && p[1] == '-') {
+        month = p[0] - '0';
+        p += 2;
+    } else {
+        return 0;
+    }
+    /* `3[01]|[12]\d|0[1-9]|[1-9]| [1-9]`, first alternative that matches */
+    if (p[0] == '3' && (p[1] == '0' || p[1] == '1')) {
+        day = 30 + (p[1] - '0');
+        p += 2;
+    } else if ((p[0] == '1' || p[0] == '2') && isdigit((unsigned char)p[1])) {
+        day = (p[0] - '0') * 10 + (p[1] - '0');
+        p += 2;
+    } else if (p[0] == '0' && p[1] >= '1' && p[1] <= '9') {
+        day = p[1] - '0';
+        p += 2;
+    } else if (p[0] >= '1' && p[0] <= '9') {
+        day = p[0] - '0';
+        p += 1;
+    } else if (p[0] == ' ' && p[1] >= '1' && p[1] <= '9') {
+        day = p[1] - '0';
+        p += 2;
+    } else {
+        return 0;
+    }
+    if (*p) return 0;  /* "unconverted data remains" */
+    int leap = (year % 4 == 0 && year % 100 != 0) || year % 400 == 0;
+    int last = mdays[month - 1] + (month == 2 && leap);
+    return year >= 1 && day <= last;
+}
+
+/* run.py:_parse_datetime is fromisoformat, whose grammar moves between
+ * Python versions. Everything it has ever accepted starts with a
+ * four-digit year; anything else may be fine, so Python decides. */
+static int check_datetime(const char *s) {
+    for (int i = 0; i < 4; i++)
+        if (!isdigit((unsigned char)s[i])) return 0;
+    return -1;
+}
+
+/* Growable message buffer; `oom` makes every later call a no-op. */
+typedef struct {
+    char  *s;
+    size_t n, cap;
+    int    oom;
+} SBuf;
+
+static void sb_add(SBuf *b, const char *s, size_t l) {
+    if (b->oom) return;
+    if (b->n + l + 1 > b->cap) {
+        size_t cap = b->cap ? b->cap : 256;
+        while (cap < b->n + l + 1) cap *= 2;
+        char *grown = (char *)realloc(b->s, cap);
+        if (!grown) { b->oom = 1; return; }
+        b->s = grown;
+        b->cap = cap;
+    }
+    memcpy(b->s + b->n, s, l);
+    b->n += l;
+    b->s[b->n] = 0;
+}
+
+static void sb_str(SBuf *b, const char *s) { sb_add(b, s, strlen(s)); }
+
+/* repr() of an ASCII str. -1 for anything else: repr keeps printable
+ * non-ASCII characters and escapes the rest, which isn't worth mirroring. */
+static int sb_repr(SBuf *b, const char *s) {
+    if (!is_ascii(s)) return -1;
+    char q = (strchr(s, '\'') && !strchr(s, '"')) ? '"' : '\'';
+    sb_add(b, &q, 1);
+    for (const char *p = s; *p; p++) {
+        char esc[5];
+        if (*p == '\\' || *p == q) {
+            esc[0] = '\\';
+            esc[1] = *p;
+            sb_add(b, esc, 2);
+        } else if (*p == '\t') {
+            sb_str(b, "\\t");
+        } else if (*p == '\n') {
+            sb_str(b, "\\n");
+        } else if (*p == '\r') {
+            sb_str(b, "\\r");
+        } else if ((unsigned char)*p < 0x20 || *p == 0x7f) {
+            snprintf(esc, sizeof(esc), "\\x%02x", (unsigned char)*p);
+            sb_str(b, esc);
+        } else {
+            sb_add(b, p, 1);
+        }
+    }
+    sb_add(b, &q, 1);
+    return 0;
+}
+
+/* argparse's _get_action_name. */
+static void sb_action_name(SBuf *b, const VAction *act) {
+    if (!act->n_opts) sb_str(b, act->dest);
+    for (int i = 0; i < act->n_opts; i++) {
+        if (i) sb_str(b, "/");
+        sb_str(b, act->opts[i]);
+    }
+}
+
+/* argparse's "argument NAME: " prefix. */
+static void sb_argument(SBuf *b, const VAction *act) {
+    sb_str(b, "argument ");
+    sb_action_name(b, act);
+    sb_str(b, ": ");
+}
+
+/* True for a bool default build_parser_for_function reads as truthy
+ * (→ `--no-x`); -1 for a tuple/list literal. */
+static int bool_default_truthy(const char *d) {
+    size_t l = strlen(d);
+    if (strcmp(d, "None") == 0 || strcmp(d, "False") == 0 || strcmp(d, "false") == 0)
+        return 0;
+    if (strcmp(d, "True") == 0 || strcmp(d, "true") == 0) return 1;
+    if (d[0] == '(' || d[0] == '[') return -1;
+    if (l >= 1 && ((d[0] == '"' && d[l - 1] == '"') || (d[0] == '\'' && d[l - 1] == '\'')))
+        return l > 2;
+    return l > 0;
+}
+
+/* Can argparse convert this default without Python-only knowledge? It
+ * runs `type=` over string defaults of options that weren't given, so an
+ * int param defaulting to a module constant is only known at run time. */
+static int default_is_plain(const char *d, int vtype, int multi) {
+    if (d[0] == '(' || d[0] == '[')
+        return multi && (vtype == VT_STR || vtype == VT_PATH);
+    if (vtype == VT_STR || vtype == VT_PATH) return 1;
+    /* parse_default turns these into None / True / False, not strings */
+    if (strcmp(d, "None") == 0 || strcmp(d, "True") == 0 || strcmp(d, "true") == 0 ||
+        strcmp(d, "False") == 0 || strcmp(d, "false") == 0) return 1;
+    if (vtype == VT_INT) return check_int(d) == 1;
+    if (vtype == VT_FLOAT) return check_float(d) == 1;
+    return 0;
+}
+
+/* The cached field list of the pydantic model annotation `ann` names, read
+ * the way run.py:_annotation_pydantic_name reads it, for the shapes that
+ * can be followed exactly: `M`, `pkg.M`, `Optional[M]`, `M | None`. NULL
+ * with *defer clear when no model name occurs in `ann`; NULL with *defer
+ * set when one does but the annotation has another shape or the model has
+ * no entry in "pydantic_schemas" (main.extract_pydantic_schemas left it
+ * to Python). */
+static const jv *pydantic_fields_for(const char *ann, const jv *pyd_models,
+                                     const jv *schemas, int *defer) {
+    *defer = 0;
+    if (!ann || !pyd_models || pyd_models->kind != JV_ARR) return NULL;
+    int named = 0;
+    for (size_t k = 0; k < pyd_models->u.arr.n && !named; k++) {
+        const jv *m = &pyd_models->u.arr.items[k];
+        named = m->kind == JV_STR && strstr(ann, m->u.str.s) != NULL;
+    }
+    if (!named) return NULL;
+    *defer = 1;
+    const char *s = ann;
+    size_t l = strlen(ann);
+    strip_span(&s, &l);
+    if (l > 10 && memcmp(s, "Optional[", 9) == 0 && s[l - 1] == ']') {
+        s += 9;
+        l -= 10;
+        strip_span(&s, &l);
+    }
+    /* `|`-separated parts, all but one of them `None` */
+    const char *cls = NULL, *end = s + l;
+    size_t cl = 0;
+    for (const char *part = s;; ) {
+        const char *bar = memchr(part, '|', (size_t)(end - part));
+        if (!bar) bar = end;
+        const char *ps = part;
+        size_t pl = (size_t)(bar - part);
+        strip_span(&ps, &pl);
+        if (!span_eq(ps, pl, "None")) {
+            if (cls) return NULL;
+            cls = ps;
+            cl = pl;
+        }
+        if (bar == end) break;
+        part = bar + 1;
+    }
+    if (!cls) return NULL;
+    const char *tail = cls;
+    for (size_t i = 0; i < cl; i++) {
+        if (cls[i] == '.') tail = cls + i + 1;
+        else if (!isalnum((unsigned char)cls[i]) && cls[i] != '_') return NULL;
+    }
+    size_t tl = cl - (size_t)(tail - cls);
+    if (!is_identifier(tail, tl) || !schemas || schemas->kind != JV_OBJ) return NULL;
+    for (size_t k = 0; k < schemas->u.obj.n; k++) {
+        if (schemas->u.obj.klens[k] == tl && memcmp(schemas->u.obj.keys[k], tail, tl) == 0 &&
+            schemas->u.obj.vals[k].kind == JV_ARR) {
+            *defer = 0;
+            return &schemas->u.obj.vals[k];
+        }
+    }
+    return NULL;
+}
+
+/* The `--field` actions build_parser_for_function adds for a pydantic
+ * parameter, from its cached field list. -1 when Python has to decide. */
+static int pydantic_actions(const jv *fields, VAction *acts, int *n, int max,
+                            Arena *a) {
+    for (size_t i = 0; i < fields->u.arr.n; i++) {
+        const jv *f = &fields->u.arr.items[i];
+        if (f->kind != JV_OBJ) return -1;
+        const jv *fn = jv_obj_get(f, "name");
+        const jv *fa = jv_obj_get(f, "annotation");
+        const jv *fr = jv_obj_get(f, "required");
+        const jv *fd = jv_obj_get(f, "default");
+        if (!fn || fn->kind != JV_STR || !fn->u.str.l || !is_ascii(fn->u.str.s) ||
+            !fa || fa->kind != JV_STR) return -1;
+        int vt = vtype_lookup(fa->u.str.s, fa->u.str.l);
+        if (vt != VT_STR && vt != VT_INT && vt != VT_FLOAT && vt != VT_BOOL) return -1;
+        /* argparse runs `type=` over the string default of an option that
+         * wasn't given */
+        if (fd && fd->kind == JV_STR &&
+            ((vt == VT_INT && check_int(fd->u.str.s) != 1) ||
+             (vt == VT_FLOAT && check_float(fd->u.str.s) != 1))) return -1;
+        if (*n == max) return -1;
+        VAction *act = &acts[(*n)++];
+        memset(act, 0, sizeof(*act));
+        act->vtype = vt;
+        act->dest = fn->u.str.s;
+        const char *dashed = dasherize(a, fn->u.str.s, fn->u.str.l);
+        char *lng = (char *)arena_alloc(a, strlen(dashed) + 6);
+        if (vt == VT_BOOL) {
+            int truthy = fd && fd->kind == JV_BOOL && fd->u.b;
+            sprintf(lng, truthy ? "--no-%s" : "--%s", dashed);
+            act->nargs = 0;
+        } else {
+            sprintf(lng, "--%s", dashed);
+            act->nargs = 1;
+            act->required = fr && fr->kind == JV_BOOL && fr->u.b;
+        }
+        act->opts[act->n_opts++] = lng;
+    }
+    return 0;
+}
+
+/* The actions build_parser_for_function adds for `params`, in order.
+ * Returns the count, or -1 when the parser depends on something only
+ * Python knows. */
+static int build_actions(const jv *params, const jv *enums, const jv *pyd_models,
+                         const jv *schemas, VAction *acts, int max, Arena *a) {
+    if (!params || params->kind != JV_ARR) return 0;
+    char **shorts = NULL;
+    compute_short_flags(params, &shorts, a);
+    int n = 0;
+    for (size_t i = 0; i < params->u.arr.n; i++) {
+        const jv *p = &params->u.arr.items[i];
+        if (p->kind != JV_OBJ) return -1;
+        const jv *pn = jv_obj_get(p, "name");
+        if (!pn || pn->kind != JV_STR || !pn->u.str.l || !is_ascii(pn->u.str.s)) return -1;
+        const char *name = pn->u.str.s;
+        const jv *isa = jv_obj_get(p, "is_args");
+        const jv *isk = jv_obj_get(p, "is_kwargs");
+        if (strcmp(name, "self") == 0 || strcmp(name, "cls") == 0 ||
+            (isa && isa->kind == JV_BOOL && isa->u.b) ||
+            (isk && isk->kind == JV_BOOL && isk->u.b)) continue;
+        if (jv_obj_get(p, "lazy_arg")) return -1;
+
+        const jv *an = jv_obj_get(p, "type_annotation");
+        const char *ann = (an && an->kind == JV_STR) ? an->u.str.s : NULL;
+        const jv *dv = jv_obj_get(p, "default");
+        if (dv && dv->kind != JV_STR && dv->kind != JV_NULL) return -1;
+        const char *def = (dv && dv->kind == JV_STR) ? dv->u.str.s : NULL;
+        if (ann && (!is_ascii(ann) || strstr(ann, "dict[") || strstr(ann, "Dict[")))
+            return -1;
+        int defer;
+        const jv *fields = pydantic_fields_for(ann, pyd_models, schemas, &defer);
+        if (defer) return -1;
+        if (fields) {
+            if (pydantic_actions(fields, acts, &n, max, a)) return -1;
+            continue;
+        }
+
+        int vt;
+        if (ann && *ann) vt = annotation_vtype(ann);
+        else vt = (def && (str_ieq(def, "true") || str_ieq(def, "false"))) ? VT_BOOL : VT_STR;
+        if (vt < 0 || (vt == VT_STR && ann && maybe_custom_type(ann, enums))) return -1;
+        const jv *choices = enum_choices_for(enums, ann);
+        if (choices) {
+            if (choices->kind != JV_ARR) return -1;
+            for (size_t k = 0; k < choices->u.arr.n; k++)
+                if (choices->u.arr.items[k].kind != JV_STR) return -1;
+            if (!choices->u.arr.n) choices = NULL;
+        }
+
+        if (n == max) return -1;
+        VAction *act = &acts[n++];
+        memset(act, 0, sizeof(*act));
+        act->vtype = vt;
+        act->dest = name;
+        const char *dashed = dasherize(a, name, strlen(name));
+        char *lng = (char *)arena_alloc(a, strlen(dashed) + 6);
+        const char *sh = shorts ? shorts[i] : NULL;
+        if (vt == VT_BOOL) {
+            int truthy = def ? bool_default_truthy(def) : 0;
+            if (truthy < 0) return -1;
+            sprintf(lng, truthy ? "--no-%s" : "--%s", dashed);
+            if (!truthy && sh) act->opts[act->n_opts++] = sh;
+            act->opts[act->n_opts++] = lng;
+            act->nargs = 0;
+            continue;
+        }
+        if (choices && vt != VT_STR) return -1;
+        act->choices = choices;
+        int multi = is_multi_value(ann);
+        if (def) {
+            if (!default_is_plain(def, vt, multi)) return -1;
+            sprintf(lng, "--%s", dashed);
+            if (sh) act->opts[act->n_opts++] = sh;
+            act->opts[act->n_opts++] = lng;
+            act->nargs = multi ? NARGS_STAR : 1;
+        } else {
+            act->nargs = multi ? NARGS_PLUS : 1;
+        }
+    }
+
+    /* argparse refuses duplicate option strings at build time. */
+    for (int i = 0; i < n; i++)
+        for (int j = 0; j < acts[i].n_opts; j++) {
+            const char *o = acts[i].opts[j];
+            for (int k = 0; cliche_globals[k]; k++)
+                if (strcmp(o, cliche_globals[k]) == 0) return -1;
+            for (int i2 = i; i2 < n; i2++)
+                for (int j2 = (i2 == i ? j + 1 : 0); j2 < acts[i2].n_opts; j2++)
+                    if (strcmp(o, acts[i2].opts[j2]) == 0) return -1;
+        }
+    return n;
+}
+
+/* Would argparse's _get_option_tuples match option `o` for the option-like
+ * token `t`? Long tokens match by prefix up to any `=`; short ones by their
+ * first two characters (`-xVALUE`). */
+static int option_matches(const char *o, const char *t) {
+    if (t[1] == '-') return strncmp(o, t, strcspn(t, "=")) == 0;
+    return strncmp(o, t, 2) == 0 && !o[2];
+}
+
+/* argparse's _negative_number_matcher, `^-\d+$|^-\d*\.\d+$` (re's `$`
+ * also matches before a final newline). */
+static int looks_negative(const char *s) {
+    const char *p = s + 1;
+    size_t n = 0;
+    while (isdigit((unsigned char)*p)) { p++; n++; }
+    if (*p == '.') {
+        p++;
+        size_t f = 0;
+        while (isdigit((unsigned char)*p)) { p++; f++; }
+        if (!f) return 0;
+    } else if (!n) {
+        return 0;
+    }
+    return *p == 0 || (p[0] == '\n' && p[1] == 0);
+}
+
+typedef struct {
+    VAction  *acts;
+    int       n_acts;
+    VAction **pos;       /* positionals, in order */
+    int       n_pos, next_pos;
+    char    **tok;
+    char     *kind;      /* 'A' argument, 'O' option */
+    VAction **opt;       /* per 'O' token; NULL when unknown */
+    int       n;
+    int      *extras;    /* token indices argparse couldn't place */
+    int       n_extras;
+    SBuf     *msg;
+} VState;
+
+/* argparse's take_action/_get_values: convert every string, then check
+ * every value against the choices. 0 ok, 1 error in msg, DEFER. */
+static int take_action(VState *st, VAction *act, char **vals, int nv) {
+    static const char *type_names[] = {
+        "str", "Path", "int", "float", "_parse_date", "_parse_datetime", "bool"
+    };
+    act->seen = 1;
+    for (int i = 0; i < nv; i++) {
+        int ok = 1;
+        switch (act->vtype) {
+        case VT_INT:      ok = check_int(vals[i]); break;
+        case VT_FLOAT:    ok = check_float(vals[i]); break;
+        case VT_DATE:     ok = check_date(vals[i]); break;
+        case VT_DATETIME: ok = check_datetime(vals[i]); break;
+        default: break;
+        }
+        if (ok < 0) return DEFER;
+        if (!ok) {
+            sb_argument(st->msg, act);
+            sb_str(st->msg, "invalid ");
+            sb_str(st->msg, type_names[act->vtype]);
+            sb_str(st->msg, " value: ");
+            return sb_repr(st->msg, vals[i]) ? DEFER : 1;
+        }
+    }
+    if (!act->choices) return 0;
+    for (int i = 0; i < nv; i++) {
+        const jv *c = act->choices;
+        size_t k = 0;
+        while (k < c->u.arr.n && strcmp(c->u.arr.items[k].u.str.s, vals[i]) != 0) k++;
+        if (k < c->u.arr.n) continue;
+        sb_argument(st->msg, act);
+        sb_str(st->msg, "invalid choice: ");
+        if (sb_repr(st->msg, vals[i])) return DEFER;
+        sb_str(st->msg, " (choose from ");
+        for (k = 0; k < c->u.arr.n; k++) {
+            if (k) sb_str(st->msg, ", ");
+            if (sb_repr(st->msg, c->u.arr.items[k].u.str.s)) return DEFER;
+        }
+        sb_str(st->msg, ")");
+        return 1;
+    }
+    return 0;
+}
+
+/* argparse's consume_positionals: as many of the remaining positionals as
+ * the run of arguments at `start` can fill, the first nargs='+' one taking
+ * whatever is left over. */
+static int consume_positionals(VState *st, int start, int *stop) {
+    int avail = 0;
+    while (start + avail < st->n && st->kind[start + avail] == 'A') avail++;
+    int take = st->n_pos - st->next_pos;
+    if (take > avail) take = avail;
+    *stop = start;
+    if (take <= 0) return 0;
+    int extra = avail - take, at = start;
+    for (int j = 0; j < take; j++) {
+        VAction *act = st->pos[st->next_pos + j];
+        int cnt = 1;
+        if (act->nargs == NARGS_PLUS && extra) {
+            cnt += extra;
+            extra = 0;
+        }
+        int rc = take_action(st, act, st->tok + at, cnt);
+        if (rc) return rc;
+        at += cnt;
+    }
+    st->next_pos += take;
+    *stop = at;
+    return 0;
+}
+
+/* argparse's consume_optional for an option without an `=value`. */
+static int consume_optional(VState *st, int start, int *stop) {
+    VAction *act = st->opt[start];
+    *stop = start + 1;
+    if (!act) {
+        st->extras[st->n_extras++] = start;
+        return 0;
+    }
+    int cnt = 0;
+    if (act->nargs == 1) {
+        if (start + 1 >= st->n || st->kind[start + 1] != 'A') {
+            sb_argument(st->msg, act);
+            sb_str(st->msg, "expected one argument");
+            return 1;
+        }
+        cnt = 1;
+    } else if (act->nargs == NARGS_STAR) {
+        while (start + 1 + cnt < st->n && st->kind[start + 1 + cnt] == 'A') cnt++;
+    }
+    *stop = start + 1 + cnt;
+    return take_action(st, act, st->tok + start + 1, cnt);
+}
+
+/* Classify each token like argparse's _parse_optional. DEFER for anything
+ * that isn't a plain argument, an exact option of ours, or an unknown
+ * option argparse can't confuse with one. */
+static int classify_tokens(VState *st) {
+    for (int i = 0; i < st->n; i++) {
+        const char *t = st->tok[i];
+        st->opt[i] = NULL;
+        st->kind[i] = 'A';
+        if (strcmp(t, "--") == 0) return DEFER;
+        if (t[0] != '-') continue;
+        for (int k = 0; cliche_globals[k]; k++)
+            if (strcmp(t, cliche_globals[k]) == 0) return DEFER;
+        VAction *hit = NULL;
+        for (int k = 0; k < st->n_acts && !hit; k++)
+            for (int j = 0; j < st->acts[k].n_opts; j++)
+                if (strcmp(t, st->acts[k].opts[j]) == 0) hit = &st->acts[k];
+        if (hit) {
+            st->kind[i] = 'O';
+            st->opt[i] = hit;
+            continue;
+        }
+        if (!t[1]) continue;
+        /* `--opt=value`, `--abbrev`, `-xVALUE`: argparse would match one of
+         * our options after all. */
+        for (int k = 0; cliche_globals[k]; k++)
+            if (option_matches(cliche_globals[k], t)) return DEFER;
+        for (int k = 0; k < st->n_acts; k++)
+            for (int j = 0; j < st->acts[k].n_opts; j++)
+                if (option_matches(st->acts[k].opts[j], t)) return DEFER;
+        if (looks_negative(t) || strchr(t, ' ')) continue;
+        st->kind[i] = 'O';
+    }
+    return 0;
+}
+
+/* argparse's _parse_known_args loop, then the required and unrecognized
+ * checks of parse_args. 0 when argv parses, 1 with the error in st->msg,
+ * DEFER. */
+static int simulate_parse(VState *st) {
+    int rc = classify_tokens(st);
+    if (rc) return rc;
+    int max_opt = -1;
+    for (int i = 0; i < st->n; i++)
+        if (st->kind[i] == 'O') max_opt = i;
+    int start = 0, stop;
+    while (start <= max_opt) {
+        int next_opt = start;
+        while (st->kind[next_opt] != 'O') next_opt++;
+        if (start != next_opt) {
+            if ((rc = consume_positionals(st, start, &stop))) return rc;
+            if (stop > start) {
+                start = stop;
+                continue;
+            }
+        }
+        for (; start < next_opt; start++) st->extras[st->n_extras++] = start;
+        if ((rc = consume_optional(st, start, &start))) return rc;
+    }
+    if ((rc = consume_positionals(st, start, &stop))) return rc;
+    for (; stop < st->n; stop++) st->extras[st->n_extras++] = stop;
+
+    /* Positionals and required options not taken, in the order the
+     * parser added them. */
+    int missing = 0;
+    for (int i = 0; i < st->n_acts; i++) {
+        const VAction *act = &st->acts[i];
+        if (act->seen || (act->n_opts && !act->required)) continue;
+        sb_str(st->msg, missing++ ? ", " : "the following arguments are required: ");
+        sb_action_name(st->msg, act);
+    }
+    if (missing) return 1;
+    if (st->n_extras) {
+        sb_str(st->msg, "unrecognized arguments: ");
+        for (int j = 0; j < st->n_extras; j++) {
+            if (j) sb_str(st->msg, " ");
+            sb_str(st->msg, st->tok[st->extras[j]]);
+        }
+        return 1;
+    }
+    return 0;
+}
+
+/* Validate the arguments of command `e` (everything after its name) and
+ * write argparse's error when they don't parse. Returns 2 after an error,
+ * DEFER otherwise. */
+static int validate_command_args(const char *cache_path, const char *prog,
+                                 const jv *cache, CmdEntry *e, int nargs,
+                                 char **args, Arena *a) {
+    int color = stream_supports_color(STDERR_FILENO);
+    if (color != stream_supports_color(STDOUT_FILENO)) {
+        /* colorize_help then mixes stderr's and stdout's colour state;
+         * the store only has all-or-nothing variants. */
+        return DEFER;
+    }
+    const jv *fn = cmd_func(e, a);
+    if (!fn) return DEFER;
+    const jv *params = jv_obj_get(fn, "parameters");
+
+    VAction acts[128];
+    int n_acts = build_actions(params, jv_obj_get(cache, "enums"),
+                               jv_obj_get(cache, "pydantic_models"),
+                               jv_obj_get(cache, "pydantic_schemas"), acts,
+                               (int)(sizeof(acts) / sizeof(acts[0])), a);
+    if (n_acts < 0) return DEFER;
+
+    VState st = { .acts = acts, .n_acts = n_acts, .n = nargs };
+    st.pos = (VAction **)arena_alloc(a, sizeof(VAction *) * (size_t)(n_acts + 1));
+    for (int i = 0; i < n_acts; i++)
+        if (!acts[i].n_opts) st.pos[st.n_pos++] = &acts[i];
+    st.tok = (char **)arena_alloc(a, sizeof(char *) * (size_t)(nargs + 1));
+    st.kind = (char *)arena_alloc(a, (size_t)nargs + 1);
+    st.opt = (VAction **)arena_alloc(a, sizeof(VAction *) * (size_t)(nargs + 1));
+    st.extras = (int *)arena_alloc(a, sizeof(int) * (size_t)(nargs + 1));
+    for (int i = 0; i < nargs; i++) {
+        if (!is_ascii(args[i])) return DEFER;
+        /* run.main's `--x_y` → `--x-y`, flag part only */
+        st.tok[i] = args[i];
+        if (strncmp(args[i], "--", 2) == 0 && strchr(args[i], '_')) {
+            size_t l = strlen(args[i]), fl = strcspn(args[i], "=");
+            char *t = (char *)arena_alloc(a, l + 1);
+            memcpy(t, args[i], l + 1);
+            for (size_t k = 0; k < fl; k++)
+                if (t[k] == '_') t[k] = '-';
+            st.tok[i] = t;
+        }
+    }
+
+    SBuf msg = {0};
+    st.msg = &msg;
+    int rc = simulate_parse(&st);
+    if (rc == 1 && !msg.oom &&
+        write_stored(cache_path, prog, "meta", 0, NULL, "argv-check", NULL) == 0 &&
+        write_stored(cache_path, prog, "help", color, e->group, e->name, stderr) == 0) {
+        fprintf(stderr, "\n%s%s%s\n", red_on(color), msg.s, reset_on(color));
+        rc = 2;
+    } else {
+        rc = DEFER;
+    }
+    free(msg.s);
+    return rc;
+}
+
+/* `<cmd> args...` / `<group> <cmd> args...` the way run.main resolves
+ * them: a top-level command first, then a group spelled exactly as its
+ * dasherized name. */
+static int check_command_argv(const char *cache_path, const char *prog,
+                              CmdList *cmds, const jv *cache, int uargc,
+                              char **uargv, Arena *a) {
+    CmdEntry *e = find_cmd(cmds, NULL, uargv[0]);
+    if (e) return validate_command_args(cache_path, prog, cache, e,
+                                        uargc - 1, uargv + 1, a);
+    if (uargc < 2 || strcmp(uargv[1], "-h") == 0 || strcmp(uargv[1], "--help") == 0)
+        return DEFER;
+    const char *group = dasherize(a, uargv[0], strlen(uargv[0]));
+    e = find_cmd(cmds, group, uargv[1]);
+    if (!e || !e->group || strcmp(e->group, group) != 0) return DEFER;
+    return validate_command_args(cache_path, prog, cache, e, uargc - 2,
+                                 uargv + 2, a);
+}
+
+/* ============================================================
+ *                          main
+ * ============================================================ */
+
+static int read_file(const char *path, Arena *a, char **out, size_t *len) {
+    int fd = open(path, O_RDONLY);
+    if (fd < 0) return -1;
+    struct stat st;
+    if (fstat(fd, &st) != 0) { close(fd); return -1; }
+    char *buf = (char *)arena_alloc(a, (size_t)st.st_size + 1);
+    size_t got = 0;
+    while (got < (size_t)st.st_size) {
+        ssize_t r = read(fd, buf + got, (size_t)st.st_size - got);
+        if (r <= 0) { close(fd); return -1; }
+        got += (size_t)r;
+    }
+    buf[got] = 0;
+    close(fd);
+    *out = buf;
+    *len = got;
+    return 0;
+}
+
+/* Identify global options that need Python (anything stateful). */
+static int needs_python_for_globals(int uargc, char **uargv) {
+    static const char *bail[] = {
+        "--pdb", "--pip", "--uv", "--pyspy", "--cli", "--version",
+        "--skip-gen", "--raw", "--output-format", "--notraceback", "--timing",
+        "--batch", "--import-profile",
+        NULL
+    };
+    for (int i = 0; i < uargc; i++) {
+        for (int k = 0; bail[k]; k++) {
+            if (strcmp(uargv[i], bail[k]) == 0) return 1;
+        }
+    }
+    /* run.main's batch mode, spelled `--batch=FILE` ahead of any command. */
+    if (uargc > 0 && strncmp(uargv[0], "--batch=", 8) == 0) return 1;
+    for (int i = 0; i < uargc; i++)
+        if (strncmp(uargv[i], "--import-profile=", 17) == 0) return 1;
+    return 0;
+}
+
+/* Read and parse the JSON cache, gate on schema version and freshness, and
+ * build the sorted command list. Returns 0 on success, DEFER otherwise; the
+ * caller owns `a` either way. */
+static int load_json_cache(const char *cache_path, Arena *a, jv *root,
+                           CmdList *cmds) {
+    char *src = NULL;
+    size_t slen = 0;
+    /* Stat before reading: a JSON replaced in between is newer than the
+     * one the token names, never older. */
+    struct stat st;
+    int watched = stat(cache_path, &st) == 0 &&
+        watch_vouches(cache_path, (uint64_t)st.st_size,
+                      (uint64_t)st.st_mtime * 1000000000u + (uint64_t)ST_MTIM_NSEC(st));
+    if (read_file(cache_path, a, &src, &slen) != 0) return DEFER;
+    JP p = { .src = src, .i = 0, .len = slen, .a = a, .err = 0 };
+    if (parse_value(&p, root) || p.err) return DEFER;
+    if (root->kind != JV_OBJ) return DEFER;
+
+    /* schema gate */
+    const jv *ver = jv_obj_get(root, "version");
+    if (!ver || ver->kind != JV_STR ||
+        strcmp(ver->u.str.s, EXPECTED_CACHE_VERSION) != 0)
+        return DEFER;
+
+    /* freshness — figure out pkg_dir from any cached function file_path
+     * by stripping the relative module path. We use the first file's
+     * file_path as the source-of-truth and strip its rel_path. */
+    const char *pkg_dir = NULL;
+    char pkg_dir_buf[4096];
+    const jv *files = jv_obj_get(root, "files");
+    if (files && files->kind == JV_OBJ) {
+        for (size_t i = 0; i < files->u.obj.n && !pkg_dir; i++) {
+            const char *rel = files->u.obj.keys[i];
+            size_t      rl  = files->u.obj.klens[i];
+            const jv *finfo = &files->u.obj.vals[i];
+            const jv *fns = jv_obj_get(finfo, "functions");
+            if (!fns || fns->kind != JV_ARR || !fns->u.arr.n) continue;
+            const jv *fp = jv_obj_get(&fns->u.arr.items[0], "file_path");
+            if (!fp || fp->kind != JV_STR) continue;
+            if (fp->u.str.l <= rl + 1) continue;
+            size_t base = fp->u.str.l - rl;
+            /* file_path ends with rel_path; strip "/<rel>" */
+            if (memcmp(fp->u.str.s + base, rel, rl) != 0) continue;
+            if (base && fp->u.str.s[base - 1] == '/') base--;
+            if (base >= sizeof(pkg_dir_buf)) continue;
+            memcpy(pkg_dir_buf, fp->u.str.s, base);
+            pkg_dir_buf[base] = 0;
+            pkg_dir = pkg_dir_buf;
+        }
+    }
+
+    if (getenv("CLICHEC_DEBUG"))
+        fprintf(stderr, "clichec: pkg_dir=%s\n", pkg_dir ? pkg_dir : "(null)");
+    if (!watched && !cache_is_fresh(root, pkg_dir)) {
+        if (getenv("CLICHEC_DEBUG"))
+            fprintf(stderr, "clichec: stale cache (deferring)\n");
+        return DEFER;
+    }
+
+    build_index(root, cmds, a);
+    return 0;
+}
+
+/* ============================================================
+ *                 argcomplete (shell completion)
  * ============================================================
  *
  * argcomplete protocol (per argcomplete/finders.py):
@@ -1499,6 +3152,17 @@ static int needs_python_for_globals(int uargc, char **uargv) {
  *   - output goes to env _ARGCOMPLETE_STDOUT_FILENAME if set, else fd 8
  *   - exit 0 after writing
  *
+ * zsh and fish speak the same protocol with descriptions attached (the
+ * hooks `cliche install` writes set these; see install._SHELL_RC_LINES):
+ *   - _ARGCOMPLETE_SHELL=zsh → `candidate:description`, `:` and shell
+ *     specials in the candidate backslash-escaped, for `_describe`
+ *   - _ARGCOMPLETE_DFS set (fish: tab) → `candidate<DFS>description`, for
+ *     `complete -a`
+ *   - _ARGCOMPLETE_SUPPRESS_SPACE=1 → no trailing space on a lone match
+ * A command's description is the first line of its docstring; `-h` /
+ * `--help` get argparse's; everything else has none, as in argcomplete
+ * with cliche's completion parser.
+ *
  * Tab completion fires on every keystroke; saving Python startup here
  * (~30–50 ms → ~2 ms) is the most user-visible win this binary delivers.
  *
@@ -1565,7 +3229,22 @@ static int starts_with_n(const char *s, const char *p, int n) {
     return 1;
 }
 
+/* Per-shell output shape, read once by do_complete (see the header above). */
+static struct {
+    int zsh;             /* _ARGCOMPLETE_SHELL=zsh */
+    char dfs;            /* _ARGCOMPLETE_DFS, 0 when unset */
+    int suppress_space;  /* _ARGCOMPLETE_SUPPRESS_SPACE=1 */
+} g_comp;
+
+/* argparse's text for its `-h` / `--help` action, which argcomplete shows. */
+#define HELP_FLAG_DESC "show this help message and exit"
+
+static void emit_description(FILE *out, const char *d, char ifs) {
+    for (; *d && *d != '\n'; d++) fputc(*d == ifs ? ' ' : *d, out);
+}
+
 /* Emit candidates whose prefix matches `pfx[:plen]`, joined by `ifs`.
+ * `descs[i]` (NULL array or entry = none) is shown by zsh and fish.
  *
  * argcomplete appends a single trailing space ONLY when there is exactly
  * one matching candidate (the "completion is final, advance to next arg"
@@ -1575,7 +3254,7 @@ static int starts_with_n(const char *s, const char *p, int n) {
  *
  * We replicate that exactly: pre-filter once, count matches, then write. */
 static void emit_candidates(FILE *out, const char *ifs,
-                            const char **cands, int n,
+                            const char **cands, const char **descs, int n,
                             const char *pfx, int plen) {
     /* First pass: count matches */
     int matches = 0;
@@ -1592,20 +3271,51 @@ static void emit_candidates(FILE *out, const char *ifs,
         if (plen > 0 && (int)cl < plen) continue;
         if (plen > 0 && !starts_with_n(c, pfx, plen)) continue;
         if (wrote) fputs(ifs, out);
-        fputs(c, out);
-        if (matches == 1 && (cl == 0 || c[cl - 1] != '/')) fputc(' ', out);
+        if (g_comp.zsh) {
+            for (const char *k = c; *k; k++) {
+                if (strchr("\\();<>|&!`$*?[]{} \t\n\"':", *k)) fputc('\\', out);
+                fputc(*k, out);
+            }
+        } else {
+            fputs(c, out);
+        }
+        if (matches == 1 && !g_comp.suppress_space && (cl == 0 || c[cl - 1] != '/'))
+            fputc(' ', out);
+        if (g_comp.zsh || g_comp.dfs) {
+            const char *d = descs && descs[i] ? descs[i] : "";
+            if (!*d && (strcmp(c, "-h") == 0 || strcmp(c, "--help") == 0))
+                d = HELP_FLAG_DESC;
+            fputc(g_comp.zsh ? ':' : g_comp.dfs, out);
+            emit_description(out, d, ifs[0]);
+        }
         wrote = 1;
     }
 }
 
+/* The cached fields of a pydantic parameter, or NULL — in which case
+ * completion treats it like any other parameter, as run.py's completion
+ * parser does for a model whose fields it doesn't know. */
+static const jv *param_fields(const jv *p, const jv *pyd_models, const jv *schemas) {
+    const jv *ann = jv_obj_get(p, "type_annotation");
+    int defer;
+    if (!ann || ann->kind != JV_STR) return NULL;
+    return pydantic_fields_for(ann->u.str.s, pyd_models, schemas, &defer);
+}
+
+static int field_is_bool(const jv *f) {
+    const jv *fa = jv_obj_get(f, "annotation");
+    return fa && fa->kind == JV_STR && strcmp(fa->u.str.s, "bool") == 0;
+}
+
 /* Build a deduped, sorted list of (group ∪ topcmd) names. argparse also
  * registers `-h` / `--help` on every parser (default `add_help=True`), and
  * argcomplete includes those in the candidate set. We append them here so
  * `<bin> <TAB>` matches Python's output: commands+groups+`-h`+`--help`. */
 static void collect_top_names(CmdList *cmds, const char ***out_arr,
-                              int *out_n, Arena *a) {
+                              const char ***out_descs, int *out_n, Arena *a) {
     /* +2 entries for the `-h` / `--help` argparse always registers. */
     const char **arr = (const char **)arena_alloc(a, sizeof(char *) * (cmds->n + 3));
+    const char **descs = (const char **)arena_alloc(a, sizeof(char *) * (cmds->n + 3));
     int n = 0;
     for (size_t i = 0; i < cmds->n; i++) {
         const char *nm = cmds->items[i].group ? cmds->items[i].group
@@ -1614,20 +3324,26 @@ static void collect_top_names(CmdList *cmds, const char ***out_arr,
         for (int k = 0; k < n; k++) {
             if (strcmp(arr[k], nm) == 0) { dup_found = 1; break; }
         }
-        if (!dup_found) arr[n++] = nm;
+        if (dup_found) continue;
+        descs[n] = cmds->items[i].group ? NULL : cmds->items[i].doc;
+        arr[n++] = nm;
     }
+    descs[n] = NULL;
     arr[n++] = "-h";
+    descs[n] = NULL;
     arr[n++] = "--help";
-    *out_arr = arr;
-    *out_n   = n;
+    *out_arr   = arr;
+    *out_descs = descs;
+    *out_n     = n;
 }
 
 /* Collect flag names for a function: short flags (`-b`), long flags
- * (`--base`), and `--no-` variants for default=True bools. argparse's
+ * (`--base`), `--no-` variants for default=True bools, and the `--field`
+ * flags of pydantic parameters whose fields are cached. argparse's
  * always-on `-h` / `--help` are appended at the end so they appear in the
  * candidate set the same way Python's argcomplete emits them. */
-static void collect_flags(const jv *fn, const char ***out_arr, int *out_n,
-                          Arena *a) {
+static void collect_flags(const jv *fn, const jv *pyd_models, const jv *schemas,
+                          const char ***out_arr, int *out_n, Arena *a) {
     const jv *params = jv_obj_get(fn, "parameters");
     int cap = 64, n = 0;
     const char **arr = (const char **)arena_alloc(a, sizeof(char *) * cap);
@@ -1644,12 +3360,33 @@ static void collect_flags(const jv *fn, const char ***out_arr, int *out_n,
         if (p->kind != JV_OBJ) continue;
         const jv *pname = jv_obj_get(p, "name");
         const jv *pdef  = jv_obj_get(p, "default");
-        if (!pname || pname->kind != JV_STR || !pdef) continue;
         const jv *isa = jv_obj_get(p, "is_args");
         const jv *isk = jv_obj_get(p, "is_kwargs");
         if ((isa && isa->kind == JV_BOOL && isa->u.b) ||
             (isk && isk->kind == JV_BOOL && isk->u.b)) continue;
         const jv *ann = jv_obj_get(p, "type_annotation");
+        const jv *fields = param_fields(p, pyd_models, schemas);
+        if (fields) {
+            for (size_t k = 0; k < fields->u.arr.n; k++) {
+                const jv *f = &fields->u.arr.items[k];
+                const jv *fname = f->kind == JV_OBJ ? jv_obj_get(f, "name") : NULL;
+                if (!fname || fname->kind != JV_STR) continue;
+                const jv *fdef = jv_obj_get(f, "default");
+                int no = field_is_bool(f) && fdef && fdef->kind == JV_BOOL && fdef->u.b;
+                const char *dashed = dasherize(a, fname->u.str.s, fname->u.str.l);
+                char *flag = (char *)arena_alloc(a, strlen(dashed) + 6);
+                sprintf(flag, no ? "--no-%s" : "--%s", dashed);
+                if (n + 2 >= cap) {
+                    cap *= 2;
+                    const char **na = (const char **)arena_alloc(a, sizeof(char *) * cap);
+                    memcpy(na, arr, sizeof(char *) * n);
+                    arr = na;
+                }
+                arr[n++] = flag;
+            }
+            continue;
+        }
+        if (!pname || pname->kind != JV_STR || !pdef) continue;
         int is_bool = (ann && ann->kind == JV_STR && strstr(ann->u.str.s, "bool")) ||
                       (pdef->kind == JV_STR &&
                        (str_ieq(pdef->u.str.s, "True") ||
@@ -1705,7 +3442,64 @@ static void collect_flags(const jv *fn, const char ***out_arr, int *out_n,
     *out_n   = n;
 }
 
-static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
+/* Candidates a `@completer` function stored (cliche/completions.py):
+ * `<pkg>_<hash>.completions/<module>.<func>`, whose first line is the epoch
+ * second it expires at and every later line one candidate. Returns their
+ * count, or -1 when the file is missing, unreadable or expired — then
+ * Python runs the completer and rewrites it. */
+static int read_completions(const char *cache_path, const jv *spec, Arena *a,
+                            const char ***out) {
+    const jv *mod = jv_obj_get(spec, "module");
+    const jv *fn = jv_obj_get(spec, "func");
+    if (!mod || mod->kind != JV_STR || !fn || fn->kind != JV_STR) return -1;
+    size_t cl = strlen(cache_path);
+    if (cl < 5 || strcmp(cache_path + cl - 5, ".json") != 0) return -1;
+    char path[4096];
+    int n = snprintf(path, sizeof path, "%.*s.completions/%s.%s", (int)(cl - 5),
+                     cache_path, mod->u.str.s, fn->u.str.s);
+    if (n < 0 || (size_t)n >= sizeof path) return -1;
+
+    int fd = open(path, O_RDONLY);
+    if (fd < 0) return -1;
+    struct stat st;
+    if (fstat(fd, &st) != 0 || st.st_size <= 0 || st.st_size > (64 << 20)) {
+        close(fd);
+        return -1;
+    }
+    size_t len = (size_t)st.st_size;
+    char *buf = (char *)arena_alloc(a, len + 1);
+    size_t got = 0;
+    while (got < len) {
+        ssize_t r = read(fd, buf + got, len - got);
+        if (r <= 0) break;
+        got += (size_t)r;
+    }
+    close(fd);
+    if (got != len) return -1;
+    buf[len] = 0;
+
+    char *end;
+    long long expires = strtoll(buf, &end, 10);
+    if (end == buf || *end != '\n' || expires <= (long long)time(NULL)) return -1;
+    int count = 0;
+    for (char *c = end + 1; *c; c++)
+        if (*c == '\n') count++;
+    const char **arr = (const char **)arena_alloc(a, sizeof(char *) * ((size_t)count + 1));
+    int k = 0;
+    for (char *line = end + 1; *line && k <= count;) {
+        char *nl = strchr(line, '\n');
+        if (nl) *nl = 0;
+        if (*line) arr[k++] = line;
+        if (!nl) break;
+        line = nl + 1;
+    }
+    *out = arr;
+    return k;
+}
+
+static int do_complete(const char *cache_path, CmdList *cmds, Arena *a,
+                       const jv *enums_for_complete, const jv *pyd_models,
+                       const jv *schemas) {
     const char *cl = getenv("COMP_LINE");
     if (!cl) cl = "";
     const char *cp = getenv("COMP_POINT");
@@ -1734,6 +3528,12 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
 
     const char *ifs = getenv("_ARGCOMPLETE_IFS");
     if (!ifs || !*ifs) ifs = "\v";
+    const char *shell = getenv("_ARGCOMPLETE_SHELL");
+    const char *dfs = getenv("_ARGCOMPLETE_DFS");
+    const char *nospace = getenv("_ARGCOMPLETE_SUPPRESS_SPACE");
+    g_comp.zsh = shell && strcmp(shell, "zsh") == 0;
+    g_comp.dfs = dfs ? dfs[0] : 0;
+    g_comp.suppress_space = nospace && strcmp(nospace, "1") == 0;
     FILE *out = open_completion_stream();
     if (!out) return DEFER;
 
@@ -1753,10 +3553,10 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
     }
 
     if (widx == 1) {
-        const char **arr;
+        const char **arr, **descs;
         int n;
-        collect_top_names(cmds, &arr, &n, a);
-        emit_candidates(out, ifs, arr, n, prefix, plen);
+        collect_top_names(cmds, &arr, &descs, &n, a);
+        emit_candidates(out, ifs, arr, descs, n, prefix, plen);
         fclose(out);
         return 0;
     }
@@ -1767,7 +3567,8 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
     const jv *top_fn = NULL;
     for (size_t i = 0; i < cmds->n; i++) {
         if (!cmds->items[i].group && strcmp(cmds->items[i].name, w1) == 0) {
-            top_fn = cmds->items[i].func;
+            top_fn = cmd_func(&cmds->items[i], a);
+            if (!top_fn) { fclose(out); return DEFER; }
             break;
         }
     }
@@ -1784,15 +3585,19 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
         /* completing a subcommand name. argparse's group parser also
          * registers `-h` / `--help`, so include those for parity. */
         const char **arr = (const char **)arena_alloc(a, sizeof(char *) * (cmds->n + 3));
+        const char **descs = (const char **)arena_alloc(a, sizeof(char *) * (cmds->n + 3));
         int n = 0;
         for (size_t i = 0; i < cmds->n; i++) {
             if (cmds->items[i].group && strcmp(cmds->items[i].group, w1) == 0) {
+                descs[n] = cmds->items[i].doc;
                 arr[n++] = cmds->items[i].name;
             }
         }
+        descs[n] = NULL;
         arr[n++] = "-h";
+        descs[n] = NULL;
         arr[n++] = "--help";
-        emit_candidates(out, ifs, arr, n, prefix, plen);
+        emit_candidates(out, ifs, arr, descs, n, prefix, plen);
         fclose(out);
         return 0;
     }
@@ -1810,7 +3615,8 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
             if (cmds->items[i].group &&
                 strcmp(cmds->items[i].group, w1) == 0 &&
                 strcmp(cmds->items[i].name, w2) == 0) {
-                target_fn = cmds->items[i].func;
+                target_fn = cmd_func(&cmds->items[i], a);
+                if (!target_fn) { fclose(out); return DEFER; }
                 pos_start = 3;
                 break;
             }
@@ -1820,8 +3626,8 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
     /* Flag-name completion: `--<TAB>` or `-<TAB>`. */
     if (target_fn && plen >= 1 && prefix[0] == '-') {
         const char **arr; int n;
-        collect_flags(target_fn, &arr, &n, a);
-        emit_candidates(out, ifs, arr, n, prefix, plen);
+        collect_flags(target_fn, pyd_models, schemas, &arr, &n, a);
+        emit_candidates(out, ifs, arr, NULL, n, prefix, plen);
         fclose(out);
         return 0;
     }
@@ -1880,6 +3686,17 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
                 if (cmd_name_eq(pn->u.str.s, fname)) {
                     if (PARAM_IS_BOOL(p)) break;  /* no value to complete */
                     const jv *ann = jv_obj_get(p, "type_annotation");
+                    const jv *dyn = jv_obj_get(p, "completer");
+                    if (dyn && dyn->kind == JV_OBJ &&
+                        !(enums_for_complete && ann && ann->kind == JV_STR &&
+                          enum_for_annotation(enums_for_complete, ann->u.str.s))) {
+                        const char **arr;
+                        int n = read_completions(cache_path, dyn, a, &arr);
+                        if (n < 0) { fclose(out); return DEFER; }
+                        emit_candidates(out, ifs, arr, NULL, n, prefix, plen);
+                        fclose(out);
+                        return 0;
+                    }
                     if (enums_for_complete && ann && ann->kind == JV_STR) {
                         const jv *evals = enum_for_annotation(enums_for_complete,
                                                               ann->u.str.s);
@@ -1891,7 +3708,7 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
                                 const jv *v = &evals->u.arr.items[k];
                                 if (v->kind == JV_STR) arr[n++] = v->u.str.s;
                             }
-                            emit_candidates(out, ifs, arr, n, prefix, plen);
+                            emit_candidates(out, ifs, arr, NULL, n, prefix, plen);
                         }
                     }
                     fclose(out);
@@ -1914,15 +3731,24 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
             const char *fname = w[1] == '-' ? w + 2 : w + 1;
             if (strncmp(fname, "no-", 3) == 0) fname += 3;
             int found_param = 0, is_bool_flag = 0;
-            for (size_t k = 0; k < params->u.arr.n; k++) {
+            for (size_t k = 0; k < params->u.arr.n && !found_param; k++) {
                 const jv *p = &params->u.arr.items[k];
                 if (p->kind != JV_OBJ) continue;
                 const jv *pn = jv_obj_get(p, "name");
                 if (!pn || pn->kind != JV_STR) continue;
-                if (cmd_name_eq(pn->u.str.s, fname)) {
+                const jv *fields = param_fields(p, pyd_models, schemas);
+                for (size_t f = 0; fields && f < fields->u.arr.n; f++) {
+                    const jv *fo = &fields->u.arr.items[f];
+                    const jv *fn = fo->kind == JV_OBJ ? jv_obj_get(fo, "name") : NULL;
+                    if (fn && fn->kind == JV_STR && cmd_name_eq(fn->u.str.s, fname)) {
+                        found_param = 1;
+                        is_bool_flag = field_is_bool(fo);
+                        break;
+                    }
+                }
+                if (!fields && cmd_name_eq(pn->u.str.s, fname)) {
                     found_param = 1;
                     is_bool_flag = PARAM_IS_BOOL(p);
-                    break;
                 }
             }
             if (found_param && !is_bool_flag) {
@@ -1945,6 +3771,7 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
         if ((isa && isa->kind == JV_BOOL && isa->u.b) ||
             (isk && isk->kind == JV_BOOL && isk->u.b)) continue;
         if (jv_obj_get(p, "default")) continue;  /* optional → not positional */
+        if (param_fields(p, pyd_models, schemas)) continue;  /* --field flags */
         const jv *pn = jv_obj_get(p, "name");
         if (!pn || pn->kind != JV_STR) continue;
         if (strcmp(pn->u.str.s, "self") == 0 ||
@@ -1959,10 +3786,12 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
      * positional choices (since the user could type either). Build the
      * combined candidate set so the parity test sees the same shape. */
     const char **flag_arr; int flag_n;
-    collect_flags(target_fn, &flag_arr, &flag_n, a);
+    collect_flags(target_fn, pyd_models, schemas, &flag_arr, &flag_n, a);
 
     int total_cap = flag_n;
     const jv *enum_vals = NULL;
+    const char **dyn_arr = NULL;
+    int dyn_n = 0;
     if (next_pos) {
         const jv *ann = jv_obj_get(next_pos, "type_annotation");
         if (enums_for_complete && ann && ann->kind == JV_STR) {
@@ -1973,6 +3802,12 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
                 total_cap += (int)evals->u.arr.n;
             }
         }
+        const jv *dyn = jv_obj_get(next_pos, "completer");
+        if (!enum_vals && dyn && dyn->kind == JV_OBJ) {
+            dyn_n = read_completions(cache_path, dyn, a, &dyn_arr);
+            if (dyn_n < 0) { fclose(out); return DEFER; }
+            total_cap += dyn_n;
+        }
     }
     const char **all = (const char **)arena_alloc(a, sizeof(char *) * (size_t)(total_cap + 1));
     int total_n = 0;
@@ -1983,13 +3818,307 @@ static int do_complete(CmdList *cmds, Arena *a, const jv *enums_for_complete) {
             if (v->kind == JV_STR) all[total_n++] = v->u.str.s;
         }
     }
-    emit_candidates(out, ifs, all, total_n, prefix, plen);
+    for (int i = 0; i < dyn_n; i++) all[total_n++] = dyn_arr[i];
+    emit_candidates(out, ifs, all, NULL, total_n, prefix, plen);
     fclose(out);
     return 0;
     #undef PARAM_IS_BOOL
 }
 
-int main(int argc, char **argv) {
+/* ============================================================
+ *                 zygote client (CLICHE_ZYGOTE=1)
+ * ============================================================
+ *
+ * Protocol lives in cliche/zygote.py (module docstring). In short: connect
+ * to `<cache stem>.sock`, send "CZY1" + u32 length with fds 0/1/2 attached
+ * as SCM_RIGHTS, then the NUL-separated payload (cwd, argc, argv..., envc,
+ * env...). The server answers with the forked child's pid (0 = refused,
+ * e.g. stale cache) and, when the child exits, its exit status.
+ *
+ * Only reached when the wrapper runs in zygote mode (CLICHEC_PYTHON set).
+ * The plain wrapper treats every rc except 0/1 as "defer to Python", which
+ * would re-run a zygote-served command that legitimately exited 2; in
+ * zygote mode clichec owns the process and the status is final.
+ */
+
+extern char **environ;
+
+static volatile sig_atomic_t zygote_child = 0;
+
+static void zygote_forward(int sig) {
+    if (zygote_child > 0) kill((pid_t)zygote_child, sig);
+}
+
+typedef struct { char *buf; size_t len, cap; int oom; } ZBuf;
+
+static void zbuf_add(ZBuf *b, const char *s) {
+    size_t n = strlen(s) + 1;  /* keep the NUL — it's the field separator */
+    if (b->oom) return;
+    if (b->len + n > b->cap) {
+        size_t cap = b->cap ? b->cap * 2 : 4096;
+        while (cap < b->len + n) cap *= 2;
+        char *nb = (char *)realloc(b->buf, cap);
+        if (!nb) { b->oom = 1; return; }
+        b->buf = nb;
+        b->cap = cap;
+    }
+    memcpy(b->buf + b->len, s, n);
+    b->len += n;
+}
+
+static int write_all(int fd, const char *p, size_t n) {
+    while (n) {
+        ssize_t w = write(fd, p, n);
+        if (w < 0) {
+            if (errno == EINTR) continue;
+            return -1;
+        }
+        p += w;
+        n -= (size_t)w;
+    }
+    return 0;
+}
+
+/* Read a big-endian int32. 0 on success, -1 on EOF / error. */
+static int read_be32(int fd, int32_t *out) {
+    unsigned char b[4];
+    size_t got = 0;
+    while (got < 4) {
+        ssize_t r = read(fd, b + got, 4 - got);
+        if (r < 0 && errno == EINTR) continue;
+        if (r <= 0) return -1;
+        got += (size_t)r;
+    }
+    *out = (int32_t)(((uint32_t)b[0] << 24) | ((uint32_t)b[1] << 16) |
+                     ((uint32_t)b[2] << 8) | (uint32_t)b[3]);
+    return 0;
+}
+
+static int zygote_dispatch(const char *cache_path, const char *prog,
+                           int uargc, char **uargv) {
+    const char *z = getenv("CLICHE_ZYGOTE");
+    if (!z || !*z || strcmp(z, "0") == 0) return DEFER;
+    if (getenv("_ARGCOMPLETE")) return DEFER;
+    /* Mirrors zygote._LOCAL_ONLY_FLAGS: these can't run in a forked child. */
+    for (int i = 0; i < uargc; i++) {
+        if (strcmp(uargv[i], "--pdb") == 0 || strcmp(uargv[i], "--pyspy") == 0)
+            return DEFER;
+    }
+
+    struct sockaddr_un sa;
+    memset(&sa, 0, sizeof(sa));
+    sa.sun_family = AF_UNIX;
+    size_t cl = strlen(cache_path);
+    size_t stem = (cl > 5 && strcmp(cache_path + cl - 5, ".json") == 0) ? cl - 5 : cl;
+    /* 103 = zygote._MAX_SOCKET_PATH (macOS sun_path is 104 incl. NUL). */
+    if (stem + 5 > 103 || stem + 5 >= sizeof(sa.sun_path)) return DEFER;
+    memcpy(sa.sun_path, cache_path, stem);
+    memcpy(sa.sun_path + stem, ".sock", 6);
+
+    char cwd[PATH_MAX];
+    if (!getcwd(cwd, sizeof(cwd))) return DEFER;
+
+    int s = socket(AF_UNIX, SOCK_STREAM, 0);
+    if (s < 0) return DEFER;
+    if (connect(s, (struct sockaddr *)&sa, sizeof(sa)) != 0) {
+        close(s);
+        return DEFER;
+    }
+
+    ZBuf b = {0};
+    char num[32];
+    zbuf_add(&b, cwd);
+    snprintf(num, sizeof(num), "%d", uargc + 1);
+    zbuf_add(&b, num);
+    zbuf_add(&b, prog);
+    for (int i = 0; i < uargc; i++) zbuf_add(&b, uargv[i]);
+    int envc = 0;
+    for (char **e = environ; *e; e++) envc++;
+    snprintf(num, sizeof(num), "%d", envc);
+    zbuf_add(&b, num);
+    for (char **e = environ; *e; e++) zbuf_add(&b, *e);
+    if (b.oom || b.len > (1u << 20)) {
+        free(b.buf);
+        close(s);
+        return DEFER;
+    }
+
+    unsigned char hdr[8] = { 'C', 'Z', 'Y', '1',
+        (unsigned char)(b.len >> 24), (unsigned char)(b.len >> 16),
+        (unsigned char)(b.len >> 8),  (unsigned char)b.len };
+    struct iovec iov = { hdr, sizeof(hdr) };
+    int fds[3] = { STDIN_FILENO, STDOUT_FILENO, STDERR_FILENO };
+    union {
+        struct cmsghdr h;
+        char buf[CMSG_SPACE(sizeof(fds))];
+    } ctl;
+    memset(&ctl, 0, sizeof(ctl));
+    struct msghdr msg;
+    memset(&msg, 0, sizeof(msg));
+    msg.msg_iov = &iov;
+    msg.msg_iovlen = 1;
+    msg.msg_control = ctl.buf;
+    msg.msg_controllen = sizeof(ctl.buf);
+    struct cmsghdr *cm = CMSG_FIRSTHDR(&msg);
+    cm->cmsg_level = SOL_SOCKET;
+    cm->cmsg_type = SCM_RIGHTS;
+    cm->cmsg_len = CMSG_LEN(sizeof(fds));
+    memcpy(CMSG_DATA(cm), fds, sizeof(fds));
+
+    ssize_t sent;
+    do { sent = sendmsg(s, &msg, 0); } while (sent < 0 && errno == EINTR);
+    int ok = sent == (ssize_t)sizeof(hdr) && write_all(s, b.buf, b.len) == 0;
+    free(b.buf);
+    int32_t pid = 0;
+    if (!ok || read_be32(s, &pid) != 0 || pid <= 0) {
+        /* Nothing ran (no fork yet) — safe to fall back to Python. */
+        close(s);
+        return DEFER;
+    }
+
+    zygote_child = pid;
+    struct sigaction act;
+    memset(&act, 0, sizeof(act));
+    act.sa_handler = zygote_forward;
+    act.sa_flags = SA_RESTART;
+    sigemptyset(&act.sa_mask);
+    sigaction(SIGINT, &act, NULL);
+    sigaction(SIGTERM, &act, NULL);
+    sigaction(SIGHUP, &act, NULL);
+    sigaction(SIGQUIT, &act, NULL);
+
+    int32_t status = 0;
+    int rc = read_be32(s, &status);
+    close(s);
+    if (rc != 0) {
+        fprintf(stderr, "error: lost connection to the cliche zygote server\n");
+        return 1;
+    }
+    return (int)(status & 0xff);
+}
+
+/* CLICHE_TRACE=/path/trace.json (cliche/trace.py): Chrome trace-event
+ * spans for this process, buffered and appended to the file once, at exit.
+ * Timestamps are epoch microseconds so they line up with the wrapper's and
+ * Python's. A no-op when the variable is unset. */
+static const char *g_trace_path;
+static char *g_trace_buf;
+static size_t g_trace_len, g_trace_cap;
+static int64_t g_trace_last;
+
+static int64_t trace_now(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_REALTIME, &ts);
+    return (int64_t)ts.tv_sec * 1000000 + ts.tv_nsec / 1000;
+}
+
+static void trace_add(const char *fmt, ...) {
+    char line[256];
+    va_list ap;
+    va_start(ap, fmt);
+    int n = vsnprintf(line, sizeof line, fmt, ap);
+    va_end(ap);
+    if (n < 0 || (size_t)n >= sizeof line) return;
+    if (g_trace_len + (size_t)n > g_trace_cap) {
+        size_t cap = g_trace_cap ? g_trace_cap * 2 : 2048;
+        while (cap < g_trace_len + (size_t)n) cap *= 2;
+        char *buf = (char *)realloc(g_trace_buf, cap);
+        if (!buf) return;
+        g_trace_buf = buf;
+        g_trace_cap = cap;
+    }
+    memcpy(g_trace_buf + g_trace_len, line, (size_t)n);
+    g_trace_len += (size_t)n;
+}
+
+/* `name` is always a literal: nothing to escape. */
+static void trace_span(const char *name, int64_t start, int64_t end, long pid, int rc) {
+    if (!g_trace_path) return;
+    if (rc == INT32_MIN)
+        trace_add("{\"name\":\"%s\",\"cat\":\"clichec\",\"ph\":\"X\",\"ts\":%lld,"
+                  "\"dur\":%lld,\"pid\":%ld,\"tid\":%ld},\n",
+                  name, (long long)start, (long long)(end - start), pid, pid);
+    else
+        trace_add("{\"name\":\"%s\",\"cat\":\"clichec\",\"ph\":\"X\",\"ts\":%lld,"
+                  "\"dur\":%lld,\"pid\":%ld,\"tid\":%ld,\"args\":{\"rc\":%d}},\n",
+                  name, (long long)start, (long long)(end - start), pid, pid, rc);
+}
+
+/* Close the span that has run since the previous mark. */
+static void trace_mark(const char *name) {
+    if (!g_trace_path) return;
+    int64_t t = trace_now();
+    trace_span(name, g_trace_last, t, (long)getpid(), INT32_MIN);
+    g_trace_last = t;
+}
+
+/* The first writer creates the file and opens the (never closed) array. */
+static void trace_flush(void) {
+    if (!g_trace_path || !g_trace_len) return;
+    int fd = open(g_trace_path, O_WRONLY | O_APPEND | O_CREAT | O_EXCL, 0644);
+    int fresh = fd >= 0;
+    if (!fresh) fd = open(g_trace_path, O_WRONLY | O_APPEND);
+    if (fd >= 0) {
+        char *buf = (char *)malloc(g_trace_len + 2);
+        if (buf) {
+            size_t off = 0;
+            if (fresh) { memcpy(buf, "[\n", 2); off = 2; }
+            memcpy(buf + off, g_trace_buf, g_trace_len);
+            ssize_t w = write(fd, buf, off + g_trace_len);
+            (void)w;
+            free(buf);
+        }
+        close(fd);
+    }
+    g_trace_len = 0;
+}
+
+/* Become the Python launcher, exactly what the plain wrapper's last line
+ * does: `python [-S] [-X pycache_prefix=...] -c "..." args`. `pycache` is
+ * the `-X` value and `site` the recorded start-up (`_clichec.record_site`)
+ * to run ahead of the launcher under -S; both NULL in the sh wrapper's
+ * zygote mode. Returns only if execv fails. */
+static int exec_python(const char *python, const char *argv0, const char *pkg_name,
+                       const char *pycache, const char *site,
+                       int uargc, char **uargv) {
+    /* sys.argv[0] goes inside a single-quoted Python literal — escape the
+     * two characters that could end it early. */
+    size_t need = 128 + 2 * strlen(argv0) + 2 * strlen(pkg_name) +
+                  (site ? strlen(site) : 0);
+    char *code = (char *)malloc(need);
+    char **args = (char **)malloc(sizeof(char *) * ((size_t)uargc + 8));
+    if (!code || !args) return DEFER;
+    char *w = code;
+    w += sprintf(w, "import sys; sys.argv[0] = '");
+    for (const char *c = argv0; *c; c++) {
+        if (*c == '\\' || *c == '\'') *w++ = '\\';
+        *w++ = *c;
+    }
+    if (site)
+        sprintf(w, "'; %slauncher.launch_%s()", site, pkg_name);
+    else
+        sprintf(w, "'; from cliche.launcher import launch_%s; launch_%s()",
+                pkg_name, pkg_name);
+    int n = 0;
+    args[n++] = (char *)python;
+    if (site) args[n++] = "-S";
+    if (pycache) {
+        args[n++] = "-X";
+        args[n++] = (char *)pycache;
+    }
+    args[n++] = "-c";
+    args[n++] = code;
+    for (int i = 0; i < uargc; i++) args[n++] = uargv[i];
+    args[n] = NULL;
+    execv(python, args);
+    fprintf(stderr, "error: cannot exec %s: %s\n", python, strerror(errno));
+    return 127;
+}
+
+/* Set by entry_main: the installed binary's own name, for run()'s prog. */
+static const char *g_entry_prog;
+
+static int run(int argc, char **argv) {
     /* Diagnostic shortcut: `clichec --version` prints the cliche package
      * version this binary was compiled against and exits 0. Doesn't go
      * through the wrapper (which always passes `<cache> <pkg> ...`) so
@@ -2012,8 +4141,10 @@ int main(int argc, char **argv) {
      *      sh can't rewrite argv[0] across exec (no `exec -a` portable form).
      *   2. basename of argv[0] — works when invoked directly with the binary
      *      name as the script (or via bash `exec -a name`).
-     *   3. fall back to pkg_name when called as the literal `clichec*` binary. */
+     *   3. fall back to pkg_name when called as the literal `clichec*` binary
+     *      (an installed entry binary is its own name, whatever it starts with). */
     const char *prog = getenv("CLICHEC_PROG");
+    if ((!prog || !*prog) && g_entry_prog) prog = g_entry_prog;
     if (!prog || !*prog) {
         const char *slash = strrchr(argv[0], '/');
         const char *base = slash ? slash + 1 : argv[0];
@@ -2024,83 +4155,53 @@ int main(int argc, char **argv) {
     int is_complete = (getenv("_ARGCOMPLETE") != NULL);
     if (!is_complete && needs_python_for_globals(uargc, uargv)) return DEFER;
 
+    /* Prefer the binary index; the JSON is the fallback whenever the index
+     * is missing or doesn't match it. enums / pydantic_models are only
+     * parsed for paths that can reach a per-command renderer. */
     Arena a = {0};
-    char *src = NULL;
-    size_t slen = 0;
-    if (read_file(cache_path, &a, &src, &slen) != 0) {
-        arena_free(&a);
-        return DEFER;
-    }
-    JP p = { .src = src, .i = 0, .len = slen, .a = &a, .err = 0 };
     jv root;
-    if (parse_value(&p, &root) || p.err) {
-        arena_free(&a);
-        return DEFER;
-    }
-    if (root.kind != JV_OBJ) { arena_free(&a); return DEFER; }
-
-    /* schema gate */
-    const jv *ver = jv_obj_get(&root, "version");
-    if (!ver || ver->kind != JV_STR ||
-        strcmp(ver->u.str.s, EXPECTED_CACHE_VERSION) != 0) {
-        arena_free(&a);
-        return DEFER;
-    }
-
-    /* freshness — figure out pkg_dir from any cached function file_path
-     * by stripping the relative module path. We use the first file's
-     * file_path as the source-of-truth and strip its rel_path. */
-    const char *pkg_dir = NULL;
-    char pkg_dir_buf[4096];
-    const jv *files = jv_obj_get(&root, "files");
-    if (files && files->kind == JV_OBJ) {
-        for (size_t i = 0; i < files->u.obj.n && !pkg_dir; i++) {
-            const char *rel = files->u.obj.keys[i];
-            size_t      rl  = files->u.obj.klens[i];
-            const jv *finfo = &files->u.obj.vals[i];
-            const jv *fns = jv_obj_get(finfo, "functions");
-            if (!fns || fns->kind != JV_ARR || !fns->u.arr.n) continue;
-            const jv *fp = jv_obj_get(&fns->u.arr.items[0], "file_path");
-            if (!fp || fp->kind != JV_STR) continue;
-            if (fp->u.str.l <= rl + 1) continue;
-            size_t base = fp->u.str.l - rl;
-            /* file_path ends with rel_path; strip "/<rel>" */
-            if (memcmp(fp->u.str.s + base, rel, rl) != 0) continue;
-            if (base && fp->u.str.s[base - 1] == '/') base--;
-            if (base >= sizeof(pkg_dir_buf)) continue;
-            memcpy(pkg_dir_buf, fp->u.str.s, base);
-            pkg_dir_buf[base] = 0;
-            pkg_dir = pkg_dir_buf;
-        }
-    }
-
-    if (getenv("CLICHEC_DEBUG"))
-        fprintf(stderr, "clichec: pkg_dir=%s\n", pkg_dir ? pkg_dir : "(null)");
-    if (!cache_is_fresh(&root, pkg_dir)) {
+    CmdList cmds = {0};
+    if (idx_open(cache_path, &g_idx) == 0) {
+        trace_mark("clichec.open");
         if (getenv("CLICHEC_DEBUG"))
-            fprintf(stderr, "clichec: stale cache (deferring)\n");
-        arena_free(&a);
-        return DEFER;
+            fprintf(stderr, "clichec: pkg_dir=%s (index)\n", g_idx.pkg_dir);
+        int fresh = watch_vouches(cache_path, g_idx.json_len, g_idx.json_mtime_ns) ||
+                    idx_is_fresh(&g_idx);
+        trace_mark("clichec.freshness");
+        if (!fresh || idx_root(&g_idx, &a, &root, is_complete || uargc >= 1) != 0) {
+            if (getenv("CLICHEC_DEBUG"))
+                fprintf(stderr, "clichec: stale cache (deferring)\n");
+            idx_close(&g_idx);
+            arena_free(&a);
+            return DEFER;
+        }
+        idx_build_list(&g_idx, &cmds);
+        trace_mark("clichec.parse");
+    } else {
+        int lrc = load_json_cache(cache_path, &a, &root, &cmds);
+        trace_mark("clichec.load_json");
+        if (lrc != 0) {
+            arena_free(&a);
+            return lrc;
+        }
     }
 
-    CmdList cmds = {0};
-    build_index(&root, &cmds, &a);
-
     if (is_complete) {
-        int rc = do_complete(&cmds, &a, jv_obj_get(&root, "enums"));
+        int rc = do_complete(cache_path, &cmds, &a, jv_obj_get(&root, "enums"),
+                             jv_obj_get(&root, "pydantic_models"),
+                             jv_obj_get(&root, "pydantic_schemas"));
         free(cmds.items);
         arena_free(&a);
+        idx_close(&g_idx);
         return rc;
     }
 
     /* dispatch */
     int rc = DEFER;
-    if (uargc == 0) {
-        render_top_help(prog, &cmds, &root);
-        rc = 0;
-    } else if (uargc == 1 &&
-               (strcmp(uargv[0], "-h") == 0 || strcmp(uargv[0], "--help") == 0)) {
-        render_top_help(prog, &cmds, &root);
+    if (uargc == 0 || (uargc == 1 &&
+               (strcmp(uargv[0], "-h") == 0 || strcmp(uargv[0], "--help") == 0))) {
+        if (serve_stored_help(cache_path, prog, "top", NULL, "") != 0)
+            render_top_help(prog, &cmds, &root);
         rc = 0;
     } else if (uargc == 1 && strcmp(uargv[0], "--llm-help") == 0) {
         /* Top-level --llm-help embeds an env snapshot (Python version,
@@ -2114,21 +4215,20 @@ int main(int argc, char **argv) {
         /* <cmd> --llm-help  OR  <group> <cmd> --llm-help */
         if (uargc == 2) {
             const char *cmd = uargv[0];
-            for (size_t i = 0; i < cmds.n; i++) {
-                if (!cmds.items[i].group &&
-                    cmd_name_eq(cmds.items[i].name, cmd)) {
-                    rc = render_command_llm(&root, prog,
-                                            cmds.items[i].func, NULL, cmd);
+            CmdEntry *e = find_cmd(&cmds, NULL, cmd);
+            if (e) {
+                if (serve_stored_help(cache_path, prog, "llm", NULL, e->name) == 0) {
+                    rc = 0;
                     goto done;
                 }
+                const jv *fn = cmd_func(e, &a);
+                rc = fn ? render_command_llm(&root, prog, fn, NULL, cmd) : DEFER;
+                goto done;
             }
             /* maybe it's a group name → defer to Python which prints group help */
-            for (size_t i = 0; i < cmds.n; i++) {
-                if (cmds.items[i].group &&
-                    cmd_name_eq(cmds.items[i].group, cmd)) {
-                    rc = DEFER;
-                    goto done;
-                }
+            if (has_group(&cmds, cmd)) {
+                rc = DEFER;
+                goto done;
             }
             /* `<typo> --llm-help` on a single-cmd-dispatch CLI might be the
              * legit positional value of the lone function (`scd_solo bob
@@ -2143,39 +4243,39 @@ int main(int argc, char **argv) {
         } else if (uargc == 3) {
             const char *grp = uargv[0];
             const char *cmd = uargv[1];
-            for (size_t i = 0; i < cmds.n; i++) {
-                if (cmds.items[i].group &&
-                    cmd_name_eq(cmds.items[i].group, grp) &&
-                    cmd_name_eq(cmds.items[i].name, cmd)) {
-                    rc = render_command_llm(&root, prog,
-                                            cmds.items[i].func, grp, cmd);
-                    goto done;
-                }
+            CmdEntry *e = find_cmd(&cmds, grp, cmd);
+            if (e && serve_stored_help(cache_path, prog, "llm", e->group, e->name) == 0) {
+                rc = 0;
+                goto done;
             }
-            rc = DEFER;
+            const jv *fn = e ? cmd_func(e, &a) : NULL;
+            rc = fn ? render_command_llm(&root, prog, fn, grp, cmd) : DEFER;
         } else {
             rc = DEFER;
         }
     } else if (uargc == 2 && uargv[0][0] != '-' &&
                (strcmp(uargv[1], "-h") == 0 || strcmp(uargv[1], "--help") == 0)) {
-        /* `<cmd> --help`. We render an argparse-shaped help from the cache.
+        /* `<cmd> --help`. The stored argparse output when there is one;
+         * otherwise we render an argparse-shaped help from the cache.
          *
-         * Byte-exact parity with run.py's argparse output isn't a goal —
-         * argparse's HelpFormatter does line-wrapping, metavar quoting, and
-         * choice display we don't (and shouldn't) reimplement. The parity
-         * test asserts *content* parity instead: rc=0, all param names
-         * appear, defaults appear, choices appear. Drift in the rendering
-         * style is acceptable; missing information is not. */
+         * Byte-exact parity with run.py's argparse output isn't a goal of
+         * the fallback — argparse's HelpFormatter does line-wrapping,
+         * metavar quoting, and choice display we don't (and shouldn't)
+         * reimplement. The parity test asserts *content* parity instead:
+         * rc=0, all param names appear, defaults appear, choices appear.
+         * Drift in the rendering style is acceptable; missing information
+         * is not. */
         const char *cmd = uargv[0];
-        const jv *fn = NULL;
-        for (size_t i = 0; i < cmds.n; i++) {
-            if (!cmds.items[i].group && cmd_name_eq(cmds.items[i].name, cmd)) {
-                fn = cmds.items[i].func;
-                break;
-            }
+        CmdEntry *e = find_cmd(&cmds, NULL, cmd);
+        if (e && serve_stored_help(cache_path, prog, "help", NULL, e->name) == 0) {
+            rc = 0;
+            goto done;
         }
+        const jv *fn = e ? cmd_func(e, &a) : NULL;
         if (fn) {
             rc = render_command_help(&root, prog, fn, NULL, cmd, &a);
+        } else if (serve_group_listing(cache_path, prog, cmd) == 0) {
+            rc = 0;
         } else {
             /* `<group> --help` — group help generation lives in run.py. */
             rc = DEFER;
@@ -2185,15 +4285,12 @@ int main(int argc, char **argv) {
         /* `<group> <cmd> --help` — same content-parity contract as above. */
         const char *grp = uargv[0];
         const char *cmd = uargv[1];
-        const jv *fn = NULL;
-        for (size_t i = 0; i < cmds.n; i++) {
-            if (cmds.items[i].group &&
-                cmd_name_eq(cmds.items[i].group, grp) &&
-                cmd_name_eq(cmds.items[i].name, cmd)) {
-                fn = cmds.items[i].func;
-                break;
-            }
+        CmdEntry *e = find_cmd(&cmds, grp, cmd);
+        if (e && serve_stored_help(cache_path, prog, "help", e->group, e->name) == 0) {
+            rc = 0;
+            goto done;
         }
+        const jv *fn = e ? cmd_func(e, &a) : NULL;
         if (fn) {
             rc = render_command_help(&root, prog, fn, grp, cmd, &a);
         } else {
@@ -2202,17 +4299,7 @@ int main(int argc, char **argv) {
     } else if (uargc >= 1 && uargv[0][0] != '-') {
         /* unknown top-level command / typo path */
         const char *cand = uargv[0];
-        int top_match = 0, group_match = 0;
-        for (size_t i = 0; i < cmds.n; i++) {
-            if (!cmds.items[i].group && cmd_name_eq(cmds.items[i].name, cand)) {
-                top_match = 1;
-                break;
-            }
-            if (cmds.items[i].group && cmd_name_eq(cmds.items[i].group, cand)) {
-                group_match = 1;
-            }
-        }
-        if (!top_match && !group_match) {
+        if (!find_cmd(&cmds, NULL, cand) && !has_group(&cmds, cand)) {
             /* Three possible interpretations of `<bin> <unknown>`:
              *   1. Real typo on a multi-cmd CLI → emit "Unknown command".
              *   2. Single-cmd-dispatch positional value (`scd_solo bob`
@@ -2230,16 +4317,234 @@ int main(int argc, char **argv) {
                 unknown_command(prog, cand, &cmds, &a);
                 rc = 1;
             }
+        } else if (uargc == 1 && !find_cmd(&cmds, NULL, cand) &&
+                   serve_group_listing(cache_path, prog, cand) == 0) {
+            /* bare `<group>` lists its commands, same as `<group> --help` */
+            rc = 0;
         } else {
-            rc = DEFER;
+            /* a real invocation: fail fast on argv argparse would reject */
+            rc = check_command_argv(cache_path, prog, &cmds, &root, uargc,
+                                    uargv, &a);
         }
     } else {
         rc = DEFER;
     }
 
 done:
+    trace_mark("clichec.render");
     free(cmds.items);
     arena_free(&a);
+    idx_close(&g_idx);
     return rc;
 }
 
+/* Start tracing when CLICHE_TRACE is set; returns the start time. The
+ * wrapper's span, when there is one, runs from its handover to now. */
+static int64_t trace_begin(long wrapper_pid) {
+    const char *trace = getenv("CLICHE_TRACE");
+    if (!trace || !*trace) return 0;
+    g_trace_path = trace;
+    int64_t t_start = g_trace_last = trace_now();
+    trace_add("{\"name\":\"process_name\",\"ph\":\"M\",\"pid\":%ld,"
+              "\"args\":{\"name\":\"clichec\"}},\n", (long)getpid());
+    const char *handover = getenv("CLICHE_TRACE_EXEC_NS");
+    if (handover && *handover && strspn(handover, "0123456789") == strlen(handover))
+        trace_span("wrapper", (int64_t)(strtoll(handover, NULL, 10) / 1000), t_start,
+                   wrapper_pid, INT32_MIN);
+    return t_start;
+}
+
+static void trace_handover(void) {
+    if (!g_trace_path) return;
+    char ns[32];
+    snprintf(ns, sizeof ns, "%lld", (long long)trace_now() * 1000);
+    setenv("CLICHE_TRACE_EXEC_NS", ns, 1);
+}
+
+/* ============================================================
+ *         entry mode: clichec installed as the CLI itself
+ * ============================================================
+ *
+ * `cliche install` puts a copy of clichec at bin/<name> and
+ * its settings in a sidecar next to it, `.<name>.cliche`, one KEY=value per
+ * line (see `_clichec.render_entry_config`):
+ *
+ *     PKG=mathlib            the package, as in the cache file's name
+ *     PKG_DIR_HASH=1a2b3c4d  md5(pkg_dir)[:8], likewise
+ *     PYTHON=/venv/bin/python
+ *     PYCACHE_PREFIX=1       start Python with -X pycache_prefix=<private>
+ *     SITE=sys.path += ...;  the start-up to run under -S (optional)
+ *
+ * It then does what the sh wrapper does, without the shell or the fork:
+ * serve the call, or exec Python with the launcher. A binary with that
+ * sidecar runs in this mode whatever its name (`clichec-tools` included);
+ * without one, anything but the literal `clichec*` name does too, and says
+ * the sidecar is missing.
+ */
+
+typedef struct {
+    const char *pkg, *hash, *python, *site;
+    int pycache;
+} Entry;
+
+/* The path the shell ran us by: argv[0] itself when it has a slash (as
+ * sh's `$0` would be), else the first executable match on PATH. */
+static char *resolve_self(const char *argv0, Arena *a) {
+    size_t al = strlen(argv0);
+    if (strchr(argv0, '/')) {
+        char *self = (char *)arena_alloc(a, al + 1);
+        memcpy(self, argv0, al + 1);
+        return self;
+    }
+    const char *path = getenv("PATH");
+    if (!path) return NULL;
+    while (1) {
+        size_t dl = strcspn(path, ":");
+        const char *dir = dl ? path : ".";
+        size_t dlen = dl ? dl : 1;
+        char *cand = (char *)arena_alloc(a, dlen + al + 2);
+        memcpy(cand, dir, dlen);
+        cand[dlen] = '/';
+        memcpy(cand + dlen + 1, argv0, al + 1);
+        if (access(cand, X_OK) == 0) return cand;
+        if (!path[dl]) return NULL;
+        path += dl + 1;
+    }
+}
+
+static char *entry_config_path(const char *self, Arena *a) {
+    const char *slash = strrchr(self, '/');
+    size_t dl = slash ? (size_t)(slash - self) + 1 : 0;
+    const char *base = self + dl;
+    char *p = (char *)arena_alloc(a, strlen(self) + 9);
+    sprintf(p, "%.*s.%s.cliche", (int)dl, self, base);
+    return p;
+}
+
+static int load_entry(const char *config, Arena *a, Entry *e) {
+    char *src;
+    size_t len;
+    memset(e, 0, sizeof *e);
+    if (read_file(config, a, &src, &len) != 0) return -1;
+    for (char *line = src; line && *line;) {
+        char *nl = strchr(line, '\n');
+        if (nl) *nl = 0;
+        char *eq = strchr(line, '=');
+        if (line[0] != '#' && eq) {
+            *eq = 0;
+            const char *v = eq + 1;
+            if (strcmp(line, "PKG") == 0) e->pkg = v;
+            else if (strcmp(line, "PKG_DIR_HASH") == 0) e->hash = v;
+            else if (strcmp(line, "PYTHON") == 0) e->python = v;
+            else if (strcmp(line, "SITE") == 0) e->site = *v ? v : NULL;
+            else if (strcmp(line, "PYCACHE_PREFIX") == 0) e->pycache = strcmp(v, "1") == 0;
+        }
+        line = nl ? nl + 1 : NULL;
+    }
+    return e->pkg && e->hash && e->python ? 0 : -1;
+}
+
+static int entry_main(int argc, char **argv, Arena *a, char *self, char *config) {
+    Entry e;
+    if (!config || load_entry(config, a, &e) != 0) {
+        fprintf(stderr, "error: %s: cannot read its cliche settings (%s)\n", argv[0],
+                config ? config : "not found on PATH");
+        return 127;
+    }
+    /* A handover left in the environment isn't ours: nothing ran before us. */
+    unsetenv("CLICHE_TRACE_EXEC_NS");
+    int64_t t_start = trace_begin(0);
+
+    const char *xdg = getenv("XDG_CACHE_HOME");
+    const char *home = getenv("HOME");
+    char *cache_home;
+    if (xdg && *xdg) {
+        cache_home = (char *)xdg;
+    } else {
+        cache_home = (char *)arena_alloc(a, strlen(home ? home : "") + 8);
+        sprintf(cache_home, "%s/.cache", home ? home : "");
+    }
+    char *cache = (char *)arena_alloc(a, strlen(cache_home) + strlen(e.pkg) +
+                                          strlen(e.hash) + 16);
+    sprintf(cache, "%s/cliche/%s_%s.json", cache_home, e.pkg, e.hash);
+    const char *slash = strrchr(argv[0], '/');
+    const char *prog = slash ? slash + 1 : argv[0];
+    g_entry_prog = prog;
+
+    /* run()'s argv, as the wrapper passes it: <prog> <cache> <pkg> args... */
+    char **cargv = (char **)arena_alloc(a, sizeof(char *) * ((size_t)argc + 3));
+    cargv[0] = argv[0];
+    cargv[1] = cache;
+    cargv[2] = (char *)e.pkg;
+    for (int i = 1; i < argc; i++) cargv[i + 2] = argv[i];
+    cargv[argc + 2] = NULL;
+
+    const char *z = getenv("CLICHE_ZYGOTE");
+    int zygote_mode = z && *z && strcmp(z, "0") != 0;
+    int rc = DEFER;
+    if (zygote_mode || access(cache, F_OK) == 0) rc = run(argc + 2, cargv);
+    if (zygote_mode && rc == DEFER) {
+        rc = zygote_dispatch(cache, prog, argc - 1, argv + 1);
+        trace_mark("clichec.zygote");
+    }
+    trace_span("clichec", t_start, trace_now(), (long)getpid(), rc);
+    trace_flush();
+    /* The wrapper's rule: 0, 1 and 2 are answers (any status is, from a
+     * zygote), everything else goes to Python. */
+    if (zygote_mode ? rc != DEFER : (rc == 0 || rc == 1 || rc == 2)) return rc;
+
+    trace_handover();
+    char *pycache = NULL;
+    if (e.pycache) {
+        pycache = (char *)arena_alloc(a, strlen(cache_home) + 40);
+        sprintf(pycache, "pycache_prefix=%s/cliche/pycache", cache_home);
+    }
+    const char *full_site = getenv("CLICHE_FULL_SITE");
+    const char *site = full_site && *full_site ? NULL : e.site;
+    return exec_python(e.python, self, e.pkg, pycache, site, argc - 1, argv + 1);
+}
+
+int main(int argc, char **argv) {
+    /* Entry mode is decided by the sidecar, not the name: `cliche install`
+     * may well be asked for a CLI called `clichec-tools`. */
+    Arena a = {0};
+    char *self = resolve_self(argv[0], &a);
+    char *config = self ? entry_config_path(self, &a) : NULL;
+    const char *slash = strrchr(argv[0], '/');
+    if ((config && access(config, F_OK) == 0) ||
+        strncmp(slash ? slash + 1 : argv[0], "clichec", 7) != 0)
+        return entry_main(argc, argv, &a, self, config);
+    arena_free(&a);
+    const char *python = getenv("CLICHEC_PYTHON");
+    int zygote_mode = python && *python;
+    /* The wrapper's start; in zygote mode it exec'd us, otherwise it is
+     * our parent and the Python it may exec keeps its pid. */
+    int64_t t_start = trace_begin(zygote_mode ? (long)getpid() : (long)getppid());
+    int rc = run(argc, argv);
+    if (rc != DEFER || argc < 3 || !zygote_mode) {
+        trace_span("clichec", t_start, trace_now(), (long)getpid(), rc);
+        trace_flush();
+        return rc;
+    }
+
+    /* Zygote-mode wrapper: we own the rest of this invocation. Resolve the
+     * program name the same way run() does, then drop the wrapper-private
+     * variables so neither the zygote child nor Python inherits them. */
+    const char *argv0 = getenv("CLICHEC_ARGV0");
+    const char *prog = getenv("CLICHEC_PROG");
+    char *py = strdup(python);
+    char *a0 = strdup(argv0 && *argv0 ? argv0 : argv[0]);
+    char *pg = strdup(prog && *prog ? prog : argv[2]);
+    if (!py || !a0 || !pg) return DEFER;
+    unsetenv("CLICHEC_PYTHON");
+    unsetenv("CLICHEC_ARGV0");
+    unsetenv("CLICHEC_PROG");
+
+    rc = zygote_dispatch(argv[1], pg, argc - 3, argv + 3);
+    trace_mark("clichec.zygote");
+    trace_span("clichec", t_start, trace_now(), (long)getpid(), rc);
+    trace_flush();
+    if (rc != DEFER) return rc;
+    trace_handover();
+    return exec_python(py, a0, argv[2], NULL, NULL, argc - 3, argv + 3);
+}
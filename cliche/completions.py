@@ -0,0 +1,110 @@
+"""Dynamic value completion: `@completer` functions and their stored candidates.
+
+    from cliche import cli, completer
+
+    @completer("service", ttl=600)
+    def services():
+        return [s["name"] for s in deploy_api.list_services()]
+
+    @cli
+    def deploy(service: str, env: str = "prod"):
+        ...
+
+Like `@cli`, `@completer(*params, ttl=...)` does nothing at runtime. The
+scan finds it in the source, and each parameter with one of those names in
+the same module's `@cli` functions gets a `completer` entry in the cache:
+`{"module", "func"}`, plus `"ttl"` when one is given (the default is
+`DEFAULT_TTL` seconds). Completing that parameter's value, either as a
+positional or after its flag, reads `<pkg>_<hash>.completions/<module>.<func>`
+next to the cache. The first line of that file is the epoch second it
+expires at, and each later line is one candidate.
+
+While the file is fresh, clichec serves it on every keystroke, and Python
+is not started. When it is missing or expired, clichec hands the keystroke
+to Python. Python imports the module, calls the completer with no
+arguments and rewrites the file with the result. If the completer raises,
+the expired candidates are served (or none) and the file is left alone, so
+the next keystroke tries again. Candidates don't depend on what has been
+typed, because the prefix is matched afterwards. That is why one call
+serves every keystroke until the TTL runs out.
+"""
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+DEFAULT_TTL = 300
+
+
+def store_path(cache_path, spec: dict) -> Path:
+    """`<pkg>_<hash>.json` → `<pkg>_<hash>.completions/<module>.<func>`."""
+    return Path(cache_path).with_suffix(".completions") / f"{spec['module']}.{spec['func']}"
+
+
+def read(path: Path, fresh_only: bool = True) -> list[str] | None:
+    """The stored candidates; None when missing, unreadable or (with
+    `fresh_only`) expired."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            expires, *lines = f.read().split("\n")
+        if fresh_only and int(expires) <= time.time():
+            return None
+    except (OSError, ValueError):
+        return None
+    return [line for line in lines if line]
+
+
+def write(path: Path, candidates, ttl: float) -> None:
+    """Store `candidates` for `ttl` seconds. Atomic, like the cache writes."""
+    lines = [str(c) for c in candidates]
+    body = "\n".join(c for c in lines if c and "\n" not in c and "\r" not in c)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(f"{int(time.time() + ttl)}\n{body}\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def remove(cache_path) -> list[Path]:
+    """Delete every stored candidate list of `cache_path`; returns what was
+    removed."""
+    directory = Path(cache_path).with_suffix(".completions")
+    removed = []
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return removed
+    for entry in entries:
+        try:
+            os.unlink(entry.path)
+            removed.append(Path(entry.path))
+        except OSError:
+            pass
+    try:
+        directory.rmdir()
+        removed.append(directory)
+    except OSError:
+        pass
+    return removed
+
+
+def candidates(spec: dict, cache_path) -> list[str]:
+    """Candidates for a parameter whose `completer` entry is `spec`: the
+    stored ones while fresh, otherwise a new call to the completer."""
+    path = store_path(cache_path, spec) if cache_path else None
+    if path is not None:
+        stored = read(path)
+        if stored is not None:
+            return stored
+    try:
+        import importlib
+        fn = getattr(importlib.import_module(spec["module"]), spec["func"])
+        result = [str(c) for c in fn()]
+    except Exception:
+        return (read(path, fresh_only=False) if path is not None else None) or []
+    if path is not None:
+        try:
+            write(path, result, spec.get("ttl", DEFAULT_TTL))
+        except OSError:
+            pass
+    return result
@@ -0,0 +1,273 @@
+"""Parse plans: a command's argv to keyword arguments without argparse.
+
+`build_parser_for_function` adds a dozen actions and re-reads every
+annotation, default and short flag before argparse looks at argv, and run.py
+needs argparse (cliche/argparser.py) imported to do it. For a signature made
+only of str, int, float, Path, date, datetime, bools, enums and
+list/tuple/set/frozenset of those, the scan stores what that parser would
+be, as `parse_plan` in the function's cache record, one entry per action:
+
+    {"dest": "count", "opts": ["-c", "--count"], "type": "int", "nargs": 1,
+     "default": 1}
+
+`opts` is absent for positionals. `nargs` is 1, "*" or "+", or 0 for a bool
+flag, whose `const` is the value the flag stores. An annotation naming
+anything but those types (an enum, presumably) is kept as `enum`, and its
+choices are looked up in the cache's enums at run time; `tuple` marks a
+tuple default (JSON has lists only).
+
+`parse` walks argv the way argparse does, like clichec's argv check
+(`simulate_parse` in clichec.c), and gives up — returns None — on anything
+that isn't a plain success: `-h`, a global option, `--`, an unknown or
+abbreviated option, a value that doesn't convert or isn't a choice, a
+missing or extra argument, or an annotation that turns out not to be one of
+the cache's enums. run.main then builds the argparse parser as before, which
+prints the help or the error, so a plan only ever changes how fast a
+command line parses, never what it parses to.
+"""
+from __future__ import annotations
+
+import math
+import re
+from types import SimpleNamespace
+
+# Names an annotation may be built from for its `type=` to be known at scan
+# time. Anything else (`Color`, `Color.V`, `Port`, `Config`) is recorded as
+# `enum`, so a custom type callable or a pydantic model never parses here.
+_STATIC_NAMES = {
+    "str", "int", "float", "bool", "Path", "pathlib.Path", "date", "datetime",
+    "datetime.date", "datetime.datetime", "None", "Optional", "list", "List",
+    "tuple", "Tuple", "set", "Set", "frozenset", "FrozenSet",
+}
+
+# build_parser_for_function's CLICHE OPTIONS group, and the destinations
+# invoke_function drops. argparse refuses a parameter that clashes with them.
+_GLOBAL_OPTS = {
+    "-h", "--help", "--llm-help", "--pdb", "--pyspy", "--raw", "--output-format",
+    "--full-traceback", "--timing", "--import-profile",
+}
+_GLOBAL_DESTS = {
+    "cli", "pdb", "pip", "uv", "pyspy", "raw", "output_format", "full_traceback",
+    "timing", "import_profile", "version", "llm_help", "help",
+}
+
+_NEGATIVE_NUMBER = re.compile(r"^-\d+$|^-\d*\.\d+$")
+
+
+def _type_name(param_type) -> str | None:
+    from pathlib import Path
+
+    from cliche import run
+    names = {str: "str", int: "int", float: "float", Path: "path",
+             run._parse_date: "date", run._parse_datetime: "datetime"}
+    return names.get(param_type)
+
+
+def _plain(value) -> bool:
+    """JSON round-trips it unchanged (bar tuple → list)."""
+    if isinstance(value, (list, tuple)):
+        return all(_plain(v) and not isinstance(v, (list, tuple)) for v in value)
+    if isinstance(value, float):
+        return math.isfinite(value)
+    return value is None or isinstance(value, (str, int, bool))
+
+
+def plan(parameters: list[dict]) -> list[dict] | None:
+    """The parse plan for a function's scanned `parameters`; None when its
+    parser depends on something only the user's module knows (a lazy
+    default, a dict, a default the plan can't store)."""
+    from cliche import abbrev, run
+
+    short_flags = abbrev.get_short_flags(parameters)
+    entries = []
+    for param in parameters:
+        name = param["name"]
+        if name in ("self", "cls") or param.get("is_args") or param.get("is_kwargs"):
+            continue
+        annotation = param.get("type_annotation")
+        default_str = param.get("default")
+        if param.get("lazy_arg") or name in _GLOBAL_DESTS:
+            return None
+        if annotation and (run._parse_dict_annotation(annotation)
+                           or "dict[" in annotation or "Dict[" in annotation):
+            return None
+
+        param_type = run.resolve_param_type(annotation, default_str)
+        default = run.parse_default(default_str, param_type)
+        if not _plain(default):
+            return None
+        entry = {"dest": name}
+        if annotation and not set(re.findall(r"[A-Za-z_][\w.]*", annotation)) <= _STATIC_NAMES:
+            entry["enum"] = annotation
+        has_default = default_str is not None
+        dashed = name.replace("_", "-")
+
+        if param_type is bool:
+            if has_default and default:
+                entry.update(opts=[f"--no-{dashed}"], nargs=0, const=False, default=True)
+            else:
+                entry.update(opts=abbrev.build_var_names(name, short_flags.get(name), True),
+                             nargs=0, const=True, default=False if default is None else default)
+            entry.pop("enum", None)   # no `choices=` on a flag
+            entries.append(entry)
+            continue
+
+        type_name = _type_name(param_type)
+        if type_name is None:
+            return None
+        entry["type"] = type_name
+        multi = run.is_multi_value_type(annotation)
+        if has_default:
+            entry["opts"] = abbrev.build_var_names(name, short_flags.get(name), True)
+            entry["nargs"] = "*" if multi or isinstance(default, (list, tuple)) else 1
+            entry["default"] = list(default) if isinstance(default, tuple) else default
+            if isinstance(default, tuple):
+                entry["tuple"] = True
+        else:
+            entry["nargs"] = "+" if multi else 1
+        entries.append(entry)
+
+    opts = [o for entry in entries for o in entry.get("opts", ())]
+    if len(set(opts)) != len(opts) or _GLOBAL_OPTS.intersection(opts):
+        return None
+    return entries
+
+
+def _converter(type_name: str):
+    from pathlib import Path
+
+    from cliche import run
+    return {"str": str, "int": int, "float": float, "path": Path,
+            "date": run._parse_date, "datetime": run._parse_datetime}[type_name]
+
+
+class _Unparsed(Exception):
+    """argv needs argparse: for its help, its error, or a case not ported."""
+
+
+def parse(plan: list[dict], argv: list[str], enums: dict | None = None,
+          pydantic_models=()) -> SimpleNamespace | None:
+    """What `build_parser_for_function(...).parse_args(argv)` returns for
+    this plan, minus the global options; None when argparse must run."""
+    try:
+        return _parse(plan, argv, enums or {}, pydantic_models)
+    except _Unparsed:
+        return None
+
+
+def _parse(plan, argv, enums, pydantic_models):
+    from cliche import run
+
+    by_opt, positionals, choices = {}, [], {}
+    for entry in plan:
+        annotation = entry.get("enum")
+        if annotation is not None:
+            if run._annotation_pydantic_name(annotation, pydantic_models):
+                raise _Unparsed
+            found = run.get_enum_from_annotation(annotation, enums)
+            if not found:
+                raise _Unparsed
+            choices[entry["dest"]] = found
+        if "opts" in entry:
+            for opt in entry["opts"]:
+                by_opt[opt] = entry
+        else:
+            positionals.append(entry)
+
+    # Classify like argparse's _parse_optional: 'A' an argument, 'O' one of
+    # our options (with its `=value`, if any).
+    kinds, opts, explicit = [], [], []
+    for token in argv:
+        entry, value = None, None
+        if token == "--":
+            raise _Unparsed
+        if token.startswith("-") and token != "-":
+            entry = by_opt.get(token)
+            if entry is None and token.startswith("--") and "=" in token:
+                flag, _, value = token.partition("=")
+                entry = by_opt.get(flag)
+                if entry is None or entry["nargs"] == 0 or not value:
+                    raise _Unparsed
+            if entry is None and not _NEGATIVE_NUMBER.match(token):
+                raise _Unparsed
+        kinds.append("A" if entry is None else "O")
+        opts.append(entry)
+        explicit.append(value)
+
+    values = {}
+
+    def take(entry, strings):
+        if entry["nargs"] == 0:
+            values[entry["dest"]] = entry["const"]
+            return
+        try:
+            converted = [_converter(entry["type"])(s) for s in strings]
+        except (TypeError, ValueError):
+            raise _Unparsed
+        allowed = choices.get(entry["dest"])
+        if allowed is not None and any(v not in allowed for v in converted):
+            raise _Unparsed
+        values[entry["dest"]] = converted[0] if entry["nargs"] == 1 else converted
+
+    def run_of_arguments(start):
+        end = start
+        while end < len(argv) and kinds[end] == "A":
+            end += 1
+        return end
+
+    # argparse's _parse_known_args loop: the run of arguments before each
+    # option fills as many positionals as it can (the first nargs='+' one
+    # taking what's left over); each option takes its values.
+    next_pos = 0
+    start = 0
+    while start < len(argv):
+        if kinds[start] == "A":
+            end = run_of_arguments(start)
+            take_n = min(len(positionals) - next_pos, end - start)
+            if take_n <= 0:
+                raise _Unparsed   # unrecognized arguments
+            extra = end - start - take_n
+            for entry in positionals[next_pos:next_pos + take_n]:
+                count = 1
+                if entry["nargs"] == "+" and extra:
+                    count, extra = count + extra, 0
+                take(entry, argv[start:start + count])
+                start += count
+            next_pos += take_n
+            if start != end:
+                raise _Unparsed
+            continue
+        entry = opts[start]
+        if explicit[start] is not None:
+            take(entry, [explicit[start]])
+            start += 1
+        elif entry["nargs"] == 0:
+            take(entry, [])
+            start += 1
+        else:
+            end = run_of_arguments(start + 1)
+            if entry["nargs"] == 1:
+                if end == start + 1:
+                    raise _Unparsed   # expected one argument
+                end = start + 2
+            take(entry, argv[start + 1:end])
+            start = end
+    if next_pos < len(positionals):
+        raise _Unparsed   # the following arguments are required
+
+    # Options not given keep their default; argparse runs `type=` over a
+    # string default.
+    for entry in plan:
+        dest = entry["dest"]
+        if dest in values or "opts" not in entry:
+            continue
+        default = entry["default"]
+        if isinstance(default, str) and entry["nargs"] != 0:
+            try:
+                default = _converter(entry["type"])(default)
+            except (TypeError, ValueError):
+                raise _Unparsed
+        elif entry.get("tuple"):
+            default = tuple(default)
+        values[dest] = default
+    return SimpleNamespace(**values)
@@ -0,0 +1,509 @@
+"""Help texts pre-rendered at cache-write time (`<pkg>_<hash>.help`).
+
+`<prog> --help`, `<prog> <group>`, `<prog> <cmd> --help` and
+`<prog> <cmd> --llm-help` are pure functions of the cache, the program name
+and — for argparse's wrapping — the terminal width. Rather than re-running
+argparse and the colorize_help regexes on every call (and keeping clichec's
+C re-implementations byte-identical), `_scan_and_cache` renders them once
+through the same run.py functions the live paths use and stores the exact
+bytes. run.main and clichec look the text up and write it; anything not in
+the store falls through to live rendering, so a missing entry is only ever
+slower, never different.
+
+What is stored, keyed `"<kind>\\t<group>\\t<name>"` (empty group for
+top-level commands):
+
+    top, top+color          top-level help
+    group, group+color      group listing
+    help, help+color        per-command argparse help, rendered at COLUMNS
+    llm                     per-command --llm-help
+    meta  argv-check        present when clichec may print argparse errors
+                            itself (see _argparse_matches_clichec)
+
+Not stored: the top-level `--llm-help` (embeds cwd and a timestamp), and the
+argparse help of functions whose annotations reference a pydantic model the
+scanner could not read field by field (no "pydantic_schemas" entry) —
+expanding those means importing user code, which the scan never does.
+
+Layout (little-endian):
+
+    header      magic "CLIH", format, the JSON's size + mtime_ns, adler32 of
+                the entry table and key strings, COLUMNS, flags, the prog
+                string, entry count, entry table and blob area offsets
+    entries     sorted by key bytes: key (offset, length), blob (offset,
+                length), adler32 of the blob, 8-byte render digest
+    strings     keys and prog, NUL-terminated UTF-8
+    blobs       raw UTF-8 output, not terminated
+
+Like the binary index (cliche/cache_index.py), the store is trusted only
+while the JSON on disk has the size and mtime in its header. Readers also
+require the same program name — the usage lines embed it — and, for the
+argparse kinds, a terminal exactly COLUMNS wide.
+
+Per-command argparse help costs about a millisecond each to render. Entries
+are reused across rewrites by render digest, so an edit re-renders only what
+it touched; when more than `_INLINE_RENDER_LIMIT` still need rendering (first
+run of a very large CLI, a cliche upgrade) the cheap kinds are written
+straight away and the rest is filled in by a detached background process.
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+MAGIC = b"CLIH"
+FORMAT = 1
+
+# argparse wraps at `columns - 2`; 80 is what it assumes without a terminal.
+COLUMNS = 80
+
+FLAG_COMPLETE = 1
+
+_HEADER = struct.Struct("<4sIQQ8I")
+_ENTRY = struct.Struct("<5I8s")
+
+_INLINE_RENDER_LIMIT = 64
+
+_WIDTH_KINDS = ("help", "help+color")
+
+
+def store_path(cache_file) -> Path:
+    """Sidecar path for a cache file: `<pkg>_<hash>.json` → `<pkg>_<hash>.help`."""
+    return Path(cache_file).with_suffix(".help")
+
+
+def make_key(kind: str, group: str | None = "", name: str = "") -> str:
+    return f"{kind}\t{group or ''}\t{name}"
+
+
+def _read_header(path):
+    try:
+        with open(path, "rb") as f:
+            head = f.read(_HEADER.size)
+    except OSError:
+        return None
+    if len(head) != _HEADER.size:
+        return None
+    h = _HEADER.unpack(head)
+    if h[0] != MAGIC or h[1] != FORMAT:
+        return None
+    return h
+
+
+def needs_refresh(cache_file, prog: str) -> bool:
+    """True when the store is missing, stale, or unfinished for `prog`.
+
+    A current store rendered for a different program name (the CLI run
+    through an alias) is left alone; rewriting it on every call from either
+    name would just flip it back and forth.
+    """
+    h = _read_header(store_path(cache_file))
+    if h is None:
+        return True
+    try:
+        st = os.stat(cache_file)
+    except OSError:
+        return False
+    if (h[2], h[3]) != (st.st_size, st.st_mtime_ns):
+        return True
+    if h[6] & FLAG_COMPLETE:
+        return False
+    return _read_prog(store_path(cache_file), h) == prog
+
+
+def _read_prog(path, h):
+    prog_off, prog_len = h[7], h[8]
+    try:
+        with open(path, "rb") as f:
+            f.seek(prog_off)
+            return f.read(prog_len).decode("utf-8", "surrogatepass")
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _read_entries(path, prog: str) -> dict:
+    """`{key: (digest, blob)}` of an existing store rendered for `prog`."""
+    try:
+        data = Path(path).read_bytes()
+    except OSError:
+        return {}
+    if len(data) < _HEADER.size:
+        return {}
+    h = _HEADER.unpack_from(data)
+    (magic, fmt, _size, _mtime_ns, table_sum, columns, _flags,
+     prog_off, prog_len, n, entries_off, blobs_off) = h
+    if magic != MAGIC or fmt != FORMAT or columns != COLUMNS:
+        return {}
+    if zlib.adler32(data[_HEADER.size:blobs_off]) != table_sum:
+        return {}
+    if data[prog_off:prog_off + prog_len].decode("utf-8", "surrogatepass") != prog:
+        return {}
+    out = {}
+    for i in range(n):
+        ko, kl, bo, bl, bsum, digest = _ENTRY.unpack_from(data, entries_off + i * _ENTRY.size)
+        blob = data[bo:bo + bl]
+        if zlib.adler32(blob) == bsum:
+            out[data[ko:ko + kl].decode("utf-8", "surrogatepass")] = (digest, blob)
+    return out
+
+
+def encode_store(entries: dict, prog: str, json_size: int, json_mtime_ns: int,
+                 complete: bool) -> bytes:
+    """Encode `{key: (digest, blob)}` into the sidecar format."""
+    items = sorted((k.encode("utf-8", "surrogatepass"), d, b) for k, (d, b) in entries.items())
+    entries_off = _HEADER.size
+    strtab_off = entries_off + _ENTRY.size * len(items)
+
+    strings = bytearray()
+
+    def ref(raw):
+        off = strtab_off + len(strings)
+        strings.extend(raw + b"\0")
+        return off, len(raw)
+
+    key_refs = [ref(k) for k, _, _ in items]
+    prog_ref = ref(prog.encode("utf-8", "surrogatepass"))
+    blobs_off = strtab_off + len(strings)
+
+    table = bytearray()
+    blobs = bytearray()
+    for (_, digest, blob), (ko, kl) in zip(items, key_refs):
+        table += _ENTRY.pack(ko, kl, blobs_off + len(blobs), len(blob),
+                             zlib.adler32(blob), digest)
+        blobs += blob
+    table += strings
+    header = _HEADER.pack(
+        MAGIC, FORMAT, json_size, json_mtime_ns, zlib.adler32(table), COLUMNS,
+        FLAG_COMPLETE if complete else 0, *prog_ref, len(items), entries_off,
+        blobs_off,
+    )
+    return header + bytes(table) + bytes(blobs)
+
+
+def _capture(fn, color: bool) -> bytes:
+    import contextlib
+    import io
+
+    import cliche.run as run
+
+    buf = io.StringIO()
+    saved = run._COLOR_OVERRIDE
+    run._COLOR_OVERRIDE = color
+    try:
+        with contextlib.redirect_stdout(buf):
+            fn()
+    finally:
+        run._COLOR_OVERRIDE = saved
+    return buf.getvalue().encode("utf-8", "surrogatepass")
+
+
+def _digest(*parts) -> bytes:
+    import hashlib
+
+    try:
+        from cliche import __version__ as version
+    except ImportError:
+        version = "unknown"
+    raw = json.dumps([FORMAT, COLUMNS, version, *parts], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8", "surrogatepass")).digest()[:8]
+
+
+# argv, and the error clichec's argparse mirror prints for it (None: parses),
+# against _argparse_matches_clichec's parser.
+_ARGV_PROBES = [
+    ([], "the following arguments are required: name, kind, rest"),
+    (["n", "A", "1", "--bogus", "x"], "unrecognized arguments: --bogus x"),
+    (["-c", "abc", "n", "A", "1"], "argument -c/--count: invalid int value: 'abc'"),
+    (["n", "C", "1"], "argument kind: invalid choice: 'C' (choose from 'A', 'B')"),
+    (["n", "it's", "1"], "argument kind: invalid choice: \"it's\" (choose from 'A', 'B')"),
+    (["n", "A", "1", "x"], "argument rest: invalid float value: 'x'"),
+    (["n", "A", "1", "-c"], "argument -c/--count: expected one argument"),
+    (["n", "A", "--tags", "1", "z", "1"], "argument --tags: invalid int value: 'z'"),
+    (["n", "A", "1", "--when", "2023-02-29"],
+     "argument --when: invalid _parse_date value: '2023-02-29'"),
+    (["n", "-c", "2", "A", "-1.5", "--no-x", "--flag", "--tags"], None),
+    (["n", "A", "1", "-q", "2"], "unrecognized arguments: -q 2"),
+]
+
+# The same for a required option, as a statically expanded pydantic field
+# (see run.build_parser_for_function) produces: argparse lists it among the
+# positionals in the order the arguments were added.
+_REQUIRED_PROBES = [
+    ([], "the following arguments are required: name, --port, kind"),
+    (["n", "k"], "the following arguments are required: --port"),
+    (["n", "--port", "x", "k"], "argument --port: invalid int value: 'x'"),
+    (["n", "--port", "80", "k"], None),
+]
+
+
+def _argparse_matches_clichec() -> bool:
+    """Whether this interpreter's argparse rejects argv the way clichec does.
+
+    clichec re-implements argparse's argv walk and error messages (as of
+    Python 3.11) to fail fast without starting Python. Later argparse
+    releases reword some errors and consume positionals differently, so
+    clichec only gets the go-ahead when these canned cases come out the same.
+    """
+    import argparse
+
+    import cliche.run as run
+
+    class Rejected(Exception):
+        pass
+
+    class Probe(argparse.ArgumentParser):
+        def error(self, message):
+            raise Rejected(message)
+
+    parser = Probe(prog="probe", add_help=False)
+    parser.add_argument("-c", "--count", dest="count", type=int, default=1)
+    parser.add_argument("--flag", dest="flag", action="store_true")
+    parser.add_argument("--no-x", dest="x", action="store_false", default=True)
+    parser.add_argument("--tags", dest="tags", type=int, nargs="*")
+    parser.add_argument("--when", dest="when", type=run._parse_date)
+    parser.add_argument("name", type=str)
+    parser.add_argument("kind", type=str, choices=["A", "B"])
+    parser.add_argument("rest", type=float, nargs="+")
+    required = Probe(prog="probe", add_help=False)
+    required.add_argument("name", type=str)
+    required.add_argument("--port", dest="port", type=int, required=True)
+    required.add_argument("kind", type=str)
+    for parser, probes in ((parser, _ARGV_PROBES), (required, _REQUIRED_PROBES)):
+        for argv, want in probes:
+            try:
+                parser.parse_args(argv)
+                got = None
+            except Rejected as e:
+                got = str(e)
+            except Exception:
+                return False
+            if got != want:
+                return False
+    return True
+
+
+def render_entries(cache: dict, prog: str, old: dict | None = None,
+                   limit: int | None = None) -> tuple[dict, int]:
+    """Render every storable help text for `cache` as invoked by `prog`.
+
+    Entries in `old` whose digest still matches are reused as-is. At most
+    `limit` argparse help pairs are rendered fresh (None: no limit); the
+    second element of the result counts the ones left out.
+    """
+    import functools
+
+    import cliche.run as run
+    from cliche.argparser import CleanHelpFormatter
+
+    old = old or {}
+    enums = cache.get("enums", {})
+    schemas = cache.get("pydantic_schemas", {})
+    pydantic_models = {name: schemas.get(name) for name in cache.get("pydantic_models", [])}
+    commands, subcommands = {}, {}
+    for finfo in cache.get("files", {}).values():
+        for func in finfo.get("functions", []):
+            name = func["name"].replace("_", "-")
+            func = dict(func, cli_name=name)
+            if func.get("group"):
+                subcommands.setdefault(func["group"], {})[name] = func
+            else:
+                commands[name] = func
+
+    out = {}
+    # Listings are cheap and depend on every docstring; always re-render.
+    top = functools.partial(run.print_help, commands, subcommands, prog_name=prog,
+                            description=cache.get("description"))
+    out[make_key("top")] = (b"\0" * 8, _capture(top, False))
+    out[make_key("top+color")] = (b"\0" * 8, _capture(top, True))
+    for group, funcs in subcommands.items():
+        listing = functools.partial(run.print_group_help, group, funcs, prog)
+        out[make_key("group", group)] = (b"\0" * 8, _capture(listing, False))
+        out[make_key("group+color", group)] = (b"\0" * 8, _capture(listing, True))
+    if _argparse_matches_clichec():
+        out[make_key("meta", "", "argv-check")] = (b"\0" * 8, b"1")
+
+    pending = 0
+    all_funcs = [("", n, f) for n, f in commands.items()]
+    all_funcs += [(g, n, f) for g, fs in subcommands.items() for n, f in fs.items()]
+    for group, name, func in all_funcs:
+        key = make_key("llm", group, name)
+        digest = _digest("llm", prog, group, func)
+        hit = old.get(key)
+        if hit and hit[0] == digest:
+            out[key] = hit
+        else:
+            out[key] = (digest, _capture(functools.partial(
+                run.print_llm_command_help, func, prog, name, group=group or None), False))
+
+        used_models = {run._annotation_pydantic_name(p.get("type_annotation"), pydantic_models)
+                       for p in func.get("parameters", [])} - {None}
+        if any(pydantic_models[m] is None for m in used_models):
+            continue
+        used_enums = {}
+        for p in func.get("parameters", []):
+            values = run.get_enum_from_annotation(p.get("type_annotation") or "", enums)
+            if values:
+                used_enums[p.get("type_annotation")] = values
+        used_schemas = {m: pydantic_models[m] for m in used_models}
+        digest = _digest("help", prog, func, used_enums, used_schemas)
+        keys = (make_key("help", group, name), make_key("help+color", group, name))
+        hits = [old.get(k) for k in keys]
+        if all(h and h[0] == digest for h in hits):
+            out.update(zip(keys, hits))
+            continue
+        if limit is not None and limit <= 0:
+            pending += 1
+            continue
+        if limit is not None:
+            limit -= 1
+        parser = run.build_parser_for_function(func, enums, prog_name=prog, help_only=True,
+                                               pydantic_models=pydantic_models)
+        parser.formatter_class = functools.partial(CleanHelpFormatter, width=COLUMNS - 2)
+        for k, color in zip(keys, (False, True)):
+            out[k] = (digest, _capture(lambda: sys.stdout.write(parser.format_clean_help()), color))
+    return out, pending
+
+
+def refresh(cache: dict, cache_file, prog: str, background: bool = True) -> None:
+    """Re-render the store for the JSON now at `cache_file`.
+
+    `cache` must be what that JSON holds. Nothing is written if the JSON
+    changes while rendering — whoever changed it refreshes the store.
+    """
+    cache_file = Path(cache_file)
+    path = store_path(cache_file)
+    try:
+        before = os.stat(cache_file)
+    except OSError:
+        return
+    entries, pending = render_entries(
+        cache, prog, _read_entries(path, prog),
+        limit=_INLINE_RENDER_LIMIT if background else None)
+    try:
+        after = os.stat(cache_file)
+    except OSError:
+        return
+    if (before.st_size, before.st_mtime_ns) != (after.st_size, after.st_mtime_ns):
+        return
+    blob = encode_store(entries, prog, after.st_size, after.st_mtime_ns, complete=not pending)
+    tmp = path.with_suffix(path.suffix + f".tmp.{os.getpid()}")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, path)
+    finally:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+    if pending and background:
+        _spawn_background_refresh(cache_file, prog)
+
+
+def _lock_path(cache_file) -> Path:
+    return Path(cache_file).with_suffix(".help.lock")
+
+
+def _spawn_background_refresh(cache_file, prog: str) -> None:
+    import fcntl
+    import subprocess
+
+    # One renderer at a time: skip the spawn while another holds the lock.
+    try:
+        fd = os.open(_lock_path(cache_file), os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return
+    os.close(fd)
+    code = ("from cliche.help_store import _background_refresh; "
+            f"_background_refresh({str(cache_file)!r}, {prog!r})")
+    try:
+        subprocess.Popen(
+            [sys.executable, "-c", code],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, start_new_session=True, close_fds=True,
+        )
+    except OSError:
+        pass
+
+
+def _background_refresh(cache_file: str, prog: str) -> None:
+    import fcntl
+
+    fd = os.open(_lock_path(cache_file), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+        refresh(cache, cache_file, prog, background=False)
+    except Exception:
+        pass
+    finally:
+        os.close(fd)
+
+
+def lookup(cache_file, kind: str, group: str | None, name: str, prog: str,
+           color: bool = False, columns: int | None = None) -> str | None:
+    """The stored text for one help request, or None to render live.
+
+    `columns` defaults to the terminal width argparse would use; it only
+    matters for the argparse kinds.
+    """
+    if color and kind != "llm":
+        kind += "+color"
+    if kind in _WIDTH_KINDS:
+        if columns is None:
+            import shutil
+            columns = shutil.get_terminal_size().columns
+        if columns != COLUMNS:
+            return None
+    import mmap
+
+    path = store_path(cache_file)
+    try:
+        st = os.stat(cache_file)
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    with data:
+        if len(data) < _HEADER.size:
+            return None
+        (magic, fmt, size, mtime_ns, table_sum, columns_, _flags,
+         prog_off, prog_len, n, entries_off, blobs_off) = _HEADER.unpack_from(data)
+        if (magic != MAGIC or fmt != FORMAT or columns_ != COLUMNS
+                or (size, mtime_ns) != (st.st_size, st.st_mtime_ns)
+                or not _HEADER.size <= blobs_off <= len(data)):
+            return None
+        if zlib.adler32(data[_HEADER.size:blobs_off]) != table_sum:
+            return None
+        if data[prog_off:prog_off + prog_len] != prog.encode("utf-8", "surrogatepass"):
+            return None
+        want = make_key(kind, group, name).encode("utf-8", "surrogatepass")
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            ko, kl, bo, bl, bsum, _ = _ENTRY.unpack_from(data, entries_off + mid * _ENTRY.size)
+            key = data[ko:ko + kl]
+            if key < want:
+                lo = mid + 1
+            elif key > want:
+                hi = mid
+            else:
+                blob = data[bo:bo + bl]
+                if len(blob) != bl or zlib.adler32(blob) != bsum:
+                    return None
+                return blob.decode("utf-8", "surrogatepass")
+    return None
@@ -0,0 +1,238 @@
+"""`--import-profile`: where the time goes while user modules import.
+
+`install()` puts a finder at the front of `sys.meta_path`. The finder asks
+the remaining finders for the spec, as the import system would. When the
+loader is a per-module instance, which covers source, bytecode and
+extension modules, it times that instance's `create_module` and
+`exec_module` and then restores them. Each module
+becomes a node in a tree: its parent is the module whose execution
+triggered the import. Its cumulative time runs from the start of the
+lookup to the end of execution, and its self time is that minus its
+children's. This is what `python -X importtime` reports. This version
+runs inside the CLI, starts before the parser is built (so the imports
+behind `type=` converters and pydantic field expansion count), and can
+write the tree to a file.
+
+    --import-profile           the heaviest imports as a tree, and the top
+                               20 by self time, on stderr at exit
+    --import-profile=N         the same with the top N
+    --import-profile=FILE      a speedscope profile (`*.json`), or collapsed
+                               stacks for flamegraph.pl (`*.folded`)
+
+The value may also follow as its own token (`--import-profile 5`), when it
+is a count or a `.json`/`.folded` file name; anything else after a bare
+`--import-profile` is left for the command line. Given after the command
+name, it starts once that command's parser has read it (so after parser
+building), and a command with its own `import_profile` parameter keeps the
+option.
+
+Modules imported before `install()` (cliche itself and what Python loads
+at startup) are already in `sys.modules` and don't show up.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+
+# Tree rows thinner than this share of the total are left out of the report.
+_TREE_MIN_SHARE = 0.01
+
+
+class _Node:
+    __slots__ = ("name", "start", "end", "children")
+
+    def __init__(self, name: str, start: float):
+        self.name = name
+        self.start = start
+        self.end = start
+        self.children: list[_Node] = []
+
+    @property
+    def cumulative(self) -> float:
+        return self.end - self.start
+
+    @property
+    def self_time(self) -> float:
+        return self.cumulative - sum(c.cumulative for c in self.children)
+
+
+class _Finder:
+    """Meta-path finder that times the loading of whatever the others find."""
+
+    def __init__(self):
+        self.roots: list[_Node] = []
+        self.stack: list[_Node] = []
+        self.t0 = time.perf_counter()
+
+    def find_spec(self, name, path=None, target=None):
+        start = time.perf_counter()
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find = getattr(finder, "find_spec", None)
+            if find is None:
+                continue
+            spec = find(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        # Classes (BuiltinImporter, FrozenImporter) are shared by every
+        # module they load; patching them would time everyone's imports.
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        create_module = getattr(loader, "create_module", None)
+        exec_module = loader.exec_module
+        opened: list[_Node] = []
+
+        def open_node() -> _Node:
+            if not opened:
+                node = _Node(name, start)
+                (self.stack[-1].children if self.stack else self.roots).append(node)
+                self.stack.append(node)
+                opened.append(node)
+            return opened[0]
+
+        def close_node(node: _Node) -> None:
+            node.end = time.perf_counter()
+            self.stack.remove(node)
+            for attr in ("create_module", "exec_module"):
+                loader.__dict__.pop(attr, None)
+
+        # Single-phase extension modules run their init, imports included,
+        # in create_module; everything else in exec_module.
+        def timed_create_module(spec):
+            node = open_node()
+            try:
+                return create_module(spec)
+            except BaseException:
+                close_node(node)
+                raise
+
+        def timed_exec_module(module):
+            node = open_node()
+            try:
+                exec_module(module)
+            finally:
+                close_node(node)
+
+        try:
+            if create_module is not None:
+                loader.create_module = timed_create_module
+            loader.exec_module = timed_exec_module
+        except AttributeError:  # loaders with __slots__
+            pass
+        return spec
+
+
+_finder: _Finder | None = None
+
+
+def install() -> None:
+    global _finder
+    if _finder is None:
+        _finder = _Finder()
+        sys.meta_path.insert(0, _finder)
+
+
+def uninstall() -> list[_Node]:
+    """Remove the finder; returns the recorded tree."""
+    global _finder
+    finder, _finder = _finder, None
+    if finder is None:
+        return []
+    try:
+        sys.meta_path.remove(finder)
+    except ValueError:
+        pass
+    return finder.roots
+
+
+def _walk(nodes, depth=0):
+    for node in nodes:
+        yield depth, node
+        yield from _walk(node.children, depth + 1)
+
+
+def format_report(roots: list[_Node], top: int = 20) -> str:
+    total = sum(r.cumulative for r in roots)
+    count = sum(1 for _ in _walk(roots))
+    lines = [f"import profile: {count} modules, {total * 1000:.1f}ms"]
+    if not roots:
+        return lines[0] + "\n"
+    lines.append(f"{'cum ms':>9} {'self ms':>9}  module")
+    for depth, node in _walk(roots):
+        if node.cumulative >= total * _TREE_MIN_SHARE:
+            lines.append(f"{node.cumulative * 1000:9.1f} {node.self_time * 1000:9.1f}  "
+                         f"{'  ' * depth}{node.name}")
+    heaviest = sorted((n for _, n in _walk(roots)), key=lambda n: n.self_time, reverse=True)
+    lines.append("")
+    lines.append(f"top {min(top, len(heaviest))} by self time:")
+    for node in heaviest[:top]:
+        lines.append(f"{node.self_time * 1000:9.1f}ms  {node.name}")
+    return "\n".join(lines) + "\n"
+
+
+def _speedscope(roots: list[_Node], t0: float) -> dict:
+    frames: list[dict] = []
+    index: dict[str, int] = {}
+    events: list[dict] = []
+
+    def add(node):
+        frame = index.setdefault(node.name, len(frames))
+        if frame == len(frames):
+            frames.append({"name": node.name})
+        events.append({"type": "O", "frame": frame, "at": (node.start - t0) * 1000})
+        for child in node.children:
+            add(child)
+        events.append({"type": "C", "frame": frame, "at": (node.end - t0) * 1000})
+
+    for root in roots:
+        add(root)
+    end = max((r.end for r in roots), default=t0)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "evented", "name": "imports", "unit": "milliseconds",
+            "startValue": 0, "endValue": (end - t0) * 1000, "events": events,
+        }],
+        "name": "cliche --import-profile",
+    }
+
+
+def _folded(roots: list[_Node]) -> str:
+    lines = []
+
+    def add(node, prefix):
+        stack = f"{prefix};{node.name}" if prefix else node.name
+        micros = round(node.self_time * 1e6)
+        if micros > 0:
+            lines.append(f"{stack} {micros}")
+        for child in node.children:
+            add(child, stack)
+
+    for root in roots:
+        add(root, "")
+    return "\n".join(lines) + "\n"
+
+
+def report(target: str | None) -> None:
+    """Stop recording and report to stderr, or to the file `target` names."""
+    t0 = _finder.t0 if _finder is not None else 0.0
+    roots = uninstall()
+    if target is None or target.isdigit():
+        sys.stderr.write(format_report(roots, int(target) if target else 20))
+        return
+    try:
+        with open(target, "w") as f:
+            if target.endswith(".folded"):
+                f.write(_folded(roots))
+            else:
+                json.dump(_speedscope(roots, t0), f)
+    except OSError as e:
+        print(f"warning: --import-profile could not write {target}: {e.strerror}", file=sys.stderr)
+        return
+    print(f"import profile written to {target}", file=sys.stderr)
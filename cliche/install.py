@@ -17,35 +17,56 @@ from dataclasses import dataclass
 from pathlib import Path
 
 
-# Shell rc files and the argcomplete invocation each one expects. argcomplete's
-# `register-python-argcomplete` auto-detects shell from $0 for bash/zsh but
-# needs `--shell fish` for fish. Fish also uses `| source` instead of `eval`.
-# `register-python-argcomplete` is on PATH at shell startup (ships with
-# argcomplete); no hard-coded absolute path so the snippet survives venv moves.
+# Shell rc lines that hook each binary into tab completion. They define the
+# completion function inline and run the binary itself with argcomplete's
+# env protocol, the way `register-python-argcomplete`'s scripts do, but
+# nothing runs at shell startup. With the fast shim, clichec answers the
+# keystroke in C, formatted for the shell (bash: bare candidates; zsh:
+# `candidate:description` for `_describe`; fish: tab-separated for
+# `complete -a`); anything it can't serve falls through to Python's
+# argcomplete, which speaks the same protocol.
 _TAG = "cliche: autocomplete for"  # marker substring for cleanup
 _SECTION_HEADER = "# cliche autocompletes"  # groups all autocomplete lines together
 
-# Each line is wrapped so a broken/missing argcomplete (stale shebang, renamed
-# Python, uninstalled package) can't spam the user's shell on every startup:
-#   - `command -v register-python-argcomplete >/dev/null` skips the eval when
-#     the binary isn't on PATH at all.
-#   - `2>/dev/null` hides any startup noise from the eval itself (bad
-#     interpreter, import errors) so a new shell stays clean.
-# Users who want to see errors can run the command directly.
+# Each line is one self-contained statement, so install/uninstall can add
+# and remove it on its own. zsh skips it when `compinit` hasn't run yet,
+# instead of erroring on every new shell. Placeholders use str.format, so
+# shell braces are doubled.
 _SHELL_RC_LINES = {
     "~/.bashrc":
-        'command -v register-python-argcomplete >/dev/null && '
-        'eval "$(register-python-argcomplete {name} 2>/dev/null)"  # ' + _TAG + ' {name}',
+        r"""_cliche_complete() {{ local IFS=$'\013'; COMPREPLY=($(COMP_LINE="$COMP_LINE" """
+        r"""COMP_POINT="$COMP_POINT" _ARGCOMPLETE=1 _ARGCOMPLETE_SHELL=bash "$1" """
+        r"""8>&1 9>&2 1>/dev/null 2>&1 </dev/null)) || unset COMPREPLY; }}; """
+        r"""complete -o nospace -o default -o bashdefault -F _cliche_complete {name}"""
+        '  # ' + _TAG + ' {name}',
     "~/.zshrc":
-        'command -v register-python-argcomplete >/dev/null && '
-        'eval "$(register-python-argcomplete {name} 2>/dev/null)"  # ' + _TAG + ' {name}',
+        r"""(( $+functions[compdef] )) && {{ _cliche_complete() {{ local IFS=$'\013'; """
+        r"""local -a c; c=($(COMP_LINE="$BUFFER" COMP_POINT="$CURSOR" _ARGCOMPLETE=1 """
+        r"""_ARGCOMPLETE_SHELL=zsh _ARGCOMPLETE_SUPPRESS_SPACE=1 "${{words[1]}}" """
+        r"""8>&1 9>&2 1>/dev/null 2>&1 </dev/null)); _describe "${{words[1]}}" c; }}; """
+        r"""compdef _cliche_complete {name}; }}"""
+        '  # ' + _TAG + ' {name}',
     "~/.config/fish/config.fish":
-        'if type -q register-python-argcomplete; '
-        'register-python-argcomplete --shell fish {name} 2>/dev/null | source; '
-        'end  # ' + _TAG + ' {name}',
+        r"""function __cliche_complete; set -lx _ARGCOMPLETE 1; set -lx _ARGCOMPLETE_SHELL fish; """
+        r"""set -lx _ARGCOMPLETE_DFS \t; set -lx _ARGCOMPLETE_IFS \n; """
+        r"""set -lx _ARGCOMPLETE_SUPPRESS_SPACE 1; set -lx COMP_LINE (commandline -p); """
+        r"""set -lx COMP_POINT (string length (commandline -cp)); """
+        r"""$argv[1] 8>&1 9>&2 1>/dev/null 2>&1; end; """
+        r"""complete -c {name} -f -a '(__cliche_complete {name})'"""
+        '  # ' + _TAG + ' {name}',
 }
 
 
+def _hook_line_pattern(name: str) -> re.Pattern:
+    """Every autocomplete line for `name`: ours (by tag), and the
+    `register-python-argcomplete <name>` lines older cliche versions wrote."""
+    return re.compile(
+        rf'^.*(?:#\s*{re.escape(_TAG)}\s+{re.escape(name)}[ \t]*'
+        rf'|register-python-argcomplete\s+(?:--shell\s+\S+\s+)?{re.escape(name)}\b.*)$\n?',
+        re.MULTILINE,
+    )
+
+
 def _insert_in_cliche_section(content: str, line: str) -> str:
     """Insert `line` into the `# cliche autocompletes` block in `content`.
 
@@ -72,18 +93,19 @@ def _insert_in_cliche_section(content: str, line: str) -> str:
     return content + suffix + f"{_SECTION_HEADER}\n{line}\n"
 
 
-def _register_autocomplete(name: str) -> list[str]:
-    """Insert the argcomplete hook into the `# cliche autocompletes` section
-    of each shell rc that exists.
+def _register_autocomplete(*names: str) -> list[str]:
+    """Insert the completion hook for each of `names` into the `# cliche
+    autocompletes` section of each shell rc that exists.
 
-    Idempotent: skips rc files that already contain the exact line. Returns the
-    list of rc paths we touched. Never creates new rc files — only edits ones
-    the user already has, so we don't clutter $HOME for shells the user doesn't
-    use.
+    Idempotent: skips rc files that already contain the exact line. A hook
+    for a name in an older form (e.g. a `register-python-argcomplete` eval)
+    is replaced. Returns the list of rc paths we touched. Never creates new
+    rc files — only edits ones the user already has, so we don't clutter
+    $HOME for shells the user doesn't use. Each rc is read and written at
+    most once, however many names.
     """
     touched = []
     for rc, line_fmt in _SHELL_RC_LINES.items():
-        line = line_fmt.format(name=name)
         path = Path(os.path.expanduser(rc))
         if not path.exists():
             continue
@@ -91,9 +113,15 @@ def _register_autocomplete(name: str) -> list[str]:
             content = path.read_text()
         except OSError:
             continue
-        if line in content:
+        new_content = content
+        for name in names:
+            line = line_fmt.format(name=name)
+            if line in new_content:
+                continue
+            new_content = _insert_in_cliche_section(
+                _hook_line_pattern(name).sub('', new_content), line)
+        if new_content == content:
             continue
-        new_content = _insert_in_cliche_section(content, line)
         try:
             path.write_text(new_content)
             touched.append(str(path))
@@ -103,17 +131,15 @@ def _register_autocomplete(name: str) -> list[str]:
 
 
 def _unregister_autocomplete(name: str) -> list[str]:
-    """Remove the argcomplete hook for `name` from each shell rc.
+    """Remove the completion hook for `name` from each shell rc.
 
-    Matches any line containing `register-python-argcomplete <name>`, so lines
-    written by older cliche versions, fish-form lines, and lines written
-    by the old cliche are all cleaned up.
+    Matches our tagged lines and any line containing
+    `register-python-argcomplete <name>`, so lines written by older cliche
+    versions, fish-form lines, and lines written by the old cliche are all
+    cleaned up.
     """
     touched = []
-    pattern = re.compile(
-        rf'^.*register-python-argcomplete\s+(?:--shell\s+\S+\s+)?{re.escape(name)}\b.*$\n?',
-        re.MULTILINE,
-    )
+    pattern = _hook_line_pattern(name)
     header_pattern = re.compile(
         rf'^{re.escape(_SECTION_HEADER)}[ \t]*$\n?',
         re.MULTILINE,
@@ -453,7 +479,7 @@ def _update_setup_cfg(directory: Path, binary_name: str, package_name: str) -> P
             f"was mis-classified as legacy — a modern pyproject.toml with a "
             f"[project] table is the canonical place for [project.scripts]."
         )
-    content = setup_cfg.read_text()
+    original = content = setup_cfg.read_text()
 
     entry_point = f"{binary_name} = {_cliche_entry_target(package_name)}"
 
@@ -491,9 +517,10 @@ def _update_setup_cfg(directory: Path, binary_name: str, package_name: str) -> P
 
     content, dep_changed = _ensure_cliche_in_setup_cfg(content)
 
-    setup_cfg.write_text(content)
-    print(f"Updated {setup_cfg}"
-          + (" (+ 'cliche' added to install_requires)" if dep_changed else ""))
+    if content != original:
+        setup_cfg.write_text(content)
+        print(f"Updated {setup_cfg}"
+              + (" (+ 'cliche' added to install_requires)" if dep_changed else ""))
     return setup_cfg
 
 
@@ -560,8 +587,9 @@ def _update_pyproject_toml(directory: Path, binary_name: str, package_name: str,
     setup_cfg = directory / "setup.cfg"
     has_setup_cfg = setup_cfg.exists()
 
-    if pyproject.exists():
-        content = pyproject.read_text()
+    original = pyproject.read_text() if pyproject.exists() else None
+    if original is not None:
+        content = original
         # Use existing package name if defined
         existing_name = _get_package_name_from_pyproject(content)
         if existing_name:
@@ -682,8 +710,11 @@ packages = ["{package_name}"]
     # If setup.cfg is also present, _update_setup_cfg already auto-injects
     # `cliche` on its side — no action needed here.
 
-    pyproject.write_text(content)
-    print(f"Updated {pyproject}")
+    # Left untouched when already current: a rewrite would move its mtime,
+    # which the runtime cache watches for the description.
+    if content != original:
+        pyproject.write_text(content)
+        print(f"Updated {pyproject}")
     return pyproject
 
 
@@ -743,7 +774,7 @@ def _editable_source_dir(pkg_name: str) -> Path | None:
     return None
 
 
-def _all_entry_points(binary_name: str) -> list[dict]:
+def _all_entry_points(binary_name: str, rescan: bool = False) -> list[dict]:
     """Return every package claiming `binary_name` as a console_scripts entry.
 
     Two dists may both declare the same script (different `pip install -e`
@@ -752,56 +783,23 @@ def _all_entry_points(binary_name: str) -> list[dict]:
     Callers that need to disambiguate (uninstall) can iterate this; callers
     that just need "some" entry (install's collision check) use
     _existing_entry_point which picks the LIVE one.
-    """
-    out: list[dict] = []
-    try:
-        from importlib.metadata import entry_points
-    except ImportError:
-        entry_points = None
 
-    if entry_points is not None:
-        for ep in entry_points(group="console_scripts"):
-            if ep.name != binary_name:
-                continue
-            pkg = _parse_cliche_entry(ep.value)
-            if pkg is None:
-                continue
-            out.append({
-                "pkg": pkg,
-                "mode": "pip",
-                "source_dir": _editable_source_dir(pkg),
-                "env_path": None,
-            })
+    Answered from the install registry (cliche/registry.py) while it's
+    valid; `rescan=True` asks the environment itself, for checks made right
+    after changing it.
+    """
+    from cliche.registry import installs, scan
 
-    for entry in _uv_tool_cliche_entries():
-        if entry["binary"] != binary_name:
-            continue
-        src = None
-        try:
-            env_path = Path(entry["env_path"])
-            for sp in (env_path / "lib").glob("python*/site-packages"):
-                for d in sp.glob(f"{entry['pkg']}*.dist-info"):
-                    direct_url = d / "direct_url.json"
-                    if direct_url.exists():
-                        data = json.loads(direct_url.read_text())
-                        url = data.get("url", "")
-                        if url.startswith("file://"):
-                            src = Path(url[len("file://"):])
-                            break
-                if src:
-                    break
-        except Exception:
-            pass
-        out.append({
-            "pkg": entry["pkg"],
-            "mode": "tool",
-            "source_dir": src,
-            "env_path": entry["env_path"],
-        })
-    return out
+    rows = scan(only={binary_name}) if rescan else installs()
+    return [{
+        "pkg": row["pkg"],
+        "mode": "tool" if row["mode"] == "tool" else "pip",
+        "source_dir": Path(row["source_dir"]) if row["source_dir"] else None,
+        "env_path": row["env_path"],
+    } for row in rows if row["binary"] == binary_name]
 
 
-def _existing_entry_point(binary_name: str) -> dict | None:
+def _existing_entry_point(binary_name: str, rescan: bool = False) -> dict | None:
     """Single-entry lookup — prefers the package whose shim file is LIVE on
     disk. Falls back to the first match when the shim owner is unknown (e.g.
     no shim file, or the shim came from a pre-cliche install).
@@ -809,7 +807,7 @@ def _existing_entry_point(binary_name: str) -> dict | None:
     Keeps backwards compatibility with callers that don't care about
     duplicates (install's collision check, zombie detection).
     """
-    entries = _all_entry_points(binary_name)
+    entries = _all_entry_points(binary_name, rescan=rescan)
     if not entries:
         return None
     if len(entries) == 1:
@@ -1065,13 +1063,148 @@ def install(name: str, module_dir: str = None, no_pip: bool = False,
     The current directory becomes the package. Creates __init__.py and _cliche.py
     here, along with pyproject.toml.
 
+    The pip step is skipped when the install is already current: same
+    config files, entry target, interpreter and mode as the last install
+    that went through, and the entry point still registered for this
+    directory (see _install_is_current).
+
     Args:
         name: Name of the CLI binary to create
         module_dir: Directory to use as the package (default: cwd)
         no_pip: Skip running pip install -e . (just generate files)
         package_name: Python import name (default: existing config, else directory name).
                       Use this when the binary name should differ from the import name.
-        force: Install even if a CLI with the same binary name already exists.
+        force: Install even if a CLI with the same binary name already exists,
+               and reinstall even when the install is current.
+    """
+    plan = _prepare_install(name, module_dir, package_name, force, tool)
+
+    if not no_pip:
+        if not force and _install_is_current(plan):
+            print(f"\n'{name}' is already installed and current — skipped the pip step.")
+        else:
+            # Whether the install registry was valid before pip touched the
+            # env decides if `record` below may update it in place.
+            from cliche.registry import load as load_registry, record
+            registry_before = load_registry()
+            if not _pip_install([plan]):
+                print("Warning: install failed", file=sys.stderr)
+                return
+            _check_installed(plan)
+            _remember_install(plan)
+            record(registry_before, name)
+
+    print(f"\nInstalled '{name}' successfully!")
+    if tool:
+        print(f"Installed as an isolated uv tool. Binary is on PATH via ~/.local/bin/{name}.")
+        print(f"Manage via: uv tool {{list,upgrade,uninstall}}  (or `cliche uninstall {name}`).")
+
+    _finish_installs([plan], no_pip=no_pip, no_autocomplete=no_autocomplete)
+
+    print(f"You can now run: {name} --help")
+
+
+_MANIFEST_KEYS = {"name", "dir", "package", "tool"}
+
+
+def _load_manifest(path: Path) -> list[dict]:
+    """Read the CLIs a `cliche install --from` manifest lists. Exits with a
+    message on anything malformed, before a single install starts.
+
+        tool = false                # default for every entry (optional)
+
+        [[cli]]
+        name = "mytool"             # binary name
+        dir = "tools/mytool"        # project dir, relative to the manifest
+        package = "my_tool"         # import name (optional)
+        tool = true                 # uv tool install (optional)
+    """
+    try:
+        import tomllib
+    except ImportError:  # Python 3.10
+        try:
+            import tomli as tomllib
+        except ImportError:
+            print("error: reading a manifest needs Python 3.11+ or `pip install tomli`.",
+                  file=sys.stderr)
+            sys.exit(1)
+    try:
+        data = tomllib.loads(path.read_text())
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        print(f"error: cannot read manifest {path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    unknown = set(data) - {"cli", "tool"}
+    if unknown or not isinstance(data.get("cli"), list) or not data["cli"]:
+        print(f"error: {path}: expected `[[cli]]` tables"
+              + (f"; unknown keys: {', '.join(sorted(unknown))}" if unknown else ""),
+              file=sys.stderr)
+        sys.exit(1)
+    entries = []
+    for i, cli in enumerate(data["cli"], 1):
+        unknown = set(cli) - _MANIFEST_KEYS
+        if unknown or not cli.get("name") or not cli.get("dir"):
+            print(f"error: {path}: [[cli]] #{i} needs `name` and `dir`"
+                  + (f"; unknown keys: {', '.join(sorted(unknown))}" if unknown else ""),
+                  file=sys.stderr)
+            sys.exit(1)
+        entries.append({
+            "name": cli["name"],
+            "dir": str(path.parent / os.path.expanduser(cli["dir"])),
+            "package": cli.get("package"),
+            "tool": bool(cli.get("tool", data.get("tool", False))),
+        })
+    names = [e["name"] for e in entries]
+    dupes = sorted({n for n in names if names.count(n) > 1})
+    if dupes:
+        print(f"error: {path}: listed more than once: {', '.join(dupes)}", file=sys.stderr)
+        sys.exit(1)
+    return entries
+
+
+def install_from_manifest(manifest: str, no_pip: bool = False, force: bool = False,
+                          no_autocomplete: bool = False) -> int:
+    """`cliche install --from manifest.toml`: install every CLI the manifest
+    lists (see _load_manifest).
+
+    Config files for all of them are written first. The ones not already
+    current then go through one pip (or `uv pip`) resolver invocation —
+    `--tool` entries still get a uv tool venv each — and the fast shims,
+    bytecode and autocomplete hooks are applied in one pass at the end.
+    """
+    path = Path(manifest)
+    entries = _load_manifest(path)
+    plans = [_prepare_install(e["name"], e["dir"], e["package"], force, e["tool"])
+             for e in entries]
+
+    if not no_pip:
+        pending = [p for p in plans if force or not _install_is_current(p)]
+        if len(pending) < len(plans):
+            print(f"\n{len(plans) - len(pending)} of {len(plans)} already installed and "
+                  f"current — skipped the pip step for those.")
+        if pending:
+            from cliche.registry import load as load_registry, record
+            registry_before = load_registry()
+            if not _pip_install(pending):
+                print("Warning: install failed", file=sys.stderr)
+                return 1
+            for plan in pending:
+                _check_installed(plan)
+                _remember_install(plan)
+            record(registry_before, *(p["name"] for p in pending))
+
+    print(f"\nInstalled {len(plans)} CLI(s) from {path}: "
+          f"{', '.join(p['name'] for p in plans)}")
+    _finish_installs(plans, no_pip=no_pip, no_autocomplete=no_autocomplete)
+    return 0
+
+
+def _prepare_install(name: str, module_dir: str | None, package_name: str | None,
+                     force: bool, tool: bool) -> dict:
+    """Everything `install` does before pip: validate the names, check for
+    a colliding binary, write the package's config files. Exits on error.
+
+    Returns the plan the later steps work from: name, directory,
+    package_name, pkg_dir, tool.
     """
     directory = Path(module_dir) if module_dir else Path.cwd()
 
@@ -1212,118 +1345,179 @@ def install(name: str, module_dir: str = None, no_pip: bool = False,
     # the file).
     _remove_legacy_cliche_module(pkg_dir, package_name)
 
-    # Run editable install
-    if not no_pip:
-        uv_path = shutil.which("uv")
-        sub_env = _subprocess_env_with_writable_cache()
-        if tool:
-            if not uv_path:
-                print("error: --tool requires uv (https://docs.astral.sh/uv/). Install uv first or drop --tool.",
-                      file=sys.stderr)
-                sys.exit(1)
-            cmd = [uv_path, "tool", "install", "--force", "--editable", str(directory)]
-            # cliche itself must be available inside the tool's isolated env.
-            # If we're running from an editable checkout, pass that path so uv
-            # doesn't need to resolve 'cliche' from PyPI.
-            nc_src = _cliche_source_dir()
-            if nc_src and (nc_src / "pyproject.toml").exists():
-                cmd += ["--with-editable", str(nc_src)]
-            print(f"\nRunning {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=False, env=sub_env)
-        elif uv_path:
-            print("\nRunning uv pip install -e .  (editable, into current Python env)")
-            result = subprocess.run(
-                [uv_path, "pip", "install", "--python", sys.executable, "-e", str(directory)],
-                capture_output=False, env=sub_env,
-            )
-        else:
-            print("\nRunning pip install -e .  (editable, into current Python env)")
-            result = subprocess.run(
-                [sys.executable, "-m", "pip", "install", "-e", str(directory)],
-                capture_output=False, env=sub_env,
-            )
-        if result.returncode != 0:
-            print("Warning: install failed", file=sys.stderr)
-            return
+    return {"name": name, "directory": directory, "package_name": package_name,
+            "pkg_dir": pkg_dir, "tool": tool}
 
-        # Post-install sanity: catch layout-shadowing bugs (namespace-package
-        # collisions, sibling `{pkg}.py` stealing the import, wrong src-layout
-        # mapping, etc.) that would otherwise surface as a cryptic runtime error.
-        #
-        # For --tool installs, sys.executable is the CALLER's Python, not the
-        # isolated tool venv, so importing `{package_name}` there would be
-        # testing the wrong environment. Invoke the binary shim instead — it
-        # runs through the tool venv's Python and does the real import chain.
-        if tool:
-            binary_path = shutil.which(name)
-            if not binary_path:
-                print(f"\nerror: tool install reported success but '{name}' is "
-                      f"not on PATH (expected under ~/.local/bin/).", file=sys.stderr)
-                sys.exit(1)
-            # Run from a foreign, freshly-created, empty cwd. Two historical
-            # failure modes are neutralised at once:
-            #  1. Flat-layout package-dir with a matching subdir only "worked"
-            #     when the shim was invoked from inside the workdir — every
-            #     other cwd crashed with ModuleNotFoundError. A foreign cwd
-            #     exposes that at install time.
-            #  2. A file named `{package_name}.py` sitting in /tmp (or anywhere
-            #     a polluted sys.path lands — e.g. a PYTHONPATH leading-colon
-            #     that puts CWD on sys.path) would shadow the real package
-            #     during the probe. Using a fresh empty subdir means even if
-            #     something drags the probe cwd onto sys.path, the dir has no
-            #     `.py` files that could steal the import.
-            # We also strip empty entries from PYTHONPATH in the probe's env:
-            # Python interprets an empty entry as CWD at import time, which
-            # would re-introduce the same shadowing window the empty cwd
-            # was meant to close.
-            probe_cwd = Path(tempfile.mkdtemp(prefix="cliche-probe-"))
-            probe_env = os.environ.copy()
-            pp = probe_env.get("PYTHONPATH")
-            if pp is not None:
-                cleaned_pp = os.pathsep.join(p for p in pp.split(os.pathsep) if p)
-                if cleaned_pp:
-                    probe_env["PYTHONPATH"] = cleaned_pp
-                else:
-                    probe_env.pop("PYTHONPATH", None)
-            try:
-                probe = subprocess.run(
-                    [binary_path, "--help"],
-                    capture_output=True, text=True,
-                    cwd=str(probe_cwd), env=probe_env,
-                )
-            finally:
-                shutil.rmtree(probe_cwd, ignore_errors=True)
-        else:
-            # Pip-mode probe: verify the package is importable AND the
-            # launcher closure constructs. `run_package_cli` isn't called
-            # here — constructing the launcher only validates the import
-            # chain, which is what the sanity check is testing.
+
+def _install_fingerprint(plan: dict) -> str:
+    """Digest of what an install's pip step depends on: the project's
+    config files, the entry target, the interpreter and the install mode.
+    Tool installs also carry the cliche they get installed with."""
+    import hashlib
+
+    h = hashlib.md5()
+    directory = plan["directory"]
+    for config in ("pyproject.toml", "setup.cfg", "setup.py"):
+        try:
+            h.update(config.encode() + b"\0" + (directory / config).read_bytes() + b"\0")
+        except OSError:
+            pass
+    parts = [plan["name"], _cliche_entry_target(plan["package_name"]), sys.executable,
+             str(directory.resolve()), "tool" if plan["tool"] else "pip"]
+    if plan["tool"]:
+        from cliche import __version__
+        parts += [__version__, str(_cliche_source_dir())]
+    h.update("\0".join(parts).encode())
+    return h.hexdigest()
+
+
+def _install_is_current(plan: dict) -> bool:
+    """Whether the pip step would change nothing: the fingerprint matches
+    the last successful install of this binary, and the install registry
+    still has it, from this directory, in the same mode."""
+    from cliche.registry import fingerprint, installs
+
+    if fingerprint(plan["name"]) != _install_fingerprint(plan):
+        return False
+    directory = plan["directory"].resolve()
+    for row in installs():
+        if row["binary"] != plan["name"] or row["pkg"] != plan["package_name"]:
+            continue
+        if (row["mode"] == "tool") != plan["tool"]:
+            continue
+        src = row["source_dir"] or row["pkg_dir"]
+        if src and (Path(src).resolve() == directory
+                    or directory in Path(src).resolve().parents):
+            return True
+    return False
+
+
+def _remember_install(plan: dict) -> None:
+    from cliche.registry import set_fingerprint
+    set_fingerprint(plan["name"], _install_fingerprint(plan))
+
+
+def _pip_install(plans: list[dict]) -> bool:
+    """Run the pip step for `plans`. Editable installs into this Python go
+    in one resolver invocation; each `--tool` install is its own uv tool
+    venv, so those run one by one. Returns False on the first failure."""
+    uv_path = shutil.which("uv")
+    sub_env = _subprocess_env_with_writable_cache()
+    for plan in plans:
+        if not plan["tool"]:
+            continue
+        if not uv_path:
+            print("error: --tool requires uv (https://docs.astral.sh/uv/). Install uv first or drop --tool.",
+                  file=sys.stderr)
+            sys.exit(1)
+        cmd = [uv_path, "tool", "install", "--force", "--editable", str(plan["directory"])]
+        # cliche itself must be available inside the tool's isolated env.
+        # If we're running from an editable checkout, pass that path so uv
+        # doesn't need to resolve 'cliche' from PyPI.
+        nc_src = _cliche_source_dir()
+        if nc_src and (nc_src / "pyproject.toml").exists():
+            cmd += ["--with-editable", str(nc_src)]
+        print(f"\nRunning {' '.join(cmd)}")
+        if subprocess.run(cmd, capture_output=False, env=sub_env).returncode != 0:
+            return False
+
+    editable = [arg for plan in plans if not plan["tool"]
+                for arg in ("-e", str(plan["directory"]))]
+    if not editable:
+        return True
+    what = "-e ." if len(editable) == 2 else " ".join(editable[:6]) + (" ..." if len(editable) > 6 else "")
+    if uv_path:
+        print(f"\nRunning uv pip install {what}  (editable, into current Python env)")
+        cmd = [uv_path, "pip", "install", "--python", sys.executable, *editable]
+    else:
+        print(f"\nRunning pip install {what}  (editable, into current Python env)")
+        cmd = [sys.executable, "-m", "pip", "install", *editable]
+    return subprocess.run(cmd, capture_output=False, env=sub_env).returncode == 0
+
+
+def _check_installed(plan: dict) -> None:
+    """Post-install sanity check for one plan; exits when the binary won't
+    import cleanly."""
+    name, directory = plan["name"], plan["directory"]
+    package_name, tool = plan["package_name"], plan["tool"]
+    # Post-install sanity: catch layout-shadowing bugs (namespace-package
+    # collisions, sibling `{pkg}.py` stealing the import, wrong src-layout
+    # mapping, etc.) that would otherwise surface as a cryptic runtime error.
+    #
+    # For --tool installs, sys.executable is the CALLER's Python, not the
+    # isolated tool venv, so importing `{package_name}` there would be
+    # testing the wrong environment. Invoke the binary shim instead — it
+    # runs through the tool venv's Python and does the real import chain.
+    if tool:
+        binary_path = shutil.which(name)
+        if not binary_path:
+            print(f"\nerror: tool install reported success but '{name}' is "
+                  f"not on PATH (expected under ~/.local/bin/).", file=sys.stderr)
+            sys.exit(1)
+        # Run from a foreign, freshly-created, empty cwd. Two historical
+        # failure modes are neutralised at once:
+        #  1. Flat-layout package-dir with a matching subdir only "worked"
+        #     when the shim was invoked from inside the workdir — every
+        #     other cwd crashed with ModuleNotFoundError. A foreign cwd
+        #     exposes that at install time.
+        #  2. A file named `{package_name}.py` sitting in /tmp (or anywhere
+        #     a polluted sys.path lands — e.g. a PYTHONPATH leading-colon
+        #     that puts CWD on sys.path) would shadow the real package
+        #     during the probe. Using a fresh empty subdir means even if
+        #     something drags the probe cwd onto sys.path, the dir has no
+        #     `.py` files that could steal the import.
+        # We also strip empty entries from PYTHONPATH in the probe's env:
+        # Python interprets an empty entry as CWD at import time, which
+        # would re-introduce the same shadowing window the empty cwd
+        # was meant to close.
+        probe_cwd = Path(tempfile.mkdtemp(prefix="cliche-probe-"))
+        probe_env = os.environ.copy()
+        pp = probe_env.get("PYTHONPATH")
+        if pp is not None:
+            cleaned_pp = os.pathsep.join(p for p in pp.split(os.pathsep) if p)
+            if cleaned_pp:
+                probe_env["PYTHONPATH"] = cleaned_pp
+            else:
+                probe_env.pop("PYTHONPATH", None)
+        try:
             probe = subprocess.run(
-                [sys.executable, "-c",
-                 f"import {package_name} as _m; "
-                 f"assert _m.__file__, 'package resolved as namespace (no __init__.py)'; "
-                 f"from cliche.launcher import launch_{package_name}; "
-                 f"assert callable(launch_{package_name}); "
-                 f"print(_m.__file__)"],
+                [binary_path, "--help"],
                 capture_output=True, text=True,
+                cwd=str(probe_cwd), env=probe_env,
             )
-        if probe.returncode != 0:
-            print(f"\nerror: install completed but the binary won't import cleanly:", file=sys.stderr)
-            print(probe.stderr.strip(), file=sys.stderr)
-            print(f"\nLikely cause: something in {directory} is shadowing the package "
-                  f"named '{package_name}'. Common culprits:", file=sys.stderr)
-            print(f"  - a file named `{package_name}.py` alongside the package dir", file=sys.stderr)
-            print(f"  - a subdir `{package_name}/` with missing `__init__.py`", file=sys.stderr)
-            print(f"  - conflicting `src/{package_name}/` layout", file=sys.stderr)
-            print(f"  - package_name mismatch with actual on-disk structure", file=sys.stderr)
-            sys.exit(1)
+        finally:
+            shutil.rmtree(probe_cwd, ignore_errors=True)
+    else:
+        # Pip-mode probe: verify the package is importable AND the
+        # launcher closure constructs. `run_package_cli` isn't called
+        # here — constructing the launcher only validates the import
+        # chain, which is what the sanity check is testing.
+        probe = subprocess.run(
+            [sys.executable, "-c",
+             f"import {package_name} as _m; "
+             f"assert _m.__file__, 'package resolved as namespace (no __init__.py)'; "
+             f"from cliche.launcher import launch_{package_name}; "
+             f"assert callable(launch_{package_name}); "
+             f"print(_m.__file__)"],
+            capture_output=True, text=True,
+        )
+    if probe.returncode != 0:
+        print(f"\nerror: install completed but the binary won't import cleanly:", file=sys.stderr)
+        print(probe.stderr.strip(), file=sys.stderr)
+        print(f"\nLikely cause: something in {directory} is shadowing the package "
+              f"named '{package_name}'. Common culprits:", file=sys.stderr)
+        print(f"  - a file named `{package_name}.py` alongside the package dir", file=sys.stderr)
+        print(f"  - a subdir `{package_name}/` with missing `__init__.py`", file=sys.stderr)
+        print(f"  - conflicting `src/{package_name}/` layout", file=sys.stderr)
+        print(f"  - package_name mismatch with actual on-disk structure", file=sys.stderr)
+        sys.exit(1)
 
-    print(f"\nInstalled '{name}' successfully!")
-    if tool:
-        print(f"Installed as an isolated uv tool. Binary is on PATH via ~/.local/bin/{name}.")
-        print(f"Manage via: uv tool {{list,upgrade,uninstall}}  (or `cliche uninstall {name}`).")
 
-    # Auto-apply the fast-shim wrapper (clichec-backed). Skipped when:
+def _finish_installs(plans: list[dict], no_pip: bool = False,
+                     no_autocomplete: bool = False) -> None:
+    """The steps after pip, in one pass over every plan: fast shims,
+    bytecode, and the autocomplete hooks (each rc file written once)."""
+    # Auto-apply the fast shim (clichec as the binary). Skipped when:
     #   - no C compiler is present and no wheel-bundled binary either (the
     #     yellow one-time hint covers this — see _print_no_compiler_hint)
     #   - it's a `--tool` install (binary lives in an isolated uv-tool venv
@@ -1332,22 +1526,34 @@ def install(name: str, module_dir: str = None, no_pip: bool = False,
     #     want to stay on the Python shim — debugging, suspicious of the
     #     C path, etc; matches the same flag in cliche.launcher)
     # Failures are non-fatal: the binary keeps working as a plain Python shim.
-    if not no_pip and not tool and not os.environ.get("CLICHE_NO_FAST_SHIM"):
+    shim_plans = [p for p in plans if not p["tool"]]
+    if not no_pip and shim_plans and not os.environ.get("CLICHE_NO_FAST_SHIM"):
         try:
             from cliche._clichec import install_fast_shim, ensure_built
             if ensure_built(verbose=False):
-                ok, _msg = install_fast_shim(name, package_name, str(pkg_dir))
-                if ok:
-                    print("Fast-launch active (clichec) — help/completion served from C.")
+                for plan in shim_plans:
+                    ok, _msg = install_fast_shim(plan["name"], plan["package_name"],
+                                                 str(plan["pkg_dir"]))
+                    if ok:
+                        print("Fast-launch active (clichec) — help/completion served from C."
+                              if len(plans) == 1 else f"Fast-launch active (clichec): {plan['name']}")
             else:
                 _print_no_compiler_hint()
         except Exception:
             pass  # never break a working install on the optional fast path
 
+    # Bytecode ahead of time (cliche/bytecode.py): the package's modules and
+    # cliche's runtime, so the first Python fallback doesn't compile them —
+    # and no fallback does when site-packages is read-only.
+    if not no_pip:
+        for plan in plans:
+            _warm_bytecode(plan["name"], plan["package_name"], plan["tool"],
+                           pkg_dir=None if plan["tool"] else str(plan["pkg_dir"]))
+
     # Shell autocomplete: argcomplete is already a dep and run.py already handles
     # the _ARGCOMPLETE env var. All we need is the shell-side eval line.
     if not no_autocomplete:
-        touched = _register_autocomplete(name)
+        touched = _register_autocomplete(*(plan["name"] for plan in plans))
         if touched:
             print(f"Autocomplete registered in: {', '.join(touched)}")
             print(f"  (open a new shell or `source` the rc file to activate)")
@@ -1355,8 +1561,6 @@ def install(name: str, module_dir: str = None, no_pip: bool = False,
             # Either every rc already had the line, or no rc exists. Both are fine.
             pass
 
-    print(f"You can now run: {name} --help")
-
 
 AUTO_INIT_MARKER = '"""Package created by cliche."""'
 
@@ -1384,30 +1588,18 @@ def _pristine_pyproject(package_name: str) -> str:
 def _known_cliche_packages() -> set[str]:
     """Set of package names currently registered as cliche-installed.
 
-    Same source of truth as `cliche ls`: console_scripts entry points whose
-    target matches our `_cliche` shim, plus uv-tool entries.
+    Same source of truth as `cliche ls`: the install registry, i.e.
+    console_scripts entry points whose target matches our launcher, plus
+    uv-tool entries.
     """
-    from importlib.metadata import entry_points
-    known: set[str] = set()
-    for ep in entry_points(group="console_scripts"):
-        pkg_name = _parse_cliche_entry(ep.value)
-        if pkg_name:
-            known.add(pkg_name)
-    for t in _uv_tool_cliche_entries():
-        known.add(t["pkg"])
-    return known
+    from cliche.registry import installs
+    return {row["pkg"] for row in installs()}
 
 
 def _known_cliche_binaries() -> set[str]:
     """Set of binary names currently registered as cliche-installed."""
-    from importlib.metadata import entry_points
-    known: set[str] = set()
-    for ep in entry_points(group="console_scripts"):
-        if _parse_cliche_entry(ep.value):
-            known.add(ep.name)
-    for t in _uv_tool_cliche_entries():
-        known.add(t["binary"])
-    return known
+    from cliche.registry import installs
+    return {row["binary"] for row in installs()}
 
 
 def _remove_orphan_autocompletes() -> list[str]:
@@ -1415,17 +1607,15 @@ def _remove_orphan_autocompletes() -> list[str]:
 
     Only touches lines bearing our `# cliche: autocomplete for <name>` comment
     — lines from a different cliche fork (e.g. `# new_cliche: autocomplete
-    for <name>`) are left alone, even though their `register-python-argcomplete`
-    invocation looks identical. Returns the rc paths actually modified.
+    for <name>`) are left alone, even though their hook may look identical.
+    Returns the rc paths actually modified.
     """
     known = _known_cliche_binaries()
     # Match a full line whose trailing comment is OUR tag (anchored to `#` so
     # we don't catch `new_cliche:` as a substring), capturing the binary name
-    # both from the registration call and the comment tag — they always agree
-    # in lines we wrote, so either capture is fine.
+    # from the comment tag.
     line_re = re.compile(
-        rf'^.*register-python-argcomplete\s+(?:--shell\s+\S+\s+)?(\S+)\b.*'
-        rf'#\s*{re.escape(_TAG)}\s+(\S+)\s*$\n?',
+        rf'^.*#\s*{re.escape(_TAG)}\s+(\S+)[ \t]*$\n?',
         re.MULTILINE,
     )
     header_re = re.compile(
@@ -1443,7 +1633,7 @@ def _remove_orphan_autocompletes() -> list[str]:
             continue
 
         def _strip(m: re.Match) -> str:
-            name = m.group(2)  # comment-tag name (canonical)
+            name = m.group(1)  # comment-tag name (canonical)
             return "" if name not in known else m.group(0)
 
         new_content = line_re.sub(_strip, content)
@@ -1479,11 +1669,24 @@ def _remove_orphan_caches() -> list[Path]:
         stem = cache_file.stem
         pkg = stem.rsplit("_", 1)[0]
         if pkg and pkg not in known:
-            try:
-                cache_file.unlink()
-                removed.append(cache_file)
-            except OSError:
-                pass
+            # The binary index (cliche/cache_index.py), the help store
+            # (cliche/help_store.py), the watcher token (cliche/watch.py),
+            # the shards (cliche/shards.py) and the stored completions
+            # (cliche/completions.py) go with their JSON.
+            for path in (cache_file, cache_file.with_suffix(".idx"),
+                         cache_file.with_suffix(".help"),
+                         cache_file.with_suffix(".help.lock"),
+                         cache_file.with_suffix(".gen"),
+                         cache_file.with_suffix(".gen.lock")):
+                try:
+                    path.unlink()
+                    removed.append(path)
+                except OSError:
+                    pass
+            from cliche.shards import remove as remove_shards
+            from cliche.completions import remove as remove_completions
+            removed += remove_shards(cache_file)
+            removed += remove_completions(cache_file)
     return removed
 
 
@@ -1502,12 +1705,35 @@ def _remove_runtime_cache(package_name: str) -> list[Path]:
     if not cache_dir.is_dir():
         return []
     removed = []
-    for cache_file in cache_dir.glob(f"{package_name}_????????.json"):
-        try:
-            cache_file.unlink()
-            removed.append(cache_file)
-        except OSError:
-            pass
+    # `.idx` is the binary command index clichec reads (cliche/cache_index.py),
+    # `.help` / `.help.lock` the pre-rendered help store (cliche/help_store.py).
+    # `.sock` / `.sock.lock` belong to the opt-in zygote server
+    # (cliche/zygote.py); a live server notices its socket is gone and
+    # winds down at its idle timeout. `.gen` / `.gen.lock` belong to the
+    # `cliche watch` daemon (cliche/watch.py); without them the launchers
+    # fall back to mtime checks even if a daemon is still running.
+    # `.shards/` is the Python launcher's sharded copy (cliche/shards.py),
+    # `.completions/` the `@completer` results (cliche/completions.py).
+    from cliche.shards import remove as remove_shards
+    from cliche.completions import remove as remove_completions
+    for shards in cache_dir.glob(f"{package_name}_????????.shards"):
+        removed += remove_shards(shards.with_suffix(".json"))
+    for stored in cache_dir.glob(f"{package_name}_????????.completions"):
+        removed += remove_completions(stored.with_suffix(".json"))
+    for pattern in (f"{package_name}_????????.json",
+                    f"{package_name}_????????.idx",
+                    f"{package_name}_????????.help",
+                    f"{package_name}_????????.help.lock",
+                    f"{package_name}_????????.sock",
+                    f"{package_name}_????????.sock.lock",
+                    f"{package_name}_????????.gen",
+                    f"{package_name}_????????.gen.lock"):
+        for cache_file in cache_dir.glob(pattern):
+            try:
+                cache_file.unlink()
+                removed.append(cache_file)
+            except OSError:
+                pass
     return removed
 
 
@@ -1558,6 +1784,8 @@ def uninstall(name: str, module_dir: str = None, pkg: str = None, **kwargs):
     # happens to be in cwd. Prevents the footgun where running uninstall from a
     # different directory would happily uninstall that directory's package.
     matches = _all_entry_points(name)
+    from cliche.registry import load as load_registry, record, set_fingerprint
+    registry_before = load_registry()
     if len(matches) > 1:
         if pkg is None:
             # Before giving up, try to infer from cwd: if exactly one candidate
@@ -1677,6 +1905,8 @@ def uninstall(name: str, module_dir: str = None, pkg: str = None, **kwargs):
         package_name = directory.name.replace("-", "_") if directory else name
 
     print(f"Uninstalling package: {package_name}")
+    from cliche._clichec import _resolve_installed_binary, entry_config_path
+    shim_path = _resolve_installed_binary(name)
     sub_env = _subprocess_env_with_writable_cache()
     if tool_entry and uv_path:
         # `uv tool uninstall` expects the TOOL / package name, not the binary.
@@ -1699,12 +1929,17 @@ def uninstall(name: str, module_dir: str = None, pkg: str = None, **kwargs):
             capture_output=False, env=sub_env,
         )
 
+    # pip removes the binary, not the settings clichec installed as it reads
+    # (cliche._clichec.install_fast_shim).
+    if shim_path and not os.path.lexists(shim_path):
+        entry_config_path(shim_path).unlink(missing_ok=True)
+
     # Zombie check: the pip/uv uninstall may say "not installed" (stale
     # egg-info on PYTHONPATH, orphaned dist-info, etc.) while the entry
     # point is still reachable via importlib.metadata. Re-query; if the
     # binary is still listed, try to surgically strip it from the backing
     # metadata so the user isn't lied to.
-    still_there = _existing_entry_point(name)
+    still_there = _existing_entry_point(name, rescan=True)
     if still_there is not None:
         zombie_path = _zombie_metadata_path(name)
         if zombie_path is not None:
@@ -1721,6 +1956,8 @@ def uninstall(name: str, module_dir: str = None, pkg: str = None, **kwargs):
         else:
             _print_zombie_diagnostic(name, None)
             sys.exit(1)
+    record(registry_before, name)
+    set_fingerprint(name, None)
 
     cleaned = []
     init_file = None  # set only when we have a local dir
@@ -2218,140 +2455,33 @@ def _tilde_home(p: str) -> str:
 
 def list_installed():
     """List CLI tools installed via cliche (detected by the `_cliche.py` entry point)."""
-    import hashlib
-    import importlib.util
-    import json
     import os
-    from importlib.metadata import PackageNotFoundError, entry_points, version
+
+    from cliche.registry import installs
 
     cache_home = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
     cache_dir = Path(cache_home) / "cliche"
 
+    # The registry (cliche/registry.py) holds what the environment scan
+    # found; only whether each source dir is still there is checked live.
     rows = []
-    for ep in entry_points(group="console_scripts"):
-        pkg_name = _parse_cliche_entry(ep.value)
-        if pkg_name is None:
-            continue
-
-        # Resolve package dir WITHOUT importing — `__import__` would execute the
-        # package's __init__.py (and all its transitive imports), which dominated
-        # `cliche ls` runtime: a single CLI pulling in pydantic/google-genai
-        # cost ~1s on its own. `find_spec` only locates the file.
-        try:
-            spec = importlib.util.find_spec(pkg_name)
-        except (ImportError, ValueError):
-            spec = None
-        if spec and spec.origin:
-            pkg_path = Path(spec.origin).parent
-        elif spec and spec.submodule_search_locations:
-            pkg_path = Path(next(iter(spec.submodule_search_locations)))
+    for row in installs():
+        if row["mode"] == "tool":
+            src_dir = row["source_dir"]
+            # The tool env itself exists when no source dir was recorded.
+            exists = Path(src_dir).exists() if src_dir else True
+            path = src_dir or row["env_path"]
         else:
-            pkg_path = None
-
-        # Version
-        try:
-            ver = version(pkg_name)
-        except PackageNotFoundError:
-            ver = "?"
-
-        # Editable install? A package can have MULTIPLE concurrent metadata
-        # records (a stale .egg-info on PYTHONPATH AND a fresh .dist-info from
-        # `uv pip install -e .`) — importlib's `distribution(name)` returns
-        # only the first. Iterate `distributions(name=name)` and accept the
-        # editable signal from ANY of them, so the table shows `edit` when the
-        # user's most recent install was editable, regardless of leftover
-        # egg-info metadata competing in sys.path.
-        editable = False
-        try:
-            import importlib.metadata as im
-            for dist in im.distributions(name=pkg_name):
-                direct_url = dist.read_text("direct_url.json")
-                if direct_url:
-                    data = json.loads(direct_url)
-                    if data.get("dir_info", {}).get("editable"):
-                        editable = True
-                        break
-                # uv's PEP 660 editable installs drop a `__editable__.<pkg>-<ver>.pth`
-                # next to the dist-info instead of writing direct_url.json.
-                # Detect by the presence of that .pth sibling.
-                meta_path = getattr(dist, "_path", None)
-                if meta_path:
-                    parent = Path(meta_path).parent
-                    if any(parent.glob(f"__editable__.{pkg_name}-*.pth")):
-                        editable = True
-                        break
-        except Exception:
-            pass
-
-        # Source dir alive?
-        exists = pkg_path is not None and pkg_path.exists()
-
-        # Count @cli commands from the runtime cache, if present
-        n_cmds = None
-        if pkg_path:
-            dir_hash = hashlib.md5(str(pkg_path).encode()).hexdigest()[:8]
-            cache_file = cache_dir / f"{pkg_name}_{dir_hash}.json"
-            if cache_file.exists():
-                try:
-                    data = json.loads(cache_file.read_text())
-                    n_cmds = sum(len(f.get("functions", []))
-                                 for f in data.get("files", {}).values())
-                except Exception:
-                    pass
-
+            exists = bool(row["pkg_dir"]) and Path(row["pkg_dir"]).exists()
+            path = row["pkg_dir"] or "?"
         rows.append({
-            "binary": ep.name,
-            "pkg": pkg_name,
-            "ver": ver,
-            "mode": "edit" if editable else "site",
+            "binary": row["binary"],
+            "pkg": row["pkg"],
+            "ver": row["ver"],
+            "mode": row["mode"],
             "exists": exists,
-            "n_cmds": n_cmds,
-            "path": _tilde_home(str(pkg_path)) if pkg_path else "?",
-        })
-
-    # uv-tool-installed CLIs (live in isolated venvs, not in this Python env)
-    for t in _uv_tool_cliche_entries():
-        # Resolve source dir from the tool's editable install metadata
-        env_path = Path(t["env_path"])
-        src_dir = None
-        try:
-            for de in (env_path / "lib").glob("python*/site-packages"):
-                sp = de
-                dist_info_dirs = list(sp.glob(f"{t['pkg']}*.dist-info"))
-                for d in dist_info_dirs:
-                    direct_url = d / "direct_url.json"
-                    if direct_url.exists():
-                        data = json.loads(direct_url.read_text())
-                        url = data.get("url", "")
-                        if url.startswith("file://"):
-                            src_dir = url[len("file://"):]
-                            break
-                if src_dir:
-                    break
-        except Exception:
-            pass
-
-        exists = bool(src_dir) and Path(src_dir).exists()
-        n_cmds = None
-        if src_dir:
-            dir_hash = hashlib.md5(src_dir.encode()).hexdigest()[:8]
-            cache_file = cache_dir / f"{t['pkg']}_{dir_hash}.json"
-            if cache_file.exists():
-                try:
-                    data = json.loads(cache_file.read_text())
-                    n_cmds = sum(len(f.get("functions", []))
-                                 for f in data.get("files", {}).values())
-                except Exception:
-                    pass
-
-        rows.append({
-            "binary": t["binary"],
-            "pkg": t["pkg"],
-            "ver": t["ver"],
-            "mode": "tool",
-            "exists": exists if src_dir else True,  # tool env itself exists
-            "n_cmds": n_cmds,
-            "path": _tilde_home(src_dir or t["env_path"]),
+            "n_cmds": row["n_cmds"],
+            "path": _tilde_home(path),
         })
 
     if not rows:
@@ -2361,13 +2491,11 @@ def list_installed():
     rows.sort(key=lambda r: r["binary"])
 
     # Per-binary: read each shim file ONCE and derive both the LIVE/MASKED
-    # owner (regex against full content) and the SHIM kind (`c`/`py`/`?` from
-    # the WRAPPER_MARKER in the first ~512 bytes). Previously these were two
+    # owner (regex against full content) and the SHIM kind (`c`/`py`/`?`:
+    # clichec installed as the binary, with its settings sidecar, or the
+    # WRAPPER_MARKER in the first ~512 bytes). Previously these were two
     # separate passes that each called shutil.which + open per binary.
-    try:
-        from cliche._clichec import WRAPPER_MARKER
-    except ImportError:
-        WRAPPER_MARKER = "# cliche fast-shim wrapper"
+    from cliche._clichec import WRAPPER_MARKER, entry_config_path
     live_owners: dict[str, str | None] = {}
     shim_kinds: dict[str, str] = {}
     for bin_name in {r["binary"] for r in rows}:
@@ -2384,7 +2512,9 @@ def list_installed():
             shim_kinds[bin_name] = "?"
             live_owners[bin_name] = None
             continue
-        shim_kinds[bin_name] = "c" if WRAPPER_MARKER in content[:512] else "py"
+        fast = (WRAPPER_MARKER in content[:512] if content.startswith("#!")
+                else entry_config_path(path).is_file())
+        shim_kinds[bin_name] = "c" if fast else "py"
         m = re.search(r'from\s+([A-Za-z_][A-Za-z0-9_]*)\._cliche\s+import\s+main', content)
         live_owners[bin_name] = m.group(1) if m else None
 
@@ -2451,10 +2581,11 @@ def list_installed():
             pass
     autocomp_for: dict[str, bool] = {}
     for bin_name in {r["binary"] for r in rows}:
-        needle_bash = f"register-python-argcomplete {bin_name}"
-        needle_fish = f"register-python-argcomplete --shell fish {bin_name}"
+        needles = (f"# {_TAG} {bin_name}\n",
+                   f"register-python-argcomplete {bin_name}",
+                   f"register-python-argcomplete --shell fish {bin_name}")
         autocomp_for[bin_name] = any(
-            needle_bash in blob or needle_fish in blob for blob in rc_blobs
+            needle in blob for blob in rc_blobs for needle in needles
         )
     for r in rows:
         r["autocomp"] = "yes" if autocomp_for.get(r["binary"]) else "no"
@@ -2641,9 +2772,10 @@ def _enumerate_cliche_installs(only: str | None = None) -> list[dict]:
     Keeping the fields raw-and-factual means adding a new migration
     doesn't require adding a new pre-computed boolean to every install.
     """
-    import json as _json
     from importlib.metadata import entry_points
 
+    from cliche.registry import _tool_site_packages, _tool_source_dir
+
     def _resolve_source_dir(pkg: str) -> str | None:
         src = _editable_source_dir(pkg)
         if src is not None:
@@ -2699,21 +2831,10 @@ def _enumerate_cliche_installs(only: str | None = None) -> list[dict]:
         else:
             entry_value = ""
         src_dir = None
-        try:
-            env_path = Path(entry["env_path"])
-            for site_packages in (env_path / "lib").glob("python*/site-packages"):
-                for dist_info in site_packages.glob(f"{entry['pkg']}*.dist-info"):
-                    direct_url = dist_info / "direct_url.json"
-                    if direct_url.exists():
-                        data = _json.loads(direct_url.read_text())
-                        url = data.get("url", "")
-                        if url.startswith("file://"):
-                            src_dir = url[len("file://"):]
-                            break
-                if src_dir:
-                    break
-        except Exception:
-            pass
+        for site_packages in _tool_site_packages(entry["env_path"]):
+            src_dir = _tool_source_dir(site_packages, entry["pkg"])
+            if src_dir:
+                break
         installs.append({
             "binary": entry["binary"],
             "pkg": entry["pkg"],
@@ -2786,10 +2907,13 @@ def migrate(only: str | None = None, dry_run: bool = False, yes: bool = False) -
             print("Aborted.")
             return 1
 
+    from cliche.registry import load as load_registry, record
+
     successes = 0
     total = sum(len(ms) for _, ms in plan)
     failures: list[tuple[str, str, str]] = []
     for inst, needed in plan:
+        registry_before = load_registry()
         for m in needed:
             print(f"\n-- applying [{m.id}] to {inst['binary']} ({inst['mode']}) --")
             ok, msg = m.apply(inst)
@@ -2797,6 +2921,7 @@ def migrate(only: str | None = None, dry_run: bool = False, yes: bool = False) -
                 successes += 1
             else:
                 failures.append((inst["binary"], m.id, msg))
+        record(registry_before, inst["binary"])
 
     print(f"\nDone. Applied {successes}/{total} migration(s).")
     if failures:
@@ -2807,10 +2932,88 @@ def migrate(only: str | None = None, dry_run: bool = False, yes: bool = False) -
     return 0
 
 
+def watch(name: str, detach: bool = False, stop: bool = False) -> int:
+    """Run (or stop) the cache watcher daemon for the CLI named `name`.
+
+    The daemon (cliche/watch.py) must run under the interpreter the CLI was
+    installed into — for `--tool` installs that's the tool's own venv — so
+    this resolves the install and hands over to that interpreter.
+    """
+    entry = _existing_entry_point(name)
+    if entry is None:
+        print(f"Error: no cliche CLI named '{name}' is installed", file=sys.stderr)
+        return 1
+    python = sys.executable
+    if entry.get("env_path"):
+        python = str(Path(entry["env_path"]) / "bin" / "python")
+    pkg = entry["pkg"]
+    if stop:
+        code = f"import sys; from cliche.watch import stop; sys.exit(stop({pkg!r}))"
+    else:
+        code = (f"import sys; from cliche.watch import serve; "
+                f"sys.exit(serve({pkg!r}, {name!r}, verbose={not detach!r}))")
+    argv = [python, "-c", code]
+    if not detach:
+        os.execv(python, argv)
+    try:
+        proc = subprocess.Popen(
+            argv, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, start_new_session=True, close_fds=True,
+        )
+    except OSError as e:
+        print(f"Error: cannot start the watcher: {e}", file=sys.stderr)
+        return 1
+    print(f"watching {name} in the background (pid {proc.pid}); "
+          f"stop with `cliche watch {name} --stop`")
+    return 0
+
+
+def _warm_bytecode(name: str, pkg: str, tool: bool, pkg_dir: str | None = None,
+                   verbose: bool = False) -> int:
+    """Run `cliche.bytecode.warm` for `pkg` under the interpreter the CLI
+    named `name` runs under: this one, or the tool venv's for `--tool`."""
+    if not tool:
+        from cliche.bytecode import warm as warm_bytecode
+        return warm_bytecode(pkg, pkg_dir, verbose=verbose)
+    entry = _existing_entry_point(name) or {}
+    if not entry.get("env_path"):
+        return 1
+    python = str(Path(entry["env_path"]) / "bin" / "python")
+    code = (f"import sys; from cliche.bytecode import warm; "
+            f"sys.exit(warm({pkg!r}, verbose={verbose!r}))")
+    try:
+        return subprocess.run([python, "-c", code]).returncode
+    except OSError:
+        return 1
+
+
+def warm(name: str) -> int:
+    """Compile the CLI named `name` and cliche's runtime to bytecode ahead
+    of time (cliche/bytecode.py)."""
+    entry = _existing_entry_point(name)
+    if entry is None:
+        print(f"Error: no cliche CLI named '{name}' is installed", file=sys.stderr)
+        return 1
+    return _warm_bytecode(name, entry["pkg"], bool(entry.get("env_path")), verbose=True)
+
+
+def cache_gc(max_mb: float | None = None) -> int:
+    """Shrink the shared parse store (cliche/objects.py) to `max_mb` MiB,
+    dropping least-recently-used records first. Defaults to
+    CLICHE_OBJECTS_MAX_MB (64)."""
+    from cliche import objects
+
+    limit = None if max_mb is None else max(0, int(max_mb * 1024 * 1024))
+    removed, freed, kept, kept_bytes = objects.gc(limit)
+    print(f"removed {removed} records ({freed / 2**20:.1f} MiB), "
+          f"kept {kept} ({kept_bytes / 2**20:.1f} MiB) in {objects.objects_dir()}")
+    return 0
+
+
 def main_cli():
     """Entry point for the cliche command."""
     import argparse
-    from cliche.run import CleanArgumentParser
+    from cliche.argparser import CleanArgumentParser
 
     parser = CleanArgumentParser(prog="cliche", description="Install or uninstall cliche CLI tools")
     # Early --version short-circuit: print just the cliche version and
@@ -2848,8 +3051,13 @@ def main_cli():
 
     # Install subcommand
     install_parser = subparsers.add_parser("install", help="Install a CLI tool")
-    install_parser.add_argument("name", help="Name of the CLI command to create")
+    install_parser.add_argument("name", nargs="?", help="Name of the CLI command to create")
     install_parser.add_argument("--module-dir", "-d", help="Project directory (default: current directory)")
+    install_parser.add_argument(
+        "--from", dest="manifest", metavar="MANIFEST",
+        help="Install every CLI listed in a TOML manifest ([[cli]] tables with name, dir, "
+             "and optionally package and tool), with one pip resolver run.",
+    )
     install_parser.add_argument("--no-pip", action="store_true", help="Skip pip install -e . (just generate files)")
     install_parser.add_argument(
         "--package-name", "-p",
@@ -2926,6 +3134,67 @@ def main_cli():
         help="Skip the interactive confirmation prompt.",
     )
 
+    # watch subcommand (inotify daemon that keeps the cache fresh)
+    watch_parser = subparsers.add_parser(
+        "watch",
+        help="Keep a CLI's cache fresh with an inotify daemon (Linux)",
+        description=(
+            "Runs a daemon that watches the CLI's package tree with inotify\n"
+            "and rescans on every change. While it runs, each invocation\n"
+            "checks the cache with one token read instead of a stat per\n"
+            "tracked file. Stop it and everything falls back to the usual\n"
+            "mtime checks."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    watch_parser.add_argument("name", help="Name of the installed CLI command")
+    watch_parser.add_argument(
+        "--detach", action="store_true",
+        help="Run in the background instead of the foreground.",
+    )
+    watch_parser.add_argument(
+        "--stop", action="store_true",
+        help="Stop the running watcher for this CLI.",
+    )
+
+    # warm subcommand (ahead-of-time bytecode)
+    warm_parser = subparsers.add_parser(
+        "warm",
+        help="Compile a CLI and cliche's runtime to bytecode ahead of time",
+        description=(
+            "Compiles the CLI's modules and cliche's own to .pyc files, so\n"
+            "no invocation has to. Where they can't be written next to the\n"
+            "sources (read-only site-packages) they go to a private pycache\n"
+            "under $XDG_CACHE_HOME/cliche/pycache/, which the fast-shim\n"
+            "wrapper points Python at. `cliche install` does this already;\n"
+            "run it again after an upgrade of cliche or Python."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    warm_parser.add_argument("name", help="Name of the installed CLI command")
+
+    # cache subcommand (maintenance of the shared parse store)
+    cache_parser = subparsers.add_parser(
+        "cache",
+        help="Manage the parse store shared by all CLI caches",
+        description=(
+            "Every cache scan looks files up by content in a shared store\n"
+            "($XDG_CACHE_HOME/cliche/objects/) before parsing them, so a\n"
+            "checkout, a moved workspace or a second venv reuses earlier\n"
+            "parses. The store is trimmed once a day on its own; `gc` trims\n"
+            "it now."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    cache_sub = cache_parser.add_subparsers(dest="cache_command")
+    gc_parser = cache_sub.add_parser(
+        "gc", help="Evict least-recently-used parse records down to a size limit",
+    )
+    gc_parser.add_argument(
+        "--max-mb", type=float, default=None,
+        help="Size to trim the store to, in MiB (default: $CLICHE_OBJECTS_MAX_MB or 64).",
+    )
+
     # The C fast-fail launcher (clichec) and the fast-shim wrapper that
     # exec's it are now applied automatically: `cliche install` calls
     # `install_fast_shim` directly, and any surviving Python shim
@@ -2940,7 +3209,15 @@ def main_cli():
         print(LLM_GUIDE)
         return
 
-    if args.command == "install":
+    if args.command == "install" and args.manifest:
+        if args.name or args.module_dir or args.package_name or args.tool:
+            install_parser.error("--from takes the CLIs from the manifest; "
+                                 "drop the name, -d, -p and -t")
+        sys.exit(install_from_manifest(args.manifest, no_pip=args.no_pip, force=args.force,
+                                       no_autocomplete=args.no_autocomplete))
+    elif args.command == "install":
+        if not args.name:
+            install_parser.error("the name of the CLI is required (or --from MANIFEST)")
         install(args.name, module_dir=args.module_dir, no_pip=args.no_pip,
                 package_name=args.package_name, force=args.force, tool=args.tool,
                 no_autocomplete=args.no_autocomplete)
@@ -2950,6 +3227,14 @@ def main_cli():
         list_installed()
     elif args.command == "migrate":
         sys.exit(migrate(only=args.only, dry_run=args.dry_run, yes=args.yes))
+    elif args.command == "watch":
+        sys.exit(watch(args.name, detach=args.detach, stop=args.stop))
+    elif args.command == "warm":
+        sys.exit(warm(args.name))
+    elif args.command == "cache":
+        if args.cache_command == "gc":
+            sys.exit(cache_gc(args.max_mb))
+        cache_parser.print_help()
     else:
         parser.print_help()
 
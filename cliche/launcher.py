@@ -66,6 +66,69 @@ def _clean_sys_path() -> None:
     sys.path[:] = cleaned
 
 
+# Set by `restore_site` when the environment changed since the fast shim
+# recorded it; `_maybe_self_upgrade_shim` then writes it again.
+_site_changed = False
+
+
+def restore_site(stamps: dict, hooks: list, prefix: str, exec_prefix: str) -> None:
+    """Finish the start-up the fast shim's `python -S` skipped.
+
+    The fast shim (clichec, or the shell wrapper) has already put the
+    recorded sys.path in place (`cliche._clichec.record_site`). This restores the venv's prefixes and
+    runs the `.pth` lines that installed an import hook, which is all of
+    `site` a CLI's imports need. Other `.pth` side effects are skipped; set
+    CLICHE_FULL_SITE=1 to keep them.
+
+    Once any site-packages dir's mtime differs from the recording (a pip
+    install or uninstall since), the recording can't be trusted: run the
+    real `site.main()` instead and have the fast shim recorded again.
+    """
+    import os
+    import sys
+    global _site_changed
+    for directory, mtime in stamps.items():
+        try:
+            current = os.stat(directory).st_mtime_ns
+        except OSError:
+            current = -1
+        if current != mtime:
+            import site
+            site.main()
+            _site_changed = True
+            return
+    sys.prefix, sys.exec_prefix = prefix, exec_prefix
+    for line in hooks:
+        try:
+            exec(line)
+        except Exception:
+            pass   # as `site` does, a broken .pth line doesn't stop start-up
+    # `exit()` / `quit()` are builtins only `site.main` installs.
+    import site
+    site.setquit()
+
+
+def _entry_binary_current(path: str) -> bool | None:
+    """For clichec installed as the CLI at `path` (see
+    `cliche._clichec.install_fast_shim`): whether it is still a copy of
+    the clichec binary it came from, which a rebuild (a cliche upgrade)
+    replaces. None when `path` has no settings sidecar, i.e. isn't one."""
+    import os
+    sidecar = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.cliche")
+    try:
+        with open(sidecar) as f:
+            clichec = next((line[len("CLICHEC="):].rstrip("\n") for line in f
+                            if line.startswith("CLICHEC=")), "")
+    except OSError:
+        return None
+    try:
+        ours, source = os.stat(path), os.stat(clichec)
+    except OSError:
+        return False
+    # shutil.copy2 keeps the mtime.
+    return (ours.st_size, ours.st_mtime_ns) == (source.st_size, source.st_mtime_ns)
+
+
 def _maybe_self_upgrade_shim(pkg: str) -> None:
     """If we got here via pip's stock Python shim, rewrite the shim in place
     so subsequent invocations skip Python startup and go through clichec.
@@ -73,12 +136,14 @@ def _maybe_self_upgrade_shim(pkg: str) -> None:
     This is the auto-apply path for `pip install`: pip writes a plain Python
     console script, the user runs the binary once (paying ~50 ms Python
     startup), and on the way through this function we replace the script
-    with the fast-shim shell wrapper. Every later invocation hits clichec
-    directly (~3 ms on cache hits, falling back to Python on anything it
-    doesn't service).
+    with clichec itself (or the fast-shim shell wrapper). Every later
+    invocation hits clichec directly (~3 ms on cache hits, falling back to
+    Python on anything it doesn't service).
 
     Idempotent + silent on every failure mode:
-      - already a fast-shim → no-op (single read of argv[0]'s first 512 B)
+      - already a fast-shim → no-op (single read of argv[0]'s first 512 B),
+        unless `restore_site` found its recorded environment out of date,
+        or clichec installed as the CLI is older than the current build
       - bin/ not writable, no compiler, package not findable → no-op
       - editable-install moved → wrapper points at wrong cache dir, but
         clichec returns 64 (cache miss) and the wrapper falls through to
@@ -106,10 +171,17 @@ def _maybe_self_upgrade_shim(pkg: str) -> None:
         with open(path, 'rb') as f:
             head = f.read(512)
         if b"cliche fast-shim wrapper" in head:
-            return  # already a fast-shim
+            if not _site_changed:
+                return  # already a fast-shim
+        elif not head.startswith(b"#!"):
+            # clichec itself, installed as the CLI: reinstall it only when
+            # it's out of date. Any other binary isn't ours to touch.
+            current = _entry_binary_current(path)
+            if current is None or (current and not _site_changed):
+                return
         # Pip-generated console script begins with a Python shebang. If it's
         # something else (user-edited, custom script), don't touch it.
-        if not head.startswith(b"#!") or b"python" not in head[:200]:
+        elif not head.startswith(b"#!") or b"python" not in head[:200]:
             return
         from cliche._clichec import ensure_built, install_fast_shim
         if ensure_built(verbose=False) is None:
@@ -131,8 +203,18 @@ def _maybe_self_upgrade_shim(pkg: str) -> None:
         # the system pyenv's `bin/<name>` while we run inside a fresh test
         # venv). Pinning here keeps self-upgrade scoped to the exact shim
         # whose Python we're currently executing.
-        install_fast_shim(os.path.basename(path), pkg, pkg_dir,
-                          target_path=path)
+        ok, _msg = install_fast_shim(os.path.basename(path), pkg, pkg_dir,
+                                     target_path=path)
+        if ok:
+            # Compile the package and cliche ahead of time (cliche/bytecode.py)
+            # in the background, so this invocation doesn't wait for it.
+            import subprocess
+            subprocess.Popen(
+                [sys.executable, "-c",
+                 f"from cliche.bytecode import warm; warm({pkg!r}, {pkg_dir!r})"],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, start_new_session=True, close_fds=True,
+            )
     except Exception:
         # Never let the upgrade fail the user's invocation.
         pass
@@ -140,12 +222,25 @@ def _maybe_self_upgrade_shim(pkg: str) -> None:
 
 def _make_launcher(pkg: str):
     def _launch():
+        import os
+        if os.environ.get("CLICHE_TRACE"):
+            from cliche import trace
+            trace.started()
         _clean_sys_path()
-        # Auto-upgrade pip's stock Python shim to the fast-shim wrapper on the
-        # way through. Cheap when we're already a fast-shim (single 512 B
+        # Auto-upgrade pip's stock Python shim to the fast shim on the way
+        # through. Cheap when we're already a fast-shim (single 512 B
         # read), and once succeeded the function isn't entered again — the
         # next invocation goes straight to clichec.
         _maybe_self_upgrade_shim(pkg)
+        # Opt-in warm fork-server (CLICHE_ZYGOTE=1): hand the call to a
+        # running zygote if there is one, otherwise spawn one for next time
+        # and carry on in-process. See cliche/zygote.py.
+        if pkg != "cliche" and os.environ.get("CLICHE_ZYGOTE", "") not in ("", "0"):
+            from cliche.zygote import run_or_spawn
+            rc = run_or_spawn(pkg)
+            if rc is not None:
+                import sys
+                sys.exit(rc)
         from cliche.proctitle import set_cli_process_title
         set_cli_process_title()
         # Self-alias: `cliche install sdm -p cliche` registers `sdm` as an
@@ -123,6 +123,38 @@ def is_cli_decorator(decorator: ast.expr) -> tuple[bool, str | None]:
     return False, None
 
 
+def collect_completers(tree: ast.Module, module_name: str) -> dict:
+    """Map parameter names to the `@completer` function that completes them.
+
+    Reads top-level `@completer("a", "b", ttl=600)` decorators (plain or
+    attribute form) whose names and TTL are literals. The returned entries
+    are stored as the `completer` of matching @cli parameters; see
+    cliche/completions.py.
+    """
+    completers: dict = {}
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            if not isinstance(decorator, ast.Call):
+                continue
+            func = decorator.func
+            name = func.id if isinstance(func, ast.Name) else \
+                func.attr if isinstance(func, ast.Attribute) else None
+            if name != "completer":
+                continue
+            spec = {"module": module_name, "func": node.name}
+            for kw in decorator.keywords:
+                if (kw.arg == "ttl" and isinstance(kw.value, ast.Constant)
+                        and isinstance(kw.value.value, (int, float))
+                        and not isinstance(kw.value.value, bool)):
+                    spec["ttl"] = kw.value.value
+            for arg in decorator.args:
+                if isinstance(arg, ast.Constant) and isinstance(arg.value, str):
+                    completers[arg.value] = spec
+    return completers
+
+
 def extract_docstring(body: list[ast.stmt]) -> str | None:
     """Extract docstring from function body."""
     if body and isinstance(body[0], ast.Expr):
@@ -239,6 +271,129 @@ def extract_pydantic_models(content: str, tree: ast.Module = None) -> set[str]:
     return models
 
 
+# Field annotations build_parser_for_function maps to their own argparse
+# converter; anything else would depend on the imported class.
+_PYD_FIELD_TYPES = {"str", "int", "float", "bool"}
+
+
+def extract_pydantic_schemas(tree: ast.Module, models: set[str]) -> dict[str, list[dict]]:
+    """Field lists of the pydantic models in `models` that can be read
+    straight off the source.
+
+    Each field is `{"name", "annotation", "required"}` plus `"default"` (a
+    JSON literal) when it isn't required and `"description"` when
+    `Field(description=...)` gives one — what `_pydantic_fields` reports for
+    the imported class, in the same order (inherited fields first). With
+    these in the cache, `--help`, completion and clichec's argv check expand
+    the `--field` flags without importing the user's module.
+
+    Only models the scanner can't get wrong qualify: every base is
+    `BaseModel` / `BaseSettings` or another qualifying model of this file,
+    every field is annotated `str`, `int`, `float` or `bool`, and every
+    default is a literal or a `Field(...)` with literal arguments. A body
+    with anything else that could add or change a field (a plain
+    assignment, `default_factory`, a conditional block) leaves the model
+    out, and it is expanded by importing it, as before.
+    """
+    PYD_BASE_NAMES = {"BaseModel", "BaseSettings"}
+
+    classes: dict[str, ast.ClassDef | None] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef) and node.name in models:
+            # Defined twice: which one the module ends up with is not ours to guess.
+            classes[node.name] = None if node.name in classes else node
+
+    def literal(node):
+        try:
+            value = ast.literal_eval(node)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            raise LookupError
+        if value is None or isinstance(value, (str, bool, int)):
+            return value
+        if isinstance(value, float) and value == value and abs(value) != float("inf"):
+            return value
+        raise LookupError
+
+    def field(stmt: ast.AnnAssign) -> dict:
+        ann = stmt.annotation
+        if not isinstance(ann, ast.Name) or ann.id not in _PYD_FIELD_TYPES:
+            raise LookupError
+        out = {"name": stmt.target.id, "annotation": ann.id, "required": stmt.value is None}
+        value = stmt.value
+        call_name = None
+        if isinstance(value, ast.Call):
+            func = value.func
+            call_name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+        if call_name == "Field":
+            default = value.args[0] if value.args else None
+            if len(value.args) > 1:
+                raise LookupError
+            for kw in value.keywords:
+                if kw.arg is None or kw.arg == "default_factory":
+                    raise LookupError
+                if kw.arg == "default":
+                    default = kw.value
+                elif kw.arg == "description":
+                    out["description"] = literal(kw.value)
+                    if not isinstance(out["description"], str):
+                        raise LookupError
+            if default is None or (isinstance(default, ast.Constant) and default.value is ...):
+                out["required"] = True
+            else:
+                out["required"] = False
+                out["default"] = literal(default)
+        elif value is not None:
+            out["default"] = literal(value)
+        return out
+
+    schemas: dict[str, list[dict] | None] = {}
+
+    def schema(name: str) -> list[dict] | None:
+        if name in schemas:
+            return schemas[name]
+        schemas[name] = None  # a cycle resolves to "not static"
+        node = classes.get(name)
+        if node is None:
+            return None
+        fields: dict[str, dict] = {}
+        try:
+            for base in node.bases:
+                base_name = base.id if isinstance(base, ast.Name) else getattr(base, "attr", None)
+                if base_name in PYD_BASE_NAMES:
+                    continue
+                inherited = schema(base_name) if base_name in classes else None
+                if inherited is None:
+                    return None
+                fields.update((f["name"], f) for f in inherited)
+            for stmt in node.body:
+                if isinstance(stmt, ast.AnnAssign):
+                    if not isinstance(stmt.target, ast.Name):
+                        return None
+                    ann = stmt.annotation
+                    if isinstance(ann, ast.Subscript):
+                        ann = ann.value
+                    if isinstance(ann, (ast.Name, ast.Attribute)) and \
+                            (ann.id if isinstance(ann, ast.Name) else ann.attr) == "ClassVar":
+                        continue
+                    if stmt.target.id.startswith("_"):
+                        continue
+                    fields[stmt.target.id] = field(stmt)
+                elif isinstance(stmt, ast.Assign):
+                    targets = [t.id for t in stmt.targets if isinstance(t, ast.Name)]
+                    if len(targets) != len(stmt.targets) or not all(
+                            t == "model_config" or t.startswith("_") for t in targets):
+                        return None
+                elif not isinstance(stmt, (ast.Expr, ast.Pass, ast.FunctionDef,
+                                           ast.AsyncFunctionDef, ast.ClassDef)):
+                    return None
+        except LookupError:
+            return None
+        schemas[name] = list(fields.values())
+        return schemas[name]
+
+    return {name: schema(name) for name in sorted(classes) if schema(name) is not None}
+
+
 _LAZY_ARG_CLASSES = {"DateArg", "DateTimeArg", "DateUtcArg", "DateTimeUtcArg"}
 
 
@@ -386,31 +541,48 @@ def extract_parameters(args: ast.arguments, constants: dict | None = None) -> li
     return params
 
 
-def extract_cli_functions(content: str, file_path: Path, base_dir: Path, return_tree: bool = False):
+def module_name_for(file_path: Path, base_dir: Path) -> str:
+    """Dotted module name of `file_path` relative to `base_dir`."""
+    try:
+        relative = file_path.relative_to(base_dir)
+    except ValueError:
+        relative = file_path
+    return str(relative.with_suffix("")).replace("/", ".").replace(".__init__", "")
+
+
+def extract_cli_functions(content: str, file_path: Path, base_dir: Path, return_tree: bool = False,
+                          partial: bool = False):
     """Extract @cli decorated functions from Python source.
 
     Args:
         return_tree: If True, returns (functions, tree) tuple for AST reuse
+        partial: If True and the file is large, parse only the slices the
+            extractors read (cliche/partial_parse.py). The returned tree then
+            holds just those slices, which is all extract_python_enums and
+            extract_pydantic_models need.
     """
     functions = []
 
-    try:
-        tree = ast.parse(content)
-    except SyntaxError as e:
-        print(f"Parse error in {file_path}: {e}", file=sys.stderr)
-        return (functions, None) if return_tree else functions
+    tree = None
+    if partial:
+        from cliche.partial_parse import PARTIAL_PARSE_MIN_BYTES, parse_slices
+        if len(content) >= PARTIAL_PARSE_MIN_BYTES:
+            tree = parse_slices(content)
+    if tree is None:
+        try:
+            tree = ast.parse(content)
+        except SyntaxError as e:
+            print(f"Parse error in {file_path}: {e}", file=sys.stderr)
+            return (functions, None) if return_tree else functions
 
-    # Compute module name from path
-    try:
-        relative = file_path.relative_to(base_dir)
-    except ValueError:
-        relative = file_path
-    module_name = str(relative.with_suffix("")).replace("/", ".").replace(".__init__", "")
+    module_name = module_name_for(file_path, base_dir)
 
     # Module-level constants, so a default written as a bare constant name
     # (e.g. `timeout: float = DEFAULT_TIMEOUT`) resolves to its literal value
     # without importing/executing the user module.
     constants = collect_module_constants(tree)
+    completers = collect_completers(tree, module_name)
+    from cliche import fast_parse
 
     for node in ast.walk(tree):
         if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
@@ -424,6 +596,13 @@ def extract_cli_functions(content: str, file_path: Path, base_dir: Path, return_
                         "parameters": extract_parameters(node.args, constants),
                         "byte_offset": node.col_offset,
                     }
+                    if completers:
+                        for param in func_info["parameters"]:
+                            if param["name"] in completers:
+                                param["completer"] = completers[param["name"]]
+                    parse_plan = fast_parse.plan(func_info["parameters"])
+                    if parse_plan is not None:
+                        func_info["parse_plan"] = parse_plan
                     if group:
                         func_info["group"] = group
                     docstring = extract_docstring(node.body)
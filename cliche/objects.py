@@ -0,0 +1,184 @@
+"""Content-addressed parse store shared by every cache (`objects/`).
+
+Per-package caches are named after the package's path and trusted by mtime.
+So a `git checkout` that rewrites files with the same bytes, a CI workspace
+at a new path, or a second venv over the same source all send every file
+back through `_ast_parse_file`. This store remembers each parse by content
+instead:
+
+    $XDG_CACHE_HOME/cliche/objects/<2 hex>/<30 hex>.json
+
+The key is a blake2b digest of the file's bytes, salted with the store
+format, the cliche version and the size and mtime of the extractor's
+sources (main.py, partial_parse.py, and fast_parse.py for the parse plans
+records hold). A newer extractor, or an edited one in
+an editable install, never reads an older one's output. A record holds what
+phase 4 of `_scan_and_cache` extracts, minus anything that depends on where
+the file lives:
+
+    {"functions": [...], "enums": {...}, "pydantic_models": [...],
+     "pydantic_schemas": {...}}
+
+Functions are stored without `module` and `file_path`, and a parameter's
+`completer` without its `module`; the caller re-derives them from the file's
+current location. An mtime-only change then costs a
+read and a hash, not a parse. Files that fail to parse are never stored, so
+their syntax error is reported on every scan as before.
+
+Eviction is least-recently-used, by file mtime: `load` touches each record
+it returns. `gc` removes the stalest records until the store fits in
+CLICHE_OBJECTS_MAX_MB (default 64). `_scan_and_cache` calls `maybe_gc`
+after parsing anything, which runs `gc` at most once a day, and
+`cliche cache gc` runs it on demand.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+FORMAT = 3
+DEFAULT_MAX_MB = 64
+_GC_INTERVAL = 24 * 3600
+_GC_STAMP = ".last-gc"
+
+_salt: bytes | None = None
+
+
+def objects_dir() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    return Path(cache_home) / "cliche" / "objects"
+
+
+def digest(data: bytes) -> str:
+    """Store key for a file's bytes (32 hex chars)."""
+    global _salt
+    if _salt is None:
+        try:
+            from cliche import __version__ as version
+        except ImportError:
+            version = "unknown"
+        here = Path(__file__).parent
+        stamps = []
+        for name in ("main.py", "partial_parse.py", "fast_parse.py"):
+            try:
+                st = os.stat(here / name)
+                stamps.append(f"{st.st_size}:{st.st_mtime_ns}")
+            except OSError:
+                stamps.append("-")
+        _salt = f"cliche-objects/{FORMAT}/{version}/{'/'.join(stamps)}\0".encode()
+    h = hashlib.blake2b(_salt, digest_size=16)
+    h.update(data)
+    return h.hexdigest()
+
+
+def _record_path(key: str) -> Path:
+    return objects_dir() / key[:2] / f"{key[2:]}.json"
+
+
+def load(key: str) -> dict | None:
+    """The record stored under `key`, or None. A hit counts as a use."""
+    path = _record_path(key)
+    try:
+        with open(path) as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return record
+
+
+def save(key: str, record: dict) -> None:
+    """Store `record` under `key`, atomically. Failures are ignored: the
+    store only ever saves work."""
+    path = _record_path(key)
+    tmp = path.with_suffix(f".tmp.{os.getpid()}")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w") as f:
+            json.dump(record, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def max_bytes() -> int:
+    try:
+        mb = float(os.environ.get("CLICHE_OBJECTS_MAX_MB", DEFAULT_MAX_MB))
+    except ValueError:
+        mb = DEFAULT_MAX_MB
+    return max(0, int(mb * 1024 * 1024))
+
+
+def gc(limit: int | None = None) -> tuple[int, int, int, int]:
+    """Remove least-recently-used records until the store fits in `limit`
+    bytes (default: `max_bytes()`). Leftover temp files from killed writers
+    go too once they're an hour old.
+
+    Returns (records removed, bytes freed, records kept, bytes kept).
+    """
+    if limit is None:
+        limit = max_bytes()
+    root = objects_dir()
+    entries = []
+    stale_before = time.time() - 3600
+    try:
+        subdirs = [d.path for d in os.scandir(root) if d.is_dir(follow_symlinks=False)]
+    except OSError:
+        return 0, 0, 0, 0
+    for sub in subdirs:
+        try:
+            with os.scandir(sub) as it:
+                for entry in it:
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if entry.name.endswith(".json"):
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+                    elif ".tmp." in entry.name and st.st_mtime < stale_before:
+                        entries.append((0.0, st.st_size, entry.path))
+        except OSError:
+            continue
+
+    entries.sort(reverse=True)
+    kept = kept_bytes = removed = freed = 0
+    for mtime, size, path in entries:
+        if mtime and kept_bytes + size <= limit:
+            kept += 1
+            kept_bytes += size
+            continue
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        removed += 1
+        freed += size
+    for sub in subdirs:
+        try:
+            os.rmdir(sub)  # only succeeds once a bucket is empty
+        except OSError:
+            pass
+    try:
+        (root / _GC_STAMP).touch()
+    except OSError:
+        pass
+    return removed, freed, kept, kept_bytes
+
+
+def maybe_gc() -> None:
+    """Run `gc` if the last one was more than a day ago (one stat otherwise)."""
+    try:
+        last = os.stat(objects_dir() / _GC_STAMP).st_mtime
+    except OSError:
+        last = 0.0
+    if time.time() - last >= _GC_INTERVAL:
+        gc()
@@ -0,0 +1,500 @@
+"""Result serializers behind `--output-format`.
+
+`invoke_function` hands every non-None return value to `emit`, which writes
+it to `sys.stdout.buffer` in one of these formats:
+
+    json          indented JSON; the default for plain values
+    json-compact  JSON on one line
+    ndjson        one JSON document per line, one per item of a list or
+                  iterator; the default for iterators
+    csv, tsv      a header row, then one row per record (dicts, dataclasses,
+                  pydantic models, named tuples)
+    msgpack       MessagePack; an iterator becomes a stream of objects
+                  (needs `msgpack`)
+    arrow         an Arrow IPC stream (needs `pyarrow`) of a list of
+                  records, a dict of columns, a DataFrame or a Table
+    raw           `str()` of the value, or of each item; what --raw prints
+
+Values the json module can't encode go through `to_builtin`: dataclasses,
+pydantic models, enums, dates and times, paths, UUIDs, decimals, sets, and
+anything with a `tolist()` (NumPy arrays and scalars). The JSON formats
+write exactly what the json module does (`json.dumps(result, indent=2)` by
+default, ASCII-escaped), whichever encoder produced it. orjson is used when
+it is importable and is several times faster on big results, but only when
+its bytes are provably the same: all ASCII, no NaN or infinity, and every
+float spelled as `repr()` spells it. Anything else, and what orjson refuses
+(integers past 64 bits), goes through the json module. A value neither can
+encode is printed with `str()`, as cliche always did.
+
+Nothing builds the whole output in memory. Lists are encoded item by item,
+and iterators are consumed lazily. Everything goes through a bounded
+buffer (`_Sink`) that writes the first item at once and flushes at least
+every 100 ms while items keep coming. A reader that goes away (`| head`)
+closes the generator, so its `finally` blocks run, and the process ends
+quietly.
+
+Formats are pluggable. `register("yaml")(writer)` adds one, where
+`writer(result, sink)` calls `sink.write(bytes)`. Registering from the
+module that defines the command is enough, because that module is imported
+before the format is looked up.
+"""
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import re
+import sys
+import time
+from collections.abc import AsyncIterator, Iterator
+from datetime import date, datetime, time as dtime, timedelta
+from enum import Enum
+from pathlib import PurePath
+
+# Buffered output is written in chunks of at most this many bytes, and at
+# least this often while items keep arriving. The first write, and every
+# write to a terminal, goes out at once.
+_BUFFER_BYTES = 64 * 1024
+_FLUSH_SECONDS = 0.1
+
+# Rows per Arrow record batch when the result is a list or stream of records.
+_ARROW_BATCH_ROWS = 64 * 1024
+
+_FORMATS: dict[str, tuple] = {}
+_orjson = None
+
+
+class OutputFormatError(Exception):
+    """An unknown or unusable `--output-format`, or a result it can't hold."""
+
+
+def register(name: str, binary: bool = False, requires: str | None = None):
+    """Decorator adding `writer(result, sink)` as `--output-format name`.
+
+    `binary` formats are never written to a terminal. `requires` names a
+    module that must be importable, checked before the command runs.
+    """
+    def decorator(writer):
+        _FORMATS[name] = (writer, binary, requires)
+        return writer
+    return decorator
+
+
+def names() -> list[str]:
+    return list(_FORMATS)
+
+
+def resolve(name: str):
+    """`(writer, binary)` for `name`; raises OutputFormatError when the
+    format is unknown or its module is missing."""
+    try:
+        writer, binary, requires = _FORMATS[name]
+    except KeyError:
+        raise OutputFormatError(
+            f"unknown output format '{name}' (choose from {', '.join(_FORMATS)})") from None
+    if requires:
+        import importlib.util
+        if importlib.util.find_spec(requires) is None:
+            raise OutputFormatError(
+                f"--output-format {name} needs the {requires} package: pip install {requires}")
+    return writer, binary
+
+
+def to_builtin(obj):
+    """A JSON-friendly stand-in for `obj`; TypeError when there is none."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date, dtime)):
+        return obj.isoformat()
+    if isinstance(obj, timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, PurePath):
+        return str(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    model_dump = getattr(obj, "model_dump", None)
+    if callable(model_dump):
+        return model_dump()
+    tolist = getattr(obj, "tolist", None)
+    if callable(tolist):
+        return tolist()
+    module = type(obj).__module__
+    if module in ("uuid", "decimal", "ipaddress"):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+_JSON_ENCODERS = {
+    True: json.JSONEncoder(indent=2, default=to_builtin),
+    False: json.JSONEncoder(separators=(",", ":"), default=to_builtin),
+}
+
+# Numbers in orjson output that may be floats. orjson spells some floats
+# differently from repr() (`1e20`, `0.00001`); matches inside strings only
+# cost a needless fallback.
+_FLOAT_TOKEN = re.compile(rb"-?\d+(?:\.\d+)?e[-+]?\d+|-?\d+\.\d+")
+
+
+def _matches_json_module(obj, data: bytes) -> bool:
+    """Whether orjson's `data` for `obj` is byte-for-byte what the json
+    module writes. orjson writes non-ASCII and DEL raw where json escapes
+    them, and NaN and infinities as null where json writes NaN/Infinity."""
+    if not data.isascii() or b"\x7f" in data:
+        return False
+    for token in _FLOAT_TOKEN.findall(data):
+        if repr(float(token)).encode() != token:
+            return False
+    if b"null" in data:
+        try:
+            json.dumps(obj, default=to_builtin, allow_nan=False, check_circular=False)
+        except (TypeError, ValueError, RecursionError):
+            return False
+    return True
+
+
+def _encode(obj, indent: bool) -> bytes:
+    """JSON for `obj`, exactly as the json module writes it; via orjson when
+    available and its output is provably the same."""
+    global _orjson
+    if _orjson is None:
+        try:
+            import orjson as _orjson
+        except ImportError:
+            _orjson = False
+    if _orjson:
+        option = _orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= _orjson.OPT_INDENT_2
+        try:
+            data = _orjson.dumps(obj, default=to_builtin, option=option)
+        except TypeError:
+            data = None
+        if data is not None and _matches_json_module(obj, data):
+            return data
+    return _JSON_ENCODERS[indent].encode(obj).encode("utf-8", "surrogatepass")
+
+
+def _encode_or_str(obj, indent: bool) -> bytes:
+    try:
+        return _encode(obj, indent)
+    except (TypeError, ValueError):
+        return _encode(str(obj), indent)
+
+
+class _Sink:
+    """Bounded write buffer in front of stdout."""
+
+    closed = False
+
+    def __init__(self, out):
+        self.out = out
+        self.buf: list[bytes] = []
+        self.size = 0
+        self.last_flush = None  # None until the first write is out
+        try:
+            self.eager = os.isatty(out.fileno())
+        except (AttributeError, OSError, ValueError):
+            self.eager = False
+
+    def write(self, data: bytes) -> int:
+        self.buf.append(data)
+        self.size += len(data)
+        now = time.monotonic()
+        if (self.last_flush is None or self.eager or self.size >= _BUFFER_BYTES
+                or now - self.last_flush >= _FLUSH_SECONDS):
+            self.flush(now)
+        return len(data)
+
+    def flush(self, now: float = 0.0) -> None:
+        if self.buf:
+            self.out.write(b"".join(self.buf))
+            self.buf.clear()
+            self.size = 0
+        self.out.flush()
+        self.last_flush = now
+
+
+class _TextOut:
+    """Bytes onto a text-only stdout (e.g. `contextlib.redirect_stdout`)."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, data: bytes) -> None:
+        self.stream.write(data.decode("utf-8", "surrogateescape"))
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class _TextSink:
+    """`str` writes onto a sink, for the csv module."""
+
+    def __init__(self, sink: _Sink):
+        self.sink = sink
+
+    def write(self, text: str) -> None:
+        self.sink.write(text.encode("utf-8", "surrogateescape"))
+
+
+def _items(result):
+    """The items of a list-like or iterator result; anything else is one item."""
+    if isinstance(result, (list, tuple, Iterator)):
+        return result
+    return (result,)
+
+
+def _iterate_async(items):
+    """Drive an async iterator from synchronous code on one event loop."""
+    import asyncio
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(items.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        aclose = getattr(items, "aclose", None)
+        if aclose is not None:
+            loop.run_until_complete(aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+def _stdout_closed() -> None:
+    """The reader went away (`| head`): stop quietly, like a process killed
+    by SIGPIPE. stdout is pointed at /dev/null first so the interpreter's
+    own flush at exit doesn't raise again."""
+    try:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    except (OSError, AttributeError, ValueError):
+        pass
+    sys.exit(128 + 13)
+
+
+def emit(result, fmt: str | None = None, raw: bool = False) -> None:
+    """Write `result` to stdout as `fmt`. Without one, iterators go out as
+    ndjson, other values as json, or as `raw` under --raw."""
+    if isinstance(result, AsyncIterator):
+        result = _iterate_async(result)
+    if fmt is None:
+        fmt = "raw" if raw else "ndjson" if isinstance(result, Iterator) else "json"
+    writer, binary = resolve(fmt)
+
+    # Whatever the command print()ed is still in the text layer's buffer.
+    sys.stdout.flush()
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        if binary:
+            raise OutputFormatError(f"--output-format {fmt} needs a binary stdout")
+        out = _TextOut(sys.stdout)
+    sink = _Sink(out)
+    if binary and sink.eager:
+        raise OutputFormatError(
+            f"refusing to write {fmt} to a terminal; redirect or pipe the output")
+    try:
+        writer(result, sink)
+        sink.flush()
+    except BrokenPipeError:
+        close = getattr(result, "close", None)
+        if close is not None:
+            close()
+        _stdout_closed()
+
+
+@register("json")
+def write_json(result, sink, indent: bool = True) -> None:
+    if not isinstance(result, (list, tuple, Iterator)):
+        try:
+            data = _encode(result, indent)
+        except (TypeError, ValueError):
+            sink.write(f"{result}\n".encode("utf-8", "surrogateescape"))
+            return
+        sink.write(data + b"\n")
+        return
+    # Item by item, spelled exactly like json.dumps of the whole list.
+    first = True
+    for item in result:
+        data = _encode_or_str(item, indent)
+        if indent:
+            sink.write((b"[\n  " if first else b",\n  ") + data.replace(b"\n", b"\n  "))
+        else:
+            sink.write((b"[" if first else b",") + data)
+        first = False
+    if first:
+        sink.write(b"[]\n")
+    else:
+        sink.write(b"\n]\n" if indent else b"]\n")
+
+
+@register("json-compact")
+def write_json_compact(result, sink) -> None:
+    write_json(result, sink, indent=False)
+
+
+@register("ndjson")
+def write_ndjson(result, sink) -> None:
+    for item in _items(result):
+        try:
+            line = _encode(item, False)
+        except (TypeError, ValueError):
+            line = str(item).encode("utf-8", "surrogateescape")
+        sink.write(line + b"\n")
+
+
+@register("raw")
+def write_raw(result, sink) -> None:
+    items = result if isinstance(result, Iterator) else (result,)
+    for item in items:
+        sink.write(f"{item}\n".encode("utf-8", "surrogateescape"))
+
+
+def _record(item) -> dict | None:
+    """`item` as a `{field: value}` record, or None when it isn't one."""
+    if isinstance(item, dict):
+        return item
+    if dataclasses.is_dataclass(item) and not isinstance(item, type):
+        return {f.name: getattr(item, f.name) for f in dataclasses.fields(item)}
+    model_dump = getattr(item, "model_dump", None)
+    if callable(model_dump):
+        return model_dump()
+    asdict = getattr(item, "_asdict", None)
+    if callable(asdict) and isinstance(item, tuple):
+        return asdict()
+    return None
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, (str, int, float)):
+        return value
+    if not isinstance(value, (list, dict)):
+        try:
+            value = to_builtin(value)
+        except TypeError:
+            return str(value)
+        if isinstance(value, (str, int, float)):
+            return value
+    return _encode_or_str(value, False).decode("utf-8", "surrogateescape")
+
+
+def _write_delimited(result, sink, delimiter: str) -> None:
+    import csv
+    writer = csv.writer(_TextSink(sink), delimiter=delimiter, lineterminator="\n")
+    header = known = None
+    if isinstance(result, (list, tuple)):
+        # A materialised list gets every field any record has.
+        fields: dict = {}
+        for item in result:
+            record = _record(item)
+            if record is not None:
+                fields.update(dict.fromkeys(record))
+        header = list(fields) or None
+        if header:
+            known = set(header)
+            writer.writerow(header)
+    for item in _items(result):
+        record = _record(item)
+        if record is not None:
+            if header is None:
+                header = list(record)
+                known = set(header)
+                writer.writerow(header)
+            if not known.issuperset(record):
+                extra = [k for k in record if k not in known]
+                raise OutputFormatError(
+                    f"record fields {', '.join(map(str, extra))} are missing from the "
+                    f"header, which a streamed result takes from its first record")
+            writer.writerow([_cell(record.get(k)) for k in header])
+        elif isinstance(item, (list, tuple)):
+            writer.writerow([_cell(v) for v in item])
+        else:
+            writer.writerow([_cell(item)])
+
+
+@register("csv")
+def write_csv(result, sink) -> None:
+    _write_delimited(result, sink, ",")
+
+
+@register("tsv")
+def write_tsv(result, sink) -> None:
+    _write_delimited(result, sink, "\t")
+
+
+@register("msgpack", binary=True, requires="msgpack")
+def write_msgpack(result, sink) -> None:
+    import msgpack
+    packer = msgpack.Packer(default=to_builtin)
+    if isinstance(result, Iterator):
+        for item in result:
+            sink.write(packer.pack(item))
+    else:
+        sink.write(packer.pack(result))
+
+
+def _arrow_value(value):
+    # pyarrow takes numbers, strings, bytes, dates, times, decimals, lists
+    # and dicts as they are; the rest gets its JSON stand-in.
+    from decimal import Decimal
+    if value is None or isinstance(value, (str, bytes, int, float, date, dtime,
+                                           timedelta, Decimal, list, dict)):
+        return value
+    try:
+        return to_builtin(value)
+    except TypeError:
+        return str(value)
+
+
+@register("arrow", binary=True, requires="pyarrow")
+def write_arrow(result, sink) -> None:
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    table = None
+    if isinstance(result, pa.Table):
+        table = result
+    elif isinstance(result, pa.RecordBatch):
+        table = pa.Table.from_batches([result])
+    elif type(result).__module__.split(".")[0] == "pandas" and hasattr(result, "columns"):
+        table = pa.Table.from_pandas(result, preserve_index=False)
+    elif callable(getattr(result, "to_arrow", None)):
+        table = result.to_arrow()  # polars
+    elif isinstance(result, dict) and result and all(
+            isinstance(v, (list, tuple)) for v in result.values()):
+        table = pa.table({k: [_arrow_value(x) for x in v] for k, v in result.items()})
+    out = pa.PythonFile(sink, mode="w")
+    if table is not None:
+        with pa.ipc.new_stream(out, table.schema) as writer:
+            writer.write_table(table)
+        return
+
+    writer = schema = None
+    batch: list[dict] = []
+
+    def flush_batch():
+        nonlocal writer, schema
+        rb = pa.RecordBatch.from_pylist(batch, schema=schema)
+        if writer is None:
+            schema = rb.schema
+            writer = pa.ipc.new_stream(out, schema)
+        writer.write_batch(rb)
+        batch.clear()
+
+    for item in _items(result):
+        record = _record(item)
+        if record is None:
+            raise OutputFormatError(
+                "--output-format arrow needs records (dicts, dataclasses, pydantic "
+                "models, named tuples), a dict of columns, or a table")
+        batch.append({k: _arrow_value(v) for k, v in record.items()})
+        if len(batch) >= _ARROW_BATCH_ROWS:
+            flush_batch()
+    if batch or writer is None:
+        flush_batch()
+    writer.close()
@@ -0,0 +1,250 @@
+"""Partial AST parsing: parse only the parts of a module the cache needs.
+
+`extract_cli_functions`, `extract_python_enums`, `extract_pydantic_models`
+and `extract_pydantic_schemas` look at a handful of nodes: `@cli`
+functions, enum classes, the bases of every class, the bodies of pydantic
+models, and the top-level constants that `@cli` defaults name. On a 20k-line generated module, `ast.parse` spends
+nearly all of its time building nodes nobody reads. `parse_slices` cuts the
+source into top-level statements and parses only these:
+
+  - statements that contain a `@cli` or `@completer` decorator line or an
+    enum class header (at any depth, so methods and nested classes behave
+    as in a full parse)
+  - class headers everywhere else, with the body replaced by `pass`, for the
+    pydantic base-class closure
+  - statements holding a class that closure names a pydantic model, for
+    its fields
+  - top-level `NAME = ...` / `NAME: T = ...` statements, but only for names
+    that a parsed `@cli` function uses as a default
+
+It returns a synthetic `ast.Module` that gives the extractors the same
+results as the full tree. Statements keep their source order, so `ast.walk`
+visits functions and enums in the same order.
+
+Statement boundaries come from a lexer that only tracks strings, comments,
+brackets and backslash continuations. A C-level regex consumes runs of
+self-contained lines, and a per-token loop runs only for the few lines that
+open a multi-line string or bracket. `parse_slices` returns None, and the
+caller parses the whole file, whenever the lexer could be wrong:
+unterminated strings, unbalanced brackets, a slice that doesn't parse on
+its own, or (on 3.12+) an f-string that reuses its own quote inside a
+replacement field.
+
+A syntax error in a statement that is never sliced goes unnoticed here. It
+surfaces when the module is imported to run a command.
+"""
+import ast
+import re
+import sys
+from bisect import bisect_left, bisect_right
+
+# Files smaller than this are parsed whole. benchmarks/bench_partial_parse.py
+# has slicing ahead at every size, but below ~800 lines the saving is a few
+# milliseconds. That is about what compiling this module's patterns costs
+# each process, and too little to give up full-parse syntax checking for.
+PARTIAL_PARSE_MIN_BYTES = 16 * 1024
+
+# Kept in sync with the base-name sets in main.extract_python_enums and
+# main.extract_pydantic_models. Matching here is textual and may
+# over-select, which costs time but never changes results.
+_ENUM_WORD = re.compile(r"\b(?:Enum|IntEnum|StrEnum|Flag|IntFlag|ReprEnum)\b")
+
+# A self-contained line: code with strings and brackets (nested at most
+# three deep) closed within the run, and an optional trailing comment.
+# Docstrings and brackets may span lines as long as none of their inner
+# lines could pass for a statement, a decorator or a class header (a line
+# that opens with a closing bracket never starts a statement). `_RUN`
+# matches a whole run of such lines in one call. Every pattern is unrolled
+# as `plain (special plain)*` with specials starting on a character plain
+# text can't hold, and a lone quote never opens where three do (as in the
+# tokenizer), so each input lexes one way and a failed match can't
+# backtrack exponentially.
+_PLAIN = r"[^'\"#\\\n()\[\]{}]*"
+_STR = r"'(?!'')[^'\\\n]*(?:\\.[^'\\\n]*)*'|\"(?!\"\")[^\"\\\n]*(?:\\.[^\"\\\n]*)*\""
+_SAFE_NL = r"\n(?![^\s)\]}]|[ \t]*(?:@|class\b))"
+_DOC = (rf"'''[^'\\\n]*(?:(?:\\.|'(?!'')|{_SAFE_NL})[^'\\\n]*)*'''"
+        rf'|"""[^"\\\n]*(?:(?:\\.|"(?!"")|{_SAFE_NL})[^"\\\n]*)*"""')
+
+
+def _nest(special: str) -> str:
+    # Any closer ends any opener: valid Python never mismatches them, and
+    # one pattern per level instead of three keeps `_RUN` quick to compile.
+    return rf"[(\[{{]{_PLAIN}(?:(?:{special}|#[^\n]*(?=\n)|{_SAFE_NL}){_PLAIN})*[)\]}}]"
+
+
+_B1 = _nest(f"{_DOC}|{_STR}")
+_B2 = _nest(f"{_DOC}|{_STR}|{_B1}")
+_B3 = _nest(f"{_DOC}|{_STR}|{_B2}")
+_RUN = re.compile(rf"(?:{_PLAIN}(?:(?:{_DOC}|{_STR}|{_B3}){_PLAIN})*(?:#[^\n]*)?\n)*")
+
+# Per-token lexer for the lines `_RUN` stops at.
+_TOKEN = re.compile(
+    r"(?P<q>(?:(?<![\w.])[rRbBuUfF]{1,3})?('''|\"\"\"|'|\"))"
+    r"|(?P<c>#[^\n]*)|(?P<o>[(\[{])|(?P<x>[)\]}])|(?P<n>\\?\n)"
+)
+_STRING_END = {
+    "'": re.compile(r"(?:[^'\\\n]|\\(?:.|\n))*'"),
+    '"': re.compile(r"(?:[^\"\\\n]|\\(?:.|\n))*\""),
+    "'''": re.compile(r"(?:[^'\\]|\\(?:.|\n)|'(?!''))*'''"),
+    '"""': re.compile(r"(?:[^\"\\]|\\(?:.|\n)|\"(?!\"\"))*\"\"\""),
+}
+
+# PEP 701 lets `f"{d["k"]}"` nest its own quote, which the lexer above
+# would misread. Over-matches (any later same-quote after a `{`) on purpose.
+_NESTED_FSTRING = re.compile(
+    r"(?<![\w.])(?:[rRbB]?[fF]|[fF][rRbB])(['\"])[^\n]*?\{[^}\n]*?\1"
+)
+
+# Line-start patterns lead with the newline: sre finds a literal prefix far
+# faster than it tries `^` at every position.
+_LINE_START = re.compile(r"\n[^\s#)\]}]")
+_CONTINUATION = re.compile(r"(?:else|elif|except|finally)\b")
+_CLI_DECORATOR = re.compile(r"\n[ \t]*@[^\n]*\b(?:cli|completer)\b")
+_CLASS = re.compile(r"\n([ \t]*)class\b")
+# A class header up to its colon. Headers this can't match (deeper nesting,
+# odd line breaks) get their whole statement parsed instead.
+_HEADER = re.compile(rf"class[ \t]+\w+[ \t]*(?:(?:{_B3})[ \t]*)*:")
+
+
+def _opaque_spans(text: str) -> list[tuple[int, int]] | None:
+    """Spans no statement boundary can fall inside, sorted and disjoint:
+    top-level bracket pairs and strings that cross a line, and the line
+    after a backslash continuation. None when the source doesn't lex."""
+    spans: list[tuple[int, int]] = []
+    pos, end = 0, len(text)
+    while pos < end:
+        pos = _RUN.match(text, pos).end()
+        if pos >= end:
+            break
+        depth = 0
+        opened = 0
+        while True:
+            m = _TOKEN.search(text, pos)
+            if m is None:
+                return None
+            kind = m.lastgroup
+            pos = m.end()
+            if kind == "q":
+                quote = m.group(2)
+                tail = _STRING_END[quote].match(text, pos)
+                if tail is None:
+                    return None
+                if depth == 0 and "\n" in text[m.start():tail.end()]:
+                    spans.append((m.start(), tail.end()))
+                pos = tail.end()
+            elif kind == "o":
+                if depth == 0:
+                    opened = m.start()
+                depth += 1
+            elif kind == "x":
+                depth -= 1
+                if depth < 0:
+                    return None
+                if depth == 0:
+                    spans.append((opened, pos))
+            elif kind == "n":
+                if m.group().startswith("\\"):
+                    if depth == 0:
+                        spans.append((m.start(), pos + 1))
+                elif depth == 0:
+                    break
+    return spans
+
+
+def _span_at(spans: list[tuple[int, int]], starts: list[int], pos: int) -> int:
+    """Index of the span strictly containing `pos`, or -1."""
+    i = bisect_left(starts, pos) - 1
+    return i if i >= 0 and pos < spans[i][1] else -1
+
+
+def _default_names(stmts: list[ast.stmt]) -> set[str]:
+    names = set()
+    for stmt in stmts:
+        for node in ast.walk(stmt):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                for d in (*node.args.defaults, *node.args.kw_defaults):
+                    if isinstance(d, ast.Name):
+                        names.add(d.id)
+    return names
+
+
+def parse_slices(content: str) -> ast.Module | None:
+    """Parse the `@cli`, enum, class-header and constant slices of `content`
+    into one module, or return None when only a full parse is safe."""
+    if sys.version_info >= (3, 12) and _NESTED_FSTRING.search(content):
+        return None
+    # A leading newline puts every line start right after a "\n".
+    text = "\n" + content if content.endswith("\n") else "\n" + content + "\n"
+    spans = _opaque_spans(text)
+    if spans is None:
+        return None
+    starts = [s for s, _ in spans]
+
+    # Top-level statement boundaries. Decorators stay with their def and
+    # `else:`/`except:` with their compound statement.
+    bounds = []
+    glued = False
+    for m in _LINE_START.finditer(text):
+        pos = m.start() + 1
+        if _span_at(spans, starts, pos) >= 0:
+            continue
+        if bounds and (glued or _CONTINUATION.match(text, pos)):
+            glued = text[pos] == "@"
+            continue
+        bounds.append(pos)
+        glued = text[pos] == "@"
+    bounds.append(len(text))
+
+    def chunk_of(pos: int) -> int:
+        i = bisect_right(bounds, pos) - 1
+        if i < 0:
+            raise ValueError("slice before the first statement")
+        return i
+
+    def parse_chunk(i: int) -> list[ast.stmt]:
+        return ast.parse(text[bounds[i]:bounds[i + 1]]).body
+
+    try:
+        cli = set()
+        for m in _CLI_DECORATOR.finditer(text):
+            if _span_at(spans, starts, m.start() + 1) < 0:
+                cli.add(chunk_of(m.start() + 1))
+        whole = set()
+        headers = []
+        for m in _CLASS.finditer(text):
+            pos = m.start() + 1
+            if _span_at(spans, starts, pos) >= 0:
+                continue
+            i = chunk_of(pos)
+            header = _HEADER.match(text, m.end(1))
+            if header is None or _ENUM_WORD.search(header.group()):
+                whole.add(i)
+            else:
+                headers.append((i, header.group() + " pass"))
+
+        parsed = {i: parse_chunk(i) for i in cli}
+        needed = _default_names([s for body in parsed.values() for s in body])
+        for i in whole - cli:
+            parsed[i] = parse_chunk(i)
+        header_nodes = [(i, ast.parse(h).body[0]) for i, h in headers]
+        if header_nodes:
+            from cliche.main import extract_pydantic_models
+            models = extract_pydantic_models("", ast.Module(
+                body=[s for body in parsed.values() for s in body]
+                + [node for _, node in header_nodes], type_ignores=[]))
+            for i, node in header_nodes:
+                if node.name in models and i not in parsed:
+                    parsed[i] = parse_chunk(i)
+        if needed:
+            # Over-selects (locals, keyword arguments); the extra statements
+            # are harmless to collect_module_constants.
+            names = "|".join(map(re.escape, sorted(needed)))
+            for m in re.finditer(rf"\b(?:{names})\b\)?\s*(?::|=(?!=))", text):
+                i = chunk_of(m.start())
+                if i not in parsed:
+                    parsed[i] = parse_chunk(i)
+        body = [s for i in sorted(parsed) for s in parsed[i]]
+        body += [node for i, node in header_nodes if i not in parsed]
+    except (SyntaxError, ValueError):
+        return None
+    return ast.Module(body=body, type_ignores=[])
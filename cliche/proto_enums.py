@@ -1,10 +1,136 @@
 """
 Parse protobuf enum definitions from _pb2.py files.
-Extracts enum values by parsing the serialized descriptor.
+
+protoc embeds the serialized `FileDescriptorProto` as a bytes literal
+(`AddSerializedFile(b'...')`, or `serialized_pb=b'...'` before protobuf
+3.20). Enums are read by walking that message in the wire format:
+
+    FileDescriptorProto   4 message_type (DescriptorProto), 5 enum_type
+    DescriptorProto       3 nested_type (DescriptorProto), 4 enum_type
+    EnumDescriptorProto   1 name, 2 value (EnumValueDescriptorProto)
+    EnumValueDescriptorProto  1 name
+
+Every other field is skipped by its length, so only enum bodies are
+decoded, and message or field names never pass for enum values.
 """
-import re
+import codecs
 from pathlib import Path
 
+# Where the descriptor literal starts, newest protoc layout first.
+_OPENERS = (b"AddSerializedFile(b'", b"serialized_pb=b'")
+
+
+def _literal(content: bytes) -> bytes | None:
+    """The escaped body of the descriptor's bytes literal, if there is one."""
+    for opener in _OPENERS:
+        start = content.find(opener)
+        if start != -1:
+            break
+    else:
+        return None
+    start += len(opener)
+    end = start
+    while True:
+        end = content.find(b"'", end)
+        if end == -1:
+            return None
+        backslashes = end
+        while content[backslashes - 1] == 0x5C:   # an escaped quote: \'
+            backslashes -= 1
+        if (end - backslashes) % 2 == 0:
+            return content[start:end]
+        end += 1
+
+
+def _varint(buf: bytes, pos: int) -> tuple[int, int]:
+    result = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fields(buf: bytes, start: int, end: int):
+    """Yield (field number, start, end) for each length-delimited field of the
+    message in buf[start:end]; other fields are skipped."""
+    pos = start
+    while pos < end:
+        key = buf[pos]
+        if key < 0x80:
+            pos += 1
+        else:
+            key, pos = _varint(buf, pos)
+        wire = key & 7
+        if wire == 2:
+            n = buf[pos]
+            if n < 0x80:
+                pos += 1
+            else:
+                n, pos = _varint(buf, pos)
+            if pos + n > end:
+                raise ValueError("field overruns its message")
+            yield key >> 3, pos, pos + n
+            pos += n
+        elif wire == 0:
+            while buf[pos] >= 0x80:
+                pos += 1
+            pos += 1
+        elif wire == 1:
+            pos += 8
+        elif wire == 5:
+            pos += 4
+        else:
+            raise ValueError(f"unsupported wire type {wire}")
+    if pos != end:
+        raise ValueError("truncated message")
+
+
+def _enum(buf: bytes, start: int, end: int) -> tuple[str | None, list[str]]:
+    name, values = None, []
+    for number, s, e in _fields(buf, start, end):
+        if number == 1:
+            name = buf[s:e].decode('utf-8')
+        elif number == 2:
+            # protoc writes the value's name (field 1) first; a short one
+            # is read without walking the value.
+            n = buf[s + 1] if buf[s] == 0x0A else 0x80
+            if n < 0x80 and s + 2 + n <= e:
+                values.append(buf[s + 2:s + 2 + n].decode('utf-8'))
+                continue
+            for value_number, vs, ve in _fields(buf, s, e):
+                if value_number == 1:
+                    values.append(buf[vs:ve].decode('utf-8'))
+                    break
+            else:
+                raise ValueError("enum value without a name")
+    return name, values
+
+
+def _collect(buf: bytes, start: int, end: int, enum_field: int, nested_field: int,
+             enums: dict[str, list[str]]) -> None:
+    for number, s, e in _fields(buf, start, end):
+        if number == enum_field:
+            name, values = _enum(buf, s, e)
+            if name and values:
+                enums[name] = values
+        elif number == nested_field:
+            _collect(buf, s, e, 4, 3, enums)
+
+
+def descriptor_enums(blob: bytes) -> dict[str, list[str]]:
+    """
+    Enums of a serialized FileDescriptorProto, nested ones included, keyed
+    by their unqualified name (a later one wins a name clash).
+
+    Raises ValueError (or IndexError) when blob is not a well-formed message.
+    """
+    enums: dict[str, list[str]] = {}
+    _collect(blob, 0, len(blob), 5, 4, enums)
+    return enums
+
 
 def parse_pb2_enums(pb2_path: Path) -> dict[str, list[str]]:
     """
@@ -14,57 +140,19 @@ def parse_pb2_enums(pb2_path: Path) -> dict[str, list[str]]:
         Dict mapping enum name to list of value names.
         e.g., {'Exchange': ['NULL_EXCHANGE', 'bitmex', 'deribit', ...]}
     """
-    if not pb2_path.exists():
+    try:
+        content = pb2_path.read_bytes()
+    except OSError:
         return {}
 
-    content = pb2_path.read_text()
-
-    # Get the binary descriptor blob
-    match = re.search(r"AddSerializedFile\(b'(.+?)'\)", content, re.DOTALL)
-    if not match:
+    literal = _literal(content)
+    if literal is None:
         return {}
-
-    blob_str = match.group(1)
     try:
-        blob = bytes(blob_str, 'utf-8').decode('unicode_escape').encode('latin-1')
-    except Exception:
+        return descriptor_enums(codecs.escape_decode(literal)[0])
+    except (ValueError, IndexError, UnicodeDecodeError):
         return {}
 
-    # Get enum byte ranges from the markers at the bottom of the file
-    # e.g., _EXCHANGE._serialized_start=1338
-    ranges = {}
-    for m in re.finditer(r'_([A-Z][A-Z0-9_]+)\._serialized_start=(\d+)', content):
-        name = m.group(1)
-        start = int(m.group(2))
-        ranges[name] = {'start': start}
-
-    for m in re.finditer(r'_([A-Z][A-Z0-9_]+)\._serialized_end=(\d+)', content):
-        name = m.group(1)
-        if name in ranges:
-            ranges[name]['end'] = int(m.group(2))
-
-    # Extract values for each enum
-    enums = {}
-    for enum_name_upper, r in ranges.items():
-        if 'end' not in r:
-            continue
-
-        chunk = blob[r['start']:r['end']]
-
-        # Extract readable strings from this chunk
-        values = [s.decode('latin-1') for s in re.findall(rb'[A-Za-z_][A-Za-z0-9_]+', chunk)]
-
-        if not values:
-            continue
-
-        # First string is the enum name itself (e.g., 'Exchange'), rest are values
-        enum_name = values[0]
-        enum_values = values[1:]
-
-        enums[enum_name] = enum_values
-
-    return enums
-
 
 def build_enum_cache_from_dir(base_dir: Path) -> dict[str, list[str]]:
     """
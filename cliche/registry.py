@@ -0,0 +1,349 @@
+"""Registry of cliche-installed CLIs, so `cliche ls` doesn't rescan the env.
+
+Finding the CLIs cliche installed means walking every `console_scripts`
+entry point, then for each of ours `find_spec`, the version and every
+distribution's `direct_url.json`, and finally `uv tool list` plus a glob
+through each tool venv. With a few hundred distributions that is seconds,
+and `cliche ls`, `install` (its collision check) and `uninstall` each paid
+it. The result is kept in
+
+    $XDG_CACHE_HOME/cliche/installs_<hash of the interpreter>.json
+
+as one row per CLI:
+
+    binary, pkg, ver, mode ("edit" | "site" | "tool"), pkg_dir,
+    source_dir (editable or tool source), env_path (tool venv),
+    cache_path, n_cmds, cache_mtime_ns
+
+next to the mtime of every directory whose contents decide those rows:
+each directory on sys.path (a new or removed dist-info changes its
+parent's mtime), the uv tool dir and each tool venv's site-packages. The
+rows are trusted while every mtime and the sys.path itself are unchanged;
+anything else and `installs()` scans again. `install`, `uninstall` and
+`migrate` keep a valid registry valid through `record`, which rescans just
+the binary they touched. The command count is re-read from the runtime
+cache only when that file's mtime moved.
+
+Next to it, `installs_<hash>.fingerprints.json` maps each binary to the
+fingerprint of its last successful `cliche install` pip step, which is
+how a repeated install knows it can skip pip.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+FORMAT = 1
+
+
+def registry_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    key = hashlib.md5(f"{sys.executable}\0{sys.prefix}".encode()).hexdigest()[:8]
+    return Path(cache_home) / "cliche" / f"installs_{key}.json"
+
+
+def _mtime(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def _path_dirs() -> list[str]:
+    """sys.path as `entry_points()` sees it, minus the CWD entries that only
+    differ by where the command was started from."""
+    cwd = os.getcwd()
+    out = []
+    for p in sys.path:
+        if not p or p == cwd:
+            continue
+        p = os.path.abspath(p)
+        if p not in out and os.path.isdir(p):
+            out.append(p)
+    return out
+
+
+def _uv_tool_dir() -> str:
+    """Where `uv tool install` puts its venvs (uv's own resolution order)."""
+    if os.environ.get("UV_TOOL_DIR"):
+        return os.environ["UV_TOOL_DIR"]
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(data_home, "uv", "tools")
+
+
+def _cache_file(pkg: str, pkg_dir: str | None) -> str | None:
+    if not pkg_dir:
+        return None
+    cache_home = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
+    dir_hash = hashlib.md5(pkg_dir.encode()).hexdigest()[:8]
+    return str(Path(cache_home) / "cliche" / f"{pkg}_{dir_hash}.json")
+
+
+def _count_commands(row: dict) -> bool:
+    """Refresh `n_cmds` from the runtime cache if it changed since counted.
+    Returns whether the row changed."""
+    mtime = _mtime(row["cache_path"]) if row.get("cache_path") else -1
+    if mtime == row.get("cache_mtime_ns"):
+        return False
+    n_cmds = None
+    if mtime != -1:
+        try:
+            data = json.loads(Path(row["cache_path"]).read_text())
+            n_cmds = sum(len(f.get("functions", []))
+                         for f in data.get("files", {}).values())
+        except Exception:
+            pass
+    row["n_cmds"], row["cache_mtime_ns"] = n_cmds, mtime
+    return True
+
+
+def _pip_row(binary: str, pkg: str) -> dict:
+    import importlib.metadata as im
+    import importlib.util
+
+    # Resolve package dir WITHOUT importing — `__import__` would execute the
+    # package's __init__.py (and all its transitive imports), which dominated
+    # `cliche ls` runtime: a single CLI pulling in pydantic/google-genai
+    # cost ~1s on its own. `find_spec` only locates the file.
+    try:
+        spec = importlib.util.find_spec(pkg)
+    except (ImportError, ValueError):
+        spec = None
+    if spec and spec.origin:
+        pkg_dir = str(Path(spec.origin).parent)
+    elif spec and spec.submodule_search_locations:
+        pkg_dir = str(next(iter(spec.submodule_search_locations)))
+    else:
+        pkg_dir = None
+
+    try:
+        ver = im.version(pkg)
+    except im.PackageNotFoundError:
+        ver = "?"
+
+    # Editable install? A package can have MULTIPLE concurrent metadata
+    # records (a stale .egg-info on PYTHONPATH AND a fresh .dist-info from
+    # `uv pip install -e .`) — importlib's `distribution(name)` returns
+    # only the first. Iterate `distributions(name=name)` and accept the
+    # editable signal from ANY of them, so the table shows `edit` when the
+    # user's most recent install was editable, regardless of leftover
+    # egg-info metadata competing in sys.path.
+    editable = False
+    source_dir = None
+    try:
+        for dist in im.distributions(name=pkg):
+            direct_url = dist.read_text("direct_url.json")
+            if direct_url:
+                data = json.loads(direct_url)
+                if data.get("dir_info", {}).get("editable"):
+                    editable = True
+                    url = data.get("url", "")
+                    if url.startswith("file://"):
+                        source_dir = url[len("file://"):]
+                    break
+            # uv's PEP 660 editable installs drop a `__editable__.<pkg>-<ver>.pth`
+            # next to the dist-info instead of writing direct_url.json.
+            # Detect by the presence of that .pth sibling.
+            meta_path = getattr(dist, "_path", None)
+            if meta_path:
+                parent = Path(meta_path).parent
+                if any(parent.glob(f"__editable__.{pkg}-*.pth")):
+                    editable = True
+                    break
+    except Exception:
+        pass
+
+    return {
+        "binary": binary, "pkg": pkg, "ver": ver,
+        "mode": "edit" if editable else "site",
+        "pkg_dir": pkg_dir, "source_dir": source_dir, "env_path": None,
+        "cache_path": _cache_file(pkg, pkg_dir),
+    }
+
+
+def _tool_site_packages(env_path: str) -> list[Path]:
+    return sorted((Path(env_path) / "lib").glob("python*/site-packages"))
+
+
+def _tool_row(entry: dict, stamps: dict) -> dict:
+    """Row for one `uv tool` CLI; stamps the venv's site-packages first, so a
+    change during the probe invalidates what it records."""
+    src_dir = None
+    for site_packages in _tool_site_packages(entry["env_path"]):
+        stamps[str(site_packages)] = _mtime(str(site_packages))
+        if src_dir is None:
+            src_dir = _tool_source_dir(site_packages, entry["pkg"])
+    return {
+        "binary": entry["binary"], "pkg": entry["pkg"], "ver": entry["ver"],
+        "mode": "tool", "pkg_dir": None, "source_dir": src_dir,
+        "env_path": entry["env_path"],
+        "cache_path": _cache_file(entry["pkg"], src_dir),
+    }
+
+
+def _tool_source_dir(site_packages: Path, pkg: str) -> str | None:
+    """The `file://` URL pip recorded for the tool's own package, if any."""
+    try:
+        for dist_info in site_packages.glob(f"{pkg}*.dist-info"):
+            direct_url = dist_info / "direct_url.json"
+            if direct_url.exists():
+                url = json.loads(direct_url.read_text()).get("url", "")
+                if url.startswith("file://"):
+                    return url[len("file://"):]
+    except Exception:
+        pass
+    return None
+
+
+def _stamps() -> dict:
+    stamps = {p: _mtime(p) for p in _path_dirs()}
+    tool_dir = _uv_tool_dir()
+    stamps[tool_dir] = _mtime(tool_dir)
+    return stamps
+
+
+def scan(only: set[str] | None = None, stamps: dict | None = None) -> list[dict]:
+    """Find every cliche CLI (or just the binaries in `only`) the slow way.
+
+    `uv tool` venvs are probed in parallel — each is a handful of globs
+    and file reads, independent of the others. Tool venv stamps are added
+    to `stamps` when given.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from importlib.metadata import entry_points
+
+    from cliche.install import _parse_cliche_entry, _uv_tool_cliche_entries
+
+    stamps = {} if stamps is None else stamps
+    rows = []
+    for ep in entry_points(group="console_scripts"):
+        if only is not None and ep.name not in only:
+            continue
+        pkg = _parse_cliche_entry(ep.value)
+        if pkg is not None:
+            rows.append(_pip_row(ep.name, pkg))
+
+    tools = [t for t in _uv_tool_cliche_entries() if only is None or t["binary"] in only]
+    if tools:
+        with ThreadPoolExecutor(max_workers=min(8, len(tools))) as pool:
+            rows.extend(pool.map(lambda t: _tool_row(t, stamps), tools))
+        for t in tools:
+            parent = str(Path(t["env_path"]).parent)
+            stamps.setdefault(parent, _mtime(parent))
+    for row in rows:
+        _count_commands(row)
+    return rows
+
+
+def _load() -> dict | None:
+    try:
+        data = json.loads(registry_path().read_text())
+        if data.get("format") != FORMAT or data.get("path") != _path_dirs():
+            return None
+        for path, mtime in data["stamps"].items():
+            if _mtime(path) != mtime:
+                return None
+        return data
+    except Exception:
+        return None
+
+
+def load() -> list[dict] | None:
+    """The recorded rows, or None when missing or no longer valid."""
+    data = _load()
+    return None if data is None else data["rows"]
+
+
+def save(rows: list[dict], stamps: dict) -> None:
+    """Atomically write the registry; best effort, like every cache here."""
+    path = registry_path()
+    tmp = path.with_suffix(f".tmp.{os.getpid()}")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps({"format": FORMAT, "path": _path_dirs(),
+                                   "stamps": stamps, "rows": rows}))
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def installs() -> list[dict]:
+    """Every cliche CLI: the registry while it's valid, else a full scan
+    that is then recorded."""
+    data = _load()
+    if data is not None:
+        rows = data["rows"]
+        if any([_count_commands(row) for row in rows]):
+            save(rows, data["stamps"])
+        return rows
+    stamps = _stamps()
+    rows = scan(stamps=stamps)
+    save(rows, stamps)
+    return rows
+
+
+def record(before: list[dict] | None, *binaries: str) -> None:
+    """Bring the registry up to date after `binaries` were (un)installed.
+
+    `before` is what `load()` returned before the change. When it was
+    valid, only `binaries` are rescanned and the registry re-stamped;
+    otherwise it is dropped, and the next `installs()` scans everything.
+    """
+    if before is None:
+        try:
+            registry_path().unlink()
+        except OSError:
+            pass
+        return
+    stamps = _stamps()
+    for row in before:
+        if row["binary"] not in binaries and row["mode"] == "tool":
+            for site_packages in _tool_site_packages(row["env_path"]):
+                stamps[str(site_packages)] = _mtime(str(site_packages))
+            parent = str(Path(row["env_path"]).parent)
+            stamps.setdefault(parent, _mtime(parent))
+    rows = [r for r in before if r["binary"] not in binaries]
+    save(rows + scan(only=set(binaries), stamps=stamps), stamps)
+
+
+def _fingerprints_path() -> Path:
+    return registry_path().with_suffix(".fingerprints.json")
+
+
+def _fingerprints() -> dict:
+    try:
+        return json.loads(_fingerprints_path().read_text())
+    except Exception:
+        return {}
+
+
+def fingerprint(binary: str) -> str | None:
+    """What `cliche install` recorded for `binary`'s last pip step."""
+    return _fingerprints().get(binary)
+
+
+def set_fingerprint(binary: str, value: str | None) -> None:
+    """Record (or, with None, forget) `binary`'s install fingerprint."""
+    data = _fingerprints()
+    if value is None:
+        if data.pop(binary, None) is None:
+            return
+    else:
+        data[binary] = value
+    path = _fingerprints_path()
+    tmp = path.with_suffix(f".tmp.{os.getpid()}")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
@@ -3,7 +3,6 @@
 Fast CLI loader that uses pre-parsed cache to avoid importing all modules.
 Only imports the specific module when a command is invoked.
 """
-import argparse
 import importlib
 import json
 import os
@@ -17,6 +16,18 @@ try:
 except ImportError:
     from abbrev import get_short_flags, build_var_names
     from docstring import parse_param_descriptions, get_description_without_params
+from cliche import trace
+
+# Parser classes that moved to cliche.argparser, still importable from here.
+# Resolved on first access so `import cliche.run` doesn't import argparse.
+_ARGPARSER_NAMES = {"CleanHelpFormatter", "CleanArgumentParser", "_DictAction"}
+
+
+def __getattr__(name):
+    if name in _ARGPARSER_NAMES:
+        from cliche import argparser
+        return getattr(argparser, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 _KEY_ENUMS = {
@@ -44,10 +55,21 @@ def compress_enums(enums: dict) -> dict:
 #     into scripts, etc. get raw Python str output.
 RAW_MODE = False
 
+# --output-format: how invoke_function serializes the return value
+# (cliche/output.py). None keeps the defaults: indented JSON, NDJSON for
+# iterators, plain str under --raw.
+OUTPUT_FORMAT = None
+
+# Forces colour on/off regardless of the stream; cliche/help_store.py sets it
+# while pre-rendering the coloured and plain variants of each help text.
+_COLOR_OVERRIDE = None
+
 
 # Color formatting — disabled when output is not a TTY (piped/redirected)
 def _supports_color(stream=None) -> bool:
     """Check if the given stream supports ANSI color codes."""
+    if _COLOR_OVERRIDE is not None:
+        return _COLOR_OVERRIDE
     if RAW_MODE:
         return False
     if os.environ.get("NO_COLOR"):
@@ -166,19 +188,22 @@ def _resolve_binary(pkg_name):
 
 
 def _detect_autocomplete(binary_name) -> bool:
-    """True when a `register-python-argcomplete <binary_name>` line lives in
-    any of the user's shell rc files. Shared by `--cli` and `cliche ls`."""
+    """True when a completion hook for `binary_name` (tagged `# cliche:
+    autocomplete for <binary_name>`, or an older `register-python-argcomplete
+    <binary_name>` line) lives in any of the user's shell rc files. Shared by
+    `--cli` and `cliche ls`."""
     if not binary_name:
         return False
     import os
-    needle_bash = f"register-python-argcomplete {binary_name}"
-    needle_fish = f"register-python-argcomplete --shell fish {binary_name}"
+    needles = (f"# cliche: autocomplete for {binary_name}\n",
+               f"register-python-argcomplete {binary_name}",
+               f"register-python-argcomplete --shell fish {binary_name}")
     for config in ("~/.bashrc", "~/.zshrc", "~/.bash_profile", "~/.zprofile",
                    "~/.config/fish/config.fish"):
         try:
             with open(os.path.expanduser(config)) as f:
                 content = f.read()
-            if needle_bash in content or needle_fish in content:
+            if any(needle in content for needle in needles):
                 return True
         except (FileNotFoundError, IOError, OSError):
             pass
@@ -241,15 +266,18 @@ def _collect_cli_info(cache_path=None, pkg_name=None, install_dir=None) -> list:
     cli_dir = None
     shim = None
     try:
-        with open(binary_path) as f:
+        from cliche._clichec import is_fast_shim
+        if is_fast_shim(binary_path):
+            # clichec itself is a binary; only the shell wrapper reads as text.
+            installed, shim = True, "c"
+        with open(binary_path, errors="replace") as f:
             txt = f.read()
-        installed = "cliche" in txt.lower() or "cli tool installed" in txt.lower()
+        installed = installed or "cliche" in txt.lower() or "cli tool installed" in txt.lower()
         match = re.search(r'file_path = "([^"]+)"', txt)
         if match:
             cli_dir = match.group(1)
-        if "cliche fast-shim wrapper" in txt:
-            shim = "c"
-        elif "from cliche.launcher import launch_" in txt or "cliche" in txt.lower():
+        if shim is None and ("from cliche.launcher import launch_" in txt
+                             or "cliche" in txt.lower()):
             shim = "py"
     except (FileNotFoundError, IOError, IsADirectoryError, OSError):
         pass
@@ -433,64 +461,6 @@ def colorize_help(message: str, stream=None) -> str:
     return message
 
 
-class CleanHelpFormatter(argparse.HelpFormatter):
-    """Custom formatter that hides choices from usage line but shows in help."""
-
-    def __init__(self, prog, indent_increment=2, max_help_position=24, width=None):
-        super().__init__(prog, indent_increment, max_help_position, width)
-        self._in_usage = False
-
-    def _format_usage(self, usage, actions, groups, prefix):
-        self._in_usage = True
-        result = super()._format_usage(usage, actions, groups, prefix)
-        self._in_usage = False
-        return result
-
-    def _metavar_formatter(self, action, default_metavar):
-        # For choices in usage line, just show the dest name
-        if self._in_usage and action.choices is not None:
-            result = action.dest.upper()
-            def format(tuple_size):
-                if isinstance(result, tuple):
-                    return result
-                else:
-                    return (result,) * tuple_size
-            return format
-        return super()._metavar_formatter(action, default_metavar)
-
-
-class CleanArgumentParser(argparse.ArgumentParser):
-    """ArgumentParser with better error output - shows help before error."""
-
-    llm_mode = False  # Class-level flag for LLM mode
-
-    def __init__(self, *args, **kwargs):
-        # setdefault (not overwrite) so callers can opt into RawDescriptionHelpFormatter
-        # for multi-line description blocks; subparsers created via add_parser inherit
-        # this class through parser_class but may pass their own formatter.
-        kwargs.setdefault('formatter_class', CleanHelpFormatter)
-        super().__init__(*args, **kwargs)
-
-    def print_help(self, file=None):
-        if file is None:
-            file = sys.stdout
-        help_text = self.format_help()
-        # Replace "options:" with "OPTIONS::"
-        help_text = help_text.replace("options:", "OPTIONS::")
-        help_text = help_text.replace("positional arguments:", "POSITIONAL ARGUMENTS:")
-        help_text = colorize_help(help_text, stream=file)
-        file.write(help_text)
-
-    def error(self, message):
-        if CleanArgumentParser.llm_mode:
-            # Compact error for LLM consumption
-            sys.stderr.write(f"error: {message}\n")
-            sys.exit(2)
-        # Print help first, then the error
-        self.print_help(sys.stderr)
-        sys.stderr.write(f"\n{Colors.red(message, stream=sys.stderr)}\n")
-        sys.exit(2)
-
 def _get_cache_dir() -> Path:
     """Get the cache directory using XDG_CACHE_HOME or ~/.cache fallback."""
     cache_home = os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache"))
@@ -544,14 +514,24 @@ def build_index(data):
     """Build lookup indices from cache data.
 
     Returns (commands, subcommands, enums, pydantic_models) — the fourth
-    element is a set of class names the AST scanner identified as pydantic
-    BaseModel subclasses. help_only mode uses this to decide whether an
-    annotation is worth importing the user module to resolve.
+    element maps each class name the AST scanner identified as a pydantic
+    BaseModel subclass to its statically read field list, or None where the
+    fields need the imported class. help_only mode uses this to decide
+    whether an annotation is worth importing the user module to resolve.
     """
     commands = {}  # name -> func_info
     subcommands = {}  # group -> {name -> func_info}
     enums = data.get('enums', {})  # enum_name -> [values]
-    pydantic_models: set = set(data.get('pydantic_models', []))
+    schemas = data.get('pydantic_schemas', {})
+    pydantic_models = {name: schemas.get(name) for name in data.get('pydantic_models', [])}
+
+    from cliche.shards import Files
+    if isinstance(data['files'], Files):
+        # Sharded cache (cliche/shards.py): the tables come from the stubs
+        # and each function record is read when it is looked up.
+        from cliche.shards import build_index as build_sharded
+        commands, subcommands = build_sharded(data['files'])
+        return commands, subcommands, enums, pydantic_models
 
     for file_path, entry in data['files'].items():
         for func in entry['functions']:
@@ -732,8 +712,11 @@ def _print_llm_output_json(commands: dict, subcommands: dict, enums: dict,
         '--uv [args]': "Run uv targeting this CLI's Python environment (e.g. --uv pip install pkg, --uv sync)",
         '--pyspy N': 'Profile for N seconds with py-spy (speedscope JSON output)',
         '--raw': 'Print return value as-is (no JSON, no color) — good for pipes',
+        '--output-format F': 'Write the return value as json, json-compact, ndjson, csv, tsv, msgpack or arrow',
         '--full-traceback': 'Show the full traceback including cliche-internal wrapper frames',
         '--timing': 'Show timing information',
+        '--import-profile[=N|FILE]': 'Time every import: a tree and the top N on stderr, or a speedscope/.folded file',
+        '--batch FILE|- [-j N] [--threads]': 'Run one command line per input line in one process; NDJSON results',
     }
 
     # Output minified JSON
@@ -803,8 +786,11 @@ def _print_llm_output_lines(commands: dict, subcommands: dict, enums: dict,
     lines.append("--uv [args]: Run uv targeting this CLI's Python env (e.g. --uv pip install pkg, --uv sync)")
     lines.append("--pyspy N: Profile for N seconds with py-spy (speedscope JSON output)")
     lines.append("--raw: Print return value as-is (no JSON, no color) — good for pipes")
+    lines.append("--output-format F: Write the return value as json, json-compact, ndjson, csv, tsv, msgpack or arrow")
     lines.append("--full-traceback: Show the full traceback including cliche-internal wrapper frames")
     lines.append("--timing: Show timing information")
+    lines.append("--import-profile[=N|FILE]: Time every import: a tree and the top N on stderr, or a speedscope/.folded file")
+    lines.append("--batch FILE|- [-j N] [--threads]: Run one command line per input line in one process; NDJSON results")
     lines.append("")
 
     # Add enums
@@ -876,8 +862,10 @@ def print_llm_command_help(func: dict, prog_name: str, cmd: str, group: str = No
 
     print("## global options")
     print("--pdb: debugger on error | --pyspy N: profile Ns | --raw: plain output (no JSON/color)")
+    print("--output-format F: json, json-compact, ndjson, csv, tsv, msgpack, arrow")
     print("--full-traceback: include cliche wrappers | --timing: timing info | --llm-help: this view")
-    print(f"# Top-level only (run on `{prog_name}` itself): --version, --cli, --pip, --uv — see `{prog_name} --llm-help`")
+    print("--import-profile[=N|FILE]: import times, top N or a speedscope/.folded file")
+    print(f"# Top-level only (run on `{prog_name}` itself): --version, --cli, --pip, --uv, --batch — see `{prog_name} --llm-help`")
 
 
 
@@ -912,8 +900,43 @@ def print_help(commands, subcommands, prog_name: str = "run.py", description: st
     print(f"  {Colors.blue('--uv')}          Run uv targeting this CLI's Python environment")
     print(f"  {Colors.blue('--pyspy N')}     Profile for N seconds with py-spy (speedscope format)")
     print(f"  {Colors.blue('--raw')}         Print return value as-is (no JSON, no color)")
+    print(f"  {Colors.blue('--output-format F')} Write the return value as json, json-compact, ndjson, csv, tsv, msgpack or arrow")
     print(f"  {Colors.blue('--full-traceback')} Show the full traceback including cliche wrapper frames")
     print(f"  {Colors.blue('--timing')}      Show timing information")
+    print(f"  {Colors.blue('--import-profile')} Time every import; =N for the top N, =FILE for speedscope/.folded")
+    print(f"  {Colors.blue('--batch FILE')}  Run one command line per line of FILE (- for stdin) in one process; -j N in parallel")
+
+
+def print_group_help(group: str, funcs: dict, prog_name: str):
+    """Print the command listing for `<prog> <group> [--help]`."""
+    print(f"{Colors.blue(f'usage: {prog_name} {group} COMMAND ...')}\n")
+    print(f"Commands in '{group}':")
+    for name in sorted(funcs.keys()):
+        doc = get_docstring_first_line(funcs[name])
+        padded_name = f"    {name:24}"
+        if doc:
+            print(f"{Colors.blue(padded_name)}{doc[:50]}")
+        else:
+            print(Colors.blue(padded_name.rstrip()))
+
+
+def _print_stored_help(kind: str, group: str, name: str, prog_name: str) -> bool:
+    """Write a help text pre-rendered at cache-write time, if there is one.
+
+    See cliche/help_store.py. Returns False when the store is missing,
+    stale, rendered for another program name or terminal width, or simply
+    has no entry for this command — the caller then renders live.
+    """
+    try:
+        from cliche.help_store import lookup
+    except ImportError:
+        return False
+    text = lookup(CACHE_PATH, kind, group, name, prog_name,
+                  color=_supports_color(sys.stdout))
+    if text is None:
+        return False
+    sys.stdout.write(text)
+    return True
 
 
 def simplify_type_annotation(annotation: str) -> str:
@@ -958,7 +981,7 @@ def _parse_dict_annotation(annotation: str | None) -> tuple | None:
     """Extract (key_type, value_type) from `dict[K, V]` / `Dict[K, V]`.
 
     Returns (key_conv, value_conv) callables that argparse's `type=` can use
-    per-element via _DictAction below. Returns None if the annotation isn't a
+    per-element via cliche.argparser._DictAction. Returns None if the annotation isn't a
     parametrised dict (including the bare `dict` — no key/value info to use).
     """
     if not annotation:
@@ -992,36 +1015,6 @@ def _parse_dict_annotation(annotation: str | None) -> tuple | None:
     return key_conv, val_conv
 
 
-class _DictAction(argparse.Action):
-    """Collect `--opt k=v --opt k2=v2` (or `--opt k=v k2=v2` with nargs) into a dict.
-
-    The key/value converters come from the annotation — e.g. `dict[str, int]`
-    gives str keys and int values. Raises ArgumentError on bad format so the
-    user sees the standard argparse error, not a traceback.
-    """
-    def __init__(self, *args, key_type=str, value_type=str, **kwargs):
-        self._key_type = key_type
-        self._value_type = value_type
-        super().__init__(*args, **kwargs)
-
-    def __call__(self, parser, namespace, values, option_string=None):
-        result = getattr(namespace, self.dest, None) or {}
-        items = values if isinstance(values, list) else [values]
-        for item in items:
-            if '=' not in item:
-                raise argparse.ArgumentError(
-                    self, f"expected KEY=VALUE, got {item!r}"
-                )
-            k, v = item.split('=', 1)
-            try:
-                k_conv = self._key_type(k)
-                v_conv = self._value_type(v)
-            except (ValueError, TypeError) as e:
-                raise argparse.ArgumentError(self, f"bad key/value {item!r}: {e}")
-            result[k_conv] = v_conv
-        setattr(namespace, self.dest, result)
-
-
 def type_from_annotation(annotation: str):
     """Convert type annotation string to Python type."""
     if annotation is None:
@@ -1292,6 +1285,21 @@ def _annotation_pydantic_name(annotation: str, pydantic_models) -> str | None:
     return None
 
 
+# Field annotations main.extract_pydantic_schemas accepts, as converters.
+_PYD_FIELD_TYPES = {'str': str, 'int': int, 'float': float, 'bool': bool}
+
+
+def _pydantic_schema(annotation: str, pydantic_models) -> list[dict] | None:
+    """The scanner's field list (main.extract_pydantic_schemas) for the model
+    ``annotation`` names, or None — no model, fields that need the imported
+    class, or a plain set of names from a caller without scanner schemas.
+    """
+    name = _annotation_pydantic_name(annotation, pydantic_models)
+    if name is None or not isinstance(pydantic_models, dict):
+        return None
+    return pydantic_models[name]
+
+
 def _resolve_annotation_class(annotation: str | None, module_name: str):
     """Best-effort: resolve a type-annotation string to the class object.
 
@@ -1334,6 +1342,15 @@ def _is_pydantic_model(cls) -> bool:
         return False
 
 
+def _pydantic_field_description(model_cls, field_name: str) -> str | None:
+    """``Field(description=...)`` of one field (pydantic v2 or v1)."""
+    info = (getattr(model_cls, 'model_fields', None) or {}).get(field_name)
+    if info is None:
+        legacy = (getattr(model_cls, '__fields__', None) or {}).get(field_name)
+        info = getattr(legacy, 'field_info', None)
+    return getattr(info, 'description', None)
+
+
 def _pydantic_fields(model_cls):
     """Return [(field_name, type_cls, default, required)] for a BaseModel.
 
@@ -1387,6 +1404,8 @@ def build_parser_for_function(func, enums=None, prog_name: str = "run.py", help_
     # annotations not in the set skip `_resolve_annotation_class` and avoid
     # importing the user module. Real CLI invocations from ``main()`` always
     # pass the set; test callers that don't pass anything keep working.
+    from cliche.argparser import CleanArgumentParser, _DictAction
+
     _use_pyd_gate = pydantic_models is not None
     if pydantic_models is None:
         pydantic_models = set()
@@ -1413,10 +1432,16 @@ def build_parser_for_function(func, enums=None, prog_name: str = "run.py", help_
     global_group.add_argument('--pdb', action='store_true', help='Drop into debugger on error')
     global_group.add_argument('--pyspy', type=int, default=0, metavar='N', help='Profile for N seconds with py-spy (speedscope format)')
     global_group.add_argument('--raw', action='store_true', help='Print return value as-is (no JSON pretty-print, no color) — good for pipes')
+    # --output-format and --import-profile are left out for a command with a
+    # parameter of that name: the option is the command's own.
+    params = func.get('parameters', [])
+    own = {p['name'] for p in params}
+    if 'output_format' not in own:
+        global_group.add_argument('--output-format', metavar='FORMAT', help='Write the return value as json, json-compact, ndjson, csv, tsv, msgpack or arrow')
     global_group.add_argument('--full-traceback', action='store_true', help='Show the full traceback including cliche-internal wrapper frames')
     global_group.add_argument('--timing', action='store_true', help='Show timing information')
-
-    params = func.get('parameters', [])
+    if 'import_profile' not in own:
+        global_group.add_argument('--import-profile', nargs='?', const='', metavar='N|FILE', help='Time every import: top N on stderr, or a speedscope/.folded FILE')
 
     # Get short flags for all parameters
     short_flags = get_short_flags(params)
@@ -1522,7 +1547,12 @@ def build_parser_for_function(func, enums=None, prog_name: str = "run.py", help_
         # heavy transitive dependencies. Without the gate (test callers
         # that don't pass pydantic_models), keep the legacy always-resolve
         # path so behavior is backward compatible.
-        if not annotation:
+        # Models whose fields the scanner read statically
+        # (main.extract_pydantic_schemas) expand from the cache alone: the
+        # binding keeps the annotation and invoke_function resolves the class
+        # when it builds the instance.
+        schema = _pydantic_schema(annotation, pydantic_models) if annotation else None
+        if schema is not None or not annotation:
             annotation_cls = None
         elif _use_pyd_gate:
             pyd_candidate = _annotation_pydantic_name(annotation, pydantic_models)
@@ -1532,44 +1562,57 @@ def build_parser_for_function(func, enums=None, prog_name: str = "run.py", help_
             )
         else:
             annotation_cls = _resolve_annotation_class(annotation, module_name)
-        if _is_pydantic_model(annotation_cls):
+        if schema is not None:
+            model_name = _annotation_pydantic_name(annotation, pydantic_models)
+            fields = [(f['name'], _PYD_FIELD_TYPES[f['annotation']], f['annotation'],
+                       f.get('default'), f['required'], f.get('description'))
+                      for f in schema]
+        elif _is_pydantic_model(annotation_cls):
+            model_name = annotation_cls.__name__
+            fields = []
+            for fname, ftype, fdefault, frequired in _pydantic_fields(annotation_cls):
+                # Map basic types to argparse type converters; unknown types fall back to str.
+                fields.append((fname, ftype if ftype in (str, int, float, bool) else str,
+                               getattr(ftype, '__name__', str(ftype)), fdefault, frequired,
+                               _pydantic_field_description(annotation_cls, fname)))
+        else:
+            fields = None
+        if fields is not None:
             group = parser.add_argument_group(
-                f'{annotation_cls.__name__} (bound to `{name}`)',
+                f'{model_name} (bound to `{name}`)',
                 description=param_desc or None,
             )
             field_names = []
-            for fname, ftype, fdefault, frequired in _pydantic_fields(annotation_cls):
+            for fname, ftype_conv, type_label, fdefault, frequired, fdesc in fields:
                 flag = f'--{fname.replace("_", "-")}'
-                # Map basic types to argparse type converters; unknown types fall back to str.
-                ftype_conv = ftype if ftype in (str, int, float, bool) else str
-                type_label = getattr(ftype, '__name__', str(ftype))
-                if ftype is bool:
+                fdesc_suffix = f' {fdesc}' if fdesc else ''
+                if ftype_conv is bool:
                     # Default reflects the FLAG, not the underlying param (see
                     # non-pydantic bool branch above for the reasoning).
                     if fdefault is True:
                         group.add_argument(
                             f'--no-{fname.replace("_", "-")}', dest=fname,
                             action='store_false', default=True,
-                            help='|bool| Default: False |',
+                            help=f'|bool| Default: False |{fdesc_suffix}',
                         )
                     else:
                         group.add_argument(
                             flag, dest=fname, action='store_true',
                             default=False if fdefault is None else fdefault,
-                            help=f'|bool| Default: {fdefault if fdefault is not None else False} |',
+                            help=f'|bool| Default: {fdefault if fdefault is not None else False} |{fdesc_suffix}',
                         )
                 elif frequired:
                     group.add_argument(
                         flag, dest=fname, type=ftype_conv, required=True,
-                        help=f'|{type_label}| (required) |',
+                        help=f'|{type_label}| (required) |{fdesc_suffix}',
                     )
                 else:
                     group.add_argument(
                         flag, dest=fname, type=ftype_conv, default=fdefault,
-                        help=f'|{type_label}| Default: {fdefault} |',
+                        help=f'|{type_label}| Default: {fdefault} |{fdesc_suffix}',
                     )
                 field_names.append(fname)
-            pydantic_binds.append((name, annotation_cls, field_names))
+            pydantic_binds.append((name, annotation_cls or annotation, field_names))
             continue
 
         if param_type == bool:
@@ -1790,14 +1833,17 @@ def convert_enum_args(func, kwargs, enums):
     return kwargs
 
 
-def invoke_function(func, parsed_args, enums=None, pydantic_binds=None):
-    """Import module and invoke the function."""
+def invoke_function(func, parsed_args, enums=None, pydantic_binds=None, print_result=True):
+    """Import module and invoke the function. With `print_result=False` the
+    return value is handed back instead of printed (cliche/batch.py)."""
     import inspect  # lazy: only the invoke path needs this (~7ms import)
     module_name = func['module']
     func_name = func['name']
 
     # Import the module
     module = importlib.import_module(module_name)
+    if print_result:
+        trace.mark("run.import", module=module_name)
 
     # Check if this is a class method (first param is 'self')
     params = func.get('parameters', [])
@@ -1822,7 +1868,8 @@ def invoke_function(func, parsed_args, enums=None, pydantic_binds=None):
         fn = getattr(module, func_name)
 
     # Global CLI args to exclude from function call
-    global_args = {'cli', 'pdb', 'pip', 'uv', 'pyspy', 'raw', 'full_traceback', 'timing', 'version', 'llm_help'}
+    global_args = {'cli', 'pdb', 'pip', 'uv', 'pyspy', 'raw', 'output_format', 'full_traceback', 'timing', 'import_profile', 'version', 'llm_help'}
+    global_args -= {p['name'] for p in func.get('parameters', [])} & {'output_format', 'import_profile'}
 
     # Convert parsed args to dict, excluding None values and global CLI args
     kwargs = {k: v for k, v in vars(parsed_args).items() if v is not None and k not in global_args}
@@ -1851,6 +1898,9 @@ def invoke_function(func, parsed_args, enums=None, pydantic_binds=None):
     # only inspected once, in pydantic's validator path.
     if pydantic_binds:
         for param_name, model_cls, field_names in pydantic_binds:
+            if isinstance(model_cls, str):
+                # Expanded from the scanner's schema; the class is needed now.
+                model_cls = _resolve_annotation_class(model_cls, module_name)
             field_kwargs = {fn: kwargs.pop(fn) for fn in field_names if fn in kwargs}
             try:
                 kwargs[param_name] = model_cls(**field_kwargs)
@@ -1883,27 +1933,43 @@ def invoke_function(func, parsed_args, enums=None, pydantic_binds=None):
         elif ann.startswith('tuple[') or ann.startswith('Tuple['):
             kwargs[pname] = tuple(value)
 
+    # An unknown or unavailable --output-format fails before the command
+    # runs. Looked up only now, so formats the command's module registers
+    # are known.
+    if OUTPUT_FORMAT is not None and print_result:
+        from cliche import output
+        try:
+            output.resolve(OUTPUT_FORMAT)
+        except output.OutputFormatError as e:
+            print(f"error: {e}", file=sys.stderr)
+            sys.exit(2)
+
     # Call the function (handle async functions)
+    if print_result:
+        trace.mark("run.convert_args")
     if inspect.iscoroutinefunction(fn):
         import asyncio
         result = asyncio.run(fn(**kwargs))
     else:
         result = fn(**kwargs)
+    if not print_result:
+        return result
+    trace.mark("run.invoke", function=func_name)
 
     # A non-None return value is always auto-printed after the function runs.
     # If the function also called print(...), both outputs are shown — the
     # print usually carries diagnostic context (labels, progress), the return
     # carries the data. Users who literally want only one should either
-    # `return None` or remove the print().
+    # `return None` or remove the print(). Generators and other iterators are
+    # streamed item by item instead of being collected (cliche/output.py).
     if result is not None:
-        if RAW_MODE:
-            # Raw: no JSON pretty-print, no wrapping. Good for `| jq`, `| wc`.
-            print(result)
-        else:
-            try:
-                print(json.dumps(result, indent=2))
-            except (TypeError, ValueError):
-                print(result)
+        from cliche import output
+        try:
+            output.emit(result, OUTPUT_FORMAT, raw=RAW_MODE)
+        except output.OutputFormatError as e:
+            print(f"error: {e}", file=sys.stderr)
+            sys.exit(2)
+        trace.mark("run.output")
 
 
 def _start_pyspy(duration):
@@ -1960,6 +2026,92 @@ def _start_pyspy(duration):
     # unreachable: execvp replaced the process image
 
 
+def _dasherize_flags(argv: list) -> None:
+    """Accept underscore-style long flags (e.g. --exclude_exchanges) as aliases
+    for the canonical kebab-case (--exclude-exchanges). Rewrites the flag
+    portion in place; values after `=` are left untouched."""
+    for i, arg in enumerate(argv):
+        if arg.startswith('--') and '_' in arg:
+            flag, sep, val = arg.partition('=')
+            argv[i] = flag.replace('_', '-') + sep + val
+
+
+def _is_import_profile_value(argv: list, i: int) -> bool:
+    """argv[i] is a separate value for the `--import-profile` before it."""
+    return i < len(argv) and (argv[i].isdigit() or argv[i].endswith(('.json', '.folded')))
+
+
+def _command_index(argv: list) -> int:
+    """Index of the command name in argv: the first token that is neither a
+    global option nor the value of one. Global options taken from argv before
+    parsing are looked for only ahead of it."""
+    i = 1
+    while i < len(argv) and argv[i].startswith('-') and argv[i] != '-':
+        flag = argv[i]
+        if flag in ('--output-format', '--batch', '-j', '--jobs'):
+            i += 1
+        elif flag == '--pyspy' and i + 1 < len(argv) and argv[i + 1].isdigit():
+            i += 1
+        elif flag == '--import-profile' and _is_import_profile_value(argv, i + 1):
+            i += 1
+        i += 1
+    return i
+
+
+def _start_import_profile(target) -> None:
+    import atexit
+
+    from cliche import import_profile
+    import_profile.install()
+    atexit.register(import_profile.report, target)
+
+
+def _take_late_globals(func, parsed_args) -> None:
+    """--output-format and --import-profile given after the command name, as
+    the command's parser read them. A command with a parameter of that name
+    has the option to itself (build_parser_for_function leaves ours out)."""
+    global OUTPUT_FORMAT
+    own = {p['name'] for p in func.get('parameters', [])}
+    value = getattr(parsed_args, 'output_format', None)
+    if 'output_format' not in own and value is not None and OUTPUT_FORMAT is None:
+        OUTPUT_FORMAT = value
+    value = getattr(parsed_args, 'import_profile', None)
+    if 'import_profile' not in own and value is not None:
+        _start_import_profile(value or None)
+
+
+def _parse_command_args(func, argv, enums, prog_name, pydantic_models, show_timing=False):
+    """`(parsed_args, pydantic_binds)` for a command's `argv`.
+
+    The function's parse plan (cliche/fast_parse.py) takes it when it can;
+    anything else (help, errors, signatures without a plan) builds the
+    argparse parser.
+    """
+    import time
+    plan = func.get('parse_plan')
+    if plan is not None:
+        t = time.time()
+        from cliche import fast_parse
+        parsed_args = fast_parse.parse(plan, argv, enums, pydantic_models)
+        if parsed_args is not None:
+            trace.mark("run.parse_args", plan=True)
+            if show_timing:
+                print(f"timing parse_plan: {(time.time() - t)*1000:.1f}ms", file=sys.stderr)
+            return parsed_args, None
+
+    t = time.time()
+    help_only = any(a in ('-h', '--help') for a in argv)
+    parser = build_parser_for_function(func, enums, prog_name=prog_name, help_only=help_only, pydantic_models=pydantic_models)
+    trace.mark("run.build_parser", help_only=help_only)
+    if show_timing:
+        print(f"timing build_parser: {(time.time() - t)*1000:.1f}ms", file=sys.stderr)
+
+    parsed_args = parser.parse_args(argv)
+    trace.mark("run.parse_args")
+    _take_late_globals(func, parsed_args)
+    return parsed_args, getattr(parser, '_pydantic_binds', None)
+
+
 def main():
     global CACHE_PATH, SOURCE_DIR
     import time
@@ -2025,18 +2177,27 @@ def main():
                   file=sys.stderr)
             sys.exit(127)
 
-    # Accept underscore-style long flags (e.g. --exclude_exchanges) as aliases
-    # for the canonical kebab-case (--exclude-exchanges). Rewrite the flag
-    # portion only — values after `=` are left untouched.
-    for _i, _a in enumerate(sys.argv):
-        if _a.startswith('--') and '_' in _a:
-            _flag, _sep, _val = _a.partition('=')
-            sys.argv[_i] = _flag.replace('_', '-') + _sep + _val
+    _dasherize_flags(sys.argv)
 
     show_timing = '--timing' in sys.argv
     if show_timing:
         sys.argv.remove('--timing')
 
+    # --import-profile [N|FILE]: time every import from here on, including
+    # those parser building triggers; reported at exit (cliche/import_profile.py).
+    # The value is optional, so a separate token is only taken as one when it
+    # can't be anything else: a count, or a .json/.folded report file. Ahead
+    # of the command only, like --output-format below.
+    for _i, _a in enumerate(sys.argv[:_command_index(sys.argv)]):
+        if _a == '--import-profile' or _a.startswith('--import-profile='):
+            _target = _a.partition('=')[2] or None
+            if _a == '--import-profile' and _is_import_profile_value(sys.argv, _i + 1):
+                _target = sys.argv[_i + 1]
+                del sys.argv[_i + 1]
+            del sys.argv[_i]
+            _start_import_profile(_target)
+            break
+
     # --raw: disable color and switch result printing to plain `print()`.
     # Consumed by Colors via RAW_MODE and by invoke_function's result printer.
     global RAW_MODE
@@ -2044,6 +2205,64 @@ def main():
         sys.argv.remove('--raw')
         RAW_MODE = True
 
+    # --output-format F / --output-format=F: serializer for the return value.
+    # Taken here only ahead of the command; after it, it is the command's
+    # parser's (see _take_late_globals), so a command's own option is left alone.
+    global OUTPUT_FORMAT
+    for _i, _a in enumerate(sys.argv[:_command_index(sys.argv)]):
+        if _a == '--output-format' or _a.startswith('--output-format='):
+            _flag, _sep, _val = _a.partition('=')
+            if not _sep:
+                if _i + 1 >= len(sys.argv):
+                    print("error: argument --output-format: expected one argument", file=sys.stderr)
+                    sys.exit(2)
+                _val = sys.argv[_i + 1]
+                del sys.argv[_i + 1]
+            del sys.argv[_i]
+            OUTPUT_FORMAT = _val
+            break
+
+    # --batch FILE|- [-j N] [--threads]: run one invocation per input line in
+    # this process (cliche/batch.py). Only recognised ahead of any command,
+    # so a command's own --batch/-j options are left alone.
+    batch_source = batch_jobs = None
+    batch_threads = False
+    _leading = []
+    for _a in sys.argv[1:]:
+        if not _a.startswith('-'):
+            break
+        _leading.append(_a.partition('=')[0])
+    if '--batch' in _leading:
+        _keep, _rest = [], []
+        _args = iter(sys.argv[1:])
+        for _a in _args:
+            _flag, _eq, _val = _a.partition('=')
+            if _a.startswith('-j') and _a[2:].isdigit():
+                _flag, _val = '-j', _a[2:]
+            elif _flag in ('--batch', '-j', '--jobs') and not _eq:
+                _val = next(_args, None)
+            if _a == '--threads':
+                batch_threads = True
+            elif _a in ('--pdb', '--full-traceback'):
+                _keep.append(_a)
+            elif _flag not in ('--batch', '-j', '--jobs'):
+                _rest.append(_a)
+            elif _val is None:
+                print(f"error: argument {_flag}: expected one argument", file=sys.stderr)
+                sys.exit(2)
+            elif _flag == '--batch':
+                batch_source = _val
+            elif _val.isdigit() and int(_val) > 0:
+                batch_jobs = int(_val)
+            else:
+                print(f"error: argument {_flag}: expected a positive number, got '{_val}'", file=sys.stderr)
+                sys.exit(2)
+        if _rest:
+            print(f"error: --batch takes its commands from {batch_source}, "
+                  f"not the command line: {' '.join(_rest)}", file=sys.stderr)
+            sys.exit(2)
+        sys.argv[1:] = _keep
+
     # Trim cliche-internal frames from uncaught tracebacks so the traceback
     # opens at the user's code, but keep the very first frame (the `<string>`
     # entry shim, which prints `from cliche.launcher import launch_<pkg>`) so
@@ -2116,6 +2335,7 @@ def main():
     show_llm = '--llm-help' in sys.argv
     if show_llm:
         sys.argv.remove('--llm-help')
+        from cliche.argparser import CleanArgumentParser
         CleanArgumentParser.llm_mode = True
 
     # Regenerate cache if SOURCE_DIR is set
@@ -2131,19 +2351,38 @@ def main():
 
     # Load cache (uses PRELOADED_CACHE if set by install_generator)
     data = load_cache()
+    trace.mark("run.cache_load")
     if show_timing:
         cached = " (preloaded)" if PRELOADED_CACHE else ""
         print(f"timing cache_load{cached}: {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
 
     t1 = time.time()
     commands, subcommands, enums, pydantic_models = build_index(data)
+    trace.mark("run.build_index")
     if show_timing:
         print(f"timing build_index: {(time.time() - t1)*1000:.1f}ms", file=sys.stderr)
 
+    if batch_source is not None:
+        from cliche import batch
+        status = batch.run(batch_source, commands, subcommands, enums, pydantic_models,
+                           prog_name=prog_name, jobs=batch_jobs or 1, threads=batch_threads)
+        if show_timing:
+            print(f"timing total (batch): {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
+        sys.exit(status)
+
     # Handle argcomplete - build minimal parser for completion
     if '_ARGCOMPLETE' in os.environ:
         import argcomplete
 
+        from cliche.argparser import CleanArgumentParser
+
+        def dynamic_completer(spec):
+            """A `@completer` function's candidates (cliche/completions.py)."""
+            def _complete(**kw):
+                from cliche import completions
+                return completions.candidates(spec, CACHE_PATH)
+            return _complete
+
         def add_params_to_parser(cmd_parser, func):
             """Add function parameters to argparse parser for completion."""
             params = func.get('parameters', [])
@@ -2165,8 +2404,19 @@ def main():
                 if short_flag:
                     used_short.add(short_flag)
                 enum_choices = get_enum_from_annotation(annotation, enums)
-
-                if param_type == bool:
+                fields = _pydantic_schema(annotation, pydantic_models)
+
+                if fields is not None:
+                    # Same flags build_parser_for_function expands the model to.
+                    for f in fields:
+                        flag = f['name'].replace('_', '-')
+                        if f['annotation'] != 'bool':
+                            cmd_parser.add_argument(f'--{flag}', dest=f['name'])
+                        elif f.get('default') is True:
+                            cmd_parser.add_argument(f'--no-{flag}', dest=f['name'], action='store_false')
+                        else:
+                            cmd_parser.add_argument(f'--{flag}', dest=f['name'], action='store_true')
+                elif param_type == bool:
                     if has_default and parse_default(default_str, bool):
                         cmd_parser.add_argument(f'--no-{pname.replace("_", "-")}', dest=pname, action='store_false')
                     else:
@@ -2177,7 +2427,9 @@ def main():
                     kwargs = {'dest': pname}
                     if enum_choices:
                         kwargs['choices'] = enum_choices
-                    cmd_parser.add_argument(*var_names, **kwargs)
+                    arg = cmd_parser.add_argument(*var_names, **kwargs)
+                    if not enum_choices and param.get('completer'):
+                        arg.completer = dynamic_completer(param['completer'])
                 else:
                     # Positional argument - use completer to prevent file fallback
                     kwargs = {}
@@ -2191,10 +2443,17 @@ def main():
                     # Explicitly set completer to prevent file fallback
                     if enum_choices:
                         arg.completer = argcomplete.completers.ChoicesCompleter(enum_choices)
+                    elif param.get('completer'):
+                        arg.completer = dynamic_completer(param['completer'])
                     else:
                         # Suppress file completion for non-enum positionals
                         arg.completer = lambda **kw: []
 
+        def command_help(func):
+            """A command's description in zsh/fish completion (clichec shows
+            the same). argcomplete %-formats help strings, so escape `%`."""
+            return get_docstring_first_line(func).replace('%', '%%')
+
         # Parse COMP_LINE to see what we're completing
         comp_line = os.environ.get('COMP_LINE', '')
         comp_words = comp_line.split()
@@ -2209,26 +2468,27 @@ def main():
         # Only build the parser for the command being completed
         if target_cmd and target_cmd in commands:
             # Direct command - only build this one
-            cmd_parser = subparsers.add_parser(target_cmd)
+            cmd_parser = subparsers.add_parser(target_cmd, help=command_help(commands[target_cmd]))
             add_params_to_parser(cmd_parser, commands[target_cmd])
         elif target_cmd and target_cmd in subcommands:
             # Subcommand group
-            group_parser = subparsers.add_parser(target_cmd)
+            group_parser = subparsers.add_parser(target_cmd, help='')
             group_subparsers = group_parser.add_subparsers(dest='subcommand')
             if target_subcmd and target_subcmd in subcommands[target_cmd]:
                 # Specific subcommand - only build this one
-                cmd_parser = group_subparsers.add_parser(target_subcmd)
+                cmd_parser = group_subparsers.add_parser(
+                    target_subcmd, help=command_help(subcommands[target_cmd][target_subcmd]))
                 add_params_to_parser(cmd_parser, subcommands[target_cmd][target_subcmd])
             else:
                 # Completing subcommand name - add all subcommands (names only)
-                for name in subcommands[target_cmd]:
-                    group_subparsers.add_parser(name)
+                for name, func in subcommands[target_cmd].items():
+                    group_subparsers.add_parser(name, help=command_help(func))
         else:
             # Completing command name - add all command names (no params needed)
-            for name in commands:
-                subparsers.add_parser(name)
+            for name, func in commands.items():
+                subparsers.add_parser(name, help=command_help(func))
             for group in subcommands:
-                subparsers.add_parser(group)
+                subparsers.add_parser(group, help='')
 
         argcomplete.autocomplete(parser)
 
@@ -2242,8 +2502,10 @@ def main():
 
     # Parse command from argv
     if len(sys.argv) < 2 or sys.argv[1] in ('-h', '--help'):
-        print_help(commands, subcommands, prog_name=prog_name,
-                   description=data.get("description"))
+        if not _print_stored_help("top", "", "", prog_name):
+            print_help(commands, subcommands, prog_name=prog_name,
+                       description=data.get("description"))
+        trace.mark("run.help")
         if show_timing:
             print(f"timing total (help): {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
         return
@@ -2253,13 +2515,15 @@ def main():
     # Handle --llm-help on a specific command/group (with or without -h). Detailed per-param output.
     if show_llm:
         if cmd in commands:
-            print_llm_command_help(commands[cmd], prog_name, cmd)
+            if not _print_stored_help("llm", "", cmd, prog_name):
+                print_llm_command_help(commands[cmd], prog_name, cmd)
         elif cmd in subcommands:
             # If a specific subcommand is named, show its detailed help; else list the group.
             if len(sys.argv) >= 3 and sys.argv[2] not in ('-h', '--help'):
                 subcmd = sys.argv[2].replace('_', '-')
                 if subcmd in subcommands[cmd]:
-                    print_llm_command_help(subcommands[cmd][subcmd], prog_name, subcmd, group=cmd)
+                    if not _print_stored_help("llm", cmd, subcmd, prog_name):
+                        print_llm_command_help(subcommands[cmd][subcmd], prog_name, subcmd, group=cmd)
                 else:
                     print(f"error: unknown subcommand '{cmd} {subcmd}'", file=sys.stderr)
                     sys.exit(1)
@@ -2275,21 +2539,18 @@ def main():
     if cmd in commands:
         func = commands[cmd]
         sys.argv = sys.argv[1:]  # Shift argv for subparser
+        if sys.argv[1:] in (['-h'], ['--help']) and \
+                _print_stored_help("help", "", cmd, prog_name):
+            return
 
-        t2 = time.time()
-        help_only = any(a in ('-h', '--help') for a in sys.argv[1:])
-        parser = build_parser_for_function(func, enums, prog_name=prog_name, help_only=help_only, pydantic_models=pydantic_models)
-        if show_timing:
-            print(f"timing build_parser: {(time.time() - t2)*1000:.1f}ms", file=sys.stderr)
-
-        parsed_args = parser.parse_args()
+        parsed_args, pydantic_binds = _parse_command_args(
+            func, sys.argv[1:], enums, prog_name, pydantic_models, show_timing)
 
         if show_timing:
             print(f"timing before import: {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
 
         t3 = time.time()
-        invoke_function(func, parsed_args, enums,
-                        pydantic_binds=getattr(parser, '_pydantic_binds', None))
+        invoke_function(func, parsed_args, enums, pydantic_binds=pydantic_binds)
         if show_timing:
             print(f"timing import+invoke: {(time.time() - t3)*1000:.1f}ms", file=sys.stderr)
             print(f"timing total: {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
@@ -2298,35 +2559,26 @@ def main():
     # Check if it's a subcommand group
     if cmd in subcommands:
         if len(sys.argv) < 3 or sys.argv[2] in ('-h', '--help'):
-            print(f"{Colors.blue(f'usage: {prog_name} {cmd} COMMAND ...')}\n")
-            print(f"Commands in '{cmd}':")
-            for name in sorted(subcommands[cmd].keys()):
-                doc = get_docstring_first_line(subcommands[cmd][name])
-                padded_name = f"    {name:24}"
-                if doc:
-                    print(f"{Colors.blue(padded_name)}{doc[:50]}")
-                else:
-                    print(Colors.blue(padded_name.rstrip()))
+            if not _print_stored_help("group", cmd, "", prog_name):
+                print_group_help(cmd, subcommands[cmd], prog_name)
             return
 
         subcmd = sys.argv[2].replace('_', '-')
         if subcmd in subcommands[cmd]:
             func = subcommands[cmd][subcmd]
             sys.argv = sys.argv[2:]  # Shift argv
+            if sys.argv[1:] in (['-h'], ['--help']) and \
+                    _print_stored_help("help", cmd, subcmd, prog_name):
+                return
 
-            t2 = time.time()
-            help_only = any(a in ('-h', '--help') for a in sys.argv[1:])
-            parser = build_parser_for_function(func, enums, prog_name=prog_name, help_only=help_only, pydantic_models=pydantic_models)
-            if show_timing:
-                print(f"timing build parser: {(time.time() - t2)*1000:.1f}ms", file=sys.stderr)
-
-            parsed_args = parser.parse_args()
+            parsed_args, pydantic_binds = _parse_command_args(
+                func, sys.argv[1:], enums, prog_name, pydantic_models, show_timing)
 
             if show_timing:
                 print(f"timing before import: {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
 
             t3 = time.time()
-            invoke_function(func, parsed_args, enums)
+            invoke_function(func, parsed_args, enums, pydantic_binds=pydantic_binds)
             if show_timing:
                 print(f"timing import+invoke: {(time.time() - t3)*1000:.1f}ms", file=sys.stderr)
                 print(f"timing total: {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
@@ -2349,20 +2601,14 @@ def main():
             # the first positional arg if we shifted).
             func_argv = sys.argv[1:]
 
-            t2 = time.time()
-            help_only = any(a in ('-h', '--help') for a in func_argv)
-            parser = build_parser_for_function(func, enums, prog_name=prog_name, help_only=help_only, pydantic_models=pydantic_models)
-            if show_timing:
-                print(f"timing build_parser: {(time.time() - t2)*1000:.1f}ms", file=sys.stderr)
-
-            parsed_args = parser.parse_args(func_argv)
+            parsed_args, pydantic_binds = _parse_command_args(
+                func, func_argv, enums, prog_name, pydantic_models, show_timing)
 
             if show_timing:
                 print(f"timing before import: {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
 
             t3 = time.time()
-            invoke_function(func, parsed_args, enums,
-                            pydantic_binds=getattr(parser, '_pydantic_binds', None))
+            invoke_function(func, parsed_args, enums, pydantic_binds=pydantic_binds)
             if show_timing:
                 print(f"timing import+invoke: {(time.time() - t3)*1000:.1f}ms", file=sys.stderr)
                 print(f"timing total: {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
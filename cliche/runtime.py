@@ -5,7 +5,6 @@ Runtime for pip-installed packages using @cli decorators.
 This module is called from the generated _cliche.py entry point in user packages.
 It handles dynamic package discovery, scanning, caching, and CLI execution.
 """
-import contextlib
 import hashlib
 import importlib
 import json
@@ -15,8 +14,14 @@ import sys
 import time
 from pathlib import Path
 
+from cliche import trace
+
 SKIP_DIRS = {".git", "__pycache__", "venv", "node_modules", ".venv", "env", ".env"}
 _PARALLEL_THRESHOLD = 4
+# Below this many paths a stat batch runs serially unless CLICHE_STAT_THREADS
+# asks otherwise: thread start-up costs more than it can save on a warm page
+# cache. See benchmarks/bench_stat.py for the crossover on a given machine.
+_PARALLEL_STAT_THRESHOLD = 1024
 _RE_CLI = None  # Lazy compiled regex
 
 
@@ -189,6 +194,72 @@ def _read_pyproject_meta(pkg_dir: Path) -> tuple[str | None, float | None]:
     return None, None
 
 
+def _stat_workers(n_paths: int) -> int:
+    """How many threads should stat a batch of `n_paths` paths.
+
+    `CLICHE_STAT_THREADS=N` forces N (1 = always serial) regardless of batch
+    size — the knob for network filesystems, where every stat is a round
+    trip and even a small batch gains from overlapping them. By default a
+    batch goes parallel only past `_PARALLEL_STAT_THRESHOLD`, on one thread
+    per CPU up to 8. Mirrored in clichec.c:stat_workers.
+    """
+    env = os.environ.get("CLICHE_STAT_THREADS", "")
+    try:
+        forced = int(env) if env else 0
+    except ValueError:
+        forced = 0
+    if forced > 0:
+        return max(1, min(forced, n_paths))
+    if n_paths < _PARALLEL_STAT_THRESHOLD:
+        return 1
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def _stat_slice(paths, start, stop, out, expected, drift):
+    for i in range(start, stop):
+        if drift:
+            return
+        try:
+            mtime = os.stat(paths[i]).st_mtime
+        except OSError:
+            mtime = None
+        if expected is None:
+            out[i] = mtime
+        elif mtime is None or mtime != expected[i]:
+            drift.append(i)
+            return
+
+
+def _stat_batch(paths: list[str], expected: list[float] | None = None):
+    """Stat `paths`, across threads when the batch is big enough.
+
+    Without `expected`, returns the list of `st_mtime`s (None where stat
+    fails). With it, returns True iff every path still exists with its
+    expected mtime, stopping every worker at the first drift.
+
+    `os.stat` releases the GIL, so the threads overlap the syscalls — and,
+    on a cold page cache or NFS, the waits behind them.
+    """
+    n = len(paths)
+    out = [None] * n if expected is None else None
+    drift: list[int] = []
+    workers = _stat_workers(n)
+    if workers <= 1:
+        _stat_slice(paths, 0, n, out, expected, drift)
+    else:
+        import threading
+        step = -(-n // workers)
+        threads = [threading.Thread(target=_stat_slice,
+                                    args=(paths, lo, min(lo + step, n), out, expected, drift),
+                                    daemon=True)
+                   for lo in range(0, n, step)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    return out if expected is None else not drift
+
+
 def _get_all_py_files(directory: Path) -> dict[str, float]:
     """Get all .py files respecting skip dirs."""
     py_files, _ = _walk_tree(directory)
@@ -202,20 +273,21 @@ def _walk_tree(directory: Path) -> tuple[dict[str, float], dict[str, float]]:
     re-walking on steady-state runs: any add/remove bumps the containing dir's
     mtime. Content changes do NOT bump dir mtime — detect those via file mtime.
     """
-    py_files = {}
-    dir_mtimes = {}
     directory_str = str(directory)
+    dir_rels, dir_paths, py_rels, py_paths = [], [], [], []
     for root, dirs, files in os.walk(directory):
         dirs[:] = [d for d in dirs if d not in SKIP_DIRS and not d.startswith(".")]
-        rel_dir = os.path.relpath(root, directory_str)
-        with contextlib.suppress(OSError):
-            dir_mtimes[rel_dir] = os.stat(root).st_mtime
+        dir_rels.append(os.path.relpath(root, directory_str))
+        dir_paths.append(root)
         for fname in files:
             if fname.endswith(".py"):
                 full_path = os.path.join(root, fname)
-                rel_path = os.path.relpath(full_path, directory_str)
-                with contextlib.suppress(OSError):
-                    py_files[rel_path] = os.stat(full_path).st_mtime
+                py_rels.append(os.path.relpath(full_path, directory_str))
+                py_paths.append(full_path)
+    # One batch for both, so a large tree's stats go out in parallel.
+    mtimes = _stat_batch(dir_paths + py_paths)
+    dir_mtimes = {rel: m for rel, m in zip(dir_rels, mtimes) if m is not None}
+    py_files = {rel: m for rel, m in zip(py_rels, mtimes[len(dir_paths):]) if m is not None}
     return py_files, dir_mtimes
 
 
@@ -228,30 +300,90 @@ def _dirs_unchanged(pkg_dir: Path, old_dir_mtimes: dict[str, float]) -> bool:
     """
     if not old_dir_mtimes:
         return False
-    for rel_dir, old_mtime in old_dir_mtimes.items():
-        full = pkg_dir if rel_dir == "." else pkg_dir / rel_dir
-        try:
-            if os.stat(full).st_mtime != old_mtime:
-                return False
-        except OSError:
-            return False
-    return True
+    paths = [str(pkg_dir) if rel_dir == "." else os.path.join(pkg_dir, rel_dir)
+             for rel_dir in old_dir_mtimes]
+    return _stat_batch(paths, list(old_dir_mtimes.values()))
 
 
-def _ast_parse_file(args):
+def _stored_function(fn: dict) -> dict:
+    """`fn` as the objects store keeps it: without what depends on where the
+    file lives (its `module` and `file_path`, its completers' `module`)."""
+    stored = {k: v for k, v in fn.items() if k not in ("module", "file_path")}
+    if any("completer" in p for p in fn["parameters"]):
+        stored["parameters"] = [
+            {**p, "completer": {k: v for k, v in p["completer"].items() if k != "module"}}
+            if "completer" in p else p
+            for p in fn["parameters"]
+        ]
+    return stored
+
+
+def _ast_parse_file(args, parse: bool = True):
     """Parse a single file with full AST (for multiprocessing).
-    Returns (rel_path, functions, local_enums) or None.
+    Returns (rel_path, functions, local_enums, local_pyd_models,
+    local_pyd_schemas) or None.
+
+    The content-addressed store (cliche/objects.py) is consulted first, and
+    fresh parses are saved to it. With `parse=False` a miss returns None
+    instead of parsing.
     """
     rel_path, full_path, base_dir, package_name = args
     try:
         from pathlib import Path
 
-        from cliche.main import extract_cli_functions, extract_pydantic_models, extract_python_enums
+        from cliche import objects
+        from cliche.main import (
+            extract_cli_functions,
+            extract_pydantic_models,
+            extract_pydantic_schemas,
+            extract_python_enums,
+            module_name_for,
+        )
 
-        content = open(full_path).read()
-        functions, tree = extract_cli_functions(content, Path(full_path), Path(base_dir), return_tree=True)
+        with open(full_path, "rb") as f:
+            data = f.read()
+        key = objects.digest(data)
+        record = objects.load(key)
+        if record is not None:
+            # Re-attach what the store leaves out, in the order
+            # extract_cli_functions writes it.
+            module = module_name_for(Path(full_path), Path(base_dir))
+            functions = [
+                {"name": fn["name"], "module": module, "file_path": str(Path(full_path)),
+                 **{k: v for k, v in fn.items() if k != "name"}}
+                for fn in record["functions"]
+            ]
+            for func in functions:
+                for param in func["parameters"]:
+                    if "completer" in param:
+                        param["completer"] = {"module": module, **param["completer"]}
+            local_enums = record["enums"]
+            local_pyd_models = set(record["pydantic_models"])
+            local_pyd_schemas = record["pydantic_schemas"]
+        elif not parse:
+            return None
+        else:
+            content = data.decode()
+            functions, tree = extract_cli_functions(content, Path(full_path), Path(base_dir), return_tree=True,
+                                                    partial=True)
+            # Always extract enums — a file may be enum-only (shared `enums.py`
+            # module) with no @cli functions, but still contribute to the global
+            # enum cache consumed by @cli signatures in other files.
+            local_enums = extract_python_enums(content, tree=tree)
+            local_pyd_models = extract_pydantic_models(content, tree=tree)
+            local_pyd_schemas = (extract_pydantic_schemas(tree, local_pyd_models)
+                                 if tree is not None else {})
+            if tree is not None:
+                objects.save(key, {
+                    "functions": [_stored_function(fn) for fn in functions],
+                    "enums": local_enums,
+                    "pydantic_models": sorted(local_pyd_models),
+                    "pydantic_schemas": local_pyd_schemas,
+                })
 
         # Prepend package name to module paths (only if we have any functions).
+        # A `@completer` lives in its command's module, so its spec takes the
+        # same name (and its relative imports resolve when it's imported).
         if package_name and functions:
             for func in functions:
                 mod = func.get("module", "")
@@ -259,32 +391,46 @@ def _ast_parse_file(args):
                     func["module"] = f"{package_name}.{mod}"
                 else:
                     func["module"] = package_name
+                for param in func.get("parameters", ()):
+                    if "completer" in param:
+                        param["completer"] = {**param["completer"], "module": func["module"]}
 
-        # Always extract enums — a file may be enum-only (shared `enums.py`
-        # module) with no @cli functions, but still contribute to the global
-        # enum cache consumed by @cli signatures in other files.
-        local_enums = extract_python_enums(content, tree=tree)
-        local_pyd_models = extract_pydantic_models(content, tree=tree)
-        return (rel_path, functions or [], local_enums, local_pyd_models)
+        return (rel_path, functions or [], local_enums, local_pyd_models, local_pyd_schemas)
     except Exception:
         return None
 
 
-def _scan_and_cache(pkg_dir: Path, cache_file: Path, package_name: str = "", show_timing: bool = False) -> dict:
-    """Scan package directory for @cli functions and update cache."""
+def _scan_and_cache(pkg_dir: Path, cache_file: Path, package_name: str = "", show_timing: bool = False,
+                    prog: str | None = None) -> dict:
+    """Scan package directory for @cli functions and update cache.
+
+    With `prog`, also keep the pre-rendered help store (cliche/help_store.py)
+    in step with the cache, rendered for that program name.
+    """
     t0 = time.time()
 
-    # Load cache
-    try:
-        with open(cache_file) as f:
-            cache = json.load(f)
-        # Cache shape bump invalidates older caches in-place: anything missing
-        # the v2.2 cliche_version stamp is rewritten from scratch so the C
-        # fast-fail launcher (clichec) can trust the schema it sees.
-        if cache.get("version") != "2.2":
+    # Load cache. The shard index (cliche/shards.py) is the JSON without its
+    # function records, which are read per file only when something needs
+    # them; when it doesn't describe the JSON on disk, read the JSON.
+    from cliche import shards
+    cache_st = None
+    sharded = shards.load(cache_file)
+    if sharded is not None:
+        cache, cache_st = sharded
+    else:
+        try:
+            with open(cache_file) as f:
+                cache = json.load(f)
+                cache_st = os.fstat(f.fileno())
+        except (FileNotFoundError, json.JSONDecodeError):
             cache = {"version": "2.2", "files": {}, "enums": {}, "py_mtimes": {}}
-    except (FileNotFoundError, json.JSONDecodeError):
-        cache = {"version": "2.2", "files": {}, "enums": {}, "py_mtimes": {}}
+        cache["files"] = shards.Files.from_dict(cache.get("files", {}))
+    # Cache shape bump invalidates older caches in-place: anything missing
+    # the v2.2 cliche_version stamp is rewritten from scratch so the C
+    # fast-fail launcher (clichec) can trust the schema it sees.
+    if cache.get("version") != "2.2":
+        cache = {"version": "2.2", "files": shards.Files({}), "enums": {}, "py_mtimes": {}}
+        cache_st = None
 
     # Stamp the cliche version that wrote this cache. clichec refuses to act on
     # a cache written by a different cliche version, falling back to Python so
@@ -295,26 +441,33 @@ def _scan_and_cache(pkg_dir: Path, cache_file: Path, package_name: str = "", sho
         _cv = "unknown"
     cache["cliche_version"] = _cv
 
+    trace.mark("scan.cache_load", source="shards" if sharded is not None else "json")
     if show_timing:
-        print(f"cache_load: {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
+        source = "shards" if sharded is not None else "json"
+        print(f"cache_load: {(time.time() - t0)*1000:.1f}ms ({source})", file=sys.stderr)
 
-    old_files = cache.get("files", {})
+    old_files = cache["files"]
     old_py_mtimes = cache.get("py_mtimes", {})
     old_dir_mtimes = cache.get("dir_mtimes", {})
 
+    # A running `cliche watch` daemon (cliche/watch.py) rescans on every
+    # inotify event and vouches for the JSON we just loaded: phases 1–2 and
+    # the pyproject stat would find nothing, so skip them.
+    from cliche.watch import vouches
+    watched = cache_st is not None and vouches(cache_file, cache_st)
+
     # Phase 1: Quick check - stat only files that HAD @cli decorators
     changed_files = []
     deleted_files = []
 
-    for rel_path, file_info in old_files.items():
-        full_path = os.path.join(pkg_dir, rel_path)
-        try:
-            current_mtime = os.stat(full_path).st_mtime
-            if current_mtime != file_info.get("mtime"):
-                changed_files.append(rel_path)
-        except OSError:
+    known = [] if watched else list(old_files)
+    for rel_path, current_mtime in zip(known, _stat_batch([os.path.join(pkg_dir, r) for r in known])):
+        if current_mtime is None:
             deleted_files.append(rel_path)
+        elif current_mtime != old_files.stub(rel_path).get("mtime"):
+            changed_files.append(rel_path)
 
+    trace.mark("scan.check_known", files=len(old_files), changed=len(changed_files))
     if show_timing:
         print(
             f"check_known: {(time.time() - t0)*1000:.1f}ms ({len(old_files)} files, {len(changed_files)} changed)",
@@ -326,18 +479,21 @@ def _scan_and_cache(pkg_dir: Path, cache_file: Path, package_name: str = "", sho
     # dir's mtime is unchanged, the file set is unchanged — skip os.walk and
     # just stat tracked files for content changes.
     new_py_files = []
-    if _dirs_unchanged(pkg_dir, old_dir_mtimes):
+    if watched:
+        current_py_files = old_py_mtimes
+        current_dir_mtimes = old_dir_mtimes
+        fast_path = True
+    elif _dirs_unchanged(pkg_dir, old_dir_mtimes):
         current_py_files = {}
-        for rel_path, old_mtime in old_py_mtimes.items():
-            full_path = os.path.join(pkg_dir, rel_path)
-            try:
-                current_mtime = os.stat(full_path).st_mtime
-                current_py_files[rel_path] = current_mtime
-                if current_mtime != old_mtime and rel_path not in changed_files:
-                    changed_files.append(rel_path)
-            except OSError:
+        tracked = list(old_py_mtimes)
+        for rel_path, current_mtime in zip(tracked, _stat_batch([os.path.join(pkg_dir, r) for r in tracked])):
+            if current_mtime is None:
                 if rel_path not in deleted_files:
                     deleted_files.append(rel_path)
+                continue
+            current_py_files[rel_path] = current_mtime
+            if current_mtime != old_py_mtimes[rel_path] and rel_path not in changed_files:
+                changed_files.append(rel_path)
         current_dir_mtimes = old_dir_mtimes
         fast_path = True
     else:
@@ -353,8 +509,9 @@ def _scan_and_cache(pkg_dir: Path, cache_file: Path, package_name: str = "", sho
                 deleted_files.append(rel_path)
         fast_path = False
 
+    trace.mark("scan.check_new", new=len(new_py_files), changed=len(changed_files))
     if show_timing:
-        mode = "fast" if fast_path else "walk"
+        mode = "watched" if watched else "fast" if fast_path else "walk"
         print(
             f"check_new: {(time.time() - t0)*1000:.1f}ms ({mode}; {len(new_py_files)} new, {len(changed_files)} changed)",
             file=sys.stderr,
@@ -362,10 +519,11 @@ def _scan_and_cache(pkg_dir: Path, cache_file: Path, package_name: str = "", sho
 
     # Phase 3: Incremental update
     needs_full_ast = False
-    new_files = dict(old_files)
+    new_files = old_files.copy()
 
     for rel_path in deleted_files:
-        new_files.pop(rel_path, None)
+        if rel_path in new_files:
+            del new_files[rel_path]
 
     for rel_path in changed_files:
         full_path = os.path.join(pkg_dir, rel_path)
@@ -387,12 +545,14 @@ def _scan_and_cache(pkg_dir: Path, cache_file: Path, package_name: str = "", sho
             new_files[rel_path] = result
             needs_full_ast = True
 
+    trace.mark("scan.incremental")
     if show_timing:
         print(f"incremental: {(time.time() - t0)*1000:.1f}ms (ast_needed={needs_full_ast})", file=sys.stderr)
 
     # Phase 4: Full AST parse only for files with @cli that changed
     all_local_enums = {}
     all_local_pyd_models: set[str] = set()
+    stored, misses = 0, []
 
     if needs_full_ast:
         to_parse = []
@@ -401,66 +561,80 @@ def _scan_and_cache(pkg_dir: Path, cache_file: Path, package_name: str = "", sho
                 full_path = os.path.join(pkg_dir, rel_path)
                 to_parse.append((rel_path, full_path, str(pkg_dir), package_name))
 
-        if to_parse:
-            if len(to_parse) > _PARALLEL_THRESHOLD:
+        # Files whose exact bytes were parsed before, under any path or
+        # package, come straight from the content-addressed store
+        # (cliche/objects.py); only the rest are parsed.
+        results = [_ast_parse_file(args, parse=False) for args in to_parse]
+        misses = [i for i, result in enumerate(results) if result is None]
+        stored = len(to_parse) - len(misses)
+        if misses:
+            miss_args = [to_parse[i] for i in misses]
+            if len(miss_args) > _PARALLEL_THRESHOLD:
                 from multiprocessing import Pool, cpu_count
 
-                with Pool(min(cpu_count(), len(to_parse))) as pool:
-                    results = pool.map(_ast_parse_file, to_parse)
-                for result in results:
-                    if result:
-                        rel_path, functions, local_enums, local_pyd_models = result
-                        new_files[rel_path]["functions"] = functions
-                        all_local_enums.update(local_enums)
-                        all_local_pyd_models.update(local_pyd_models)
+                with Pool(min(cpu_count(), len(miss_args))) as pool:
+                    parsed = pool.map(_ast_parse_file, miss_args)
             else:
-                for args in to_parse:
-                    result = _ast_parse_file(args)
-                    if result:
-                        rel_path, functions, local_enums, local_pyd_models = result
-                        new_files[rel_path]["functions"] = functions
-                        all_local_enums.update(local_enums)
-                        all_local_pyd_models.update(local_pyd_models)
-
+                parsed = [_ast_parse_file(args) for args in miss_args]
+            for i, result in zip(misses, parsed):
+                results[i] = result
+            from cliche.objects import maybe_gc
+            maybe_gc()
+        for result in results:
+            if result:
+                rel_path, functions, local_enums, local_pyd_models, local_pyd_schemas = result
+                entry = {**new_files[rel_path], "functions": functions}
+                entry.pop("pydantic_schemas", None)
+                if local_pyd_models:
+                    # Every model of the file, None where it isn't static.
+                    entry["pydantic_schemas"] = {
+                        name: local_pyd_schemas.get(name) for name in sorted(local_pyd_models)}
+                new_files[rel_path] = entry
+                all_local_enums.update(local_enums)
+                all_local_pyd_models.update(local_pyd_models)
+
+    trace.mark("scan.ast_parse", parsed=len(misses))
     if show_timing:
         print(
             f"ast_parse: {(time.time() - t0)*1000:.1f}ms "
-            f"({len(all_local_enums)} local enums, {len(all_local_pyd_models)} pydantic)",
+            f"({stored} stored, {len(misses)} parsed; "
+            f"{len(all_local_enums)} local enums, {len(all_local_pyd_models)} pydantic)",
             file=sys.stderr,
         )
 
     # Phase 5: Extract enums
-    old_proto_enums = cache.get("proto_enums", {})
     old_py_enums = cache.get("py_enums", {})
 
-    _ENUM_NAME_RE = re.compile(r'\b([A-Z][a-zA-Z0-9_]+)')
+    # Each file's stub carries the names its annotations mention, so this
+    # reads no shards.
     needed_enum_names = set()
-    for finfo in new_files.values():
-        for func in finfo.get("functions", []):
-            for param in func.get("parameters", []):
-                annotation = param.get("type_annotation", "")
-                if annotation:
-                    for match in _ENUM_NAME_RE.findall(annotation):
-                        if match not in ("Optional", "List", "Tuple", "Dict", "Set", "Union", "None", "True", "False"):
-                            needed_enum_names.add(match)
+    for rel_path in new_files:
+        needed_enum_names.update(new_files.stub(rel_path)["refs"])
 
+    # Protobuf enums are kept per `_pb2.py` file with the mtime they were
+    # read at, so a changed descriptor module is the only one re-read.
     files_to_check = set(changed_files) | set(new_py_files) | set(deleted_files)
     pb2_changed = any(f.endswith("_pb2.py") for f in files_to_check)
-    if not old_proto_enums or pb2_changed:
+    if "proto_files" not in cache or pb2_changed:
         try:
             from cliche.proto_enums import parse_pb2_enums
         except ImportError:
             from proto_enums import parse_pb2_enums
 
-        proto_enums = {}
-        for rel_path in current_py_files:
+        old_proto_files = cache.get("proto_files", {})
+        proto_files = {}
+        for rel_path, mtime in current_py_files.items():
             if rel_path.endswith("_pb2.py"):
-                full_path = os.path.join(pkg_dir, rel_path)
-                enums = parse_pb2_enums(Path(full_path))
-                proto_enums.update(enums)
-        cache["proto_enums"] = proto_enums
-    else:
-        proto_enums = old_proto_enums
+                entry = old_proto_files.get(rel_path)
+                if entry is None or entry["mtime"] != mtime:
+                    full_path = os.path.join(pkg_dir, rel_path)
+                    entry = {"mtime": mtime, "enums": parse_pb2_enums(Path(full_path))}
+                proto_files[rel_path] = entry
+        cache["proto_files"] = proto_files
+        cache.pop("proto_enums", None)   # the flat map older versions kept
+    proto_enums = {}
+    for entry in cache["proto_files"].values():
+        proto_enums.update(entry["enums"])
 
     proto_enums_filtered = {k: v for k, v in proto_enums.items() if k in needed_enum_names}
 
@@ -480,6 +654,19 @@ def _scan_and_cache(pkg_dir: Path, cache_file: Path, package_name: str = "", sho
     old_pyd_models = set(cache.get("pydantic_models", []))
     cache["pydantic_models"] = sorted(old_pyd_models | all_local_pyd_models)
 
+    # Field schemas (main.extract_pydantic_schemas), unlike the names, must
+    # not outlive the source they were read from: rebuilt from every file's
+    # stub, so a model that changed or stopped being statically readable
+    # loses its entry. A name that isn't static everywhere it's defined, or
+    # is defined differently, is left out and gets imported as before.
+    pyd_schemas: dict = {}
+    for rel_path in new_files:
+        for name, fields in new_files.stub(rel_path).get("pydantic_schemas", {}).items():
+            if pyd_schemas.setdefault(name, fields) != fields:
+                pyd_schemas[name] = None
+    cache["pydantic_schemas"] = {k: v for k, v in sorted(pyd_schemas.items()) if v is not None}
+
+    trace.mark("scan.enum_extract")
     if show_timing:
         print(
             f"enum_extract: {(time.time() - t0)*1000:.1f}ms "
@@ -499,8 +686,11 @@ def _scan_and_cache(pkg_dir: Path, cache_file: Path, package_name: str = "", sho
     # top-level keys so clichec can read description directly without parsing
     # any TOML, and revalidate via pyproject_mtime in its freshness check.
     old_pyproject_mtime = cache.get("pyproject_mtime")
-    desc, pyproject_mtime = _read_pyproject_meta(pkg_dir)
-    pyproject_changed = pyproject_mtime != old_pyproject_mtime
+    if watched:
+        pyproject_changed = False
+    else:
+        desc, pyproject_mtime = _read_pyproject_meta(pkg_dir)
+        pyproject_changed = pyproject_mtime != old_pyproject_mtime
     if pyproject_changed:
         cache["pyproject_mtime"] = pyproject_mtime
         cache["description"] = desc
@@ -516,52 +706,57 @@ def _scan_and_cache(pkg_dir: Path, cache_file: Path, package_name: str = "", sho
     # filesystem accurately — otherwise clichec serves "Unknown command" on
     # commands defined in newly-added files instead of deferring to Python.
     dirs_drifted = (not fast_path) and current_dir_mtimes != old_dir_mtimes
+    # The binary index next to the JSON (cliche/cache_index.py) is what
+    # clichec reads first. It must describe the JSON byte-for-byte, so a
+    # missing one — first run after upgrading, or a JSON written by an older
+    # cliche — forces a rewrite of both even when nothing else changed.
+    from cliche.cache_index import index_matches, write_cache
+    wrote = False
     if (changed_files or deleted_files or new_py_files or pb2_changed
-            or dirs_newly_tracked or dirs_drifted or pyproject_changed):
-        cache_file_path = Path(cache_file)
-        tmp_path = cache_file_path.with_suffix(cache_file_path.suffix + f".tmp.{os.getpid()}")
+            or dirs_newly_tracked or dirs_drifted or pyproject_changed
+            or not index_matches(cache_file)):
         try:
-            with open(tmp_path, "w") as f:
-                json.dump(cache, f)
-            os.replace(tmp_path, cache_file_path)
+            cache["files"] = new_files.to_dict()
+            write_cache(cache, cache_file, pkg_dir)
+            wrote = True
         except Exception:
-            # Best-effort cleanup; if we can't write the cache, the next run
-            # just rebuilds. Don't let cache failures break CLI invocation.
-            try:
-                tmp_path.unlink()
-            except OSError:
-                pass
+            # If we can't write the cache, the next run just rebuilds. Don't
+            # let cache failures break CLI invocation.
+            pass
+    # The shard index must name the JSON just written; only the shards of
+    # files that changed are rewritten.
+    if wrote or sharded is None:
+        try:
+            shards.write(cache, new_files, cache_file)
+        except Exception:
+            pass
 
+    trace.mark("scan.cache_write")
     if show_timing:
         print(f"cache_write: {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
 
-    return cache
+    if prog:
+        from cliche.help_store import needs_refresh, refresh
+        if needs_refresh(cache_file, prog):
+            try:
+                refresh(cache, cache_file, prog)
+            except Exception:
+                # Same policy as the cache write: every help path renders
+                # live when the store is missing.
+                pass
+        trace.mark("scan.help_store")
+        if show_timing:
+            print(f"help_store: {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
 
+    return cache
 
-def run_package_cli(package_name: str, _entry_ts: float = None):
-    """
-    Entry point for pip-installed packages using @cli.
 
-    Called from the generated _cliche.py in user packages.
+def _find_package_dir(package_name: str) -> Path:
+    """Locate the source directory of `package_name`, exiting 1 if it can't.
 
-    Args:
-        package_name: The name of the package to scan for @cli functions
-        _entry_ts: Timestamp from the entry point script (before any imports)
+    Shared by `run_package_cli` and the zygote server (cliche/zygote.py),
+    which both need the directory to scan without importing the package.
     """
-    t0 = time.time()
-    show_timing = "--timing" in sys.argv
-
-    if show_timing:
-        proc_age_ms = _process_age_ms()
-        if proc_age_ms is not None and _entry_ts is not None:
-            import_ms = (t0 - _entry_ts) * 1000
-            interp_ms = proc_age_ms - import_ms
-            print(f"python_startup: {proc_age_ms:.1f}ms (interpreter: {interp_ms:.1f}ms, imports: {import_ms:.1f}ms)", file=sys.stderr)
-        elif proc_age_ms is not None:
-            print(f"python_startup: {proc_age_ms:.1f}ms", file=sys.stderr)
-        elif _entry_ts is not None:
-            print(f"import_overhead: {(t0 - _entry_ts)*1000:.1f}ms", file=sys.stderr)
-
     # Discover package location WITHOUT executing its `__init__.py`. We only
     # need `pkg_dir` here — the directory to scan for `@cli` functions. Actual
     # module import is deferred to `invoke_function` (for dispatch) or to
@@ -589,6 +784,34 @@ def run_package_cli(package_name: str, _entry_ts: float = None):
     else:
         print(f"Error: package '{package_name}' has no locatable source directory", file=sys.stderr)
         sys.exit(1)
+    return pkg_dir
+
+
+def run_package_cli(package_name: str, _entry_ts: float = None):
+    """
+    Entry point for pip-installed packages using @cli.
+
+    Called from the generated _cliche.py in user packages.
+
+    Args:
+        package_name: The name of the package to scan for @cli functions
+        _entry_ts: Timestamp from the entry point script (before any imports)
+    """
+    t0 = time.time()
+    show_timing = "--timing" in sys.argv
+
+    if show_timing:
+        proc_age_ms = _process_age_ms()
+        if proc_age_ms is not None and _entry_ts is not None:
+            import_ms = (t0 - _entry_ts) * 1000
+            interp_ms = proc_age_ms - import_ms
+            print(f"python_startup: {proc_age_ms:.1f}ms (interpreter: {interp_ms:.1f}ms, imports: {import_ms:.1f}ms)", file=sys.stderr)
+        elif proc_age_ms is not None:
+            print(f"python_startup: {proc_age_ms:.1f}ms", file=sys.stderr)
+        elif _entry_ts is not None:
+            print(f"import_overhead: {(t0 - _entry_ts)*1000:.1f}ms", file=sys.stderr)
+
+    pkg_dir = _find_package_dir(package_name)
 
     # Add pkg_dir itself so flat-layout packages can import sibling modules
     # by their top-level name (e.g. `from build_index import ...` where build_index.py
@@ -604,32 +827,22 @@ def run_package_cli(package_name: str, _entry_ts: float = None):
 
     cache_file = _get_cache_path(package_name, pkg_dir)
 
+    trace.mark("discover")
     if show_timing:
         print(f"discover: {(time.time() - t0)*1000:.1f}ms (pkg_dir={pkg_dir})", file=sys.stderr)
 
-    # Scan and cache
-    cache = _scan_and_cache(pkg_dir, cache_file, package_name, show_timing)
+    # Scan and cache. The help store is rendered for the name the CLI was
+    # invoked as — run.main derives prog_name the same way.
+    prog = os.path.basename(sys.argv[0])
+    cache = _scan_and_cache(pkg_dir, cache_file, package_name, show_timing,
+                            prog=prog if prog and prog != "-c" else None)
 
     if show_timing:
         print(f"scan_total: {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
 
-    # Build command index for lazy imports
-    func_to_mod = {}
-    commands = {}
-    subcommands = {}
-
-    for finfo in cache.get("files", {}).values():
-        for func in finfo.get("functions", []):
-            name, group, mod = func["name"], func.get("group"), func["module"]
-            key = (group or "", name)
-            func_to_mod[key] = mod
-            if group:
-                subcommands.setdefault(group, {})[name] = key
-            else:
-                commands[name] = key
-
-    if show_timing:
-        print(f"index_build: {(time.time() - t0)*1000:.1f}ms", file=sys.stderr)
+    # The command tables are built by run.build_index, from the shard stubs
+    # when the cache came from shards: only the dispatched function's shard
+    # is ever read.
 
     # Deliberately NO eager user-module import here. `invoke_function`
     # imports on successful dispatch; `build_parser_for_function` imports
@@ -0,0 +1,319 @@
+"""Sharded copy of the JSON cache, for the Python launcher (`.shards/`).
+
+`<pkg>_<hash>.json` holds every function of every file, and clichec reads it
+through the binary index (cliche/cache_index.py) a span at a time. The
+Python side used to `json.load` all of it on every call, then walk every
+function to build the command tables, although a dispatch needs one
+function record. On a CLI with thousands of commands and long docstrings,
+that load is most of the launcher's budget. Next to the JSON sits:
+
+    <pkg>_<hash>.shards/
+        index.json      the cache minus its function records, and a stub per
+                        source file: mtime, shard name, the (name, group) of
+                        each function, and the names its annotations mention
+        <16 hex>.json   one file's entry, named by a digest of its text
+
+`load` returns the cache with `files` as a `Files` mapping. Stubs answer the
+freshness checks, the command tables and the enum filter; an entry is read
+from its shard when something asks for it. A dispatch reads the index and
+one shard. `write` writes shards only for entries that changed (unchanged
+text keeps its name, so nothing is rewritten), then the index, then removes
+shards the index no longer names.
+
+The index records the size and mtime of the JSON it was written with, like
+the binary index. When any other writer replaces the JSON, `load` returns
+None and the caller reads the JSON as before. Because shard names are
+content digests, a reader holding the previous index never finds a changed
+shard under an old name. If a shard has been removed by then, the entry
+comes from the JSON instead.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from collections.abc import Mapping, MutableMapping
+from pathlib import Path
+
+FORMAT = 1
+INDEX = "index.json"
+
+# Bulk reads of more unloaded entries than this go through the JSON in one
+# parse rather than one open and parse per shard.
+_BULK = 16
+
+_NAME_RE = re.compile(r"\b([A-Z][a-zA-Z0-9_]+)")
+_NOT_ENUMS = frozenset(("Optional", "List", "Tuple", "Dict", "Set", "Union",
+                        "None", "True", "False"))
+
+
+def shard_dir(cache_file) -> Path:
+    """`<pkg>_<hash>.json` → `<pkg>_<hash>.shards`."""
+    return Path(cache_file).with_suffix(".shards")
+
+
+def referenced_names(functions) -> list[str]:
+    """Capitalised names in the parameter annotations of `functions`: the
+    candidates `_scan_and_cache` keeps enums for."""
+    names = set()
+    for func in functions:
+        for param in func.get("parameters", []):
+            annotation = param.get("type_annotation")
+            if annotation:
+                names.update(_NAME_RE.findall(annotation))
+    return sorted(names - _NOT_ENUMS)
+
+
+def make_stub(entry: dict) -> dict:
+    """What the index keeps of a file's entry."""
+    stub = {k: v for k, v in entry.items() if k != "functions"}
+    functions = entry.get("functions") or []
+    stub["commands"] = [[f["name"], f.get("group")] for f in functions]
+    stub["refs"] = referenced_names(functions)
+    return stub
+
+
+class Files(MutableMapping):
+    """`cache["files"]`, reading each entry from its shard on first access.
+
+    `stub(rel)` never touches a shard. Assigned entries are marked dirty and
+    get a new shard at the next `write`.
+    """
+
+    def __init__(self, stubs: dict, cache_file=None, json_identity=None):
+        self._stubs = stubs
+        self._entries: dict = {}
+        self._dirty: set = set()
+        self._cache_file = cache_file
+        self._json_identity = json_identity
+
+    @classmethod
+    def from_dict(cls, files: dict) -> "Files":
+        self = cls({rel: make_stub(entry) for rel, entry in files.items()})
+        self._entries = dict(files)
+        self._dirty = set(files)
+        return self
+
+    def stub(self, rel: str) -> dict:
+        return self._stubs[rel]
+
+    def __getitem__(self, rel):
+        entry = self._entries.get(rel)
+        if entry is None:
+            stub = self._stubs[rel]
+            entry = self._read_shard(stub.get("shard"))
+            if entry is None:
+                entry = self._read_json().get(rel)
+                if entry is None:
+                    raise KeyError(rel)
+            self._entries[rel] = entry
+        return entry
+
+    def __setitem__(self, rel, entry):
+        self._entries[rel] = entry
+        self._stubs[rel] = make_stub(entry)
+        self._dirty.add(rel)
+
+    def __delitem__(self, rel):
+        del self._stubs[rel]
+        self._entries.pop(rel, None)
+        self._dirty.discard(rel)
+
+    def __iter__(self):
+        return iter(self._stubs)
+
+    def __len__(self):
+        return len(self._stubs)
+
+    def copy(self) -> "Files":
+        new = Files(dict(self._stubs), self._cache_file, self._json_identity)
+        new._entries = dict(self._entries)
+        new._dirty = set(self._dirty)
+        return new
+
+    def values(self):
+        self._load_all()
+        return super().values()
+
+    def items(self):
+        self._load_all()
+        return super().items()
+
+    def to_dict(self) -> dict:
+        """Every entry, in order, as the plain dict the JSON holds."""
+        self._load_all()
+        return {rel: self._entries[rel] for rel in self._stubs}
+
+    def _load_all(self) -> None:
+        missing = [rel for rel in self._stubs if rel not in self._entries]
+        if len(missing) > _BULK:
+            files = self._read_json()
+            for rel in missing:
+                if rel in files:
+                    self._entries[rel] = files[rel]
+        for rel in missing:
+            self[rel]
+
+    def _read_shard(self, name):
+        if not name or self._cache_file is None:
+            return None
+        try:
+            with open(shard_dir(self._cache_file) / f"{name}.json") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _read_json(self) -> dict:
+        if self._cache_file is None:
+            return {}
+        try:
+            with open(self._cache_file) as f:
+                if _identity(os.fstat(f.fileno())) != self._json_identity:
+                    return {}
+                return json.load(f).get("files", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+
+class Commands(Mapping):
+    """`{cli name: function record}` over `Files`, as `run.build_index`
+    builds it, reading a function's shard only when it is looked up."""
+
+    def __init__(self, files: Files):
+        self._files = files
+        self._where: dict = {}
+
+    def add(self, cli_name: str, rel: str, name: str, group) -> None:
+        self._where[cli_name] = (rel, name, group)
+
+    def __getitem__(self, cli_name):
+        rel, name, group = self._where[cli_name]
+        for func in self._files[rel].get("functions", []):
+            if func["name"] == name and func.get("group") == group:
+                func["cli_name"] = cli_name
+                return func
+        raise KeyError(cli_name)
+
+    def __iter__(self):
+        return iter(self._where)
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, cli_name):
+        return cli_name in self._where
+
+    def values(self):
+        self._files._load_all()
+        return super().values()
+
+    def items(self):
+        self._files._load_all()
+        return super().items()
+
+
+def build_index(files: Files) -> tuple[Commands, dict]:
+    """`(commands, subcommands)` from the stubs alone."""
+    commands = Commands(files)
+    subcommands: dict = {}
+    for rel in files:
+        for name, group in files.stub(rel)["commands"]:
+            cli_name = name.replace("_", "-")
+            if group:
+                if group not in subcommands:
+                    subcommands[group] = Commands(files)
+                subcommands[group].add(cli_name, rel, name, group)
+            else:
+                commands.add(cli_name, rel, name, group)
+    return commands, subcommands
+
+
+def _identity(st: os.stat_result) -> list[int]:
+    return [st.st_size, st.st_mtime_ns]
+
+
+def load(cache_file) -> tuple[dict, os.stat_result] | None:
+    """The cache with lazy `files`, and the stat of the JSON it describes.
+
+    None when there is no index, or it was written for another JSON.
+    """
+    try:
+        st = os.stat(cache_file)
+        with open(shard_dir(cache_file) / INDEX) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (not isinstance(index, dict) or index.get("format") != FORMAT
+            or index.get("json") != _identity(st)):
+        return None
+    cache = index["cache"]
+    cache["files"] = Files(index["files"], Path(cache_file), _identity(st))
+    return cache, st
+
+
+def write(cache: dict, files: Files, cache_file) -> None:
+    """Write the shards of `files` that changed, then the index for `cache`
+    and the JSON now on disk. Raises on failure, like
+    `cache_index.write_cache`."""
+    directory = shard_dir(cache_file)
+    directory.mkdir(exist_ok=True)
+    pid = os.getpid()
+    stubs = {}
+    for rel in files:
+        stub = files.stub(rel)
+        if rel in files._dirty or not stub.get("shard"):
+            text = json.dumps(files[rel])
+            name = hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+            path = directory / f"{name}.json"
+            if not path.exists():
+                tmp = directory / f"{name}.tmp.{pid}"
+                with open(tmp, "w") as f:
+                    f.write(text)
+                os.replace(tmp, path)
+            stub = dict(stub, shard=name)
+        stubs[rel] = stub
+
+    index = {
+        "format": FORMAT,
+        "json": _identity(os.stat(cache_file)),
+        "cache": {k: v for k, v in cache.items() if k != "files"},
+        "files": stubs,
+    }
+    tmp = directory / f"{INDEX}.tmp.{pid}"
+    with open(tmp, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp, directory / INDEX)
+    files._stubs = stubs
+    files._dirty.clear()
+
+    keep = {f"{stub['shard']}.json" for stub in stubs.values()}
+    keep.add(INDEX)
+    for entry in os.scandir(directory):
+        if entry.name not in keep and ".tmp." not in entry.name:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+def remove(cache_file) -> list[Path]:
+    """Delete the shard directory of `cache_file`; returns what was removed."""
+    directory = shard_dir(cache_file)
+    removed = []
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return removed
+    for entry in entries:
+        try:
+            os.unlink(entry.path)
+            removed.append(Path(entry.path))
+        except OSError:
+            pass
+    try:
+        directory.rmdir()
+        removed.append(directory)
+    except OSError:
+        pass
+    return removed
@@ -0,0 +1,181 @@
+"""`CLICHE_TRACE=/path/trace.json`: startup spans in Chrome trace-event format.
+
+With the variable set, every stage of an invocation appends "complete"
+(`"ph": "X"`) events to that file:
+
+    wrapper        the shell wrapper (CLICHE_SH_WRAPPER installs), from
+                   its start to clichec's
+    clichec        the whole clichec run, with its exit status
+    clichec.*      open, freshness, parse (or load_json) and render
+    python         the whole Python process
+    python.startup from the exec of the interpreter to the launcher
+    discover       locating the package directory
+    scan.*         each phase of the package scan (runtime._scan_and_cache)
+    run.*          cache_load, build_index, build_parser (not when the
+                   command's parse plan takes argv), parse_args, import,
+                   convert_args, invoke and output (or help)
+
+Timestamps are microseconds since the epoch, so the stages, which are
+separate processes, line up on one timeline. The file is a JSON array
+that is never closed, a form the trace-event format allows, so many
+invocations can append to one file; it opens as is in Perfetto
+(ui.perfetto.dev) and chrome://tracing. Each process buffers its events and
+appends them once, at exit.
+
+    python -m cliche.trace FILE...
+
+prints count, mean, p50, p95 and max per span name, over every invocation
+recorded in the files.
+
+Each stage that hands over to the next process puts the handover time in
+`CLICHE_TRACE_EXEC_NS`; that is where `python.startup` begins. Without it
+(a plain pip shim) the span starts at the process start time the OS
+reports.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+PATH = os.environ.get("CLICHE_TRACE") or None
+
+_events: list[dict] = []
+_last = 0
+_start = 0
+
+
+def now() -> int:
+    """Microseconds since the epoch."""
+    return time.time_ns() // 1000
+
+
+def span(name: str, start: int, end: int | None = None, cat: str = "python", **args) -> None:
+    """Record a span from `start` to `end` (default: now), in microseconds."""
+    if PATH is None:
+        return
+    if end is None:
+        end = now()
+    if not _events:
+        import atexit
+        atexit.register(flush)
+        _events.append({"name": "process_name", "ph": "M", "pid": os.getpid(),
+                        "args": {"name": f"{os.path.basename(sys.argv[0]) or 'python'} (python)"}})
+    event = {"name": name, "cat": cat, "ph": "X", "ts": start, "dur": max(end - start, 0),
+             "pid": os.getpid(), "tid": os.getpid()}
+    if args:
+        event["args"] = args
+    _events.append(event)
+
+
+def mark(name: str, cat: str = "python", **args) -> None:
+    """Close the span that has run since the previous mark."""
+    global _last
+    if PATH is None:
+        return
+    t = now()
+    span(name, _last or t, t, cat, **args)
+    _last = t
+
+
+def started() -> None:
+    """Called first thing by the launcher: records `python.startup` and
+    starts the clock for `mark`."""
+    global _last, _start
+    if PATH is None:
+        return
+    _last = now()
+    handover = os.environ.pop("CLICHE_TRACE_EXEC_NS", "")
+    if handover.isdigit():
+        start = int(handover) // 1000
+    else:
+        from cliche.runtime import _process_age_ms
+        age = _process_age_ms()
+        if age is None:
+            return
+        start = _last - int(age * 1000)
+    _start = start
+    span("python.startup", start, _last)
+
+
+def flush() -> None:
+    """Append the buffered events to the trace file."""
+    if PATH is None or not _events:
+        return
+    if _start:
+        span("python", _start)
+    import json
+    data = "".join(json.dumps(e, separators=(",", ":")) + ",\n" for e in _events).encode()
+    _events.clear()
+    try:
+        fd = os.open(PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_EXCL, 0o644)
+        data = b"[\n" + data
+    except FileExistsError:
+        try:
+            fd = os.open(PATH, os.O_WRONLY | os.O_APPEND)
+        except OSError:
+            return
+    except OSError:
+        return
+    try:
+        os.write(fd, data)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def load(path: str) -> list[dict]:
+    """The events of a trace file, whether or not its array is closed."""
+    import json
+    with open(path, encoding="utf-8") as f:
+        text = f.read().strip()
+    if not text.endswith("]"):
+        text = text.rstrip(",") + "]"
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get("traceEvents", [])
+    return data
+
+
+def summarize(events: list[dict]) -> str:
+    """A table of the `X` spans in `events`, grouped by name."""
+    durations: dict[str, list[int]] = {}
+    first: dict[str, int] = {}
+    for e in events:
+        if e.get("ph") == "X":
+            durations.setdefault(e["name"], []).append(e.get("dur", 0))
+            first[e["name"]] = min(first.get(e["name"], e["ts"]), e["ts"])
+    if not durations:
+        return "no spans\n"
+    width = max(len(name) for name in durations)
+    lines = [f"{'span':<{width}} {'n':>6} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+    # In timeline order: where each span name first starts.
+    for name in sorted(durations, key=first.__getitem__):
+        d = sorted(durations[name])
+        n = len(d)
+        p50 = d[(n - 1) // 2]
+        p95 = d[min(n - 1, round(0.95 * (n - 1)))]
+        lines.append(f"{name:<{width}} {n:>6} {sum(d) / n / 1000:9.2f} {p50 / 1000:9.2f} "
+                     f"{p95 / 1000:9.2f} {d[-1] / 1000:9.2f}")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print("usage: python -m cliche.trace FILE...", file=sys.stderr)
+        return 2
+    events: list[dict] = []
+    for path in argv:
+        try:
+            events.extend(load(path))
+        except (OSError, ValueError) as e:
+            print(f"error: {path}: {e}", file=sys.stderr)
+            return 1
+    sys.stdout.write(summarize(events))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,621 @@
+"""Warm fork-server ("zygote") for cliche-installed CLIs.
+
+Every dispatch that clichec defers pays a full interpreter boot plus the
+import of `cliche.run` and, worst of all, the user's own module tree —
+300–900 ms for CLIs that pull in heavy libraries. The zygote keeps one
+per-package Python process alive with all of that already imported, and
+serves each invocation by `fork()`ing a child: a warm call costs a fork
+instead of an interpreter start.
+
+Opt-in: set `CLICHE_ZYGOTE=1` in the environment. Nothing changes for
+anyone who doesn't. `CLICHE_ZYGOTE_PRELOAD=1` additionally imports every
+module that defines an `@cli` function at server start (the big win for
+heavy CLIs, at the cost of running module top-level code once in the
+server), and `CLICHE_ZYGOTE_IDLE=<seconds>` overrides the idle timeout
+(default 900 s) after which the server exits on its own.
+
+Lifecycle:
+  1. The first opted-in invocation that finds no server runs normally
+     through the Python launcher, and spawns a detached server on the way
+     through (`run_or_spawn`).
+  2. The server scans the package exactly like `run_package_cli`, warms the
+     imports, and listens on a Unix socket next to the JSON cache:
+     `$XDG_CACHE_HOME/cliche/<pkg>_<hash>.sock` (mode 0600).
+  3. A client (clichec, or the launcher on shims without clichec) connects
+     and sends argv, env and cwd, with its stdin/stdout/stderr passed as
+     SCM_RIGHTS file descriptors. The server forks; the child installs the
+     fds and env, runs `cliche.run.main()`, and exits. The server relays
+     the child's pid (so the client can forward Ctrl-C) and then its exit
+     status.
+  4. Before every fork the server re-checks the cache file, the tracked
+     `py_mtimes`/`dir_mtimes` and pyproject.toml. On any drift it refuses
+     the request, stops listening and exits once running children finish;
+     the refused client falls back to the Python launcher, which rescans
+     and spawns a fresh server.
+
+Wire format (all integers big-endian):
+  request   "CZY1" + u32 payload length   (SCM_RIGHTS: fds 0, 1, 2)
+            payload = NUL-terminated fields:
+                cwd, argc, argv[0..argc), envc, "KEY=VALUE" * envc
+  response  i32 pid   (0 = refused, caller must handle the call itself)
+            i32 exit status (128+N when the child died from signal N)
+
+Children are forked from the server, not from the client, so they are not
+in the terminal's foreground process group: the client forwards SIGINT,
+SIGTERM, SIGHUP and SIGQUIT to the child pid it was handed.
+"""
+from __future__ import annotations
+
+import os
+import struct
+import sys
+
+MAGIC = b"CZY1"
+_HEADER = struct.Struct(">4sI")
+_INT = struct.Struct(">i")
+_MAX_PAYLOAD = 1 << 20
+DEFAULT_IDLE = 900.0
+
+# Global flags that must not run in a forked child: --pdb wants the client's
+# controlling terminal, --pyspy re-execs the process under a profiler.
+# Mirrored in clichec.c:zygote_dispatch.
+_LOCAL_ONLY_FLAGS = ("--pdb", "--pyspy")
+
+# `sockaddr_un.sun_path` is 108 bytes on Linux, 104 on macOS. Use the
+# smaller limit so a path that works on one host works on both.
+_MAX_SOCKET_PATH = 103
+
+_FORWARDED_SIGNALS = ("SIGINT", "SIGTERM", "SIGHUP", "SIGQUIT")
+
+
+def enabled() -> bool:
+    """True when the caller opted into zygote mode via `CLICHE_ZYGOTE`."""
+    return os.environ.get("CLICHE_ZYGOTE", "") not in ("", "0")
+
+
+def socket_path(cache_file) -> str:
+    """Socket path for the package whose JSON cache lives at `cache_file`.
+
+    Derived from the cache path (same `<pkg>_<hash>` stem) so clichec can
+    compute it from the argv it already receives, without another lookup.
+    """
+    path = str(cache_file)
+    if path.endswith(".json"):
+        path = path[:-len(".json")]
+    return path + ".sock"
+
+
+def encode_request(argv: list[str], env: dict[str, str], cwd: str) -> bytes:
+    """Serialise one invocation into the NUL-separated request payload."""
+    fields = [cwd, str(len(argv)), *argv, str(len(env))]
+    fields.extend(f"{k}={v}" for k, v in env.items())
+    return b"".join(os.fsencode(f) + b"\0" for f in fields)
+
+
+def decode_request(payload: bytes) -> tuple[list[str], dict[str, str], str]:
+    """Inverse of `encode_request`. Raises ValueError on malformed input."""
+    if not payload.endswith(b"\0"):
+        raise ValueError("unterminated request payload")
+    fields = iter(payload[:-1].split(b"\0"))
+    try:
+        cwd = os.fsdecode(next(fields))
+        argv = [os.fsdecode(next(fields)) for _ in range(int(next(fields)))]
+        env = {}
+        for _ in range(int(next(fields))):
+            key, sep, value = os.fsdecode(next(fields)).partition("=")
+            if sep:
+                env[key] = value
+    except StopIteration:
+        raise ValueError("truncated request payload") from None
+    if next(fields, None) is not None:
+        raise ValueError("trailing data in request payload")
+    if not argv:
+        raise ValueError("empty argv")
+    return argv, env, cwd
+
+
+def _recv_exact(sock, n: int) -> bytes | None:
+    buf = b""
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return buf
+
+
+def _recv_int(sock) -> int | None:
+    data = _recv_exact(sock, _INT.size)
+    return None if data is None else _INT.unpack(data)[0]
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+def request(sock_path: str, argv: list[str], env: dict[str, str] | None = None,
+            cwd: str | None = None, fds: tuple[int, int, int] = (0, 1, 2)) -> int | None:
+    """Run `argv` in the zygote listening on `sock_path`.
+
+    Returns the child's exit status, or None when the call was not served —
+    no server, a refused (stale) request, or any failure before the server
+    forked. None means "nothing ran, handle it yourself"; once a pid has
+    been received the command is running and the result is always an int.
+    """
+    import signal
+    import socket
+
+    if len(os.fsencode(sock_path)) > _MAX_SOCKET_PATH:
+        return None
+    try:
+        cwd = cwd if cwd is not None else os.getcwd()
+    except OSError:
+        return None
+    payload = encode_request(list(argv), dict(os.environ if env is None else env), cwd)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    previous = {}
+    try:
+        try:
+            sock.connect(sock_path)
+            socket.send_fds(sock, [_HEADER.pack(MAGIC, len(payload))], list(fds))
+            sock.sendall(payload)
+            pid = _recv_int(sock)
+        except OSError:
+            return None
+        if not pid:
+            return None
+
+        def _forward(signum, _frame):
+            try:
+                os.kill(pid, signum)
+            except OSError:
+                pass
+
+        # signal.signal only works from the main thread; a library caller on
+        # another thread just loses Ctrl-C forwarding, not the result.
+        for name in _FORWARDED_SIGNALS:
+            signum = getattr(signal, name, None)
+            if signum is None:
+                continue
+            try:
+                previous[signum] = signal.signal(signum, _forward)
+            except ValueError:
+                break
+        try:
+            status = _recv_int(sock)
+        except OSError:
+            status = None
+        if status is None:
+            print("error: lost connection to the cliche zygote server", file=sys.stderr)
+            return 1
+        return status
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+        sock.close()
+
+
+def spawn(package_name: str) -> None:
+    """Start a detached zygote server for `package_name` in the background.
+
+    Fire-and-forget: the server takes an exclusive lock before listening, so
+    concurrent spawns collapse to one live server and the rest exit at once.
+    """
+    import subprocess
+    code = f"from cliche.zygote import serve; serve({package_name!r})"
+    try:
+        subprocess.Popen(
+            [sys.executable, "-c", code],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, start_new_session=True, close_fds=True,
+        )
+    except OSError:
+        pass
+
+
+def run_or_spawn(package_name: str) -> int | None:
+    """Launcher hook: serve this invocation from a warm zygote if possible.
+
+    Returns the exit status when the zygote ran the command. Returns None
+    when the caller must run it in-process; in that case a server is spawned
+    for the next invocation (unless this one can never be zygote-served).
+    """
+    if "_ARGCOMPLETE" in os.environ:
+        return None
+    if any(flag in sys.argv for flag in _LOCAL_ONLY_FLAGS):
+        return None
+    from cliche.runtime import _find_package_dir, _get_cache_path
+    pkg_dir = _find_package_dir(package_name)
+    path = socket_path(_get_cache_path(package_name, pkg_dir))
+    rc = request(path, list(sys.argv))
+    if rc is None:
+        spawn(package_name)
+    return rc
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+class _State:
+    """Everything the server warmed up, plus the snapshot it validates against."""
+
+    def __init__(self, package_name: str, pkg_dir, cache_file, cache: dict):
+        self.package_name = package_name
+        self.pkg_dir = pkg_dir
+        self.cache_file = cache_file
+        self.cache = cache
+        self.cache_mtime = _mtime_ns(cache_file)
+        self.pyproject_mtimes = [_mtime_ns(p) for p in _pyproject_candidates(pkg_dir)]
+        import cliche.run as runner
+        self.run_mtime = _mtime_ns(runner.__file__)
+
+    def is_fresh(self) -> bool:
+        """True iff nothing the warm state was built from has changed.
+
+        Same signals `_scan_and_cache` and clichec use — cache file identity,
+        tracked dir mtimes (adds/removes/renames) and per-file `py_mtimes`
+        (content edits) — plus pyproject.toml for the description and
+        cliche's own run.py so an upgrade retires old servers. The tree
+        checks are skipped while a `cliche watch` daemon (cliche/watch.py)
+        vouches for the cache file.
+        """
+        from cliche.runtime import _dirs_unchanged, _stat_batch
+        from cliche.watch import vouches
+        import cliche.run as runner
+        try:
+            cache_st = os.stat(self.cache_file)
+        except OSError:
+            return False
+        if self.cache_mtime is None or cache_st.st_mtime_ns != self.cache_mtime:
+            return False
+        if _mtime_ns(runner.__file__) != self.run_mtime:
+            return False
+        # A live `cliche watch` daemon has already checked the rest.
+        if vouches(self.cache_file, cache_st):
+            return True
+        if [_mtime_ns(p) for p in _pyproject_candidates(self.pkg_dir)] != self.pyproject_mtimes:
+            return False
+        if not _dirs_unchanged(self.pkg_dir, self.cache.get("dir_mtimes", {})):
+            return False
+        py_mtimes = self.cache.get("py_mtimes", {})
+        return _stat_batch([os.path.join(self.pkg_dir, rel) for rel in py_mtimes],
+                           list(py_mtimes.values()))
+
+
+def _mtime_ns(path) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _pyproject_candidates(pkg_dir):
+    # Same two locations runtime._read_pyproject_meta consults.
+    return (os.path.join(pkg_dir, "pyproject.toml"),
+            os.path.join(os.path.dirname(str(pkg_dir)), "pyproject.toml"))
+
+
+def _preload_user_modules(cache: dict) -> None:
+    import importlib
+    modules = sorted({func["module"]
+                      for finfo in cache.get("files", {}).values()
+                      for func in finfo.get("functions", [])
+                      if func.get("module")})
+    for mod in modules:
+        try:
+            importlib.import_module(mod)
+        except BaseException:
+            # A module that fails to import here fails identically in the
+            # child, which then reports the error to the real caller.
+            pass
+
+
+def serve(package_name: str, idle: float | None = None, preload: bool | None = None) -> None:
+    """Run the zygote server for `package_name` until idle or invalidated.
+
+    Returns without serving when another server already holds the lock, or
+    when the socket path would exceed the platform's `sun_path` limit.
+    """
+    import fcntl
+    import selectors
+    import signal
+    import socket
+    import time
+
+    from cliche.launcher import _clean_sys_path
+    _clean_sys_path()
+    from cliche import runtime
+
+    if idle is None:
+        try:
+            idle = float(os.environ.get("CLICHE_ZYGOTE_IDLE", DEFAULT_IDLE))
+        except ValueError:
+            idle = DEFAULT_IDLE
+    if preload is None:
+        preload = os.environ.get("CLICHE_ZYGOTE_PRELOAD", "") not in ("", "0")
+
+    pkg_dir = runtime._find_package_dir(package_name)
+    if str(pkg_dir) not in sys.path:
+        sys.path.insert(0, str(pkg_dir))
+    cache_file = runtime._get_cache_path(package_name, pkg_dir)
+    sock_path = socket_path(cache_file)
+    if len(os.fsencode(sock_path)) > _MAX_SOCKET_PATH:
+        return
+
+    lock_fd = os.open(sock_path + ".lock", os.O_WRONLY | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(lock_fd)
+        return
+
+    # Warm everything the dispatch path touches. `inspect` is imported
+    # lazily by invoke_function and costs ~7 ms on its own.
+    cache = runtime._scan_and_cache(pkg_dir, cache_file, package_name)
+    import inspect  # noqa: F401
+    import cliche.run as runner
+    runner.CACHE_PATH = cache_file
+    runner.SOURCE_DIR = None
+    runner.PRELOADED_CACHE = cache
+    runner.INSTALL_DIR = str(pkg_dir)
+    runner.PKG_NAME = package_name
+    if preload:
+        _preload_user_modules(cache)
+    state = _State(package_name, pkg_dir, cache_file, cache)
+
+    # Bind under a temporary name and rename into place, so a client never
+    # connects to a half-initialised socket and a restarted server replaces
+    # the previous one's path atomically.
+    tmp_path = f"{sock_path}.{os.getpid()}"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        listener.bind(tmp_path)
+    finally:
+        os.umask(old_umask)
+    listener.listen(64)
+    os.replace(tmp_path, sock_path)
+    sock_ino = os.stat(sock_path).st_ino
+
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    signal.set_wakeup_fd(wake_w)
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+    stop = []
+    signal.signal(signal.SIGTERM, lambda *_: stop.append(True))
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    sel = selectors.DefaultSelector()
+    sel.register(listener, selectors.EVENT_READ, "accept")
+    sel.register(wake_r, selectors.EVENT_READ, "wake")
+    running: dict[int, socket.socket] = {}
+    accepting = True
+    last_activity = time.monotonic()
+
+    def _stop_accepting():
+        nonlocal accepting
+        if not accepting:
+            return
+        accepting = False
+        sel.unregister(listener)
+        listener.close()
+        try:
+            if os.stat(sock_path).st_ino == sock_ino:
+                os.unlink(sock_path)
+        except OSError:
+            pass
+        os.close(lock_fd)
+
+    def _reap():
+        nonlocal last_activity
+        while running:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            conn = running.pop(pid, None)
+            if conn is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if code < 0:
+                code = 128 - code
+            try:
+                conn.sendall(_INT.pack(code))
+            except OSError:
+                pass
+            conn.close()
+            last_activity = time.monotonic()
+
+    try:
+        while accepting or running:
+            if stop and accepting:
+                _stop_accepting()
+                continue
+            timeout = None
+            if accepting and not running:
+                timeout = max(0.0, idle - (time.monotonic() - last_activity))
+            events = sel.select(timeout)
+            if not events and accepting and not running and \
+                    time.monotonic() - last_activity >= idle:
+                _stop_accepting()
+                continue
+            for key, _ in events:
+                if key.data == "wake":
+                    try:
+                        while os.read(wake_r, 512):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    _reap()
+                    continue
+                if not accepting:
+                    continue
+                try:
+                    conn, _ = listener.accept()
+                except OSError:
+                    continue
+                last_activity = time.monotonic()
+                pid = _handle(conn, state, _stop_accepting,
+                              close_in_child=[sel, listener, wake_r, wake_w, lock_fd, *running.values()])
+                if pid:
+                    running[pid] = conn
+            _reap()
+    finally:
+        _stop_accepting()
+        sel.close()
+        signal.set_wakeup_fd(-1)
+        os.close(wake_r)
+        os.close(wake_w)
+
+
+def _handle(conn, state: _State, stop_accepting, close_in_child) -> int | None:
+    """Read one request, fork a child to run it, return the child pid.
+
+    Returns None (and closes `conn`) when the request is malformed, from a
+    different user, or refused because the warm state went stale.
+    """
+    import socket
+
+    fds: list[int] = []
+    try:
+        conn.settimeout(5.0)
+        if hasattr(socket, "SO_PEERCRED"):
+            creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+            _pid, uid, _gid = struct.unpack("3i", creds)
+            if uid != os.getuid():
+                raise ValueError("peer uid mismatch")
+        header, fds, _flags, _addr = socket.recv_fds(conn, _HEADER.size, 3)
+        if len(header) < _HEADER.size:
+            rest = _recv_exact(conn, _HEADER.size - len(header))
+            if rest is None:
+                raise ValueError("truncated header")
+            header += rest
+        magic, length = _HEADER.unpack(header)
+        if magic != MAGIC or len(fds) != 3 or length > _MAX_PAYLOAD:
+            raise ValueError("bad request header")
+        payload = _recv_exact(conn, length)
+        if payload is None:
+            raise ValueError("truncated payload")
+        argv, env, cwd = decode_request(payload)
+        conn.settimeout(None)
+    except (OSError, ValueError, struct.error):
+        for fd in fds:
+            os.close(fd)
+        conn.close()
+        return None
+
+    if not state.is_fresh():
+        # Stop listening BEFORE answering so the refused client's fallback
+        # (which spawns a replacement) can't reconnect to this server.
+        stop_accepting()
+        for fd in fds:
+            os.close(fd)
+        try:
+            conn.sendall(_INT.pack(0))
+        except OSError:
+            pass
+        conn.close()
+        return None
+
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            _reset_child_signals()
+            for obj in close_in_child:
+                try:
+                    if isinstance(obj, int):
+                        os.close(obj)
+                    else:
+                        obj.close()
+                except OSError:
+                    pass
+            conn.close()
+            code = _run_child(fds, argv, env, cwd)
+        finally:
+            os._exit(code)
+    for fd in fds:
+        os.close(fd)
+    try:
+        conn.sendall(_INT.pack(pid))
+    except OSError:
+        pass
+    return pid
+
+
+def _reset_child_signals() -> None:
+    """Undo the server's signal setup in a freshly forked child. Runs before
+    the wakeup pipe is closed, so a late SIGCHLD can't write to a dead fd."""
+    import signal
+    signal.set_wakeup_fd(-1)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+
+def _run_child(fds: list[int], argv: list[str], env: dict[str, str], cwd: str) -> int:
+    """Become the client's process (fds, env, cwd, argv) and run `run.main`."""
+    import io
+
+    for target, fd in enumerate(fds):
+        if fd != target:
+            os.dup2(fd, target)
+            os.close(fd)
+    encoding = sys.stdout.encoding if sys.stdout else None
+    sys.stdin = sys.__stdin__ = io.TextIOWrapper(
+        io.open(0, "rb", closefd=False), encoding=encoding)
+    sys.stdout = sys.__stdout__ = io.TextIOWrapper(
+        io.open(1, "wb", closefd=False), encoding=encoding,
+        line_buffering=os.isatty(1))
+    sys.stderr = sys.__stderr__ = io.TextIOWrapper(
+        io.open(2, "wb", closefd=False), encoding=encoding,
+        errors="backslashreplace", line_buffering=True)
+
+    try:
+        os.chdir(cwd)
+    except OSError as e:
+        print(f"error: cannot enter {cwd}: {e}", file=sys.stderr)
+        return 1
+    os.environ.clear()
+    os.environ.update(env)
+    import time
+    if hasattr(time, "tzset"):
+        time.tzset()
+    sys.argv = list(argv)
+
+    import cliche.run as runner
+    try:
+        runner.main()
+        code = 0
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except KeyboardInterrupt:
+        sys.excepthook(*sys.exc_info())
+        code = 130
+    except BaseException:
+        sys.excepthook(*sys.exc_info())
+        code = 1
+
+    try:
+        import atexit
+        atexit._run_exitfuncs()
+    except Exception:
+        pass
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+    return code & 0xFF
@@ -54,13 +54,13 @@ case "$PLATFORM" in
         # ~1MB. Worth it: the manylinux tag's whole purpose is "compatible
         # with old enough glibc"; we just opt out of the constraint entirely.
         TAG="manylinux2014_x86_64"
-        CC_CMD=(cc -std=c99 -O2 -Wall -Wextra -static
+        CC_CMD=(cc -std=c99 -O2 -Wall -Wextra -pthread -static
                 "$VERSION_FLAG"
                 -o cliche/_bin/clichec cliche/clichec.c)
         ;;
     linux-aarch64)
         TAG="manylinux2014_aarch64"
-        CC_CMD=(aarch64-linux-gnu-gcc -std=c99 -O2 -Wall -Wextra -static
+        CC_CMD=(aarch64-linux-gnu-gcc -std=c99 -O2 -Wall -Wextra -pthread -static
                 "$VERSION_FLAG"
                 -o cliche/_bin/clichec cliche/clichec.c)
         ;;
@@ -69,7 +69,7 @@ case "$PLATFORM" in
         # Apple Silicon, so it's the lowest sensible target — older macOS
         # never ran on arm64 hardware.
         TAG="macosx_11_0_arm64"
-        CC_CMD=(cc -std=c99 -O2 -Wall -Wextra -arch arm64
+        CC_CMD=(cc -std=c99 -O2 -Wall -Wextra -pthread -arch arm64
                 -mmacosx-version-min=11.0
                 "$VERSION_FLAG"
                 -o cliche/_bin/clichec cliche/clichec.c)
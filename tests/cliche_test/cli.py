@@ -4,6 +4,7 @@ Each function returns a JSON-serialisable dict so tests can
 `json.loads(stdout)` and assert on the structure. Keep the functions
 small — this is fixture code, not example code.
 """
+from dataclasses import dataclass
 from datetime import date, datetime
 from enum import Enum, IntEnum
 from pathlib import Path
@@ -150,6 +151,45 @@ async def run_async(n: int = 1):
     return {"n": n * 2}
 
 
+# ---------- streamed (generator) results ----------
+
+@cli
+def stream_rows(n: int = 3):
+    """Generator — each item is printed as one JSON line."""
+    for i in range(n):
+        yield {"i": i, "sq": i * i}
+
+
+@cli
+async def stream_rows_async(n: int = 3):
+    """Async generator — streamed the same way."""
+    for i in range(n):
+        yield {"i": i}
+
+
+# ---------- --output-format ----------
+
+@dataclass
+class Reading:
+    sensor: str
+    at: datetime
+    color: Color
+    source: Path
+
+
+@cli
+def readings(n: int = 2):
+    """Dataclass rows with datetime / Enum / Path fields."""
+    return [Reading(f"s{i}", datetime(2026, 4, 22, 10, i), Color.RED, Path(f"/data/{i}.csv"))
+            for i in range(n)]
+
+
+@cli
+def render(output_format: str = "plain", import_profile: str = ""):
+    """Own parameters named like the global options: they are its own."""
+    return {"output_format": output_format, "import_profile": import_profile}
+
+
 # ---------- exceptions (for --full-traceback / default paths) ----------
 
 @cli
@@ -54,6 +54,29 @@ E2E_ARGV_MATRIX: dict[str, list[str]] = {
     # async
     "async_run":          ["run-async", "--n", "7"],
 
+    # Generator results stream as NDJSON
+    "stream_rows":        ["stream-rows", "--n", "3"],
+    "stream_rows_raw":    ["--raw", "stream-rows", "--n", "2"],
+    "stream_rows_async":  ["stream-rows-async", "--n", "2"],
+
+    # --output-format
+    "fmt_default":        ["readings"],
+    "fmt_compact":        ["readings", "--output-format", "json-compact"],
+    "fmt_ndjson":         ["--output-format=ndjson", "readings"],
+    "fmt_csv":            ["readings", "--output-format", "csv"],
+    "fmt_tsv_stream":     ["stream-rows", "--output-format", "tsv"],
+    "fmt_json_stream":    ["stream-rows", "--n", "2", "--output-format", "json"],
+    "fmt_unknown":        ["readings", "--output-format", "yaml"],
+    "fmt_own_param":      ["render", "--output-format", "csv", "--import-profile", "x"],
+    "fmt_own_param_help": ["render", "--help"],
+    "fmt_own_after_global": ["--output-format", "json-compact", "render", "--output-format", "csv"],
+
+    # --import-profile
+    "import_profile":     ["--import-profile=3", "serve", "--host", "x"],
+    "import_profile_space": ["--import-profile", "3", "serve", "--host", "x"],
+    "import_profile_bare":  ["--import-profile", "serve", "--host", "x"],
+    "import_profile_after": ["serve", "--host", "x", "--import-profile=2"],
+
     # --raw / traceback trimming
     "raw_mode":           ["--raw", "echo-dict", "--tags", "a=1"],
     "default_pretty":     ["echo-dict", "--tags", "a=1"],
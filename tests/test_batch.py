@@ -0,0 +1,64 @@
+"""Tests for `--batch` (cliche/batch.py), against the installed fixture CLI.
+
+Contracts:
+    - one NDJSON record per command line, in input order, carrying the
+      return value or the error and the exit status the line would have had
+      on its own; the batch exits 1 when any line failed
+    - shell-quoted and JSON-array lines are both accepted; blank lines and
+      `#` comments are skipped
+    - `-j N` (processes) and `--threads` give the same records
+"""
+from __future__ import annotations
+
+import json
+import subprocess
+
+import pytest
+
+_LINES = """\
+# comment
+math add 2 3
+["echo-dict", "--tags", "a=1"]
+
+echo-date 04/22/2026
+raises
+nope
+stream-rows --n 2
+echo-dict-str --meta 'greeting=hi there'
+"""
+
+
+def _records(stdout: str) -> list[dict]:
+    return [json.loads(line) for line in stdout.splitlines()]
+
+
+def test_batch_records(cli_binary, tmp_path):
+    batch = tmp_path / "batch.txt"
+    batch.write_text(_LINES)
+    p = subprocess.run([cli_binary, "--batch", str(batch)], capture_output=True, text=True)
+    assert p.returncode == 1, p.stderr
+    records = _records(p.stdout)
+
+    assert [(r["line"], r["status"]) for r in records] == [
+        (2, 0), (3, 0), (5, 2), (6, 1), (7, 1), (8, 0), (9, 0),
+    ]
+    assert records[0]["result"] == {"sum": 5}
+    assert records[1]["result"] == {"tags": {"a": 1}, "count": 1}
+    assert "invalid" in records[2]["stderr"]
+    assert records[3]["error"] == "ValueError: intentional error from fixture"
+    assert "cliche_test/cli.py" in records[3]["stderr"]
+    assert records[4]["error"].startswith("Unknown command: nope")
+    assert records[5]["result"] == [{"i": 0, "sq": 0}, {"i": 1, "sq": 1}]
+    assert records[6]["result"] == {"meta": {"greeting": "hi there"}}
+
+
+@pytest.mark.parametrize("pool", [["-j", "3"], ["-j3", "--threads"]])
+def test_batch_pools_match_sequential(cli_binary, pool):
+    lines = "".join(f"math add {i} {i}\n" for i in range(40)) + "raises\n"
+    p = subprocess.run([cli_binary, "--batch", "-", *pool], input=lines,
+                       capture_output=True, text=True)
+    assert p.returncode == 1, p.stderr
+    records = _records(p.stdout)
+    assert [r["line"] for r in records] == list(range(1, 42))
+    assert [r["result"]["sum"] for r in records[:-1]] == [2 * i for i in range(40)]
+    assert records[-1]["status"] == 1
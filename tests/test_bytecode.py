@@ -0,0 +1,82 @@
+"""Tests for ahead-of-time bytecode (cliche/bytecode.py).
+
+Contracts:
+    - `warm` compiles every module of the package, next to the sources when
+      they're writable, without creating the private pycache
+    - when they aren't, everything, plus the stdlib modules cliche's
+      runtime imports, lands under the private pycache in the
+      `sys.pycache_prefix` layout, which is where `-X pycache_prefix`
+      imports look
+    - the fast-shim wrapper passes that prefix only when asked to
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+
+from cliche import bytecode
+from cliche._clichec import render_wrapper
+
+
+def _package(tmp_path):
+    pkg = tmp_path / "src" / "aot_pkg"
+    (pkg / "sub").mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cli.py").write_text("from cliche import cli\n\n@cli\ndef hi():\n    return 1\n")
+    (pkg / "sub" / "more.py").write_text("X = 1\n")
+    (pkg / "broken.py").write_text("def (:\n")
+    return pkg
+
+
+def _cached(path, prefix=None):
+    saved = sys.pycache_prefix
+    sys.pycache_prefix = prefix
+    try:
+        return importlib.util.cache_from_source(str(path))
+    finally:
+        sys.pycache_prefix = saved
+
+
+def test_warm_next_to_sources(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    pkg = _package(tmp_path)
+    assert bytecode.warm("aot_pkg", str(pkg), verbose=True) == 0
+    for rel in ("__init__.py", "cli.py", "sub/more.py"):
+        assert (pkg / _cached(pkg / rel)).exists(), rel
+    assert "1 failed to compile" in capsys.readouterr().out
+    assert not bytecode.pycache_dir().exists()
+
+
+def test_warm_into_private_pycache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr(bytecode, "_writable", lambda directory: False)
+    pkg = _package(tmp_path)
+    assert bytecode.warm("aot_pkg", str(pkg)) == 0
+    prefix = str(bytecode.pycache_dir())
+    cfile = _cached(pkg / "cli.py", prefix)
+    assert cfile.startswith(prefix + "/")
+    assert not (pkg / "__pycache__").exists()
+    stamp = os.stat(cfile).st_mtime_ns
+
+    # An import under the prefix reads it instead of compiling again.
+    subprocess.run([sys.executable, "-X", f"pycache_prefix={prefix}", "-c", "import aot_pkg.cli"],
+                   env={"PYTHONPATH": str(pkg.parent)}, check=True)
+    assert os.stat(cfile).st_mtime_ns == stamp
+    # cliche's runtime and the stdlib modules it imports are there too.
+    assert os.path.exists(_cached(os.path.join(os.path.dirname(bytecode.__file__), "run.py"), prefix))
+    assert os.path.exists(_cached(argparse.__file__, prefix))
+
+
+def test_wrapper_passes_prefix_only_when_asked(tmp_path):
+    args = dict(binary_name="tool", package_name="aot_pkg", pkg_dir="/x",
+                python_exe=sys.executable, clichec="/nonexistent", cache_hash="0" * 8)
+    plain = render_wrapper(**args)
+    private = render_wrapper(**args, pycache_prefix=True)
+    assert "pycache_prefix" not in plain
+    assert '"$PYTHON" -X "pycache_prefix=$CACHE_HOME/cliche/pycache" -c' in private
+    script = tmp_path / "tool"
+    script.write_text(private)
+    assert subprocess.run(["sh", "-n", str(script)]).returncode == 0
@@ -11,6 +11,9 @@ What's covered:
     2. add @cli to existing   — mtime drift on a known file
     3. add a new .py file     — file the cache has never seen, same dir
     4. add a new subpackage   — file inside a new directory entirely
+    5. parallel stat engine   — threaded checks (runtime._stat_batch and
+                                clichec's all_fresh) agree with the serial
+                                ones and still catch a single drift
 
 The C fast-fail dispatcher tracks per-file mtimes (clichec.c:cache_is_fresh)
 and exits 64 on drift; the shell wrapper then falls through to the Python
@@ -174,3 +177,62 @@ def test_freshness_add_subpackage(freshness_env):
     r = _run(binary, "deep_cmd")
     assert r.returncode == 0, f"deep_cmd not discovered:\n{r.stderr}"
     assert json.loads(r.stdout) == {"v": 4}
+
+
+def test_parallel_stat_batch_matches_serial(tmp_path, monkeypatch):
+    from cliche.runtime import _stat_batch
+    paths = []
+    for i in range(40):
+        path = tmp_path / f"f{i}.py"
+        path.write_text("")
+        paths.append(str(path))
+    paths.append(str(tmp_path / "missing.py"))
+
+    monkeypatch.setenv("CLICHE_STAT_THREADS", "1")
+    serial = _stat_batch(paths)
+    monkeypatch.setenv("CLICHE_STAT_THREADS", "4")
+    assert _stat_batch(paths) == serial
+    assert serial[-1] is None and None not in serial[:-1]
+
+    expected = serial[:-1]
+    assert _stat_batch(paths[:-1], expected)
+    for i in (0, 20, 39):
+        drifted = list(expected)
+        drifted[i] += 1
+        assert not _stat_batch(paths[:-1], drifted)
+    assert not _stat_batch(paths, serial)  # a vanished file is drift too
+
+
+def test_clichec_parallel_freshness(tmp_path, monkeypatch, _background_warmups):
+    clichec = _background_warmups["clichec"].result()
+    if not clichec:
+        pytest.skip("clichec could not be built (no C compiler present)")
+    from cliche import runtime
+    pkg = tmp_path / "src" / "cliche_parallel_stat_pkg"
+    for d in range(4):
+        (pkg / f"d{d}").mkdir(parents=True)
+        for i in range(10):
+            (pkg / f"d{d}" / f"f{i}.py").write_text("")
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cli.py").write_text("from cliche import cli\n\n@cli\ndef hello():\n    pass\n")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("CLICHE_STAT_THREADS", "4")
+    env = dict(os.environ)
+    cache_file = runtime._get_cache_path(pkg.name, pkg)
+    runtime._scan_and_cache(pkg, cache_file, pkg.name)
+
+    def run():
+        return subprocess.run([clichec, str(cache_file), pkg.name, "--help"],
+                              env=env, capture_output=True, text=True).returncode
+
+    assert run() == 0
+    # The index path, then the JSON path (index removed), each with one
+    # drifted file that only one worker's slice covers.
+    _bump_mtime(pkg / "d3" / "f9.py")
+    assert run() == 64
+    runtime._scan_and_cache(pkg, cache_file, pkg.name)
+    assert run() == 0
+    os.unlink(str(cache_file)[:-len(".json")] + ".idx")
+    assert run() == 0
+    _bump_mtime(pkg / "d0" / "f0.py")
+    assert run() == 64
@@ -0,0 +1,188 @@
+"""Tests for the binary command index (cliche/cache_index.py).
+
+Two contracts:
+    - the JSON written alongside the index is byte-identical to
+      `json.dumps(cache)`, and every recorded span slices out exactly the
+      object it names
+    - clichec prints the same thing whether it reads the index or the JSON,
+      and silently falls back to the JSON when the two disagree
+
+Like test_zygote, this uses a throwaway package on PYTHONPATH with a private
+XDG_CACHE_HOME instead of a pip install.
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from cliche import cache_index
+
+PKG_NAME = "cliche_index_pkg"
+
+_CLI_SRC = (
+    "from cliche import cli\n"
+    "\n"
+    "@cli\n"
+    "def say_hello(name: str, loud: bool = False):\n"
+    '    """Greet someone — politely.\n\n    More detail here."""\n'
+    "\n"
+    "@cli\n"
+    "def bare(x: int = 1):\n"
+    "    pass\n"
+    "\n"
+    "@cli('data_ops')\n"
+    "def export(path: str):\n"
+    '    """Export the dataset."""\n'
+    "\n"
+    "@cli('data_ops')\n"
+    "def import_rows(path: str, limit: int = 10):\n"
+    '    """Import rows."""\n'
+)
+
+
+def _scan(pkg_dir, cache_home):
+    """Run the runtime scan in a subprocess, returning the cache file path."""
+    code = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from cliche.runtime import _get_cache_path, _scan_and_cache\n"
+        f"pkg_dir = Path({str(pkg_dir)!r})\n"
+        f"cache_file = _get_cache_path({PKG_NAME!r}, pkg_dir)\n"
+        f"_scan_and_cache(pkg_dir, cache_file, {PKG_NAME!r})\n"
+        "print(cache_file)\n"
+    )
+    env = {**os.environ, "XDG_CACHE_HOME": str(cache_home)}
+    r = subprocess.run([sys.executable, "-c", code], env=env,
+                       capture_output=True, text=True, check=True)
+    return r.stdout.strip()
+
+
+@pytest.fixture
+def indexed_pkg(tmp_path):
+    pkg = tmp_path / "src" / PKG_NAME
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cli.py").write_text(_CLI_SRC)
+    (pkg / "pyproject.toml").write_text(
+        '[project]\nname = "idx"\ndescription = "Index test CLI"\n')
+    cache_home = tmp_path / "cache"
+    cache_file = _scan(pkg, cache_home)
+    return {"pkg": pkg, "cache_home": cache_home, "cache_file": cache_file}
+
+
+def test_json_is_unchanged_and_spans_slice_exactly(indexed_pkg):
+    cache_file = indexed_pkg["cache_file"]
+    with open(cache_file) as f:
+        text = f.read()
+    cache = json.loads(text)
+    assert text == json.dumps(cache)
+
+    _, key_spans, fn_spans = cache_index.dumps_with_spans(cache)
+    for key, (off, length) in key_spans.items():
+        assert json.loads(text[off:off + length]) == cache[key]
+    for (rel, i), (off, length) in fn_spans.items():
+        assert json.loads(text[off:off + length]) == cache["files"][rel]["functions"][i]
+
+
+def test_index_round_trip(indexed_pkg):
+    cache_file = indexed_pkg["cache_file"]
+    assert cache_index.index_matches(cache_file)
+    ix = cache_index.read_index(cache_index.index_path(cache_file))
+    st = os.stat(cache_file)
+    assert (ix["json_size"], ix["json_mtime_ns"]) == (st.st_size, st.st_mtime_ns)
+    assert ix["version"] == "2.2"
+    assert ix["pkg_dir"] == str(indexed_pkg["pkg"])
+    assert ix["description"] == "Index test CLI"
+    assert ix["pyproject_mtime"] == pytest.approx(
+        os.stat(indexed_pkg["pkg"] / "pyproject.toml").st_mtime)
+
+    names = [(c["group"], c["name"]) for c in ix["commands"]]
+    assert names == [(None, "bare"), (None, "say-hello"),
+                     ("data_ops", "export"), ("data_ops", "import-rows")]
+    docs = {c["name"]: c["doc"] for c in ix["commands"]}
+    assert docs["say-hello"] == "Greet someone — politely."
+    assert docs["bare"] is None
+    fresh = {(path, kind) for path, kind, _ in ix["fresh"]}
+    assert {("cli.py", "file"), ("__init__.py", "file"), (".", "dir")} <= fresh
+
+
+def test_index_is_rewritten_when_missing_or_mismatched(indexed_pkg):
+    cache_file = indexed_pkg["cache_file"]
+    idx = cache_index.index_path(cache_file)
+    idx.unlink()
+    _scan(indexed_pkg["pkg"], indexed_pkg["cache_home"])
+    assert cache_index.index_matches(cache_file)
+
+    # A JSON rewritten behind the index's back (e.g. by an older cliche).
+    later = os.stat(cache_file).st_mtime + 5
+    os.utime(cache_file, (later, later))
+    assert not cache_index.index_matches(cache_file)
+    _scan(indexed_pkg["pkg"], indexed_pkg["cache_home"])
+    assert cache_index.index_matches(cache_file)
+
+    blob = bytearray(idx.read_bytes())
+    blob[-2] ^= 0xFF
+    idx.write_bytes(bytes(blob))
+    with pytest.raises(ValueError, match="checksum"):
+        cache_index.read_index(idx)
+
+
+_ARGVS = [
+    [],
+    ["--help"],
+    ["say-hello", "--help"],
+    ["say_hello", "--help"],
+    ["data_ops", "import-rows", "--help"],
+    ["say-hello", "--llm-help"],
+    ["data_ops", "export", "--llm-help"],
+    ["say-helo"],
+    ["bare", "--llm-help"],
+    ["data-ops", "--llm-help"],
+]
+
+
+def test_clichec_output_matches_json_path(indexed_pkg, _background_warmups):
+    clichec = _background_warmups["clichec"].result()
+    if not clichec:
+        pytest.skip("clichec could not be built (no C compiler present)")
+    cache_file = indexed_pkg["cache_file"]
+    env = {**os.environ, "NO_COLOR": "1", "CLICHEC_PROG": "idx",
+           "CLICHEC_DEBUG": "1"}
+
+    def run_all():
+        out = []
+        for argv in _ARGVS:
+            r = subprocess.run([clichec, cache_file, PKG_NAME, *argv], env=env,
+                               capture_output=True, text=True)
+            out.append((r.returncode, r.stdout, r.stderr))
+        return out
+
+    with_index = run_all()
+    assert all("(index)" in err for _, _, err in with_index)
+    assert with_index[0][0] == 0 and "Index test CLI" in with_index[0][1]
+    assert with_index[2][0] == 0 and "--loud" in with_index[2][1]
+    assert with_index[7][0] == 1
+
+    idx = cache_index.index_path(cache_file)
+    blob = idx.read_bytes()
+    idx.unlink()
+    from_json = run_all()
+
+    def strip_debug(results):
+        return [(rc, out, "\n".join(l for l in err.splitlines()
+                                    if not l.startswith("clichec: ")))
+                for rc, out, err in results]
+
+    assert strip_debug(with_index) == strip_debug(from_json)
+
+    # Corrupt index → reported under CLICHEC_DEBUG, JSON served instead.
+    idx.write_bytes(blob[:-1] + bytes([blob[-1] ^ 0xFF]))
+    r = subprocess.run([clichec, cache_file, PKG_NAME], env=env,
+                       capture_output=True, text=True)
+    assert r.returncode == 0
+    assert "index unusable (checksum mismatch)" in r.stderr
+    assert r.stdout == with_index[0][1]
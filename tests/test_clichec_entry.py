@@ -0,0 +1,136 @@
+"""Tests for clichec installed as the CLI itself (entry mode, `entry_main`
+in cliche/clichec.c; cliche/_clichec.py:install_fast_shim).
+
+Contracts:
+    - install_fast_shim replaces pip's console script with clichec and
+      writes its settings sidecar; `is_fast_shim` recognises it
+    - run by path or by PATH lookup, it serves what clichec serves, prints
+      an argv error once, and exec's Python (under -S) for everything else
+    - without its sidecar it fails with a message rather than misreading argv
+    - the sidecar, not the name, selects entry mode: a CLI called
+      `clichec-tools` is still the installed CLI
+    - CLICHE_SH_WRAPPER=1 installs the shell wrapper and drops the sidecar
+    - the launcher reinstalls it once clichec was rebuilt
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from cliche import _clichec
+from cliche._clichec import (ensure_built, entry_config_path, install_fast_shim,
+                             is_fast_shim, read_entry_config)
+
+pytestmark = pytest.mark.skipif(ensure_built() is None,
+                                reason="clichec unavailable (no C compiler)")
+
+_CMDS = """\
+import sys
+from cliche import cli
+
+@cli
+def info(n: int = 1):
+    return {"no_site": sys.flags.no_site, "n": n}
+
+@cli
+def other():
+    pass
+"""
+
+
+@pytest.fixture
+def tool(tmp_path):
+    pkg = tmp_path / "src" / "entry_pkg"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cmds.py").write_text(_CMDS)
+    target = tmp_path / "bin" / "entrytool"
+    target.parent.mkdir()
+    target.write_text(f"#!{sys.executable}\nfrom cliche.launcher import launch_entry_pkg\n"
+                      "launch_entry_pkg()\n")
+    target.chmod(0o755)
+    env = {k: v for k, v in os.environ.items()
+           if k not in ("CLICHE_NO_FAST_SHIM", "CLICHE_FULL_SITE", "CLICHE_ZYGOTE",
+                        "CLICHE_SH_WRAPPER")}
+    env.update(XDG_CACHE_HOME=str(tmp_path / "cache"), NO_COLOR="1",
+               PYTHONPATH=str(tmp_path / "src"))
+    return target, pkg, env
+
+
+def _install(target, pkg, monkeypatch, env):
+    for key in ("XDG_CACHE_HOME", "PYTHONPATH"):
+        monkeypatch.setenv(key, env[key])
+    # The suite's editable installs put import hooks in site-packages, which
+    # keep the full start-up (test_site_free.py); here the -S path is tested.
+    monkeypatch.setattr(_clichec, "_site_free", lambda site: site)
+    ok, msg = install_fast_shim("entrytool", "entry_pkg", str(pkg), target_path=str(target))
+    assert ok, msg
+
+
+def test_installed_as_clichec(tool, monkeypatch):
+    target, pkg, env = tool
+    _install(target, pkg, monkeypatch, env)
+    assert target.read_bytes()[:2] != b"#!" and is_fast_shim(target)
+    settings = read_entry_config(target)
+    assert settings["PKG"] == "entry_pkg" and settings["PYTHON"] == sys.executable
+    assert target.read_bytes() == open(settings["CLICHEC"], "rb").read()
+
+    def run(*argv, path=None):
+        run_env = {**env, "PATH": f"{path}:{env['PATH']}"} if path else env
+        return subprocess.run(list(argv), env=run_env, capture_output=True, text=True)
+
+    out = run(str(target), "info", "-n", "3")
+    assert out.returncode == 0, out.stderr
+    assert '"no_site": 1' in out.stdout and '"n": 3' in out.stdout
+    # Found on PATH, argv[0] is the bare name: the sidecar is found all the same.
+    out = run("entrytool", "info", path=target.parent)
+    assert out.returncode == 0 and '"n": 1' in out.stdout
+    # The cache is warm now: help and argv errors are clichec's own.
+    out = run(str(target), "--help")
+    assert out.returncode == 0 and "info" in out.stdout
+    out = run(str(target), "info", "-n", "x")
+    assert out.returncode == 2 and out.stderr.count("invalid int value") == 1
+
+    entry_config_path(target).unlink()
+    out = run(str(target), "info")
+    assert out.returncode == 127 and ".entrytool.cliche" in out.stderr
+
+
+def test_name_starting_with_clichec(tool, monkeypatch):
+    target, pkg, env = tool
+    named = target.with_name("clichec-tools")
+    target.rename(named)
+    for key in ("XDG_CACHE_HOME", "PYTHONPATH"):
+        monkeypatch.setenv(key, env[key])
+    ok, msg = install_fast_shim("clichec-tools", "entry_pkg", str(pkg), target_path=str(named))
+    assert ok, msg
+    assert entry_config_path(named).name == ".clichec-tools.cliche"
+    for _ in range(2):  # cold (Python), then warm (clichec itself)
+        out = subprocess.run([str(named), "info", "-n", "2"], env=env,
+                             capture_output=True, text=True)
+        assert out.returncode == 0, out.stderr
+        assert '"n": 2' in out.stdout
+    out = subprocess.run([str(named), "--help"], env=env, capture_output=True, text=True)
+    assert out.returncode == 0 and "clichec-tools" in out.stdout
+
+
+def test_sh_wrapper_on_request(tool, monkeypatch):
+    target, pkg, env = tool
+    _install(target, pkg, monkeypatch, env)
+    monkeypatch.setenv("CLICHE_SH_WRAPPER", "1")
+    _install(target, pkg, monkeypatch, env)
+    assert target.read_text().startswith("#!/bin/sh") and is_fast_shim(target)
+    assert not entry_config_path(target).exists()
+
+
+def test_rebuilt_clichec_is_reinstalled(tool, monkeypatch):
+    target, pkg, env = tool
+    _install(target, pkg, monkeypatch, env)
+    config = entry_config_path(target)
+    settings = read_entry_config(target)
+    config.write_text(config.read_text().replace(settings["CLICHEC"], "/gone/clichec"))
+    subprocess.run([str(target), "info"], env=env, capture_output=True, check=True)
+    assert read_entry_config(target)["CLICHEC"] == settings["CLICHEC"]
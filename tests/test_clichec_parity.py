@@ -21,7 +21,8 @@ Surface deliberately excluded:
   - top-level `--llm-help`     — clichec defers to Python (env-info snapshot
                                   with Python interpreter / pip / autocomplete
                                   state is awkward to reproduce in C).
-  - signatures referencing pydantic — clichec defers (no field schema in cache).
+  - signatures referencing pydantic — clichec's renderer defers; the stored
+                                  help (test_help_store) serves them.
   - real dispatch                   — clichec always defers.
 
 ## Speed
@@ -105,6 +106,21 @@ COMPLETION_CASES = [
     ("complete_subcmd_flag",    "<bin> math add --"),
 ]
 
+# The env the zsh / fish hooks (install._SHELL_RC_LINES) add: candidates then
+# carry descriptions, so these compare the exact output lines.
+SHELL_ENV = {
+    "zsh":  {"_ARGCOMPLETE_SHELL": "zsh", "_ARGCOMPLETE_SUPPRESS_SPACE": "1"},
+    "fish": {"_ARGCOMPLETE_SHELL": "fish", "_ARGCOMPLETE_DFS": "\t",
+             "_ARGCOMPLETE_SUPPRESS_SPACE": "1"},
+}
+SHELL_COMPLETION_CASES = [
+    (f"{shell}_{tid}", shell, line)
+    for shell in SHELL_ENV
+    for tid, line in [("top", "<bin> "), ("subcmd", "<bin> math "),
+                      ("single", "<bin> math a"), ("flag_names", "<bin> with-cache --"),
+                      ("pos_enum", "<bin> echo-enum ")]
+]
+
 
 # ---------------------------------------------------------------------------
 # Session fixtures: build clichec, prime the cache, pre-run every parity case.
@@ -189,7 +205,7 @@ def _run_clichec(clichec: str, cache_path: str, prog_name: str,
     )
 
 
-def _run_complete(binary: str, comp_line: str) -> str:
+def _run_complete(binary: str, comp_line: str, shell: str | None = None) -> str:
     """Argcomplete-style completion via the canonical Python launcher.
 
     Same reasoning as _run_python: auto-apply replaces the on-disk shim with
@@ -212,7 +228,8 @@ def _run_complete(binary: str, comp_line: str) -> str:
                "_ARGCOMPLETE_STDOUT_FILENAME": tmp.name,
                "COMP_LINE": comp_line,
                "COMP_POINT": str(len(comp_line)),
-               "NO_COLOR": "1"}
+               "NO_COLOR": "1",
+               **SHELL_ENV.get(shell, {})}
         subprocess.run([sys.executable, "-c", code], env=env,
                        capture_output=True, text=True, timeout=5)
         with open(tmp.name) as f:
@@ -225,7 +242,7 @@ def _run_complete(binary: str, comp_line: str) -> str:
 
 
 def _run_complete_clichec(clichec: str, cache_path: str, prog_name: str,
-                          comp_line: str) -> str:
+                          comp_line: str, shell: str | None = None) -> str:
     tmp = tempfile.NamedTemporaryFile(mode="w", delete=False)
     tmp.close()
     try:
@@ -236,7 +253,8 @@ def _run_complete_clichec(clichec: str, cache_path: str, prog_name: str,
                "COMP_LINE": comp_line,
                "COMP_POINT": str(len(comp_line)),
                "NO_COLOR": "1",
-               "CLICHEC_PROG": prog_name}
+               "CLICHEC_PROG": prog_name,
+               **SHELL_ENV.get(shell, {})}
         subprocess.run([clichec, cache_path, PKG_NAME], env=env,
                        capture_output=True, text=True, timeout=5)
         with open(tmp.name) as f:
@@ -312,6 +330,12 @@ def compute_parity_warmup(cli_binary: str, clichec: str | None) -> tuple[str | N
             cli_binary, ln)))
         jobs.append((("c_comp",  tid), lambda ln=line: _run_complete_clichec(
             clichec, cache_path, cli_binary, ln)))
+    for tid, shell, comp_line in SHELL_COMPLETION_CASES:
+        line = comp_line.replace("<bin>", cli_binary)
+        jobs.append((("py_comp", tid), lambda ln=line, sh=shell: _run_complete(
+            cli_binary, ln, sh)))
+        jobs.append((("c_comp",  tid), lambda ln=line, sh=shell: _run_complete_clichec(
+            clichec, cache_path, cli_binary, ln, sh)))
 
     def _exec(item):
         key, fn = item
@@ -432,6 +456,23 @@ def test_clichec_completion_matches_python(parity_results, test_id, comp_line):
         )
 
 
+@pytest.mark.parametrize("test_id,shell,comp_line", SHELL_COMPLETION_CASES,
+                         ids=[c[0] for c in SHELL_COMPLETION_CASES])
+def test_clichec_shell_completion_matches_python(parity_results, test_id, shell, comp_line):
+    """zsh's `candidate:description` and fish's tab-separated lines match
+    argcomplete's line for line (in any order); commands describe
+    themselves with their docstring's first line."""
+    py = sorted(s for s in parity_results[("py_comp", test_id)].split("\n") if s)
+    c  = sorted(s for s in parity_results[("c_comp",  test_id)].split("\n") if s)
+    assert py == c, f"[{test_id}] completion drift"
+    sep = ":" if shell == "zsh" else "\t"
+    assert all(sep in line for line in c), c
+    if test_id.endswith("_top"):
+        assert f"echo-date{sep}Echo an ISO date back as JSON." in c
+    if test_id.endswith("_single"):
+        assert c == [f"add{sep}Grouped subcommand: `nc-test-bin math add 2 3`."]
+
+
 def test_auto_apply_on_cliche_install(tmp_path_factory, clichec_binary,
                                       cli_results, parity_results):
     """End-to-end: `cliche install <name>` writes a fast-shim wrapper, and
@@ -524,8 +565,8 @@ def test_auto_apply_on_cliche_install(tmp_path_factory, clichec_binary,
 
 
 def test_wrapper_falls_through_on_unexpected_exit(tmp_path, clichec_binary):
-    """The fast-shim wrapper must trust ONLY rc=0 (success) and rc=1 (handled
-    error like unknown-command). Every other code — `64` (defer),
+    """The fast-shim wrapper must trust ONLY rc=0 (success), rc=1 (handled
+    error like unknown-command) and rc=2 (argv rejected). Every other code — `64` (defer),
     `139` (SIGSEGV), `137` (SIGKILL), `127` (clichec missing) — has to fall
     through to the Python launcher so a misbehaving clichec never bricks the
     binary.
@@ -577,6 +618,7 @@ def test_wrapper_falls_through_on_unexpected_exit(tmp_path, clichec_binary):
         # (clichec rc, expected wrapper rc, side that should answer)
         (0,    0, "CLICHEC"),  # clichec handled it, success
         (1,    1, "CLICHEC"),  # clichec handled it, error (e.g. unknown-cmd)
+        (2,    2, "CLICHEC"),  # clichec rejected the argv, as argparse would
         (64,   0, "PYTHON"),   # explicit defer — expected fall-through
         (139,  0, "PYTHON"),   # SIGSEGV-like exit — must NOT brick binary
         (137,  0, "PYTHON"),   # SIGKILL/OOM — same
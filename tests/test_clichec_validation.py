@@ -0,0 +1,183 @@
+"""Tests for clichec's argument validation (fail fast without Python).
+
+Contracts:
+    - for argv argparse rejects, clichec writes exactly what run.py writes
+      (the command's help, then the error) and exits 2, plain and coloured
+    - argv that parses, and anything whose outcome needs Python (custom type
+      callables, abbreviations, `--`, the cliche globals, a width the store
+      wasn't rendered for), exits 64 so the wrapper runs Python
+    - without the store's "argv-check" entry clichec never serves an error
+
+Same throwaway-package setup as test_help_store.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from cliche import help_store
+
+PKG_NAME = "cliche_validation_pkg"
+PROG = "cv"
+
+_CLI_SRC = (
+    "from datetime import date\n"
+    "from enum import Enum\n"
+    "from pydantic import BaseModel, Field\n"
+    "from cliche import cli\n"
+    "\n"
+    "class Color(Enum):\n"
+    "    RED = 'red'\n"
+    "    GREEN = 'green'\n"
+    "\n"
+    "def Port(s):\n"
+    "    return int(s)\n"
+    "\n"
+    "class Conn(BaseModel):\n"
+    "    host: str\n"
+    "    port: int = Field(80, description='TCP port')\n"
+    "    tls: bool = False\n"
+    "    verify: bool = True\n"
+    "\n"
+    "@cli\n"
+    "def paint(target: str, color: Color = Color.RED, coats: int = 2,\n"
+    "          dry_run: bool = False, fast: bool = True):\n"
+    '    """Paint something."""\n'
+    "    print('painted', target)\n"
+    "\n"
+    "@cli\n"
+    "def add(a: int, b: float, when: date = None, tags: list[int] = None):\n"
+    '    """Add numbers."""\n'
+    "    print(a + b)\n"
+    "\n"
+    "@cli\n"
+    "def serve(port: Port):\n"
+    "    pass\n"
+    "\n"
+    "@cli\n"
+    "def connect(conn: Conn, retries: int = 1):\n"
+    '    """Connect somewhere."""\n'
+    "    print(conn.host, conn.port, conn.tls, conn.verify, retries)\n"
+    "\n"
+    "@cli('data')\n"
+    "def export_rows(path: str, limit: int = 10):\n"
+    '    """Export rows."""\n'
+)
+
+_REJECTED = [
+    ["paint"],
+    ["paint", "x", "--coats", "abc"],
+    ["paint", "x", "-c", "zz"],
+    ["paint", "x", "--color", "blue"],
+    ["paint", "x", "--fast"],
+    ["paint", "x", "y"],
+    ["paint", "x", "--coats"],
+    ["paint", "--dry_run"],
+    ["paint", "it's", "--color", "it's"],
+    ["add", "1"],
+    ["add", "1", "two"],
+    ["add", "1", "2", "--when", "2023-02-29"],
+    ["add", "1", "2", "--tags", "1", "x"],
+    ["add", "1", "2", "--bogus", "3"],
+    ["connect"],
+    ["connect", "--port", "1"],
+    ["connect", "--host", "h", "--port", "x"],
+    ["connect", "--host", "h", "--bogus"],
+    ["connect", "--host", "h", "--verify"],
+    ["data", "export-rows"],
+    ["data", "export_rows", "p", "--limit", "x"],
+]
+
+_DEFERRED = [
+    ["paint", "x", "--no-fast", "--dry-run"],   # valid
+    ["add", "-1", "-2.5", "--tags"],            # valid
+    ["paint", "x", "--coats=3"],                # explicit `=` argument
+    ["paint", "x", "--coa", "3"],               # abbreviation
+    ["paint", "--", "x"],
+    ["paint", "x", "--pdb"],
+    ["paint", "x", "-h"],
+    ["serve", "abc"],                           # custom type callable
+    ["connect", "--host", "h", "--tls", "--no-verify", "--port", "8"],  # valid
+    ["add", "1", "2", "--when", "é"],           # non-ASCII
+]
+
+_LAUNCHER = (
+    "from cliche.runtime import run_package_cli\n"
+    f"run_package_cli({PKG_NAME!r})\n"
+)
+
+
+@pytest.fixture
+def validation_env(tmp_path, _background_warmups):
+    clichec = _background_warmups["clichec"].result()
+    if not clichec:
+        pytest.skip("clichec could not be built (no C compiler present)")
+    src = tmp_path / "src"
+    pkg = src / PKG_NAME
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cli.py").write_text(_CLI_SRC)
+    launcher = tmp_path / PROG
+    launcher.write_text(_LAUNCHER)
+    env = {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache"),
+           "PYTHONPATH": str(src), "COLUMNS": "80", "CLICHEC_PROG": PROG}
+    for var in ("NO_COLOR", "FORCE_COLOR"):
+        env.pop(var, None)
+
+    def python(argv, **extra):
+        r = subprocess.run([sys.executable, str(launcher), *argv],
+                           env={**env, **extra}, capture_output=True, text=True)
+        return r.returncode, r.stdout, r.stderr
+
+    python(["--help"])  # first run writes the cache and the store
+    cache_files = list((tmp_path / "cache" / "cliche").glob(f"{PKG_NAME}_*.json"))
+    assert len(cache_files) == 1
+    cache_file = cache_files[0]
+
+    def fast(argv, **extra):
+        r = subprocess.run([clichec, str(cache_file), PKG_NAME, *argv],
+                           env={**env, **extra}, capture_output=True, text=True)
+        return r.returncode, r.stdout, r.stderr
+
+    return {"python": python, "fast": fast, "cache_file": cache_file}
+
+
+def test_rejected_argv_matches_python(validation_env):
+    if not help_store._argparse_matches_clichec():
+        pytest.skip("this interpreter's argparse differs from clichec's mirror")
+    python, fast = validation_env["python"], validation_env["fast"]
+    for color in ({}, {"FORCE_COLOR": "1"}):
+        for argv in _REJECTED:
+            got = fast(argv, **color)
+            assert got[0] == 2, (argv, got)
+            assert got == python(argv, **color), argv
+    rc, out, err = fast(["add", "1", "two"])
+    assert out == "" and err.endswith("\nargument b: invalid float value: 'two'\n")
+    assert err.startswith("usage: cv add ")
+    assert "\033[1;31margument a: invalid int value" in fast(["add", "x", "2"], FORCE_COLOR="1")[2]
+
+
+def test_valid_or_python_only_argv_defers(validation_env):
+    fast = validation_env["fast"]
+    for argv in _DEFERRED:
+        assert fast(argv)[0] == 64, argv
+    # The error embeds the 80-column help; another width has to render live.
+    assert fast(["paint"], COLUMNS="100")[0] == 64
+    # A statically read pydantic model binds without clichec importing it.
+    argv = ["connect", "--host", "h", "--tls", "--no-verify", "--port", "8"]
+    assert validation_env["python"](argv) == (0, "h 8 True False 1\n", "")
+
+
+def test_no_argv_check_entry_means_no_fast_errors(validation_env):
+    cache_file = validation_env["cache_file"]
+    path = help_store.store_path(cache_file)
+    entries = help_store._read_entries(path, PROG)
+    entries.pop(help_store.make_key("meta", "", "argv-check"), None)
+    st = os.stat(cache_file)
+    path.write_bytes(help_store.encode_store(entries, PROG, st.st_size,
+                                             st.st_mtime_ns, complete=True))
+    assert help_store.lookup(cache_file, "help", "", "paint", PROG, columns=80)
+    assert validation_env["fast"](["paint"])[0] == 64
@@ -0,0 +1,127 @@
+"""Tests for `@completer` (cliche/completions.py) on a throwaway package.
+
+Contracts:
+    - the scan records a `@completer` as the `completer` of the same
+      module's @cli parameters with that name, in full and sliced parses;
+      the installed cache names its module in full, as it does the command's,
+      so a completer's relative imports work
+    - the first completion runs the completer in Python and stores its
+      candidates; while they are fresh, clichec serves them (positional and
+      flag value) without starting Python, and the completer isn't called
+    - expired candidates make clichec defer; Python refreshes them, and
+      serves the old ones when the completer raises
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from cliche import completions
+from cliche.main import extract_cli_functions
+
+PKG = "completer_pkg"
+
+_MODULE = '''\
+import os
+from cliche import cli, completer
+
+from .api import SERVICES
+
+
+@completer("service", "target", ttl=600)
+def services():
+    with open(os.environ["CALLS_FILE"], "a") as f:
+        f.write("x")
+    if os.environ.get("COMPLETER_FAILS"):
+        raise RuntimeError("api down")
+    return SERVICES
+
+
+@cli
+def deploy(service: str, target: str = "api", force: bool = False):
+    return service
+'''
+
+
+def test_scan_records_completer():
+    functions = extract_cli_functions(_MODULE, Path("/pkg/ops.py"), Path("/pkg"))
+    params = {p["name"]: p for p in functions[0]["parameters"]}
+    spec = {"module": "ops", "func": "services", "ttl": 600}
+    assert params["service"]["completer"] == spec
+    assert params["target"]["completer"] == spec
+    assert "completer" not in params["force"]
+
+    # Large modules are sliced; the @completer function must be in a slice.
+    padding = "".join(f"\ndef helper{i}(a, b=None):\n    return [a, b]\n" for i in range(600))
+    sliced = extract_cli_functions(_MODULE + padding, Path("/pkg/ops.py"), Path("/pkg"),
+                                   partial=True)
+    assert sliced == functions
+
+
+@pytest.fixture(scope="module")
+def clichec():
+    from cliche._clichec import ensure_built
+    path = ensure_built()
+    if path is None:
+        pytest.skip("clichec could not be built (no C compiler present)")
+    return str(path)
+
+
+def _complete(argv, env, comp_line, out_file):
+    env = {**env, "_ARGCOMPLETE": "1", "_ARGCOMPLETE_IFS": "\n",
+           "_ARGCOMPLETE_STDOUT_FILENAME": str(out_file),
+           "COMP_LINE": comp_line, "COMP_POINT": str(len(comp_line))}
+    rc = subprocess.run(argv, env=env, capture_output=True, timeout=30).returncode
+    text = out_file.read_text() if out_file.exists() else ""
+    out_file.unlink(missing_ok=True)
+    return rc, sorted(text.split())
+
+
+def test_completions_stored_and_served(tmp_path, clichec):
+    pkg = tmp_path / "src" / PKG
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "ops.py").write_text(_MODULE)
+    (pkg / "api.py").write_text('SERVICES = ["api", "web", "worker"]\n')
+    calls = tmp_path / "calls"
+    env = {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache"), "NO_COLOR": "1",
+           "PYTHONPATH": str(tmp_path / "src"), "CLICHE_NO_FAST_SHIM": "1",
+           "CLICHEC_PROG": "tool", "CALLS_FILE": str(calls)}
+    python = [sys.executable, "-c", "import sys; sys.argv[0] = 'tool'; "
+              f"from cliche.launcher import launch_{PKG}; launch_{PKG}()"]
+    out = tmp_path / "out"
+    subprocess.run(python + ["--help"], env=env, capture_output=True, check=True)
+    cache = next((tmp_path / "cache" / "cliche").glob(f"{PKG}_*.json"))
+    c = [clichec, str(cache), PKG]
+    spec = {"module": f"{PKG}.ops", "func": "services"}
+    assert '"module": "completer_pkg.ops", "func": "services"' in cache.read_text()
+
+    # Nothing stored yet: clichec defers, Python calls the completer.
+    assert _complete(c, env, "tool deploy ", out)[0] == 64
+    rc, words = _complete(python, env, "tool deploy w", out)
+    assert (rc, words) == (0, ["web", "worker"])
+    assert calls.read_text() == "x"
+    assert completions.read(completions.store_path(cache, spec)) == ["api", "web", "worker"]
+
+    # Fresh: clichec serves it, with the flags argparse would offer too.
+    rc, words = _complete(c, env, "tool deploy ", out)
+    assert rc == 0
+    assert {"api", "web", "worker", "--target", "--force"} <= set(words)
+    assert _complete(c, env, "tool deploy api --target w", out) == (0, ["web", "worker"])
+    assert calls.read_text() == "x"
+
+    # Expired: clichec defers again. A failing completer serves the old list.
+    store = completions.store_path(cache, spec)
+    store.write_text("0\n" + store.read_text().split("\n", 1)[1])
+    assert _complete(c, env, "tool deploy ", out)[0] == 64
+    rc, words = _complete(python, {**env, "COMPLETER_FAILS": "1"}, "tool deploy a", out)
+    assert (rc, words) == (0, ["api"])
+    assert completions.read(store) is None
+    assert calls.read_text() == "xx"
+
+    removed = completions.remove(cache)
+    assert store in removed and not store.parent.exists()
@@ -196,6 +196,111 @@ def test_async_function_wrapped_with_asyncio_run(cli_results):
     assert _data(cli_results, "async_run") == {"n": 14}
 
 
+# ---------- streamed results ----------
+
+def test_generator_streams_ndjson(cli_results):
+    p = cli_results["stream_rows"]
+    assert p.returncode == 0, p.stderr
+    assert [json.loads(line) for line in p.stdout.splitlines()] == [
+        {"i": 0, "sq": 0}, {"i": 1, "sq": 1}, {"i": 2, "sq": 4},
+    ]
+
+
+def test_generator_raw_mode_prints_items(cli_results):
+    p = cli_results["stream_rows_raw"]
+    assert p.stdout.splitlines() == ["{'i': 0, 'sq': 0}", "{'i': 1, 'sq': 1}"]
+
+
+def test_async_generator_streams_ndjson(cli_results):
+    p = cli_results["stream_rows_async"]
+    assert p.returncode == 0, p.stderr
+    assert p.stdout.splitlines() == ['{"i":0}', '{"i":1}']
+
+
+# ---------- --output-format ----------
+
+_READINGS = [
+    {"sensor": "s0", "at": "2026-04-22T10:00:00", "color": "red", "source": "/data/0.csv"},
+    {"sensor": "s1", "at": "2026-04-22T10:01:00", "color": "red", "source": "/data/1.csv"},
+]
+
+
+def test_default_json_encodes_dataclasses(cli_results):
+    p = cli_results["fmt_default"]
+    assert json.loads(p.stdout) == _READINGS
+    assert p.stdout.startswith('[\n  {\n    "sensor": "s0",')
+
+
+def test_output_format_compact_and_ndjson(cli_results):
+    assert cli_results["fmt_compact"].stdout.count("\n") == 1
+    assert json.loads(cli_results["fmt_compact"].stdout) == _READINGS
+    lines = cli_results["fmt_ndjson"].stdout.splitlines()
+    assert [json.loads(line) for line in lines] == _READINGS
+
+
+def test_output_format_csv_tsv(cli_results):
+    assert cli_results["fmt_csv"].stdout.splitlines() == [
+        "sensor,at,color,source",
+        "s0,2026-04-22T10:00:00,red,/data/0.csv",
+        "s1,2026-04-22T10:01:00,red,/data/1.csv",
+    ]
+    assert cli_results["fmt_tsv_stream"].stdout.splitlines() == [
+        "i\tsq", "0\t0", "1\t1", "2\t4",
+    ]
+
+
+def test_output_format_json_collects_a_stream(cli_results):
+    p = cli_results["fmt_json_stream"]
+    assert json.loads(p.stdout) == [{"i": 0, "sq": 0}, {"i": 1, "sq": 1}]
+
+
+def test_output_format_unknown_fails_before_running(cli_results):
+    p = cli_results["fmt_unknown"]
+    assert p.returncode == 2
+    assert "unknown output format 'yaml'" in p.stderr
+    assert p.stdout == ""
+
+
+def test_output_format_parameter_is_the_commands_own(cli_results):
+    # A command's own output_format / import_profile take their options;
+    # the globals are then only recognised ahead of the command name.
+    p = cli_results["fmt_own_param"]
+    assert p.returncode == 0, p.stderr
+    assert json.loads(p.stdout) == {"output_format": "csv", "import_profile": "x"}
+    assert "import profile:" not in p.stderr
+    p = cli_results["fmt_own_param_help"]
+    assert p.returncode == 0, p.stderr
+    assert "--output-format" in p.stdout and "--import-profile" in p.stdout
+    p = cli_results["fmt_own_after_global"]
+    assert p.returncode == 0, p.stderr
+    assert p.stdout == '{"output_format":"csv","import_profile":""}\n'
+
+
+# ---------- --import-profile ----------
+
+def test_import_profile_reports_user_imports(cli_results):
+    p = cli_results["import_profile"]
+    assert json.loads(p.stdout)["host"] == "x"
+    assert "import profile:" in p.stderr
+    assert "cliche_test.cli" in p.stderr
+    assert "top 3 by self time:" in p.stderr
+
+
+def test_import_profile_value_as_separate_token(cli_results):
+    # `--import-profile 3` takes the count; before a command name it is bare.
+    p = cli_results["import_profile_space"]
+    assert p.returncode == 0, p.stderr
+    assert json.loads(p.stdout)["host"] == "x"
+    assert "top 3 by self time:" in p.stderr
+    p = cli_results["import_profile_bare"]
+    assert p.returncode == 0, p.stderr
+    assert "top 20 by self time:" in p.stderr
+    # After the command name, the command's parser reads it.
+    p = cli_results["import_profile_after"]
+    assert p.returncode == 0, p.stderr
+    assert "top 2 by self time:" in p.stderr
+
+
 # ---------- global flags: --raw ----------
 
 def test_raw_mode_plain_print(cli_results):
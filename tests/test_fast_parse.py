@@ -0,0 +1,206 @@
+"""Tests for parse plans (cliche/fast_parse.py).
+
+Contracts:
+    - the scan stores a plan for signatures of primitives, Path, dates,
+      bools, enums and their collections, and none for dicts, lazy
+      defaults or parameters that clash with cliche's own options
+    - wherever a plan parses an argv, the command's argparse parser parses
+      it to the same values; wherever argparse exits (help, errors), and on
+      anything the plan doesn't handle, the plan gives up
+    - argparse isn't imported to run a command the plan parses, nor by
+      `import cliche.run`, whose moved parser classes stay importable
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from cliche import fast_parse
+from cliche.main import extract_cli_functions, extract_python_enums
+from cliche.run import build_parser_for_function
+
+_MODULE = '''\
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+from cliche import cli
+
+
+class Color(Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+@cli
+def mixed(name: str, count: int = 1, ratio: float = 0.5, out: Path = Path("/tmp"),
+          verbose: bool = False, cache: bool = True, when: date = "2024-01-02"):
+    pass
+
+
+@cli
+def many(first: int, rest: list[float], tags: tuple[str, ...] = ("a", "b"),
+         at: Optional[datetime] = None, nums: set[int] = None):
+    pass
+
+
+@cli
+def colors(color: Color, more: list[Color] = [], fallback: Color = Color.RED):
+    pass
+
+
+@cli
+def leading_variadic(paths: tuple[Path, ...], target: str):
+    pass
+
+
+@cli
+def custom(port: Port):
+    pass
+
+
+@cli
+def bad_default(n: int = compute()):
+    pass
+
+
+@cli
+def mapping(tags: dict[str, int] = {}):
+    pass
+
+
+@cli
+def clashes(raw: bool = False):
+    pass
+'''
+
+_ENUMS = extract_python_enums(_MODULE)
+
+_GLOBALS = {"llm_help", "pdb", "pyspy", "raw", "output_format", "full_traceback",
+            "timing", "import_profile"}
+
+
+@pytest.fixture(scope="module")
+def functions():
+    found = extract_cli_functions(_MODULE, Path("/pkg/cmds.py"), Path("/pkg"))
+    return {f["name"]: dict(f, cli_name=f["name"].replace("_", "-")) for f in found}
+
+
+def _argparse(func, argv):
+    parser = build_parser_for_function(func, _ENUMS, prog_name="tool", pydantic_models=set())
+    try:
+        parsed = parser.parse_args(argv)
+    except SystemExit:
+        return None
+    return {k: v for k, v in vars(parsed).items() if k not in _GLOBALS}
+
+
+def test_plans_stored_for_simple_signatures(functions):
+    for name in ("mixed", "many", "colors", "leading_variadic", "custom", "bad_default"):
+        assert "parse_plan" in functions[name], name
+    for name in ("mapping", "clashes"):
+        assert "parse_plan" not in functions[name], name
+    plan = {e["dest"]: e for e in functions["mixed"]["parse_plan"]}
+    assert plan["count"] == {"dest": "count", "type": "int", "opts": ["-c", "--count"],
+                             "nargs": 1, "default": 1}
+    assert plan["cache"] == {"dest": "cache", "opts": ["--no-cache"], "nargs": 0,
+                             "const": False, "default": True}
+    assert plan["name"] == {"dest": "name", "type": "str", "nargs": 1}
+    assert {e["dest"]: e.get("enum") for e in functions["colors"]["parse_plan"]} == {
+        "color": "Color", "more": "list[Color]", "fallback": "Color"}
+
+
+# (function, argv, whether the plan takes it)
+_CASES = [
+    ("mixed", ["bob"], True),
+    ("mixed", ["bob", "-c", "3", "--ratio", "-1.5", "--verbose", "--no-cache"], True),
+    ("mixed", ["--count=4", "bob", "-v", "--out", "rel/dir", "--when", "2020-02-29"], True),
+    ("mixed", ["-c", "-7", "bob", "-c", "8"], True),
+    ("mixed", ["-"], True),
+    ("mixed", ["bob", "--when", "2023-02-29"], False),
+    ("mixed", ["bob", "-c", "x"], False),
+    ("mixed", ["bob", "-c"], False),
+    ("mixed", ["bob", "extra"], False),
+    ("mixed", [], False),
+    ("mixed", ["bob", "--cou", "2"], False),
+    ("mixed", ["bob", "-c3"], False),
+    ("mixed", ["bob", "--verbose=yes"], False),
+    ("mixed", ["bob", "-h"], False),
+    ("mixed", ["bob", "--raw"], False),
+    ("mixed", ["--", "bob"], False),
+    ("mixed", ["-x"], False),
+    ("many", ["1", "2.5", "3"], True),
+    ("many", ["1", "2", "--tags", "x", "y", "--at", "2024-05-01T10:00", "--nums", "3", "3"], True),
+    ("many", ["1", "--tags", "2"], False),
+    ("many", ["1", "2", "-t", "--nums", "4"], True),
+    ("many", ["1", "-t", "--nums", "4"], False),
+    ("many", ["1", "2", "--tags", "x", "3"], True),
+    ("many", ["1", "2", "--at", "2024-01-01", "6"], False),
+    ("many", ["1", "--tags", "x", "2", "3"], False),
+    ("many", ["1", "--nums", "4", "--", "2"], False),
+    ("many", ["1"], False),
+    ("many", ["1", "two"], False),
+    ("colors", ["RED"], True),
+    ("colors", ["GREEN", "--more", "RED", "GREEN", "-f", "GREEN"], True),
+    ("colors", ["BLUE"], False),
+    ("colors", ["RED", "--more", "RED", "PINK"], False),
+    ("leading_variadic", ["a", "b", "c"], True),
+    ("leading_variadic", ["a"], False),
+    ("bad_default", [], False),
+    ("bad_default", ["-n", "2"], True),
+]
+
+
+@pytest.mark.parametrize("name,argv,taken", _CASES)
+def test_plan_matches_argparse(functions, name, argv, taken):
+    func = functions[name]
+    parsed = fast_parse.parse(func["parse_plan"], argv, _ENUMS)
+    assert (parsed is not None) == taken
+    if taken:
+        expected = _argparse(func, argv)
+        assert vars(parsed) == expected
+        assert all(type(vars(parsed)[k]) is type(v) for k, v in expected.items())
+
+
+def test_plan_gives_up_on_unresolved_annotations(functions):
+    # `Port` isn't an enum: a custom type callable, converted by argparse.
+    assert fast_parse.parse(functions["custom"]["parse_plan"], ["80"], _ENUMS) is None
+    # An enum name the pydantic gate flags goes through argparse too.
+    plan = functions["colors"]["parse_plan"]
+    assert fast_parse.parse(plan, ["RED"], _ENUMS, {"Color"}) is None
+
+
+def test_dispatch_skips_argparse(tmp_path):
+    pkg = tmp_path / "src" / "plan_pkg"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cmds.py").write_text(
+        "import sys\nfrom cliche import cli\n\n"
+        "@cli\ndef add(a: int, b: int = 2):\n"
+        "    return {'sum': a + b, 'argparse': 'argparse' in sys.modules}\n")
+    env = {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache"), "NO_COLOR": "1",
+           "PYTHONPATH": str(tmp_path / "src"), "CLICHE_NO_FAST_SHIM": "1"}
+    python = [sys.executable, "-c", "import sys; sys.argv[0] = 'tool'; "
+              "from cliche.launcher import launch_plan_pkg; launch_plan_pkg()"]
+    # The first run scans (and the scan imports argparse); the second doesn't.
+    subprocess.run(python + ["add", "1"], env=env, capture_output=True, check=True)
+    out = subprocess.run(python + ["add", "1", "-b", "5"], env=env, capture_output=True,
+                         text=True, check=True).stdout
+    assert '"sum": 6' in out and '"argparse": false' in out
+    err = subprocess.run(python + ["add", "x"], env=env, capture_output=True, text=True)
+    assert err.returncode == 2 and "invalid int value: 'x'" in err.stderr
+
+
+def test_moved_parser_classes_still_importable_from_run():
+    code = ("import sys, cliche.run as run\n"
+            "assert 'argparse' not in sys.modules\n"
+            "from cliche.run import _DictAction, CleanArgumentParser, CleanHelpFormatter\n"
+            "from cliche import argparser\n"
+            "assert _DictAction is argparser._DictAction\n"
+            "assert CleanArgumentParser is argparser.CleanArgumentParser\n")
+    subprocess.run([sys.executable, "-c", code], check=True)
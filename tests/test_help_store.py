@@ -0,0 +1,187 @@
+"""Tests for the pre-rendered help store (cliche/help_store.py).
+
+Contracts:
+    - every stored text is byte-identical to what run.py renders live, in
+      both the plain and the coloured variant
+    - lookups miss (so callers render live) for another program name, a
+      different terminal width, a JSON rewritten behind the store's back, and
+      pydantic models the scanner couldn't read field by field
+    - re-rendering reuses entries whose inputs didn't change, and the inline
+      render limit leaves the remainder pending
+    - clichec writes the same bytes Python does
+
+Same throwaway-package setup as test_cache_index.
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from cliche import help_store
+
+PKG_NAME = "cliche_help_store_pkg"
+PROG = "hs"
+
+_CLI_SRC = (
+    "from enum import Enum\n"
+    "from pydantic import BaseModel\n"
+    "from cliche import cli\n"
+    "\n"
+    "class Color(Enum):\n"
+    "    RED = 'red'\n"
+    "    GREEN = 'green'\n"
+    "\n"
+    "class Cfg(BaseModel):\n"
+    "    depth: int = 1\n"
+    "\n"
+    "class Opts(BaseModel):\n"
+    "    tags: list[str] = []\n"
+    "\n"
+    "@cli\n"
+    "def paint(target: str, color: Color = Color.RED, coats: int = 2, dry_run: bool = False):\n"
+    '    """Paint something.\n\n    :param coats: how many coats — at least one\n    """\n'
+    "\n"
+    "@cli\n"
+    "def configure(cfg: Cfg):\n"
+    '    """Configure from a model."""\n'
+    "\n"
+    "@cli\n"
+    "def tune(opts: Opts):\n"
+    '    """Tune from a model."""\n'
+    "\n"
+    "@cli('data')\n"
+    "def export_rows(path: str, limit: int = 10):\n"
+    '    """Export rows."""\n'
+)
+
+_ARGVS = [
+    [],
+    ["--help"],
+    ["paint", "--help"],
+    ["paint", "--llm-help"],
+    ["configure", "--help"],
+    ["data"],
+    ["data", "--help"],
+    ["data", "export-rows", "--help"],
+    ["data", "export_rows", "--llm-help"],
+]
+
+# argv[0] is the program name run.main and the store key off. With
+# HS_LIVE set, stored lookups are disabled so run.py renders everything.
+_LAUNCHER = (
+    "import os\n"
+    "import cliche.run\n"
+    "if os.environ.get('HS_LIVE'):\n"
+    "    cliche.run._print_stored_help = lambda *a: False\n"
+    "from cliche.runtime import run_package_cli\n"
+    f"run_package_cli({PKG_NAME!r})\n"
+)
+
+
+@pytest.fixture
+def store_env(tmp_path):
+    src = tmp_path / "src"
+    pkg = src / PKG_NAME
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cli.py").write_text(_CLI_SRC)
+    (pkg / "pyproject.toml").write_text(
+        '[project]\nname = "hs"\ndescription = "Help store test CLI"\n')
+    launcher = tmp_path / PROG
+    launcher.write_text(_LAUNCHER)
+    env = {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache"),
+           "PYTHONPATH": str(src), "COLUMNS": "80"}
+    for var in ("NO_COLOR", "FORCE_COLOR", "HS_LIVE"):
+        env.pop(var, None)
+
+    def run(argv, **extra):
+        r = subprocess.run([sys.executable, str(launcher), *argv],
+                           env={**env, **extra}, capture_output=True, text=True)
+        return r.returncode, r.stdout, r.stderr
+
+    run(["--help"])  # first run writes the cache and the store
+    cache_files = list((tmp_path / "cache" / "cliche").glob(f"{PKG_NAME}_*.json"))
+    assert len(cache_files) == 1
+    return {"pkg": pkg, "run": run, "env": env, "cache_file": cache_files[0]}
+
+
+def test_stored_texts_match_live_rendering(store_env):
+    run = store_env["run"]
+    for color in ({}, {"FORCE_COLOR": "1"}):
+        for argv in _ARGVS:
+            stored = run(argv, **color)
+            live = run(argv, HS_LIVE="1", **color)
+            assert stored == live, argv
+            assert stored[0] == 0 and stored[1], argv
+    assert "\033[" in run(["paint", "--help"], FORCE_COLOR="1")[1]
+
+
+def test_lookup_misses(store_env):
+    cache_file = store_env["cache_file"]
+    hit = help_store.lookup(cache_file, "help", "", "paint", PROG, columns=80)
+    assert hit and "--coats" in hit
+    assert help_store.lookup(cache_file, "help", "", "paint", "other", columns=80) is None
+    assert help_store.lookup(cache_file, "help", "", "paint", PROG, columns=120) is None
+    # Width only matters for argparse output.
+    assert help_store.lookup(cache_file, "llm", "", "paint", PROG, columns=120)
+
+    # Fields the scanner read statically expand without the user module;
+    # anything else needs it: llm-help only.
+    assert "--depth" in help_store.lookup(cache_file, "help", "", "configure", PROG, columns=80)
+    assert help_store.lookup(cache_file, "help", "", "tune", PROG, columns=80) is None
+    assert help_store.lookup(cache_file, "llm", "", "tune", PROG)
+
+    later = os.stat(cache_file).st_mtime + 5
+    os.utime(cache_file, (later, later))
+    assert help_store.lookup(cache_file, "top", "", "", PROG) is None
+    assert help_store.needs_refresh(cache_file, PROG)
+
+
+def test_rerender_reuses_entries_and_honours_limit(store_env):
+    with open(store_env["cache_file"]) as f:
+        cache = json.load(f)
+    entries, pending = help_store.render_entries(cache, PROG, limit=0)
+    assert pending == 3  # paint, configure and export-rows; tune is never rendered
+    assert help_store.make_key("help", "", "paint") not in entries
+    assert help_store.make_key("llm", "", "paint") in entries
+
+    full, pending = help_store.render_entries(cache, PROG)
+    assert pending == 0
+
+    # A changed signature invalidates that command's entries only.
+    for fn in cache["files"]["cli.py"]["functions"]:
+        if fn["name"] == "export_rows":
+            fn["docstring"] = "Export rows, faster."
+    entries, pending = help_store.render_entries(cache, PROG, old=full, limit=0)
+    assert pending == 1
+    assert entries[help_store.make_key("help", "", "paint")] == full[help_store.make_key("help", "", "paint")]
+    assert b"faster" in entries[help_store.make_key("llm", "data", "export-rows")][1]
+
+
+def test_clichec_serves_stored_bytes(store_env, _background_warmups):
+    clichec = _background_warmups["clichec"].result()
+    if not clichec:
+        pytest.skip("clichec could not be built (no C compiler present)")
+    cache_file = str(store_env["cache_file"])
+    env = {**store_env["env"], "CLICHEC_PROG": PROG, "CLICHEC_DEBUG": "1"}
+
+    def clichec_run(argv, **extra):
+        return subprocess.run([clichec, cache_file, PKG_NAME, *argv],
+                              env={**env, **extra}, capture_output=True, text=True)
+
+    for color in ({}, {"FORCE_COLOR": "1"}):
+        for argv in _ARGVS:
+            r = clichec_run(argv, **color)
+            assert r.returncode == 0, (argv, r.stderr)
+            assert "help store unusable" not in r.stderr
+            assert r.stdout == store_env["run"](argv, **color)[1], argv
+
+    # Another width: clichec's own renderer, not the stored 80-column text.
+    r = clichec_run(["paint", "--help"], COLUMNS="120")
+    assert r.returncode == 0
+    assert "help store unusable (terminal width differs)" in r.stderr
+    assert "--coats" in r.stdout
@@ -0,0 +1,70 @@
+"""Tests for `--import-profile` (cliche/import_profile.py).
+
+Contracts:
+    - each module imported while the finder is installed is a node under
+      the module whose execution imported it, with self time excluding
+      its children
+    - loaders are left as they were found
+    - the tree renders as a report, speedscope events and folded stacks
+"""
+from __future__ import annotations
+
+import json
+import sys
+
+import pytest
+
+from cliche import import_profile
+
+
+@pytest.fixture
+def pkg(tmp_path, monkeypatch):
+    root = tmp_path / "iprof_pkg"
+    root.mkdir()
+    (root / "__init__.py").write_text("from iprof_pkg import heavy, light\n")
+    (root / "heavy.py").write_text("import time\ntime.sleep(0.05)\nfrom iprof_pkg import leaf\n")
+    (root / "light.py").write_text("X = 1\n")
+    (root / "leaf.py").write_text("import time\ntime.sleep(0.02)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield
+    for name in [m for m in sys.modules if m.startswith("iprof_pkg")]:
+        del sys.modules[name]
+
+
+def test_tree_and_times(pkg):
+    import_profile.install()
+    try:
+        import iprof_pkg  # noqa: F401
+    finally:
+        roots = import_profile.uninstall()
+
+    (top,) = [r for r in roots if r.name == "iprof_pkg"]
+    assert [c.name for c in top.children] == ["iprof_pkg.heavy", "iprof_pkg.light"]
+    heavy = top.children[0]
+    assert [c.name for c in heavy.children] == ["iprof_pkg.leaf"]
+    assert heavy.cumulative >= 0.07 and 0.05 <= heavy.self_time < heavy.cumulative
+    assert top.self_time < 0.02
+    assert "exec_module" not in vars(sys.modules["iprof_pkg.heavy"].__loader__)
+
+    report = import_profile.format_report(roots, top=2)
+    assert report.splitlines()[-2].endswith("iprof_pkg.heavy")
+    assert "      iprof_pkg.leaf" in report
+
+
+def test_file_formats(pkg, tmp_path):
+    import_profile.install()
+    import iprof_pkg  # noqa: F401
+    import_profile.report(str(tmp_path / "p.folded"))
+    folded = (tmp_path / "p.folded").read_text().splitlines()
+    assert any(line.startswith("iprof_pkg;iprof_pkg.heavy;iprof_pkg.leaf ") for line in folded)
+
+    for name in [m for m in sys.modules if m.startswith("iprof_pkg")]:
+        del sys.modules[name]
+    import_profile.install()
+    import iprof_pkg  # noqa: F401,F811
+    import_profile.report(str(tmp_path / "p.json"))
+    profile = json.loads((tmp_path / "p.json").read_text())["profiles"][0]
+    opens = [e for e in profile["events"] if e["type"] == "O"]
+    closes = [e for e in profile["events"] if e["type"] == "C"]
+    assert len(opens) == len(closes) >= 4
+    assert all(a["at"] <= b["at"] for a, b in zip(profile["events"], profile["events"][1:]))
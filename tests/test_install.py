@@ -157,7 +157,9 @@ class TestToolInstallProbe:
         with mock.patch.object(install_mod.subprocess, "run", side_effect=fake_run), \
              mock.patch.object(install_mod.shutil, "which", side_effect=fake_which), \
              mock.patch.object(install_mod, "_existing_entry_point", return_value=None), \
-             mock.patch.object(install_mod, "_cliche_source_dir", return_value=None):
+             mock.patch.object(install_mod, "_cliche_source_dir", return_value=None), \
+             mock.patch.dict(install_mod.os.environ,
+                             {"XDG_CACHE_HOME": str(pkg_dir.parent / "cache")}):
             install(
                 binary_name, module_dir=str(pkg_dir),
                 package_name=pkg_dir.name, tool=tool, no_autocomplete=True,
@@ -368,3 +370,142 @@ class TestSingleCommandDispatch:
             f"explicit subcommand failed:\nstdout: {r.stdout}\nstderr: {r.stderr}"
         )
         assert r.stdout.strip() == "hi alice"
+
+
+class TestAutocompleteHooks:
+    """Completion hooks in shell rc files: one self-contained line per shell
+    and binary, replacing older `register-python-argcomplete` lines, and
+    taken out again on uninstall."""
+
+    @pytest.fixture
+    def home(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        (tmp_path / ".config" / "fish").mkdir(parents=True)
+        (tmp_path / ".config" / "fish" / "config.fish").write_text("set -x EDITOR vim\n")
+        (tmp_path / ".zshrc").write_text(
+            "autoload -Uz compinit && compinit\n"
+            "# cliche autocompletes\n"
+            "command -v register-python-argcomplete >/dev/null && "
+            'eval "$(register-python-argcomplete mytool 2>/dev/null)"'
+            "  # cliche: autocomplete for mytool\n"
+        )
+        return tmp_path
+
+    def test_register_replaces_legacy_and_is_idempotent(self, home):
+        touched = install_mod._register_autocomplete("mytool")
+        assert sorted(touched) == sorted([str(home / ".zshrc"),
+                                          str(home / ".config/fish/config.fish")])
+        zshrc = (home / ".zshrc").read_text()
+        assert "register-python-argcomplete" not in zshrc
+        assert zshrc.count("# cliche autocompletes") == 1
+        assert "compdef _cliche_complete mytool; }  # cliche: autocomplete for mytool\n" in zshrc
+        fish = (home / ".config/fish/config.fish").read_text()
+        assert fish.startswith("set -x EDITOR vim\n# cliche autocompletes\n")
+        assert "complete -c mytool -f -a '(__cliche_complete mytool)'" in fish
+        assert not (home / ".bashrc").exists()
+        assert install_mod._register_autocomplete("mytool") == []
+
+    def test_unregister_leaves_other_binaries(self, home):
+        install_mod._register_autocomplete("mytool")
+        install_mod._register_autocomplete("mytool2")
+        install_mod._unregister_autocomplete("mytool")
+        zshrc = (home / ".zshrc").read_text()
+        assert "autocomplete for mytool\n" not in zshrc
+        assert "autocomplete for mytool2\n" in zshrc
+        install_mod._unregister_autocomplete("mytool2")
+        assert (home / ".zshrc").read_text() == "autoload -Uz compinit && compinit\n"
+        assert (home / ".config/fish/config.fish").read_text() == "set -x EDITOR vim\n"
+
+
+class TestInstallNoOp:
+    """A repeated `cliche install` skips pip while its fingerprint (config
+    files, entry target, interpreter, mode) matches the last install and the
+    registry still has the CLI from this directory; `--from` installs a
+    manifest's CLIs with one resolver run and one autocomplete pass."""
+
+    @pytest.fixture
+    def env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.setenv("CLICHE_NO_FAST_SHIM", "1")
+        (tmp_path / ".bashrc").write_text("")
+        calls: list[list[str]] = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(list(cmd))
+            return subprocess.CompletedProcess(cmd, returncode=0, stdout="", stderr="")
+
+        def fake_which(name):
+            return "/usr/local/bin/uv" if name == "uv" else f"/home/test/.local/bin/{name}"
+
+        with mock.patch.object(install_mod.subprocess, "run", side_effect=fake_run), \
+             mock.patch.object(install_mod.shutil, "which", side_effect=fake_which), \
+             mock.patch.object(install_mod, "_existing_entry_point", return_value=None), \
+             mock.patch.object(install_mod, "_cliche_source_dir", return_value=None), \
+             mock.patch.object(install_mod, "_warm_bytecode", return_value=0):
+            yield tmp_path, calls
+
+    def _pkg(self, root, name):
+        pkg = root / name
+        pkg.mkdir()
+        (pkg / "ops.py").write_text("from cliche import cli\n@cli\ndef hello():\n    pass\n")
+        return pkg
+
+    @staticmethod
+    def _pip_calls(calls):
+        return [c for c in calls if c[1:3] == ["pip", "install"] or c[1:3] == ["tool", "install"]]
+
+    def test_repeat_install_skips_pip(self, env):
+        root, calls = env
+        pkg = self._pkg(root, "noop_pkg")
+        row = {"binary": "noopbin", "pkg": "noop_pkg", "mode": "edit",
+               "source_dir": str(pkg), "pkg_dir": str(pkg)}
+        with mock.patch("cliche.registry.installs", return_value=[row]):
+            install("noopbin", module_dir=str(pkg), no_autocomplete=True)
+            assert len(self._pip_calls(calls)) == 1
+            mtime = (pkg / "pyproject.toml").stat().st_mtime_ns
+            install("noopbin", module_dir=str(pkg), no_autocomplete=True)
+            assert len(self._pip_calls(calls)) == 1
+            assert (pkg / "pyproject.toml").stat().st_mtime_ns == mtime
+            install("noopbin", module_dir=str(pkg), no_autocomplete=True, force=True)
+            assert len(self._pip_calls(calls)) == 2
+
+            (pkg / "pyproject.toml").write_text(
+                (pkg / "pyproject.toml").read_text().replace("0.1.0", "0.2.0"))
+            install("noopbin", module_dir=str(pkg), no_autocomplete=True)
+            assert len(self._pip_calls(calls)) == 3
+        # Gone from the registry (uninstalled behind cliche's back): reinstall.
+        with mock.patch("cliche.registry.installs", return_value=[]):
+            install("noopbin", module_dir=str(pkg), no_autocomplete=True)
+        assert len(self._pip_calls(calls)) == 4
+
+    def test_install_from_manifest(self, env):
+        root, calls = env
+        self._pkg(root, "man_a")
+        self._pkg(root, "man_b")
+        self._pkg(root, "man_c")
+        manifest = root / "clis.toml"
+        manifest.write_text(
+            '[[cli]]\nname = "mana"\ndir = "man_a"\n\n'
+            '[[cli]]\nname = "manb"\ndir = "man_b"\n\n'
+            '[[cli]]\nname = "manc"\ndir = "man_c"\ntool = true\n'
+        )
+        assert install_mod.install_from_manifest(str(manifest)) == 0
+        pip_calls = self._pip_calls(calls)
+        assert [c[1:3] for c in pip_calls] == [["tool", "install"], ["pip", "install"]]
+        assert pip_calls[0][-1] == str(root / "man_c")
+        assert pip_calls[1][-4:] == ["-e", str(root / "man_a"), "-e", str(root / "man_b")]
+        bashrc = (root / ".bashrc").read_text()
+        assert all(f"autocomplete for {n}\n" in bashrc for n in ("mana", "manb", "manc"))
+        assert bashrc.count("# cliche autocompletes") == 1
+
+    def test_manifest_errors_before_installing(self, env):
+        root, calls = env
+        manifest = root / "clis.toml"
+        manifest.write_text('[[cli]]\nname = "x"\ndir = "a"\n\n[[cli]]\nname = "x"\ndir = "b"\n')
+        with pytest.raises(SystemExit):
+            install_mod.install_from_manifest(str(manifest))
+        manifest.write_text('[[cli]]\nname = "x"\npath = "a"\n')
+        with pytest.raises(SystemExit):
+            install_mod.install_from_manifest(str(manifest))
+        assert calls == []
@@ -0,0 +1,133 @@
+"""Tests for the content-addressed parse store (cliche/objects.py).
+
+Contracts:
+    - a file whose bytes were parsed before is served from the store, under
+      any path: an mtime-only touch and a package moved to a new directory
+      both skip the parse and give the same cache entries, with `module`,
+      `file_path` and a completer's `module` re-derived from where the file
+      lives now
+    - an edit to an extractor source (fast_parse.py included) changes the keys
+    - files that fail to parse are never stored
+    - `gc` evicts least-recently-used records first, down to the limit
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import time
+
+import pytest
+
+from cliche import objects
+from cliche.runtime import _get_cache_path, _scan_and_cache
+
+_SRC = (
+    "from enum import Enum\n"
+    "from cliche import cli, completer\n"
+    "\n"
+    "class Color(Enum):\n"
+    "    RED = 'red'\n"
+    "\n"
+    "@completer('times')\n"
+    "def counts():\n"
+    "    return ['1', '2']\n"
+    "\n"
+    "@cli\n"
+    "def paint(color: Color = Color.RED, times: int = 2):\n"
+    '    """Paint something."""\n'
+)
+
+
+@pytest.fixture
+def cache_home(tmp_path, monkeypatch):
+    home = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(home))
+    return home
+
+
+def _scan(pkg_dir, capsys):
+    capsys.readouterr()
+    cache = _scan_and_cache(pkg_dir, _get_cache_path("objpkg", pkg_dir), "objpkg",
+                            show_timing=True)
+    return cache, capsys.readouterr().err
+
+
+def _functions(cache):
+    return {rel: info["functions"] for rel, info in cache["files"].items()}
+
+
+def test_store_serves_touched_and_moved_files(tmp_path, cache_home, capsys):
+    pkg = tmp_path / "a" / "objpkg"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cmds.py").write_text(_SRC)
+
+    first, err = _scan(pkg, capsys)
+    assert "0 stored, 1 parsed" in err
+    assert any(objects.objects_dir().rglob("*.json"))
+
+    # Same bytes, new mtime: the per-package cache rescans, the store answers.
+    later = time.time() + 5
+    os.utime(pkg / "cmds.py", (later, later))
+    touched, err = _scan(pkg, capsys)
+    assert "1 stored, 0 parsed" in err
+    assert _functions(touched) == _functions(first)
+
+    # Same bytes at a new path: a fresh cache, but still no parse.
+    moved = tmp_path / "b" / "objpkg"
+    shutil.copytree(pkg, moved)
+    elsewhere, err = _scan(moved, capsys)
+    assert "1 stored, 0 parsed" in err
+    (fn,) = elsewhere["files"]["cmds.py"]["functions"]
+    assert fn["file_path"] == str(moved / "cmds.py")
+    assert fn["module"] == "objpkg.cmds"
+    assert fn["name"] == "paint"
+    assert fn["parameters"] == first["files"]["cmds.py"]["functions"][0]["parameters"]
+    times = next(p for p in fn["parameters"] if p["name"] == "times")
+    assert times["completer"] == {"module": "objpkg.cmds", "func": "counts"}
+    (record,) = objects.objects_dir().rglob("*.json")
+    assert '"completer":{"func":"counts"}' in record.read_text()
+
+
+def test_syntax_errors_are_not_stored(tmp_path, cache_home, capsys):
+    pkg = tmp_path / "objpkg"
+    pkg.mkdir()
+    (pkg / "bad.py").write_text("from cliche import cli\n@cli\ndef f(:\n    pass\n")
+    _scan(pkg, capsys)
+    assert not any(objects.objects_dir().rglob("*.json"))
+
+
+def test_gc_evicts_least_recently_used(cache_home):
+    keys = [objects.digest(f"file {i}".encode()) for i in range(6)]
+    for i, key in enumerate(keys):
+        objects.save(key, {"functions": [], "enums": {}, "pydantic_models": [], "pad": "x" * 100})
+        path = objects._record_path(key)
+        os.utime(path, (1000 + i, 1000 + i))
+    # Reading the oldest makes it the most recently used.
+    assert objects.load(keys[0]) is not None
+    size = objects._record_path(keys[0]).stat().st_size
+
+    removed, freed, kept, kept_bytes = objects.gc(limit=3 * size)
+    assert (removed, kept) == (3, 3)
+    assert freed == kept_bytes == 3 * size
+    survivors = [key for key in keys if objects.load(key) is not None]
+    assert survivors == [keys[0], keys[4], keys[5]]
+
+    assert objects.gc(limit=0)[:3] == (3, 3 * size, 0)
+    assert not any(objects.objects_dir().rglob("*.json"))
+
+
+def test_extractor_sources_salt_the_keys(monkeypatch):
+    monkeypatch.setattr(objects, "_salt", None)
+    key = objects.digest(b"x")
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        st = real_stat(path, *args, **kwargs)
+        if str(path).endswith("fast_parse.py"):
+            return os.stat_result(tuple(st), {"st_mtime_ns": st.st_mtime_ns + 1})
+        return st
+
+    monkeypatch.setattr(os, "stat", stat)
+    monkeypatch.setattr(objects, "_salt", None)
+    assert objects.digest(b"x") != key
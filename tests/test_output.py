@@ -0,0 +1,128 @@
+"""Tests for the --output-format serializers (cliche/output.py).
+
+Contracts:
+    - the default json output is byte-identical to
+      `json.dumps(result, indent=2)` with either encoder, lists included
+      although they are written item by item; orjson's output is only used
+      where it provably matches (ASCII, finite floats spelled like repr)
+    - dataclasses, enums, dates, paths, sets and `tolist()` values encode
+    - csv takes its header from every record of a list, but from the first
+      record of a stream, and rejects later records with other fields
+    - `register` adds a format; a format whose module is missing fails in
+      `resolve`, before the command runs
+"""
+from __future__ import annotations
+
+import io
+import json
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+from pathlib import Path
+
+import pytest
+
+from cliche import output
+
+
+class _Stdout(io.TextIOWrapper):
+    def __init__(self):
+        super().__init__(io.BytesIO(), encoding="utf-8")
+
+    def text(self) -> str:
+        self.flush()
+        return self.buffer.getvalue().decode()
+
+
+def _emit(monkeypatch, result, fmt=None) -> str:
+    out = _Stdout()
+    monkeypatch.setattr(output.sys, "stdout", out)
+    output.emit(result, fmt)
+    return out.text()
+
+
+@pytest.mark.parametrize("orjson", [True, False])
+def test_json_matches_json_dumps(monkeypatch, orjson):
+    if not orjson:
+        monkeypatch.setattr(output, "_orjson", False)
+    result = [{"a": 1, "b": [1, 2, {"c": None}]}, [], {}, "é", 2 ** 70, 1.5]
+    expected = json.dumps(result, indent=2) + "\n"
+    assert _emit(monkeypatch, result) == expected
+    assert _emit(monkeypatch, []) == "[]\n"
+    assert _emit(monkeypatch, {"k": (1, 2)}) == json.dumps({"k": [1, 2]}, indent=2) + "\n"
+
+
+_TRICKY = [
+    {"s": "café", "n": float("nan")},
+    {"inf": [float("inf"), -float("inf")], "none": None},
+    [1e20, 1e-05, 0.1, -0.0, 123456789.123, 1e16, 2.5e-300],
+    {"del": "\x7f", "ctl": "\x1f\n\t", "sep": "\u2028", "quote": '"\\'},
+    {1: "int key", 1.5: "float key", None: "null key"},
+    {"big": 2 ** 70, "nested": {"a": [], "b": {}, "c": [[{}]]}},
+    "a plain string",
+]
+
+
+@pytest.mark.parametrize("indent", [True, False])
+def test_encoders_agree(monkeypatch, indent):
+    pytest.importorskip("orjson")
+    for payload in _TRICKY:
+        with_orjson = output._encode(payload, indent)
+        monkeypatch.setattr(output, "_orjson", False)
+        without = output._encode(payload, indent)
+        monkeypatch.undo()
+        assert with_orjson == without, payload
+        if indent:
+            assert without == json.dumps(payload, indent=2).encode(), payload
+
+
+class _Shade(Enum):
+    DARK = "dark"
+
+
+@dataclass
+class _Row:
+    day: date
+    shade: _Shade
+    path: Path
+    tags: frozenset
+
+
+class _Array:
+    def tolist(self):
+        return [1, 2]
+
+
+def test_rich_values_encode(monkeypatch):
+    row = _Row(date(2026, 1, 2), _Shade.DARK, Path("/tmp/x"), frozenset({"a"}))
+    text = _emit(monkeypatch, {"row": row, "arr": _Array()}, "json-compact")
+    assert json.loads(text) == {
+        "row": {"day": "2026-01-02", "shade": "dark", "path": "/tmp/x", "tags": ["a"]},
+        "arr": [1, 2],
+    }
+    # Neither encoder knows it: printed with str(), as before.
+    assert _emit(monkeypatch, object(), "json").startswith("<object object at")
+
+
+def test_csv_headers(monkeypatch):
+    rows = [{"a": 1}, {"b": "x,y", "a": None}, {"a": [1]}]
+    assert _emit(monkeypatch, rows, "csv").splitlines() == [
+        "a,b", "1,", ',"x,y"', '[1],',
+    ]
+    with pytest.raises(output.OutputFormatError, match="missing from the header"):
+        _emit(monkeypatch, iter(rows), "csv")
+
+
+def test_register_and_resolve(monkeypatch):
+    monkeypatch.setattr(output, "_FORMATS", dict(output._FORMATS))
+
+    @output.register("upper")
+    def write_upper(result, sink):
+        sink.write(str(result).upper().encode() + b"\n")
+
+    assert _emit(monkeypatch, "hi", "upper") == "HI\n"
+    output.register("needs-missing", requires="no_such_module_xyz")(write_upper)
+    with pytest.raises(output.OutputFormatError, match="pip install no_such_module_xyz"):
+        output.resolve("needs-missing")
+    with pytest.raises(output.OutputFormatError, match="unknown output format"):
+        output.resolve("nope")
@@ -0,0 +1,228 @@
+"""Tests for partial AST parsing (cliche/partial_parse.py).
+
+Contracts:
+    - on any source, the sliced tree gives extract_cli_functions,
+      extract_python_enums, extract_pydantic_models and
+      extract_pydantic_schemas exactly what the full tree gives: same
+      functions (order, parameters, resolved constant defaults, docstrings,
+      byte offsets), same enums, same pydantic models and field schemas
+    - text that only looks like code (inside docstrings, multi-line strings,
+      brackets, backslash continuations) never becomes a slice
+    - statements nobody reads are not parsed
+    - anything the lexer can't vouch for falls back to a full parse
+"""
+from __future__ import annotations
+
+import ast
+import json
+from pathlib import Path
+
+import pytest
+
+from cliche import partial_parse
+from cliche.main import (
+    extract_cli_functions,
+    extract_pydantic_models,
+    extract_pydantic_schemas,
+    extract_python_enums,
+)
+
+_SOURCES = {
+    "basic": (
+        '"""Module docstring."""\n'
+        "from enum import Enum\n"
+        "from cliche import cli\n"
+        "\n"
+        "LIMIT = 10\n"
+        "NAME: str = 'x'\n"
+        "\n"
+        "class Color(Enum):\n"
+        "    RED = 'red'\n"
+        "    GREEN = 'green'\n"
+        "\n"
+        "def helper(a, b=None):\n"
+        "    return a\n"
+        "\n"
+        "@cli\n"
+        "def paint(color: Color = Color.RED, limit: int = LIMIT, name=NAME):\n"
+        '    """Paint."""\n'
+    ),
+    "fake_code_in_strings": (
+        '"""Usage:\n'
+        "@cli\n"
+        "def fake(): pass\n"
+        "class Fake(Enum):\n"
+        "    A = 1\n"
+        '"""\n'
+        "SQL = '''\n"
+        "SELECT 1\n"
+        "LIMIT = 3\n"
+        "'''\n"
+        "from cliche import cli\n"
+        "LIMIT = 5\n"
+        "@cli\n"
+        "def real(limit: int = LIMIT):\n"
+        '    """Doc with\n'
+        "    @cli\n"
+        "    class Inner(Enum): pass\n"
+        '    """\n'
+    ),
+    "brackets_and_continuations": (
+        "from cliche import cli\n"
+        "CONFIG = dict(\n"
+        "DEBUG = 1,\n"
+        ")\n"
+        "TOTAL = 1 + \\\n"
+        "2\n"
+        "TABLE = {\n"
+        "    'k': [1, (2, {3: 4})],  # a comment with a ' quote\n"
+        "}\n"
+        "@cli\n"
+        "def run(debug=DEBUG, total=TOTAL, table=TABLE):\n"
+        "    pass\n"
+    ),
+    "reassigned_constant": (
+        "from cliche import cli\n"
+        "LIMIT = 5\n"
+        "@cli\n"
+        "def a(limit: int = LIMIT): pass\n"
+        "if True: x = 1\n"
+        "LIMIT = 6\n"
+        "RATE = 1.5; OTHER = RATE\n"
+        "@cli('grp')\n"
+        "def b(rate: float = RATE, other=OTHER): pass\n"
+    ),
+    "nesting_and_decorators": (
+        "import enum\n"
+        "from typing import TYPE_CHECKING\n"
+        "from pydantic import BaseModel\n"
+        "from cliche import cli\n"
+        "import cliche\n"
+        "\n"
+        "class Outer:\n"
+        "    class Mode(enum.IntEnum):\n"
+        "        A = 1\n"
+        "        B: int = 2\n"
+        "\n"
+        "    @cli\n"
+        "    def method(self): pass\n"
+        "\n"
+        "class Base(\n"
+        "    BaseModel,\n"
+        "):  # comment: with a colon\n"
+        "    x: int = 1\n"
+        "\n"
+        "class Conn(Base):\n"
+        "    host: str = Field('h', description='Host: name')\n"
+        "    tls: bool = False\n"
+        "\n"
+        "def factory():\n"
+        "    class Derived(Base): pass\n"
+        "    return Derived\n"
+        "\n"
+        "class Leaf(Derived): y = 2\n"
+        "\n"
+        "if TYPE_CHECKING:\n"
+        "    pass\n"
+        "else:\n"
+        "    @cli\n"
+        "    def hidden(): pass\n"
+        "\n"
+        "try:\n"
+        "    import foo\n"
+        "except ImportError:\n"
+        "    @cliche.cli(\n"
+        "        'grp'\n"
+        "    )\n"
+        "    async def fallback(n: int = 1): ...\n"
+        "\n"
+        "@staticmethod\n"
+        "@cli\n"
+        "# a comment between decorators and def\n"
+        "def stacked(x=f'{1}' 'lit', y=\"#not a comment\"): pass\n"
+        "class NoBases: pass\n"
+        "class Flags(enum.Flag): A = 1"
+    ),
+    "crlf_and_tabs": (
+        "from cliche import cli\r\n"
+        "from enum import Enum\r\n"
+        "N = 3\r\n"
+        "class E(Enum):\r\n"
+        "\tX = 1\r\n"
+        "@cli\r\n"
+        "def f(n=N):\r\n"
+        "\tpass\r\n"
+    ),
+}
+
+
+def _results(content: str, tree: ast.Module) -> str:
+    functions, _ = extract_cli_functions(content, Path("/pkg/mod.py"), Path("/pkg"),
+                                         return_tree=True)
+    if tree is not None:
+        # Same extraction, fed the given tree instead of a fresh full parse.
+        import cliche.main as main
+        parse, main.ast.parse = main.ast.parse, lambda *a, **k: tree
+        try:
+            functions = extract_cli_functions(content, Path("/pkg/mod.py"), Path("/pkg"))
+        finally:
+            main.ast.parse = parse
+    models = extract_pydantic_models(content, tree)
+    schemas = extract_pydantic_schemas(tree or ast.parse(content), models)
+    return json.dumps([functions, extract_python_enums(content, tree),
+                       sorted(models), schemas])
+
+
+@pytest.mark.parametrize("name", sorted(_SOURCES))
+def test_slices_match_full_parse(name):
+    content = _SOURCES[name]
+    tree = partial_parse.parse_slices(content)
+    assert tree is not None, "the lexer should vouch for valid source"
+    assert _results(content, tree) == _results(content, ast.parse(content))
+
+
+def test_extract_cli_functions_partial_mode(monkeypatch):
+    monkeypatch.setattr(partial_parse, "PARTIAL_PARSE_MIN_BYTES", 0)
+    content = _SOURCES["basic"]
+    full, full_tree = extract_cli_functions(content, Path("/pkg/mod.py"), Path("/pkg"),
+                                            return_tree=True)
+    sliced, tree = extract_cli_functions(content, Path("/pkg/mod.py"), Path("/pkg"),
+                                         return_tree=True, partial=True)
+    assert sliced == full
+    assert sliced[0]["parameters"][1]["default"] == "10"
+    assert extract_python_enums(content, tree) == extract_python_enums(content, full_tree)
+    # Only the slices were parsed: no helper, no imports, no NAME-less noise.
+    names = {getattr(node, "name", None) for node in tree.body}
+    assert "helper" not in names and {"paint", "Color"} <= names
+    assert not any(isinstance(node, ast.ImportFrom) for node in tree.body)
+
+
+def test_large_generated_module():
+    chunks = ["from enum import Enum\nfrom cliche import cli\nLIMIT = 7\n"]
+    for i in range(400):
+        chunks.append(
+            f"class C{i}(Enum):\n    A = {i}\n\n"
+            f"def helper{i}(a, b=None):\n"
+            f'    """Helper {i}.\n\n    Details.\n    """\n'
+            f"    return dict(a=a, b=[b, (1, 2)], c={{'k': '{i}'}})\n\n"
+            f"TABLE_{i} = {{\n    'k': ({i}, \"v\"),\n}}\n\n"
+        )
+        if i % 50 == 0:
+            chunks.append(f"@cli\ndef cmd{i}(limit: int = LIMIT, c: C{i} = C{i}.A):\n    pass\n\n")
+    content = "".join(chunks)
+    tree = partial_parse.parse_slices(content)
+    assert tree is not None
+    assert _results(content, tree) == _results(content, ast.parse(content))
+    assert not any(getattr(node, "name", "").startswith("helper") for node in tree.body)
+
+
+@pytest.mark.parametrize("content", [
+    "from cliche import cli\nX = 'unterminated\n@cli\ndef f(): pass\n",
+    "from cliche import cli\nX = '''never closed\n@cli\ndef f(): pass\n",
+    "from cliche import cli\nX = (1,\n@cli\ndef f(): pass\n",
+    "from cliche import cli\nX = 1)\n@cli\ndef f(): pass\n",
+    "from cliche import cli\n@cli\ndef f(:\n    pass\n",
+    "    @cli\ndef f(): pass\n",
+])
+def test_falls_back_when_unsure(content):
+    assert partial_parse.parse_slices(content) is None
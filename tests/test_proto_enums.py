@@ -0,0 +1,118 @@
+"""Tests for protobuf enum extraction (cliche/proto_enums.py).
+
+Contracts:
+    - enums come from walking the serialized FileDescriptorProto: top-level
+      and nested enums with their value names, and nothing else — message,
+      field and package names never show up
+    - both protoc layouts (`AddSerializedFile(b'...')` and the pre-3.20
+      `serialized_pb=b'...'`) are read, escaped quotes included; a malformed
+      descriptor gives no enums rather than an error
+    - a rescan re-reads only the `_pb2.py` files whose mtime changed
+"""
+from __future__ import annotations
+
+import os
+import time
+
+from cliche import proto_enums
+from cliche.proto_enums import descriptor_enums, parse_pb2_enums
+from cliche.runtime import _get_cache_path, _scan_and_cache
+
+# protoc 3.21 output for:
+#   package demo;
+#   enum Exchange { NULL_EXCHANGE = 0; bitmex = 1; deribit = 2; }
+#   message Order {
+#     enum Side { SIDE_UNSET = 0; BUY = 1; SELL = 2; }
+#     message Leg { enum Kind { K0 = 0; K1 = 1; } string note = 1; }
+#     Side side = 1; string symbol_name = 2;
+#   }
+_PB2 = (
+    "from google.protobuf import descriptor_pool as _descriptor_pool\n"
+    "DESCRIPTOR = _descriptor_pool.Default()."
+    r"AddSerializedFile(b'\n\x0b\x65nums.proto\x12\x04\x64\x65mo\"\x94\x01\n"
+    r"\x05Order\x12\x1e\n\x04side\x18\x01 \x01(\x0e\x32\x10.demo.Order.Side"
+    r"\x12\x13\n\x0bsymbol_name\x18\x02 \x01(\t\x1a+\n\x03Leg\x12\x0c\n\x04n"
+    r"ote\x18\x01 \x01(\t\"\x16\n\x04Kind\x12\x06\n\x02K0\x10\x00\x12\x06\n"
+    r"\x02K1\x10\x01\")\n\x04Side\x12\x0e\n\nSIDE_UNSET\x10\x00\x12\x07\n"
+    r"\x03\x42UY\x10\x01\x12\x08\n\x04SELL\x10\x02*6\n\x08\x45xchange\x12"
+    r"\x11\n\rNULL_EXCHANGE\x10\x00\x12\n\n\x06\x62itmex\x10\x01\x12\x0b\n"
+    r"\x07\x64\x65ribit\x10\x02\x62\x06proto3')"
+    "\n_globals = globals()\n"
+    "_globals['_EXCHANGE']._serialized_start=172\n")
+
+
+def _ld(number: int, payload: bytes) -> bytes:
+    """One length-delimited field (lengths here stay below 128)."""
+    return bytes([number << 3 | 2, len(payload)]) + payload
+
+
+def _enum(name: str, *values: str) -> bytes:
+    return _ld(1, name.encode()) + b"".join(
+        _ld(2, _ld(1, v.encode()) + bytes([2 << 3, i])) for i, v in enumerate(values))
+
+
+def _literal(blob: bytes) -> str:
+    """blob as protoc writes it: single quotes, escaped."""
+    return "b'" + repr(blob)[2:-1].replace("\\'", "'").replace("'", "\\'") + "'"
+
+
+def test_descriptor_walk():
+    assert parse_pb2_enums is proto_enums.parse_pb2_enums
+    blob = _ld(1, b"x.proto") + _ld(4, _ld(1, b"Msg") + _ld(4, _enum("Inner", "A", "B")))
+    blob += _ld(5, _enum("Top", "X", "it's"))
+    assert descriptor_enums(blob) == {"Inner": ["A", "B"], "Top": ["X", "it's"]}
+
+
+def test_parse_pb2_file(tmp_path):
+    path = tmp_path / "enums_pb2.py"
+    path.write_text(_PB2)
+    assert parse_pb2_enums(path) == {
+        "Kind": ["K0", "K1"],
+        "Side": ["SIDE_UNSET", "BUY", "SELL"],
+        "Exchange": ["NULL_EXCHANGE", "bitmex", "deribit"],
+    }
+
+    blob = _ld(5, _enum("Quote", "it's", "ok"))
+    path.write_text("DESCRIPTOR = _descriptor.FileDescriptor(name='q.proto', "
+                    f"serialized_pb={_literal(blob)})\n")
+    assert parse_pb2_enums(path) == {"Quote": ["it's", "ok"]}
+
+    path.write_text("DESCRIPTOR = pool.AddSerializedFile(b'\\n\\xff\\xff')\n")
+    assert parse_pb2_enums(path) == {}
+    assert parse_pb2_enums(tmp_path / "missing_pb2.py") == {}
+
+
+def test_rescan_reads_changed_pb2_only(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    pkg = tmp_path / "protopkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cli.py").write_text(
+        "from cliche import cli\n\n@cli\ndef trade(side: Side, venue: Quote):\n    pass\n")
+    (pkg / "a_pb2.py").write_text(_PB2)
+    quote = _ld(5, _enum("Quote", "BID", "ASK"))
+    (pkg / "b_pb2.py").write_text(f"DESCRIPTOR = pool.AddSerializedFile({_literal(quote)})\n")
+
+    read = []
+    real = proto_enums.parse_pb2_enums
+    monkeypatch.setattr(proto_enums, "parse_pb2_enums", lambda p: read.append(p.name) or real(p))
+
+    def scan():
+        return _scan_and_cache(pkg, _get_cache_path("protopkg", pkg), "protopkg")
+
+    cache = scan()
+    assert sorted(read) == ["a_pb2.py", "b_pb2.py"]
+    assert cache["enums"] == {"Side": ["SIDE_UNSET", "BUY", "SELL"], "Quote": ["BID", "ASK"]}
+
+    quote = _ld(5, _enum("Quote", "BID", "ASK", "MID"))
+    (pkg / "b_pb2.py").write_text(f"DESCRIPTOR = pool.AddSerializedFile({_literal(quote)})\n")
+    later = time.time() + 5
+    os.utime(pkg / "b_pb2.py", (later, later))
+    read.clear()
+    cache = scan()
+    assert read == ["b_pb2.py"]
+    assert cache["enums"]["Quote"] == ["BID", "ASK", "MID"]
+
+    read.clear()
+    scan()
+    assert read == []
@@ -176,6 +176,95 @@ class TestHelpOnlyPydanticExpansion:
         assert extract_pydantic_models(src) == {"Inner", "Outer"}
 
 
+class TestStaticPydanticSchemas:
+    """Models the scanner reads field by field expand from the cache alone."""
+
+    _SCHEMA = [
+        {"name": "host", "annotation": "str", "required": True},
+        {"name": "port", "annotation": "int", "required": False, "default": 8080,
+         "description": "TCP port"},
+        {"name": "tls", "annotation": "bool", "required": False, "default": False},
+    ]
+
+    def test_extract_pydantic_schemas(self):
+        import ast
+
+        from cliche.main import extract_pydantic_models, extract_pydantic_schemas
+        src = (
+            "from typing import ClassVar\n"
+            "from pydantic import BaseModel, Field\n"
+            "class Base(BaseModel):\n"
+            "    model_config = {'frozen': True}\n"
+            "    host: str\n"
+            "    port: int = 1\n"
+            "class Conn(Base):\n"
+            "    \"\"\"A connection.\"\"\"\n"
+            "    kind: ClassVar[str] = 'x'\n"
+            "    port: int = Field(8080, description='TCP port', ge=1)\n"
+            "    tls: bool = Field(default=False)\n"
+            "    name: str = Field(...)\n"
+            "    def url(self):\n"
+            "        return self.host\n"
+            "class Tags(BaseModel):\n"
+            "    tags: list[str] = []\n"
+            "class Made(BaseModel):\n"
+            "    n: int = Field(default_factory=int)\n"
+            "class Derived(Tags):\n"
+            "    x: int = 0\n"
+        )
+        tree = ast.parse(src)
+        schemas = extract_pydantic_schemas(tree, extract_pydantic_models("", tree))
+        assert schemas["Base"] == [
+            {"name": "host", "annotation": "str", "required": True},
+            {"name": "port", "annotation": "int", "required": False, "default": 1},
+        ]
+        assert schemas["Conn"] == [
+            {"name": "host", "annotation": "str", "required": True},
+            {"name": "port", "annotation": "int", "required": False, "default": 8080,
+             "description": "TCP port"},
+            {"name": "tls", "annotation": "bool", "required": False, "default": False},
+            {"name": "name", "annotation": "str", "required": True},
+        ]
+        # Non-builtin field types, default factories and their subclasses
+        # need the imported class.
+        assert set(schemas) == {"Base", "Conn"}
+
+    def _func(self):
+        return {
+            "name": "_handler", "cli_name": "_handler",
+            "module": __name__, "file_path": "",
+            "parameters": [{"name": "cfg", "type_annotation": "SimpleModel"}],
+            "docstring": "",
+        }
+
+    def test_expands_without_import(self, monkeypatch):
+        import cliche.run as run
+        monkeypatch.setattr(run, "_resolve_annotation_class",
+                            lambda *a: pytest.fail("imported the user module"))
+        parser = build_parser_for_function(
+            self._func(), help_only=True, pydantic_models={"SimpleModel": self._SCHEMA},
+        )
+        ns = parser.parse_args(["--host", "x", "--port", "9", "--tls"])
+        assert (ns.host, ns.port, ns.tls) == ("x", 9, True)
+        assert parser._pydantic_binds == [("cfg", "SimpleModel", ["host", "port", "tls"])]
+        assert "|int| Default: 8080 | TCP port" in parser.format_help()
+
+    def test_invoke_resolves_the_class(self, capsys):
+        import json
+        parser = build_parser_for_function(
+            self._func(), pydantic_models={"SimpleModel": self._SCHEMA},
+        )
+        ns = parser.parse_args(["--host", "h"])
+        invoke_function(self._func(), ns, pydantic_binds=parser._pydantic_binds)
+        assert json.loads(capsys.readouterr().out) == {"host": "h", "port": 8080, "tls": False}
+
+    def test_missing_schema_imports_as_before(self):
+        parser = build_parser_for_function(
+            self._func(), help_only=True, pydantic_models={"SimpleModel": None},
+        )
+        assert parser._pydantic_binds == [("cfg", SimpleModel, ["host", "port", "tls"])]
+
+
 class TestInvokeFunctionWithPydantic:
     def test_model_reconstructed_at_invoke(self):
         """End-to-end: parse → invoke → function receives real BaseModel instance."""
@@ -0,0 +1,109 @@
+"""Tests for the install registry (cliche/registry.py).
+
+Contracts:
+    - `installs()` scans once, then answers from the registry file while
+      every stamped directory's mtime and sys.path are unchanged
+    - a new dist-info on sys.path (its dir's mtime) or a different sys.path
+      sends it back to the full scan
+    - the command count follows the runtime cache without a rescan
+    - `record` rescans only the binary it's given when the registry was
+      valid before, and drops the registry when it wasn't
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import pytest
+
+from cliche import registry
+
+
+def _dist(site, name, binary):
+    dist_info = site / f"{name}-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text(f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        f"[console_scripts]\n{binary} = cliche.launcher:launch_{name}\n")
+    pkg = site / name
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    return pkg
+
+
+def _bump(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    site = tmp_path / "site-packages"
+    site.mkdir()
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("UV_TOOL_DIR", str(tmp_path / "tools"))
+    monkeypatch.setattr(sys, "path", [str(site), *sys.path])
+    _dist(site, "regpkg_a", "rega")
+    return site
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    calls = []
+    real_scan = registry.scan
+
+    def counting_scan(only=None, stamps=None):
+        calls.append(only)
+        return real_scan(only=only, stamps=stamps)
+
+    monkeypatch.setattr(registry, "scan", counting_scan)
+    return calls
+
+
+def _mine(rows):
+    return {r["binary"]: r for r in rows if r["pkg"].startswith("regpkg_")}
+
+
+def test_scan_once_then_registry(site, scans):
+    rows = _mine(registry.installs())
+    assert rows["rega"]["pkg_dir"] == str(site / "regpkg_a")
+    assert rows["rega"]["mode"] == "site" and rows["rega"]["ver"] == "1.0"
+    assert _mine(registry.installs()) == rows
+    assert scans == [None]
+
+    _dist(site, "regpkg_b", "regb")
+    assert set(_mine(registry.installs())) == {"rega", "regb"}
+    assert scans == [None, None]
+
+
+def test_changed_sys_path_rescans(site, scans, tmp_path, monkeypatch):
+    registry.installs()
+    other = tmp_path / "other"
+    other.mkdir()
+    monkeypatch.setattr(sys, "path", [str(other), *sys.path])
+    registry.installs()
+    assert scans == [None, None]
+
+
+def test_command_count_follows_cache(site, scans):
+    row = _mine(registry.installs())["rega"]
+    assert row["n_cmds"] is None
+    cache = row["cache_path"]
+    with open(cache, "w") as f:
+        json.dump({"files": {"a.py": {"functions": [{}, {}]}}}, f)
+    assert _mine(registry.installs())["rega"]["n_cmds"] == 2
+    assert scans == [None]
+
+
+def test_record(site, scans):
+    before = registry.installs()
+    _dist(site, "regpkg_b", "regb")
+    registry.record(before, "regb")
+    assert scans == [None, {"regb"}]
+    assert set(_mine(registry.installs())) == {"rega", "regb"}
+    assert scans == [None, {"regb"}]
+
+    _bump(site)
+    registry.record(registry.load(), "regb")
+    assert not registry.registry_path().exists()
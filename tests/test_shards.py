@@ -0,0 +1,144 @@
+"""Tests for the sharded cache (cliche/shards.py).
+
+Contracts:
+    - a scan leaves an index and one shard per file next to the JSON, and
+      the next scan loads the index instead of the JSON
+    - command tables built from the stubs hold the same commands and
+      function records as tables built from the JSON
+    - a no-change scan reads no shards; a dispatch reads exactly one
+    - editing a file rewrites only its shard; deleting one removes its shard
+    - the index is ignored once anything else rewrites the JSON
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+
+import pytest
+
+import cliche.run as run
+from cliche import shards
+from cliche.cache_index import write_cache
+from cliche.runtime import _get_cache_path, _scan_and_cache
+
+_ALPHA = (
+    "from enum import Enum\n"
+    "from cliche import cli\n"
+    "\n"
+    "class Mode(Enum):\n"
+    "    FAST = 'fast'\n"
+    "\n"
+    "@cli\n"
+    "def go(mode: Mode = Mode.FAST, times: int = 1):\n"
+    '    """Go somewhere."""\n'
+    "\n"
+    "@cli('data')\n"
+    "def export_rows(path: str):\n"
+    '    """Export rows."""\n'
+)
+_BETA = (
+    "from cliche import cli\n"
+    "\n"
+    "@cli\n"
+    "def stop(now: bool = False):\n"
+    '    """Stop."""\n'
+    "\n"
+    "@cli('data')\n"
+    "def import_rows(path: str, limit: int = 10):\n"
+    '    """Import rows."""\n'
+)
+
+
+@pytest.fixture
+def pkg(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    pkg = tmp_path / "shardpkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("")
+    (pkg / "alpha.py").write_text(_ALPHA)
+    (pkg / "beta.py").write_text(_BETA)
+    return pkg
+
+
+def _scan(pkg):
+    return _scan_and_cache(pkg, _get_cache_path("shardpkg", pkg), "shardpkg")
+
+
+def _shard_names(pkg):
+    directory = shards.shard_dir(_get_cache_path("shardpkg", pkg))
+    return {p.name for p in directory.iterdir()} - {shards.INDEX}
+
+
+def _tables(cache):
+    commands, subcommands, enums, _ = run.build_index(cache)
+    return ({name: commands[name] for name in commands},
+            {g: {name: funcs[name] for name in funcs} for g, funcs in subcommands.items()},
+            enums)
+
+
+def test_sharded_tables_match_json(pkg):
+    first = _scan(pkg)
+    assert _shard_names(pkg) and len(_shard_names(pkg)) == 2
+
+    loaded = shards.load(_get_cache_path("shardpkg", pkg))
+    assert loaded is not None
+    again = _scan(pkg)
+    assert isinstance(again["files"], shards.Files)
+
+    with open(_get_cache_path("shardpkg", pkg)) as f:
+        from_json = json.load(f)
+    assert _tables(again) == _tables(from_json)
+    assert sorted(_tables(again)[1]["data"]) == ["export-rows", "import-rows"]
+    assert _tables(again)[2] == first["enums"] == {"Mode": ["FAST"]}
+
+
+def test_dispatch_reads_one_shard(pkg, monkeypatch):
+    _scan(pkg)
+    reads = []
+    real = shards.Files._read_shard
+    monkeypatch.setattr(shards.Files, "_read_shard",
+                        lambda self, name: reads.append(name) or real(self, name))
+
+    cache = _scan(pkg)
+    commands, subcommands, _, _ = run.build_index(cache)
+    assert reads == []
+    assert set(commands) == {"go", "stop"} and "import-rows" in subcommands["data"]
+
+    func = subcommands["data"]["import-rows"]
+    assert len(reads) == 1
+    assert func["module"] == "shardpkg.beta"
+    assert [p["name"] for p in func["parameters"]] == ["path", "limit"]
+
+
+def test_edit_rewrites_only_its_shard(pkg):
+    _scan(pkg)
+    before = _shard_names(pkg)
+
+    later = time.time() + 5
+    (pkg / "beta.py").write_text(_BETA + "\n@cli\ndef extra(n: int): pass\n")
+    os.utime(pkg / "beta.py", (later, later))
+    cache = _scan(pkg)
+    after = _shard_names(pkg)
+    assert len(before & after) == 1 and len(after) == 2
+    assert "extra" in run.build_index(_scan(pkg))[0]
+    assert "extra" in run.build_index(cache)[0]
+
+    (pkg / "beta.py").unlink()
+    _scan(pkg)
+    assert _shard_names(pkg) == before & after
+
+
+def test_index_ignored_after_foreign_json_write(pkg):
+    cache_file = _get_cache_path("shardpkg", pkg)
+    _scan(pkg)
+    with open(cache_file) as f:
+        cache = json.load(f)
+    cache["description"] = "rewritten elsewhere"
+    write_cache(cache, cache_file, pkg)
+    assert shards.load(cache_file) is None
+
+    # The next scan reads the JSON, then re-shards it.
+    assert _scan(pkg)["description"] == "rewritten elsewhere"
+    loaded = shards.load(cache_file)
+    assert loaded is not None and loaded[0]["description"] == "rewritten elsewhere"
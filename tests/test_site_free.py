@@ -0,0 +1,180 @@
+"""Tests for the fast-shim wrapper's site-free Python fallback
+(cliche/_clichec.py:record_site, cliche/launcher.py:restore_site).
+
+Contracts:
+    - `record_site` returns the sys.path entries `site` adds, without CWD
+      or the entries Python has under -S, and a stamp per site-packages dir
+    - the wrapper runs Python with -S and the recorded path, and the
+      command runs as under a full start-up; CLICHE_FULL_SITE=1 opts out
+    - once a stamped dir's mtime changes, the invocation runs `site.main()`
+      and the fast shim is recorded again
+    - an environment with an import hook (an editable finder) keeps the full
+      start-up, so `multiprocessing` spawn workers can import the package
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from cliche._clichec import (_site_free, ensure_built, install_fast_shim, read_entry_config,
+                             record_site, render_wrapper)
+
+_CMDS = """\
+import sys
+from cliche import cli
+
+@cli
+def info(n: int = 1):
+    return {"no_site": sys.flags.no_site, "prefix": sys.prefix, "n": n}
+"""
+
+
+def test_record_site():
+    record = record_site(sys.executable)
+    assert record is not None
+    no_site = subprocess.run([sys.executable, "-S", "-c", "import sys; print(sys.path)"],
+                             capture_output=True, text=True, cwd="/").stdout
+    assert record["path"] and not set(record["path"]) & set(eval(no_site))
+    assert "/" not in record["path"]
+    assert record["prefix"] == sys.prefix
+    assert set(record["stamps"]) >= set(p for p in record["path"] if p.endswith("-packages"))
+    assert record_site("/nonexistent/python") is None
+
+
+@pytest.fixture
+def tool(tmp_path):
+    pkg = tmp_path / "src" / "site_pkg"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cmds.py").write_text(_CMDS)
+    stamped = tmp_path / "site-packages"
+    stamped.mkdir()
+    record = record_site(sys.executable)
+    record["stamps"] = {str(stamped): os.stat(stamped).st_mtime_ns}
+    wrapper = tmp_path / "bin" / "sitetool"
+    wrapper.parent.mkdir()
+    wrapper.write_text(render_wrapper(
+        binary_name="sitetool", package_name="site_pkg", pkg_dir=str(pkg),
+        python_exe=sys.executable, clichec="/nonexistent", cache_hash="0" * 8,
+        site=record))
+    wrapper.chmod(0o755)
+    env = {k: v for k, v in os.environ.items()
+           if k not in ("CLICHE_NO_FAST_SHIM", "CLICHE_FULL_SITE", "CLICHE_ZYGOTE")}
+    env.update(XDG_CACHE_HOME=str(tmp_path / "cache"), NO_COLOR="1",
+               PYTHONPATH=str(tmp_path / "src"))
+    return wrapper, stamped, env
+
+
+def _run(wrapper, env, *argv):
+    return subprocess.run([str(wrapper), "info", *argv], env=env, capture_output=True,
+                          text=True, check=True).stdout
+
+
+def test_wrapper_starts_without_site(tool):
+    wrapper, _, env = tool
+    assert subprocess.run(["sh", "-n", str(wrapper)]).returncode == 0
+    assert '"$PYTHON" -S -c' in wrapper.read_text()
+    out = _run(wrapper, env, "-n", "3")
+    assert '"no_site": 1' in out and '"n": 3' in out
+    assert f'"prefix": "{sys.prefix}"' in out
+    assert '"no_site": 0' in _run(wrapper, {**env, "CLICHE_FULL_SITE": "1"})
+
+
+@pytest.mark.skipif(ensure_built() is None, reason="clichec unavailable (no C compiler)")
+def test_changed_site_packages_records_again(tool):
+    wrapper, stamped, env = tool
+    before = wrapper.read_text()
+    _run(wrapper, env)
+    assert wrapper.read_text() == before
+
+    (stamped / "new_dist").mkdir()
+    out = _run(wrapper, env)
+    assert '"n": 1' in out
+    # Recorded again, into clichec installed as the CLI; same Python.
+    settings = read_entry_config(wrapper)
+    assert settings["PYTHON"] == sys.executable
+    if _site_free(record_site(sys.executable)) is None:
+        # The suite's editable installs are in site-packages: full start-up.
+        assert "SITE" not in settings
+    else:
+        assert "restore_site" in settings["SITE"] and str(stamped) not in settings["SITE"]
+
+
+def test_import_hooks_keep_the_full_start_up():
+    record = record_site(sys.executable)
+    distutils = "import _distutils_hack; _distutils_hack.add_shim()"
+    assert _site_free({**record, "hooks": []}) is not None
+    assert _site_free({**record, "hooks": [distutils]}) is not None
+    assert _site_free({**record, "hooks": ["import __editable___x_finder"]}) is None
+    assert _site_free({**record, "hooks": ["import sitecustomize"]}) is None
+    assert _site_free(None) is None
+
+
+_FINDER = """\
+import importlib.util, sys
+
+class _Finder:
+    @classmethod
+    def find_spec(cls, name, path=None, target=None):
+        if name == "mppkg":
+            return importlib.util.spec_from_file_location(
+                name, {init!r}, submodule_search_locations=[{pkg!r}])
+
+def install():
+    sys.meta_path.append(_Finder)
+"""
+
+_MP_CMDS = """\
+import multiprocessing
+from cliche import cli
+
+def child():
+    pass
+
+@cli
+def work():
+    proc = multiprocessing.get_context("spawn").Process(target=child)
+    proc.start()
+    proc.join()
+    return {"exitcode": proc.exitcode}
+"""
+
+
+@pytest.mark.skipif(ensure_built() is None, reason="clichec unavailable (no C compiler)")
+def test_spawn_workers_import_an_editable_package(tmp_path, monkeypatch):
+    # A package only an editable install's finder (a .pth import hook) finds.
+    pkg = tmp_path / "src" / "mppkg"
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cmds.py").write_text(_MP_CMDS)
+    venv = tmp_path / "venv"
+    subprocess.run([sys.executable, "-m", "venv", "--without-pip", "--system-site-packages",
+                    str(venv)], check=True)
+    python = venv / "bin" / "python"
+    purelib = subprocess.run([str(python), "-c", "import sysconfig; print(sysconfig.get_path('purelib'))"],
+                             capture_output=True, text=True, check=True).stdout.strip()
+    (Path(purelib) / "__editable___mppkg_finder.py").write_text(
+        _FINDER.format(init=str(pkg / "__init__.py"), pkg=str(pkg)))
+    (Path(purelib) / "__editable__.mppkg.pth").write_text(
+        "import __editable___mppkg_finder; __editable___mppkg_finder.install()\n")
+
+    target = venv / "bin" / "mptool"
+    target.write_text(f"#!{python}\nfrom cliche.launcher import launch_mppkg\nlaunch_mppkg()\n")
+    target.chmod(0o755)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    ok, msg = install_fast_shim("mptool", "mppkg", str(pkg), target_path=str(target))
+    assert ok, msg
+    assert "SITE" not in read_entry_config(target)
+
+    env = {k: v for k, v in os.environ.items()
+           if k not in ("CLICHE_NO_FAST_SHIM", "CLICHE_FULL_SITE", "CLICHE_ZYGOTE",
+                        "CLICHE_SH_WRAPPER", "PYTHONPATH")}
+    env.update(XDG_CACHE_HOME=str(tmp_path / "cache"), NO_COLOR="1")
+    out = subprocess.run([str(target), "work"], env=env, cwd=tmp_path, capture_output=True,
+                         text=True, timeout=60)
+    assert out.returncode == 0, out.stderr
+    assert '"exitcode": 0' in out.stdout, out.stderr
@@ -0,0 +1,62 @@
+"""Tests for streamed generator results (output.emit on an iterator).
+
+Contracts:
+    - the first item is written at once, the rest in bounded chunks
+    - a closed pipe (`| head`) closes the generator, so its `finally` runs,
+      and exits quietly with the SIGPIPE status
+"""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from cliche import output
+
+
+class _Out:
+    def __init__(self, fail_after=None):
+        self.writes: list[str] = []
+        self.fail_after = fail_after
+
+    def write(self, text):
+        if self.fail_after is not None and len(self.writes) >= self.fail_after:
+            raise BrokenPipeError
+        self.writes.append(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def test_first_item_then_bounded_chunks(monkeypatch):
+    out = _Out()
+    monkeypatch.setattr(output.sys, "stdout", out)
+    monkeypatch.setattr(output, "_FLUSH_SECONDS", 3600)
+    output.emit(iter({"i": i} for i in range(20000)))
+
+    assert out.writes[0] == '{"i":0}\n'
+    assert 2 < len(out.writes) < 20
+    assert max(map(len, out.writes)) < output._BUFFER_BYTES + 64
+    lines = "".join(out.writes).splitlines()
+    assert [json.loads(line)["i"] for line in lines] == list(range(20000))
+
+
+def test_broken_pipe_closes_generator(monkeypatch):
+    closed = []
+
+    def rows():
+        try:
+            while True:
+                yield "row"
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(output.sys, "stdout", _Out(fail_after=1))
+    monkeypatch.setattr(output, "_FLUSH_SECONDS", 0)
+    with pytest.raises(SystemExit) as exc:
+        output.emit(rows())
+    assert exc.value.code == 141
+    assert closed == [True]
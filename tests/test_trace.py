@@ -0,0 +1,77 @@
+"""Tests for CLICHE_TRACE (cliche/trace.py), against the installed fixture CLI.
+
+Contracts:
+    - one invocation appends spans from every stage it went through: clichec
+      (and the shell wrapper, if that's the fast shim), then the Python startup,
+      scan and run phases; invocations append to the same file
+    - spans of one invocation line up on one epoch-microsecond timeline
+    - the file loads whether or not its array was closed, and `summarize`
+      groups the spans by name
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+
+from cliche import trace
+from cliche._clichec import is_fast_shim
+
+
+def _run(binary, trace_file, *args):
+    env = {**os.environ, "CLICHE_TRACE": str(trace_file)}
+    return subprocess.run([binary, *args], capture_output=True, text=True, env=env)
+
+
+def test_trace_spans_every_stage(cli_binary, tmp_path):
+    trace_file = tmp_path / "trace.json"
+    # A warm cache, so the fast shim's clichec gets to look at the call.
+    subprocess.run([cli_binary, "math", "add", "1", "1"], capture_output=True)
+    assert _run(cli_binary, trace_file, "math", "add", "2", "3").returncode == 0
+    events = trace.load(str(trace_file))
+    spans = {e["name"]: e for e in events if e["ph"] == "X"}
+
+    for name in ("python", "python.startup", "discover", "scan.cache_load",
+                 "run.build_index", "run.parse_args",
+                 "run.import", "run.invoke", "run.output"):
+        assert name in spans, (name, sorted(spans))
+    # `math add`'s signature has a parse plan: no argparse parser is built.
+    assert spans["run.parse_args"]["args"] == {"plan": True}
+    assert "run.build_parser" not in spans
+    assert spans["run.import"]["args"] == {"module": "cliche_test.cli"}
+    python = spans["python"]
+    for name in ("run.invoke", "run.output"):
+        assert python["ts"] <= spans[name]["ts"] <= python["ts"] + python["dur"]
+
+    path = shutil.which(cli_binary) or cli_binary
+    fast_shim = is_fast_shim(path)
+    if fast_shim:
+        # `math add` passes clichec's argv check and is handed to Python;
+        # the shell wrapper, when there is one, starts first.
+        assert spans["clichec"]["args"] == {"rc": 64}
+        assert spans["clichec"]["ts"] <= spans["python.startup"]["ts"]
+        with open(path, "rb") as f:
+            wrapper = f.read(2) == b"#!"
+        assert ("wrapper" in spans) == wrapper
+        if wrapper:
+            assert spans["wrapper"]["ts"] <= spans["clichec"]["ts"]
+
+    # A second invocation appends to the same file.
+    assert _run(cli_binary, trace_file, "--help").returncode == 0
+    again = trace.load(str(trace_file))
+    assert len(again) > len(events)
+    assert "run.help" in {e["name"] for e in again} or fast_shim
+
+
+def test_load_and_summarize(tmp_path):
+    path = tmp_path / "t.json"
+    path.write_text(
+        '[\n{"name":"a","ph":"X","ts":10,"dur":1000,"pid":1,"tid":1},\n'
+        '{"name":"a","ph":"X","ts":50,"dur":3000,"pid":1,"tid":1},\n'
+        '{"name":"b","ph":"X","ts":20,"dur":2000,"pid":1,"tid":1},\n'
+    )
+    events = trace.load(str(path))
+    assert len(events) == 3
+    rows = trace.summarize(events).splitlines()
+    assert rows[1].split() == ["a", "2", "2.00", "1.00", "3.00", "3.00"]
+    assert rows[2].split()[:2] == ["b", "1"]
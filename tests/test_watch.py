@@ -0,0 +1,177 @@
+"""Tests for the cache watcher daemon (cliche/watch.py).
+
+Contracts:
+    - the daemon publishes a token for the JSON it verified, and republishes
+      after edits, new files and new subpackages, rescanning on its own
+    - while it runs, the Python launcher skips the tree stats and clichec
+      trusts the token instead of its per-file mtime checks
+    - a daemon killed without cleanup leaves a token nobody trusts
+    - SIGTERM removes the token; a second daemon for the same package refuses
+
+Same throwaway-package setup as test_zygote. Linux only (inotify).
+"""
+from __future__ import annotations
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from cliche import watch
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"),
+                                reason="cliche watch needs inotify")
+
+PKG_NAME = "cliche_watch_pkg"
+PROG = "cw"
+
+_CLI_SRC = (
+    "from cliche import cli\n"
+    "\n"
+    "@cli\n"
+    "def hello(name: str = 'x'):\n"
+    '    """Say hello."""\n'
+    "    print('hello', name)\n"
+)
+
+_LAUNCHER = (
+    "from cliche.runtime import run_package_cli\n"
+    f"run_package_cli({PKG_NAME!r})\n"
+)
+
+
+@pytest.fixture
+def watch_env(tmp_path):
+    src = tmp_path / "src"
+    pkg = src / PKG_NAME
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cli.py").write_text(_CLI_SRC)
+    launcher = tmp_path / PROG
+    launcher.write_text(_LAUNCHER)
+    env = {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache"),
+           "PYTHONPATH": str(src), "NO_COLOR": "1", "COLUMNS": "80"}
+    procs = []
+
+    def python(argv):
+        return subprocess.run([sys.executable, str(launcher), *argv],
+                              env=env, capture_output=True, text=True)
+
+    python(["--help"])
+    cache_file = next((tmp_path / "cache" / "cliche").glob(f"{PKG_NAME}_*.json"))
+
+    def start():
+        procs.append(subprocess.Popen(
+            [sys.executable, "-c",
+             f"import sys; from cliche.watch import serve; sys.exit(serve({PKG_NAME!r}, {PROG!r}))"],
+            env=env, cwd=str(tmp_path), stderr=subprocess.DEVNULL,
+        ))
+        wait_for(lambda: watch.read_token(cache_file), "daemon never published a token")
+        return procs[-1]
+
+    yield {"pkg": pkg, "env": env, "python": python, "cache_file": cache_file,
+           "start": start}
+    for proc in procs:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+
+
+def wait_for(predicate, what, timeout=15.0):
+    deadline = time.time() + timeout
+    while True:
+        result = predicate()
+        if result:
+            return result
+        assert time.time() < deadline, what
+        time.sleep(0.02)
+
+
+def _commands(cache_file):
+    with open(cache_file) as f:
+        cache = json.load(f)
+    return {fn["name"] for finfo in cache["files"].values() for fn in finfo["functions"]}
+
+
+def _vouched(cache_file):
+    return watch.vouches(cache_file, os.stat(cache_file))
+
+
+def test_daemon_rescans_on_change(watch_env):
+    cache_file, pkg = watch_env["cache_file"], watch_env["pkg"]
+    watch_env["start"]()
+    generation = watch.read_token(cache_file)[2]
+    assert _vouched(cache_file)
+
+    def republished():
+        token = watch.read_token(cache_file)
+        return token and token[2] > generation and _vouched(cache_file) and token
+
+    (pkg / "more.py").write_text(
+        "from cliche import cli\n\n@cli\ndef added():\n    pass\n")
+    generation = wait_for(republished, "no new generation after adding a file")[2]
+    assert "added" in _commands(cache_file)
+
+    (pkg / "more.py").write_text(
+        "from cliche import cli\n\n@cli\ndef renamed():\n    pass\n")
+    generation = wait_for(republished, "no new generation after an edit")[2]
+    assert {"hello", "renamed"} <= _commands(cache_file)
+    assert "added" not in _commands(cache_file)
+
+    # A new subpackage: its directory is only watched after the scan that
+    # found it, and its contents still make it into the cache.
+    sub = pkg / "sub"
+    sub.mkdir()
+    (sub / "__init__.py").write_text("")
+    (sub / "deep.py").write_text(
+        "from cliche import cli\n\n@cli\ndef nested():\n    pass\n")
+    wait_for(lambda: republished() and "nested" in _commands(cache_file),
+             "new subpackage never reached the cache")
+
+
+def test_launchers_trust_a_live_daemon_only(watch_env, _background_warmups):
+    cache_file, python = watch_env["cache_file"], watch_env["python"]
+    clichec = _background_warmups["clichec"].result()
+    proc = watch_env["start"]()
+
+    assert "(watched;" in python(["--help", "--timing"]).stderr
+    if clichec:
+        r = subprocess.run([clichec, str(cache_file), PKG_NAME, "--help"],
+                           env={**watch_env["env"], "CLICHEC_DEBUG": "1",
+                                "CLICHEC_PROG": PROG},
+                           capture_output=True, text=True)
+        assert r.returncode == 0 and "hello" in r.stdout
+        assert "watcher vouches" in r.stderr
+
+    # SIGKILL skips the cleanup: the token survives, the lock doesn't.
+    proc.kill()
+    proc.wait()
+    assert watch.read_token(cache_file)
+    assert not _vouched(cache_file)
+    assert "(watched;" not in python(["--help", "--timing"]).stderr
+    if clichec:
+        r = subprocess.run([clichec, str(cache_file), PKG_NAME, "--help"],
+                           env={**watch_env["env"], "CLICHEC_DEBUG": "1"},
+                           capture_output=True, text=True)
+        assert r.returncode == 0
+        assert "watcher vouches" not in r.stderr
+
+
+def test_sigterm_cleans_up_and_second_daemon_refuses(watch_env):
+    cache_file = watch_env["cache_file"]
+    proc = watch_env["start"]()
+    second = subprocess.run(
+        [sys.executable, "-c",
+         f"import sys; from cliche.watch import serve; sys.exit(serve({PKG_NAME!r}))"],
+        env=watch_env["env"], capture_output=True, text=True, timeout=30)
+    assert second.returncode == 1
+    assert f"already watching {PKG_NAME} (pid {proc.pid})" in second.stderr
+
+    proc.send_signal(signal.SIGTERM)
+    assert proc.wait(timeout=15) == 0
+    assert watch.read_token(cache_file) is None
+    assert not watch.daemon_alive(cache_file)
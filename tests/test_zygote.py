@@ -0,0 +1,177 @@
+"""Tests for the opt-in warm fork-server (cliche/zygote.py).
+
+Uses a throwaway package on PYTHONPATH plus a private XDG_CACHE_HOME rather
+than a pip install: the server only needs `find_spec` to locate the package
+and a writable cache dir for its socket, so there's nothing to gain from
+paying for the batched install in conftest.
+
+Covered:
+    - request payload round-trip
+    - dispatch through the Python client: stdout, exit status, env and cwd
+      all come from the client, not the server
+    - invalidation: an mtime bump makes the server refuse and retire
+    - idle timeout: the server unlinks its socket and exits
+    - the clichec client, through a zygote-mode wrapper (needs a compiler)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from cliche import zygote
+
+PKG_NAME = "cliche_zygote_pkg"
+
+_CLI_SRC = (
+    "import os\n"
+    "from cliche import cli\n"
+    "\n"
+    "@cli\n"
+    "def where(name: str = 'x'):\n"
+    '    """Report the invocation context."""\n'
+    "    return {'name': name, 'cwd': os.getcwd(),\n"
+    "            'var': os.environ.get('ZYGOTE_TEST_VAR')}\n"
+    "\n"
+    "@cli\n"
+    "def leave(code: int):\n"
+    "    raise SystemExit(code)\n"
+)
+
+
+@pytest.fixture
+def zygote_env():
+    # Not pytest's tmp_path: that nests deep enough to push the socket past
+    # the ~104-byte AF_UNIX path limit, and the server declines to start.
+    tmp_path = Path(tempfile.mkdtemp(prefix="czy"))
+    src = tmp_path / "src"
+    pkg = src / PKG_NAME
+    pkg.mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "cli.py").write_text(_CLI_SRC)
+    cache_home = tmp_path / "cache"
+    env = {**os.environ, "XDG_CACHE_HOME": str(cache_home),
+           "PYTHONPATH": str(src), "NO_COLOR": "1"}
+    env.pop("CLICHE_ZYGOTE", None)
+    dir_hash = hashlib.md5(str(pkg).encode()).hexdigest()[:8]
+    cache_file = cache_home / "cliche" / f"{PKG_NAME}_{dir_hash}.json"
+    procs = []
+
+    def start(idle: float = 30.0) -> str:
+        sock = zygote.socket_path(cache_file)
+        procs.append(subprocess.Popen(
+            [sys.executable, "-c",
+             f"from cliche.zygote import serve; serve({PKG_NAME!r}, idle={idle})"],
+            env=env, cwd=str(tmp_path),
+        ))
+        deadline = time.time() + 15
+        while not os.path.exists(sock):
+            assert time.time() < deadline, "zygote server never started listening"
+            assert procs[-1].poll() is None, "zygote server exited during startup"
+            time.sleep(0.05)
+        return sock
+
+    yield {"pkg": pkg, "env": env, "cache_file": cache_file, "start": start,
+           "procs": procs, "tmp": tmp_path}
+    for p in procs:
+        if p.poll() is None:
+            p.terminate()
+        p.wait(timeout=10)
+    shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def _call(sock: str, argv: list[str], env: dict, cwd: str) -> tuple[int | None, str, str]:
+    """Run argv through the Python client with pipes standing in for stdio."""
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    null = os.open(os.devnull, os.O_RDONLY)
+    try:
+        rc = zygote.request(sock, argv, env=env, cwd=cwd, fds=(null, out_w, err_w))
+    finally:
+        os.close(null)
+        os.close(out_w)
+        os.close(err_w)
+    with os.fdopen(out_r) as out, os.fdopen(err_r) as err:
+        return rc, out.read(), err.read()
+
+
+def test_request_payload_round_trip():
+    argv = ["prog", "cmd", "", "--flag=a b", "ünïcode"]
+    env = {"A": "1", "EMPTY": "", "WITH_EQ": "x=y"}
+    payload = zygote.encode_request(argv, env, "/some/dir")
+    assert zygote.decode_request(payload) == (argv, env, "/some/dir")
+    with pytest.raises(ValueError):
+        zygote.decode_request(payload[:-3])
+
+
+def test_zygote_dispatch_uses_client_context(zygote_env):
+    sock = zygote_env["start"]()
+    env = {**zygote_env["env"], "ZYGOTE_TEST_VAR": "from-client"}
+    cwd = str(zygote_env["tmp"] / "src")
+
+    rc, out, err = _call(sock, ["zt", "where", "--name", "bob"], env, cwd)
+    assert rc == 0, err
+    assert json.loads(out) == {"name": "bob", "cwd": cwd, "var": "from-client"}
+
+    rc, _, _ = _call(sock, ["zt", "leave", "7"], env, cwd)
+    assert rc == 7
+
+    rc, _, err = _call(sock, ["zt", "leave", "not-an-int"], env, cwd)
+    assert rc == 2
+    assert "invalid int value" in err
+
+
+def test_zygote_refuses_and_retires_when_sources_change(zygote_env):
+    sock = zygote_env["start"]()
+    cli_py = zygote_env["pkg"] / "cli.py"
+    later = time.time() + 2
+    os.utime(cli_py, (later, later))
+
+    rc, _, _ = _call(sock, ["zt", "where"], zygote_env["env"], str(zygote_env["tmp"]))
+    assert rc is None, "stale zygote must not serve the request"
+    assert zygote_env["procs"][-1].wait(timeout=10) == 0
+    assert not os.path.exists(sock)
+
+
+def test_zygote_idle_timeout(zygote_env):
+    sock = zygote_env["start"](idle=0.5)
+    assert zygote_env["procs"][-1].wait(timeout=10) == 0
+    assert not os.path.exists(sock)
+    assert zygote.request(sock, ["zt", "where"]) is None
+
+
+def test_clichec_zygote_client(zygote_env, _background_warmups):
+    clichec = _background_warmups["clichec"].result()
+    if not clichec:
+        pytest.skip("clichec could not be built (no C compiler present)")
+    from cliche._clichec import render_wrapper
+
+    pkg_dir = str(zygote_env["pkg"])
+    wrapper = zygote_env["tmp"] / "zt"
+    wrapper.write_text(render_wrapper(
+        binary_name="zt", package_name=PKG_NAME, pkg_dir=pkg_dir,
+        python_exe=sys.executable, clichec=clichec,
+        cache_hash=hashlib.md5(pkg_dir.encode()).hexdigest()[:8],
+    ))
+    wrapper.chmod(0o755)
+    zygote_env["start"]()
+    env = {**zygote_env["env"], "CLICHE_ZYGOTE": "1", "ZYGOTE_TEST_VAR": "via-c"}
+
+    r = subprocess.run([str(wrapper), "where", "--name", "c"], env=env,
+                       capture_output=True, text=True, cwd=str(zygote_env["tmp"]))
+    assert r.returncode == 0, r.stderr
+    assert json.loads(r.stdout)["var"] == "via-c"
+
+    # Exit statuses are relayed verbatim — including 64, which the plain
+    # wrapper would otherwise treat as "defer to Python" and run twice.
+    r = subprocess.run([str(wrapper), "leave", "64"], env=env,
+                       capture_output=True, text=True)
+    assert r.returncode == 64